@@ -3,7 +3,9 @@
 Typer-based command-line interface for the Forex Data Aggregator.
 """
 
-from typing import List
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Tuple
 import typer
 
 from forex_data import HistoricalManagerDB
@@ -16,6 +18,119 @@ app = typer.Typer(
 )
 
 
+def _generate_ticker(
+    manager: HistoricalManagerDB,
+    ticker: str,
+    timeframe: str,
+    start_date: str,
+    end_date: str,
+    measure_bytes: bool = True
+) -> Tuple[int, int]:
+    """
+    Download and aggregate the data of a ticker in the database.
+
+    Returns the rows retrieved and the bytes added to the database,
+    0 if measure_bytes is False.
+    """
+    bytes_before = manager.get_ticker_byte_size(ticker) if measure_bytes else 0
+
+    # Query / download data. HistoricalManagerDB automatically downloads
+    # missing historical periods and caches them locally.
+    lazy_frame = manager.get_data(
+        ticker=ticker,
+        timeframe=timeframe,
+        start=start_date,
+        end=end_date
+    )
+
+    # Collect lazy frame if applicable to get actual row count
+    if hasattr(lazy_frame, "collect"):
+        df = lazy_frame.collect()
+    else:
+        df = lazy_frame
+
+    if not measure_bytes:
+        return len(df), 0
+
+    return len(df), manager.get_ticker_byte_size(ticker) - bytes_before
+
+
+def _generate_concurrently(
+    manager: HistoricalManagerDB,
+    config: str,
+    tickers: List[str],
+    timeframe: List[str],
+    start_date: str,
+    end_date: str,
+    workers: int
+) -> List[str]:
+    """
+    Generate the database of several tickers concurrently.
+
+    Each ticker runs on its own manager, sharing the download connectors
+    of manager. A failed ticker is reported and does not stop the others.
+
+    Returns the tickers failed.
+    """
+    def run(ticker: str) -> Tuple[int, int]:
+        ticker_manager = HistoricalManagerDB(
+            config=config,
+            source_connectors=manager.get_source_connectors()
+        )
+        try:
+            ticker_manager.add_timeframe(timeframe)
+            return _generate_ticker(ticker_manager, ticker, timeframe[0],
+                                    start_date, end_date)
+        finally:
+            ticker_manager.close()
+
+    failed = []
+    total_bytes = 0
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+
+        futures = {executor.submit(run, ticker): ticker for ticker in tickers}
+
+        for done, future in enumerate(as_completed(futures), start=1):
+
+            ticker = futures[future]
+            elapsed = time.perf_counter() - started
+
+            try:
+                rows, nbytes = future.result()
+            except Exception as e:
+                failed.append(ticker)
+                typer.secho(
+                    f"[{done}/{len(tickers)}] Error downloading tick data for ticker "
+                    f"{ticker} and processing timeframes {', '.join(timeframe)}: {e}",
+                    fg=typer.colors.RED,
+                    err=True
+                )
+                continue
+
+            total_bytes += nbytes
+            completed = done - len(failed)
+            typer.secho(
+                f"[{done}/{len(tickers)}] {ticker}: {rows} rows, "
+                f"{nbytes / 1e6:.1f} MB written | "
+                f"{completed / elapsed * 60:.1f} tickers/min, "
+                f"{total_bytes / 1e6 / elapsed:.1f} MB/s",
+                fg=typer.colors.GREEN
+            )
+
+    elapsed = time.perf_counter() - started
+    typer.secho(
+        f"Processed {len(tickers) - len(failed)}/{len(tickers)} tickers "
+        f"in {elapsed:.1f} s with {workers} workers: "
+        f"{(len(tickers) - len(failed)) / elapsed * 60:.1f} tickers/min, "
+        f"{total_bytes / 1e6 / elapsed:.1f} MB/s",
+        fg=typer.colors.BLUE
+    )
+
+    return failed
+
+
 @app.command(name="generate-database")
 def generate_database(
     tickers: List[str] = typer.Argument(
@@ -45,6 +160,16 @@ def generate_database(
         "-c",
         help="YAML configuration file path or a YAML formatted string."
     ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        "-w",
+        min=1,
+        help=(
+            "Number of tickers processed concurrently. "
+            "Download connectors are shared among the workers."
+        )
+    ),
 ):
     """
     Generate and cache historical forex data in the database.
@@ -89,47 +214,58 @@ def generate_database(
         )
         raise typer.Exit(code=1)
 
-    for ticker in normalized_tickers:
-        typer.secho(
-            f"Generating database for ticker: {ticker} | "
-            f"Timeframes: {', '.join(normalized_timeframe)} | "
-            f"Range: {start_date} to {end_date}",
-            fg=typer.colors.CYAN
-        )
+    if workers > 1 and len(normalized_tickers) > 1:
 
-        try:
-            # Query / download data. HistoricalManagerDB automatically downloads
-            # missing historical periods and caches them locally.
-            lazy_frame = manager.get_data(
-                ticker=ticker,
-                timeframe=normalized_timeframe[0],
-                start=start_date,
-                end=end_date
-            )
-
-            # Collect lazy frame if applicable to get actual row count
-            if hasattr(lazy_frame, "collect"):
-                df = lazy_frame.collect()
-            else:
-                df = lazy_frame
-
-            row_count = len(df)
-            typer.secho(
-                f"Successfully retrieved tick data for {ticker} from start date "
-                f"{start_date} to end date {end_date}",
-                fg=typer.colors.GREEN
-            )
+        failed = _generate_concurrently(manager,
+                                        config,
+                                        normalized_tickers,
+                                        normalized_timeframe,
+                                        start_date,
+                                        end_date,
+                                        workers)
 
-        except Exception as e:
+        if failed:
             typer.secho(
-                f"Error downloading tick data for ticker {ticker} "
-                f"and processing timeframes {', '.join(normalized_timeframe)}: {e}",
+                f"Database generation failed for tickers: {', '.join(failed)}",
                 fg=typer.colors.RED,
                 err=True
             )
             manager.close()
             raise typer.Exit(code=1)
 
+    else:
+
+        for ticker in normalized_tickers:
+            typer.secho(
+                f"Generating database for ticker: {ticker} | "
+                f"Timeframes: {', '.join(normalized_timeframe)} | "
+                f"Range: {start_date} to {end_date}",
+                fg=typer.colors.CYAN
+            )
+
+            try:
+                rows, _ = _generate_ticker(manager,
+                                           ticker,
+                                           normalized_timeframe[0],
+                                           start_date,
+                                           end_date,
+                                           measure_bytes=False)
+                typer.secho(
+                    f"Successfully retrieved tick data for {ticker} from start date "
+                    f"{start_date} to end date {end_date}: {rows} rows",
+                    fg=typer.colors.GREEN
+                )
+
+            except Exception as e:
+                typer.secho(
+                    f"Error downloading tick data for ticker {ticker} "
+                    f"and processing timeframes {', '.join(normalized_timeframe)}: {e}",
+                    fg=typer.colors.RED,
+                    err=True
+                )
+                manager.close()
+                raise typer.Exit(code=1)
+
     manager.close()
     typer.secho(
         f"Database generation complete, tickers processed: "
@@ -31,6 +31,7 @@ test_config_yaml = '''
 DATA_FILETYPE: 'parquet'
 ENGINE: 'polars_lazy'
 DATA_PATH: '~/.test_database'
+DB_CACHE_MAX_BYTES: 1000000000
 '''
 
 
@@ -155,6 +156,7 @@ def main():
         logger.info(f"  Successful (with data): {success_count}")
         logger.info(f"  Successful (empty results): {empty_count}")
         logger.info(f"  Errors: {error_count}")
+        logger.info(f"  Partition cache: {histmanager._db_connector.get_cache_stats()}")
 
         if error_count == 0:
             logger.success("Sanity test COMPLETED with NO ERRORS.")
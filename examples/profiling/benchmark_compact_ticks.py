@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the compact tick schema (DB_COMPACT_TICKS): year tick files
+stored with float32 prices against int32 pipettes prices with delta
+encoded timestamps. Reports bytes per tick on disk and the read speed
+of a full year, in MB/s of decoded data.
+
+The tick year is a synthetic random walk quoted in pipettes, its size
+is set by N_ROWS.
+"""
+import shutil
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from sys import stdout
+
+import numpy as np
+import polars as pl
+from loguru import logger
+
+from forex_data import POLARS_DTYPE_DICT, TICK_TIMEFRAME
+from forex_data.data_management import LocalDBYearConnector
+
+# ── Configuration ────────────────────────────────────────────────────────────
+N_ROWS = 20_000_000         # ticks in the synthetic year
+N_STEPS = 5                 # repeated reads per schema
+TICKER = 'eurusd'
+YEAR = 2020
+PIPETTE = 1e-5
+
+# ── Paths ─────────────────────────────────────────────────────────────────────
+BASE_DIR = Path(__file__).parent.parent
+PROFILE_DIR = BASE_DIR / 'profiling-logs'
+PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+
+DATA_PATH = Path('~/.test_database_compact_ticks').expanduser()
+TIMING_TXT = PROFILE_DIR / 'benchmark_compact_ticks_timing.txt'
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+
+@contextmanager
+def phase_timer(label: str, results: dict):
+    t0 = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - t0
+
+
+def generate_ticks() -> pl.DataFrame:
+
+    rng = np.random.default_rng(0)
+    start_ms = int(datetime(YEAR, 1, 1).timestamp() * 1000)
+    span_ms = int(datetime(YEAR + 1, 1, 1).timestamp() * 1000) - start_ms
+
+    # irregular tick times, quotes on the pipettes grid
+    timestamps = start_ms + np.sort(rng.integers(0, span_ms, N_ROWS))
+    mid = np.round(110_000 + np.cumsum(rng.integers(-3, 4, N_ROWS)))
+    spread = rng.integers(1, 20, N_ROWS)
+    ask = (mid + spread) * PIPETTE
+    bid = (mid - spread) * PIPETTE
+    ask_volume = np.round(rng.exponential(1.5, N_ROWS), 2) + 0.01
+    bid_volume = np.round(rng.exponential(1.5, N_ROWS), 2) + 0.01
+
+    return pl.DataFrame({
+        'timestamp': pl.Series(timestamps).cast(pl.Datetime('ms')),
+        'ask': ask,
+        'bid': bid,
+        'ask_volume': ask_volume,
+        'bid_volume': bid_volume,
+        'vwmp': (ask * bid_volume + bid * ask_volume) / (ask_volume + bid_volume),
+    }).unique('timestamp', keep='first', maintain_order=True).cast(
+        POLARS_DTYPE_DICT.TIME_TICK_DTYPE)
+
+
+def run_schema(ticks: pl.DataFrame, compact: bool) -> dict:
+
+    data_path = DATA_PATH / ('compact' if compact else 'float')
+    shutil.rmtree(data_path, ignore_errors=True)
+
+    connector = LocalDBYearConnector(data_path=str(data_path),
+                                     data_type='parquet',
+                                     engine='polars',
+                                     compact_ticks=compact)
+    key = connector._db_key('forex', TICKER, TICK_TIMEFRAME, YEAR)
+
+    results: dict = {}
+    with phase_timer('write', results):
+        connector.write_data(key, ticks)
+
+    filename = connector._get_filename('forex', TICKER, TICK_TIMEFRAME, YEAR)
+    filepath = connector.data_path / 'forex' / TICKER / TICK_TIMEFRAME / filename
+    results['bytes_per_tick'] = filepath.stat().st_size / ticks.height
+
+    reads = []
+    for _ in range(N_STEPS):
+        t0 = time.perf_counter()
+        read = connector.read_data_year('forex', TICKER, TICK_TIMEFRAME, YEAR)
+        reads.append(time.perf_counter() - t0)
+
+    assert read.height == ticks.height, 'rows read differ from rows written'
+    results['read'] = reads
+    results['read_mb_s'] = read.estimated_size() / 1e6 / (sum(reads) / len(reads))
+    return results
+
+
+def run_benchmark() -> dict:
+
+    results: dict = {}
+    with phase_timer('generate_ticks', results):
+        ticks = generate_ticks()
+    results['rows'] = ticks.height
+
+    results['schemas'] = {
+        'float32': run_schema(ticks, compact=False),
+        'compact int32 pipettes': run_schema(ticks, compact=True)
+    }
+    return results
+
+
+def print_report(results: dict) -> None:
+    lines = []
+    lines.append("=" * 64)
+    lines.append("  compact tick schema benchmark")
+    lines.append("=" * 64)
+    lines.append(f"  ticks                          {results['rows']:10d}")
+    lines.append("")
+    for label, measures in results['schemas'].items():
+        reads = measures['read']
+        lines.append(f"  {label}")
+        read_ms = sum(reads) / len(reads) * 1000
+        bytes_per_tick = measures['bytes_per_tick']
+        lines.append(f"    bytes per tick               {bytes_per_tick:10.3f}")
+        lines.append(f"    write                        {measures['write']:10.3f} s")
+        lines.append(
+            f"    read year                    {read_ms:10.3f} ms "
+            f"(min: {min(reads) * 1000:.3f}, max: {max(reads) * 1000:.3f})")
+        read_mb_s = measures['read_mb_s']
+        lines.append(f"    read                         {read_mb_s:10.1f} MB/s")
+    report = "\n".join(lines)
+    print("\n" + report)
+    TIMING_TXT.write_text(report)
+
+
+def main():
+    logger.remove()
+    logger.add(
+        stdout,
+        level="INFO",
+        format="<green>{time:HH:mm:ss}</green> | <level>{level:<8}</level> | {message}")
+
+    print_report(run_benchmark())
+
+
+if __name__ == '__main__':
+    main()
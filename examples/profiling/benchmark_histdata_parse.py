@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the histdata tick file parse: the previous path, writing the
+zip member to a temporary csv file re-read with polars and timestamps
+decoded by strptime, against the in-memory path of HistDataConnector,
+feeding the zip member bytes straight to the polars csv reader with a
+pinned schema. A third path decodes the timestamps with integer arithmetic
+on the digits instead of strptime: it is measured here, the connector keeps
+strptime while it is the faster of the two.
+
+Reports parse throughput in ticks/s. The month of ticks is synthetic
+and in the histdata csv format, its size is set by N_ROWS.
+"""
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from sys import stdout
+from zipfile import ZipFile, ZIP_DEFLATED
+
+import numpy as np
+import polars as pl
+from loguru import logger
+
+from forex_data.data_management import HistDataConnector
+from forex_data.data_management.common import COLUMN_NAME, DATE_FORMAT_HISTDATA_CSV
+
+# ── Configuration ────────────────────────────────────────────────────────────
+N_ROWS = 3_000_000          # ticks in the synthetic month
+N_STEPS = 5                 # repeated parses per path
+MEMBER_NAME = 'DAT_ASCII_EURUSD_T_202003.csv'
+
+# ── Paths ─────────────────────────────────────────────────────────────────────
+BASE_DIR = Path(__file__).parent.parent
+PROFILE_DIR = BASE_DIR / 'profiling-logs'
+PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+
+TIMING_TXT = PROFILE_DIR / 'benchmark_histdata_parse_timing.txt'
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+
+@contextmanager
+def phase_timer(label: str, results: dict):
+    t0 = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - t0
+
+
+def generate_zip() -> bytes:
+
+    rng = np.random.default_rng(0)
+    start_ms = int(datetime(2020, 3, 1).timestamp() * 1000)
+    span_ms = int(datetime(2020, 4, 1).timestamp() * 1000) - start_ms
+
+    offsets_ms = np.sort(rng.integers(0, span_ms, N_ROWS))
+    timestamps = pl.Series(start_ms + offsets_ms).cast(pl.Datetime('ms'))
+    bid = np.round(1.1 + np.cumsum(rng.integers(-3, 4, N_ROWS)) * 1e-5, 5)
+    ask = bid + rng.integers(1, 20, N_ROWS) * 1e-5
+
+    csv = pl.DataFrame({
+        'timestamp': timestamps.dt.strftime(DATE_FORMAT_HISTDATA_CSV),
+        'ask': ask,
+        'bid': bid,
+        'vol': np.zeros(N_ROWS, dtype=np.int64)
+    }).write_csv(include_header=False, float_precision=6)
+
+    buffer = BytesIO()
+    with ZipFile(buffer, 'w', compression=ZIP_DEFLATED) as archive:
+        archive.writestr(MEMBER_NAME, csv)
+
+    return buffer.getvalue()
+
+
+def parse_temporary_csv(zip_content: bytes, temp_path: Path) -> pl.DataFrame:
+
+    # previous path: zip member to a temporary csv file, read back, strptime
+    raw_file = ZipFile(BytesIO(zip_content)).open(MEMBER_NAME)
+    temp_filepath = temp_path / 'Temp.csv'
+    temp_filepath.write_bytes(raw_file.read())
+
+    df = pl.read_csv(
+        temp_filepath,
+        separator=',',
+        has_header=False,
+        new_columns=[COLUMN_NAME.TIMESTAMP, COLUMN_NAME.ASK,
+                     COLUMN_NAME.BID, COLUMN_NAME.VOLUME],
+        schema_overrides={COLUMN_NAME.TIMESTAMP: pl.String, COLUMN_NAME.ASK: pl.Float32,
+                          COLUMN_NAME.BID: pl.Float32, COLUMN_NAME.VOLUME: pl.Float32},
+        use_pyarrow=True
+    )
+    df = df.with_columns(
+        pl.col(COLUMN_NAME.TIMESTAMP).str.strptime(pl.Datetime('ms'),
+                                                   format=DATE_FORMAT_HISTDATA_CSV)
+    )
+    temp_filepath.unlink()
+
+    return df
+
+
+def parse_in_memory(zip_content: bytes, connector: HistDataConnector) -> pl.DataFrame:
+
+    raw_file = ZipFile(BytesIO(zip_content)).open(MEMBER_NAME)
+    return connector._parse_tick_csv(raw_file.read())
+
+
+def parse_in_memory_integer_timestamps(zip_content: bytes) -> pl.DataFrame:
+
+    # in-memory path, timestamps decoded from the digits of
+    # yyyymmdd hhmmssfff as integers instead of strptime
+    raw_file = ZipFile(BytesIO(zip_content)).open(MEMBER_NAME)
+    df = pl.read_csv(
+        raw_file.read(),
+        has_header=False,
+        schema={COLUMN_NAME.TIMESTAMP: pl.String, COLUMN_NAME.ASK: pl.Float32,
+                COLUMN_NAME.BID: pl.Float32, COLUMN_NAME.VOLUME: pl.Float32}
+    )
+
+    timestamp = pl.col(COLUMN_NAME.TIMESTAMP)
+    date = timestamp.str.slice(0, 8).cast(pl.Int32)
+    clock = timestamp.str.slice(9, 9).cast(pl.Int64)
+
+    return df.with_columns(
+        pl.datetime(date // 10_000, date // 100 % 100, date % 100,
+                    clock // 10_000_000, clock // 100_000 % 100,
+                    clock // 1000 % 100, clock % 1000 * 1000,
+                    time_unit='ms').alias(COLUMN_NAME.TIMESTAMP)
+    )
+
+
+def run_path(parse, *args) -> list:
+
+    timings = []
+    for _ in range(N_STEPS):
+        t0 = time.perf_counter()
+        df = parse(*args)
+        timings.append(time.perf_counter() - t0)
+
+    assert df.height == N_ROWS, 'rows parsed differ from rows generated'
+    return timings
+
+
+def run_benchmark() -> dict:
+
+    results: dict = {}
+    with phase_timer('generate_zip', results):
+        zip_content = generate_zip()
+    results['zip_megabytes'] = len(zip_content) / 1e6
+
+    temp_path = Path(tempfile.mkdtemp(prefix='forex_data_histdata_parse_'))
+    try:
+        connector = HistDataConnector(data_path=str(temp_path))
+
+        # same parsed data on all paths
+        reference = parse_temporary_csv(zip_content, temp_path)
+        assert reference.equals(
+            parse_in_memory(zip_content, connector)), 'parsed data differ'
+        assert reference.equals(
+            parse_in_memory_integer_timestamps(zip_content)), 'parsed data differ'
+
+        results['paths'] = {
+            'temporary csv file, strptime': run_path(parse_temporary_csv,
+                                                     zip_content, temp_path),
+            'in memory, pinned schema': run_path(parse_in_memory,
+                                                 zip_content, connector),
+            'in memory, integer timestamp decode': run_path(
+                parse_in_memory_integer_timestamps, zip_content),
+        }
+        connector.clear_temporary_folder()
+    finally:
+        shutil.rmtree(temp_path, ignore_errors=True)
+
+    return results
+
+
+def print_report(results: dict) -> None:
+    lines = []
+    lines.append("=" * 64)
+    lines.append("  histdata tick file parse benchmark")
+    lines.append("=" * 64)
+    lines.append(f"  ticks                          {N_ROWS:10d}")
+    zip_megabytes = results['zip_megabytes']
+    lines.append(f"  zip archive                    {zip_megabytes:10.1f} MB")
+    lines.append("")
+    for label, timings in results['paths'].items():
+        mean = sum(timings) / len(timings)
+        lines.append(f"  {label}")
+        lines.append(
+            f"    parse                        {mean * 1000:10.3f} ms "
+            f"(min: {min(timings) * 1000:.3f}, max: {max(timings) * 1000:.3f})")
+        throughput = N_ROWS / mean / 1e6
+        lines.append(f"    throughput                   {throughput:10.2f} M ticks/s")
+    report = "\n".join(lines)
+    print("\n" + report)
+    TIMING_TXT.write_text(report)
+
+
+def main():
+    logger.remove()
+    logger.add(
+        stdout,
+        level="INFO",
+        format="<green>{time:HH:mm:ss}</green> | <level>{level:<8}</level> | {message}")
+
+    print_report(run_benchmark())
+
+
+if __name__ == '__main__':
+    main()
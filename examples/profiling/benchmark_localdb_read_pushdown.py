@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of LocalDBConnector.read_data on a large single tick file:
+full materialization + SQL filter (previous read path) against the
+scan_parquet read path with predicate and projection pushdown.
+
+The tick file is synthetic and generated once in chunks, size is set
+by N_ROWS (300M rows produce a parquet file of a few GB).
+"""
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from sys import stdout
+
+import numpy as np
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger
+
+from forex_data import TICK_TIMEFRAME
+from forex_data.data_management import LocalDBConnector
+
+# ── Configuration ────────────────────────────────────────────────────────────
+N_ROWS = 300_000_000        # ticks in the synthetic file
+CHUNK_ROWS = 10_000_000     # rows generated and written per chunk
+TICK_EVERY_MS = 1_000       # one tick per second
+N_STEPS = 5                 # repeated reads per read path
+TICKER = 'eurusd'
+
+# ── Paths ─────────────────────────────────────────────────────────────────────
+BASE_DIR = Path(__file__).parent.parent
+PROFILE_DIR = BASE_DIR / 'profiling-logs'
+PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+
+DATA_PATH = Path('~/.test_database_pushdown').expanduser()
+TIMING_TXT = PROFILE_DIR / 'benchmark_localdb_read_pushdown_timing.txt'
+
+START_DATE = datetime(2004, 1, 1)
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+
+@contextmanager
+def phase_timer(label: str, results: dict):
+    t0 = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - t0
+
+
+def generate_tick_file(filepath: Path) -> None:
+
+    if filepath.exists():
+        logger.info(f"Reusing tick file {filepath}")
+        return
+
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(0)
+    start_ms = int(START_DATE.timestamp() * 1000)
+    price = 1.1
+
+    schema = pa.schema([
+        ('timestamp', pa.timestamp('ms')),
+        ('ask', pa.float32()),
+        ('bid', pa.float32()),
+        ('ask_volume', pa.float32()),
+        ('bid_volume', pa.float32()),
+        ('vwmp', pa.float32()),
+    ])
+
+    with pq.ParquetWriter(filepath, schema) as writer:
+        for offset in range(0, N_ROWS, CHUNK_ROWS):
+            n = min(CHUNK_ROWS, N_ROWS - offset)
+            timestamps = start_ms + (np.arange(offset, offset + n,
+                                               dtype=np.int64) * TICK_EVERY_MS)
+            mid = price + np.cumsum(rng.normal(0, 1e-5, n))
+            price = float(mid[-1])
+            volume = np.ones(n, dtype=np.float32)
+            writer.write_table(pa.table({
+                'timestamp': pa.array(timestamps, type=pa.timestamp('ms')),
+                'ask': (mid + 5e-6).astype(np.float32),
+                'bid': (mid - 5e-6).astype(np.float32),
+                'ask_volume': volume,
+                'bid_volume': volume,
+                'vwmp': mid.astype(np.float32),
+            }, schema=schema), row_group_size=1_000_000)
+            logger.info(f"Written {offset + n:,} / {N_ROWS:,} rows")
+
+
+def read_full_sql(filepath: Path, start: datetime, end: datetime) -> pl.DataFrame:
+    # previous read path: materialize the whole file then filter with SQL
+    dataframe = pl.scan_parquet(filepath).collect().lazy()
+    return dataframe.sql(f'''SELECT * FROM self
+                             WHERE timestamp >= '{start.isoformat()}'
+                             AND timestamp <= '{end.isoformat()}'
+                             ORDER BY timestamp''').collect()
+
+
+def run_benchmark() -> dict:
+
+    connector = LocalDBConnector(data_path=str(DATA_PATH),
+                                 data_type='parquet',
+                                 engine='polars_lazy')
+    filename = connector._get_filename('forex', TICKER, TICK_TIMEFRAME)
+    filepath = connector.data_path / 'forex' / TICKER / filename
+
+    results: dict = {}
+    with phase_timer('generate_file', results):
+        generate_tick_file(filepath)
+    results['file_size_gb'] = filepath.stat().st_size / 1e9
+
+    # one trading day in the middle of the file
+    span_days = N_ROWS * TICK_EVERY_MS / 1000 / 86400
+    start = START_DATE + timedelta(days=int(span_days // 2))
+    end = start + timedelta(days=1)
+
+    timings = {'full_sql': [], 'pushdown': [], 'pushdown_vwmp_only': []}
+    for _ in range(N_STEPS):
+        t0 = time.perf_counter()
+        rows_full = read_full_sql(filepath, start, end).height
+        timings['full_sql'].append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        rows_pushdown = connector.read_data('forex', TICKER, TICK_TIMEFRAME,
+                                            start, end).collect().height
+        timings['pushdown'].append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        connector.read_data('forex', TICKER, TICK_TIMEFRAME, start, end,
+                            columns=['vwmp']).collect()
+        timings['pushdown_vwmp_only'].append(time.perf_counter() - t0)
+
+    assert rows_full == rows_pushdown, 'read paths returned different rows'
+    results['rows'] = rows_pushdown
+    results['timings'] = timings
+    return results
+
+
+def print_report(results: dict) -> None:
+    lines = []
+    lines.append("=" * 64)
+    lines.append("  LocalDBConnector.read_data — pushdown benchmark")
+    lines.append("=" * 64)
+    lines.append(f"  file size                      {results['file_size_gb']:10.3f} GB")
+    lines.append(f"  rows returned                  {results['rows']:10d}")
+    lines.append("")
+    for label, values in results['timings'].items():
+        lines.append(
+            f"  {label:<30s} {sum(values) / len(values) * 1000:10.3f} ms "
+            f"(min: {min(values) * 1000:.3f}, max: {max(values) * 1000:.3f})")
+    report = "\n".join(lines)
+    print("\n" + report)
+    TIMING_TXT.write_text(report)
+
+
+def main():
+    logger.remove()
+    logger.add(
+        stdout,
+        level="INFO",
+        format="<green>{time:HH:mm:ss}</green> | <level>{level:<8}</level> | {message}")
+
+    print_report(run_benchmark())
+
+
+if __name__ == '__main__':
+    main()
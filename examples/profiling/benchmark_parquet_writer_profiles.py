@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the parquet writer profiles (DB_PARQUET_WRITER): the same
+tick year written with different codecs, compression levels, row group
+sizing, statistics and dictionary settings. Reports for each profile
+the write time, the file size and the latency of a narrow range query
+(one hour of ticks) on the year file.
+
+The tick year is a synthetic random walk, its size is set by N_ROWS.
+"""
+import shutil
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from sys import stdout
+
+import numpy as np
+import polars as pl
+from loguru import logger
+
+from forex_data import POLARS_DTYPE_DICT, TICK_TIMEFRAME
+from forex_data.data_management import LocalDBYearConnector, ParquetWriterProfile
+
+# ── Configuration ────────────────────────────────────────────────────────────
+N_ROWS = 10_000_000         # ticks in the synthetic year
+N_STEPS = 20                # narrow range queries per profile
+TICKER = 'eurusd'
+YEAR = 2020
+QUERY_SPAN = timedelta(hours=1)
+
+PROFILES = {
+    'default': None,
+    'zstd 3, 128k rows': ParquetWriterProfile(compression='zstd',
+                                              compression_level=3,
+                                              row_group_size=128 * 1024),
+    'zstd 9, daily': ParquetWriterProfile(compression='zstd',
+                                          compression_level=9,
+                                          row_group_period='1d'),
+    'snappy, monthly': ParquetWriterProfile(compression='snappy',
+                                            row_group_period='1mo'),
+    'lz4, no statistics': ParquetWriterProfile(compression='lz4',
+                                               statistics=False),
+    'zstd, no dictionary': ParquetWriterProfile(compression='zstd',
+                                                dictionary=False),
+}
+
+# ── Paths ─────────────────────────────────────────────────────────────────────
+BASE_DIR = Path(__file__).parent.parent
+PROFILE_DIR = BASE_DIR / 'profiling-logs'
+PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+
+DATA_PATH = Path('~/.test_database_parquet_writer').expanduser()
+TIMING_TXT = PROFILE_DIR / 'benchmark_parquet_writer_profiles_timing.txt'
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+
+@contextmanager
+def phase_timer(label: str, results: dict):
+    t0 = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - t0
+
+
+def generate_ticks() -> pl.DataFrame:
+
+    rng = np.random.default_rng(0)
+    start_ms = int(datetime(YEAR, 1, 1).timestamp() * 1000)
+    span_ms = int(datetime(YEAR + 1, 1, 1).timestamp() * 1000) - start_ms
+
+    timestamps = start_ms + np.sort(rng.integers(0, span_ms, N_ROWS))
+    mid = np.round(110_000 + np.cumsum(rng.integers(-3, 4, N_ROWS)))
+    spread = rng.integers(1, 20, N_ROWS)
+    ask = (mid + spread) * 1e-5
+    bid = (mid - spread) * 1e-5
+    ask_volume = np.round(rng.exponential(1.5, N_ROWS), 2) + 0.01
+    bid_volume = np.round(rng.exponential(1.5, N_ROWS), 2) + 0.01
+
+    return pl.DataFrame({
+        'timestamp': pl.Series(timestamps).cast(pl.Datetime('ms')),
+        'ask': ask,
+        'bid': bid,
+        'ask_volume': ask_volume,
+        'bid_volume': bid_volume,
+        'vwmp': (ask * bid_volume + bid * ask_volume) / (ask_volume + bid_volume),
+    }).unique('timestamp', keep='first', maintain_order=True).cast(
+        POLARS_DTYPE_DICT.TIME_TICK_DTYPE)
+
+
+def run_profile(ticks: pl.DataFrame, label: str, profile) -> dict:
+
+    data_path = DATA_PATH / label.replace(' ', '_').replace(',', '')
+    shutil.rmtree(data_path, ignore_errors=True)
+
+    connector = LocalDBYearConnector(data_path=str(data_path),
+                                     data_type='parquet',
+                                     engine='polars_lazy',
+                                     parquet_writer=profile)
+    key = connector._db_key('forex', TICKER, TICK_TIMEFRAME, YEAR)
+
+    results: dict = {}
+    with phase_timer('write', results):
+        connector.write_data(key, ticks)
+
+    filename = connector._get_filename('forex', TICKER, TICK_TIMEFRAME, YEAR)
+    filepath = connector.data_path / 'forex' / TICKER / TICK_TIMEFRAME / filename
+    results['megabytes'] = filepath.stat().st_size / 1e6
+
+    # one hour windows spread over the year
+    rng = np.random.default_rng(1)
+    starts = [datetime(YEAR, 1, 1) + timedelta(hours=int(hour))
+              for hour in rng.integers(0, 365 * 24 - 1, N_STEPS)]
+    reads = []
+    for start in starts:
+        t0 = time.perf_counter()
+        connector.read_data('forex', TICKER, TICK_TIMEFRAME,
+                            start, start + QUERY_SPAN).collect()
+        reads.append(time.perf_counter() - t0)
+
+    results['read'] = reads
+    return results
+
+
+def run_benchmark() -> dict:
+
+    results: dict = {}
+    with phase_timer('generate_ticks', results):
+        ticks = generate_ticks()
+    results['rows'] = ticks.height
+
+    results['profiles'] = {
+        label: run_profile(ticks, label, profile)
+        for label, profile in PROFILES.items()
+    }
+    return results
+
+
+def print_report(results: dict) -> None:
+    lines = []
+    lines.append("=" * 64)
+    lines.append("  parquet writer profiles benchmark")
+    lines.append("=" * 64)
+    lines.append(f"  ticks                          {results['rows']:10d}")
+    lines.append("")
+    for label, measures in results['profiles'].items():
+        reads = measures['read']
+        lines.append(f"  {label}")
+        read_ms = sum(reads) / len(reads) * 1000
+        megabytes = measures['megabytes']
+        lines.append(f"    file size                    {megabytes:10.1f} MB")
+        lines.append(f"    write                        {measures['write']:10.3f} s")
+        lines.append(
+            f"    read 1h range                {read_ms:10.3f} ms "
+            f"(min: {min(reads) * 1000:.3f}, max: {max(reads) * 1000:.3f})")
+    report = "\n".join(lines)
+    print("\n" + report)
+    TIMING_TXT.write_text(report)
+
+
+def main():
+    logger.remove()
+    logger.add(
+        stdout,
+        level="INFO",
+        format="<green>{time:HH:mm:ss}</green> | <level>{level:<8}</level> | {message}")
+
+    print_report(run_benchmark())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of reframe_data on one year of synthetic tick data for each
+supported engine: pandas (single resample pass), pyarrow (native
+floor_temporal + group_by), polars and polars_lazy.
+
+Size of the tick data is set by TICK_EVERY_MS.
+"""
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from sys import stdout
+
+import numpy as np
+import polars as pl
+import pyarrow as pa
+from loguru import logger
+
+from forex_data.data_management import reframe_data
+
+# ── Configuration ────────────────────────────────────────────────────────────
+TICK_EVERY_MS = 1_000       # one tick per second, ~31.5M ticks per year
+N_STEPS = 3                 # repeated reframes per engine and timeframe
+TIMEFRAMES = ['1m', '1h', '1d']
+START_DATE = datetime(2020, 1, 1)
+END_DATE = datetime(2021, 1, 1)
+
+# ── Paths ─────────────────────────────────────────────────────────────────────
+BASE_DIR = Path(__file__).parent.parent
+PROFILE_DIR = BASE_DIR / 'profiling-logs'
+PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+
+TIMING_TXT = PROFILE_DIR / 'benchmark_reframe_engines_timing.txt'
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+
+@contextmanager
+def phase_timer(label: str, results: dict):
+    t0 = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - t0
+
+
+def generate_ticks() -> pl.DataFrame:
+
+    rng = np.random.default_rng(0)
+    start_ms = int(START_DATE.timestamp() * 1000)
+    end_ms = int(END_DATE.timestamp() * 1000)
+    timestamps = np.arange(start_ms, end_ms, TICK_EVERY_MS, dtype=np.int64)
+    mid = 1.1 + np.cumsum(rng.normal(0, 1e-5, len(timestamps)))
+    volume = np.ones(len(timestamps), dtype=np.float32)
+
+    return pl.from_arrow(pa.table({
+        'timestamp': pa.array(timestamps, type=pa.timestamp('ms')),
+        'ask': (mid + 5e-6).astype(np.float32),
+        'bid': (mid - 5e-6).astype(np.float32),
+        'ask_volume': volume,
+        'bid_volume': volume,
+        'vwmp': mid.astype(np.float32),
+    }))
+
+
+def run_benchmark() -> dict:
+
+    results: dict = {}
+    with phase_timer('generate_ticks', results):
+        ticks = generate_ticks()
+    results['rows'] = ticks.height
+
+    inputs = {
+        'pandas': ticks.to_pandas(),
+        'pyarrow': ticks.to_arrow(),
+        'polars': ticks,
+        'polars_lazy': ticks.lazy()
+    }
+
+    timings = {}
+    for engine, data in inputs.items():
+        for tf in TIMEFRAMES:
+            values = []
+            for _ in range(N_STEPS):
+                t0 = time.perf_counter()
+                reframed = reframe_data(data, tf)
+                if engine == 'polars_lazy':
+                    reframed = reframed.collect()
+                values.append(time.perf_counter() - t0)
+            timings[f'{engine} {tf}'] = values
+            logger.info(f"{engine} {tf}: {len(reframed)} bars")
+
+    results['timings'] = timings
+    return results
+
+
+def print_report(results: dict) -> None:
+    lines = []
+    lines.append("=" * 64)
+    lines.append("  reframe_data — engines benchmark")
+    lines.append("=" * 64)
+    generate_ticks = results['generate_ticks']
+    lines.append(f"  generate ticks                 {generate_ticks:10.3f} s")
+    lines.append(f"  tick rows                      {results['rows']:10d}")
+    lines.append("")
+    for label, values in results['timings'].items():
+        lines.append(
+            f"  {label:<30s} {sum(values) / len(values) * 1000:10.3f} ms "
+            f"(min: {min(values) * 1000:.3f}, max: {max(values) * 1000:.3f})")
+    report = "\n".join(lines)
+    print("\n" + report)
+    TIMING_TXT.write_text(report)
+
+
+def main():
+    logger.remove()
+    logger.add(
+        stdout,
+        level="INFO",
+        format="<green>{time:HH:mm:ss}</green> | <level>{level:<8}</level> | {message}")
+
+    print_report(run_benchmark())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the tick year aggregation to timeframes: in-memory rollup
+(tick year read in memory) against the streaming rollup of
+DB_STREAMING_CHUNK_SIZE (tick year scanned by the polars streaming engine).
+
+Each run is executed in a fresh process so that its peak resident set
+size (RSS) is recorded separately. The tick year is synthetic and written
+once to a LocalDBYearConnector database, its size is set by TICK_EVERY_MS.
+"""
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from sys import platform, stdout
+
+import numpy as np
+import polars as pl
+from loguru import logger
+
+from forex_data import POLARS_DTYPE_DICT, TICK_TIMEFRAME
+from forex_data.data_management import LocalDBYearConnector, rollup_timeframes
+
+# ── Configuration ────────────────────────────────────────────────────────────
+TICK_EVERY_MS = 500         # two ticks per second, ~63M ticks per year
+CHUNK_ROWS = 10_000_000     # rows generated and written per chunk
+STREAMING_CHUNK_SIZES = [50_000, 500_000]
+TIMEFRAMES = ['1m', '5m', '1h', '1d']
+TICKER = 'eurusd'
+YEAR = 2020
+
+# ── Paths ─────────────────────────────────────────────────────────────────────
+BASE_DIR = Path(__file__).parent.parent
+PROFILE_DIR = BASE_DIR / 'profiling-logs'
+PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+
+DATA_PATH = Path('~/.test_database_streaming').expanduser()
+TIMING_TXT = PROFILE_DIR / 'benchmark_streaming_rollup_timing.txt'
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on linux, in bytes on macos
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / 1024 ** 2 if platform == 'darwin' else maxrss / 1024
+
+
+def connector() -> LocalDBYearConnector:
+    return LocalDBYearConnector(data_path=str(DATA_PATH),
+                                data_type='parquet',
+                                engine='polars')
+
+
+def generate_tick_year() -> None:
+
+    db = connector()
+    if TICKER in db.get_tickers_list():
+        logger.info(f"Reusing tick year {YEAR} in {DATA_PATH}")
+        return
+
+    rng = np.random.default_rng(0)
+    start_ms = int(datetime(YEAR, 1, 1).timestamp() * 1000)
+    end_ms = int(datetime(YEAR + 1, 1, 1).timestamp() * 1000)
+    n_rows = (end_ms - start_ms) // TICK_EVERY_MS
+    price = 1.1
+
+    key = db._db_key('forex', TICKER, TICK_TIMEFRAME, YEAR)
+    for offset in range(0, n_rows, CHUNK_ROWS):
+        n = min(CHUNK_ROWS, n_rows - offset)
+        positions = np.arange(offset, offset + n, dtype=np.int64)
+        timestamps = start_ms + positions * TICK_EVERY_MS
+        mid = price + np.cumsum(rng.normal(0, 1e-5, n))
+        price = float(mid[-1])
+        volume = np.ones(n)
+        db.write_data(key, pl.DataFrame({
+            'timestamp': pl.Series(timestamps).cast(pl.Datetime('ms')),
+            'ask': mid + 5e-6,
+            'bid': mid - 5e-6,
+            'ask_volume': volume,
+            'bid_volume': volume,
+            'vwmp': mid,
+        }).cast(POLARS_DTYPE_DICT.TIME_TICK_DTYPE))
+        logger.info(f"Written {offset + n:,} / {n_rows:,} rows")
+
+
+def run_rollup(streaming_chunk_size: int) -> tuple:
+
+    db = connector()
+    t0 = time.perf_counter()
+    ticks = db.read_data_year('forex', TICKER, TICK_TIMEFRAME, YEAR,
+                              lazy=streaming_chunk_size > 0)
+    rollup = rollup_timeframes(ticks, TIMEFRAMES, streaming_chunk_size)
+    rows = {tf: len(data) if isinstance(data, pl.DataFrame) else data.collect().height
+            for tf, data in rollup.items()}
+    return time.perf_counter() - t0, peak_rss_mb(), rows
+
+
+def run_benchmark() -> dict:
+
+    # the peak RSS of the parent process at fork time is inherited by
+    # spawned processes: generate in a process of its own as well
+    results: dict = {}
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=1,
+                             mp_context=get_context('spawn')) as executor:
+        executor.submit(generate_tick_year).result()
+    results['generate_ticks'] = time.perf_counter() - t0
+
+    runs = {'in_memory': 0}
+    runs.update({f'streaming chunk {size:,}': size for size in STREAMING_CHUNK_SIZES})
+
+    measures = {}
+    for label, chunk_size in runs.items():
+        # a fresh process per run, peak RSS is not shared between runs
+        with ProcessPoolExecutor(max_workers=1,
+                                 mp_context=get_context('spawn')) as executor:
+            elapsed, rss, rows = executor.submit(run_rollup, chunk_size).result()
+        measures[label] = (elapsed, rss)
+        logger.info(f"{label}: {elapsed:.3f} s, peak RSS {rss:.1f} MB, bars {rows}")
+
+    results['measures'] = measures
+    return results
+
+
+def print_report(results: dict) -> None:
+    lines = []
+    lines.append("=" * 64)
+    lines.append("  rollup_timeframes — streaming benchmark")
+    lines.append("=" * 64)
+    generate_ticks = results['generate_ticks']
+    lines.append(f"  generate ticks                 {generate_ticks:10.3f} s")
+    lines.append("")
+    for label, (elapsed, rss) in results['measures'].items():
+        lines.append(f"  {label:<30s} {elapsed:10.3f} s   peak RSS {rss:10.1f} MB")
+    report = "\n".join(lines)
+    print("\n" + report)
+    TIMING_TXT.write_text(report)
+
+
+def main():
+    logger.remove()
+    logger.add(
+        stdout,
+        level="INFO",
+        format="<green>{time:HH:mm:ss}</green> | <level>{level:<8}</level> | {message}")
+
+    print_report(run_benchmark())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the TwelveDataConnector price requests against a local
+stand-in of the Twelve Data API: the previous path, a requests.get call
+per request opening a new connection each time, against the pooled
+keep-alive session of the connector and the async get_realtime_prices,
+overlapping the requests of several symbols, with a client per poll or
+one client reused across the polls of an event loop.
+
+Reports p50/p99 latency of a single request and of a poll of all the
+symbols. The stand-in serves plain http on localhost with SERVER_DELAY
+of processing time, over the network TLS setup and round trips make the
+connection reuse gap larger. The rate limit is lifted for the benchmark.
+"""
+import asyncio
+import json
+import os
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from sys import stdout
+from threading import Thread
+import shutil
+import tempfile
+
+import numpy as np
+import requests
+from loguru import logger
+
+from forex_data.data_management import TwelveDataConnector
+
+# ── Configuration ────────────────────────────────────────────────────────────
+N_POLLS = 100               # polls of all the symbols per path
+SYMBOLS = ['EUR/USD', 'GBP/USD', 'USD/JPY', 'USD/CHF',
+           'AUD/USD', 'USD/CAD', 'NZD/USD', 'EUR/GBP']
+SERVER_DELAY = 0.005        # seconds of processing per request
+MAX_CONCURRENT_REQUESTS = 4
+
+# ── Paths ─────────────────────────────────────────────────────────────────────
+BASE_DIR = Path(__file__).parent.parent
+PROFILE_DIR = BASE_DIR / 'profiling-logs'
+PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+
+TIMING_TXT = PROFILE_DIR / 'benchmark_twelvedata_requests_timing.txt'
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+
+@contextmanager
+def phase_timer(label: str, results: dict):
+    t0 = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - t0
+
+
+class PriceHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    # headers and body are separate writes, Nagle would hold the body
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        time.sleep(SERVER_DELAY)
+        body = json.dumps({'price': '1.0850'}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def per_call_request(connector: TwelveDataConnector, symbol: str) -> dict:
+
+    # previous path: module level requests.get, a new connection per request
+    params = {'symbol': symbol, 'apikey': connector.api_key}
+    response = requests.get(f'{connector._base_url}/price', params=params,
+                            headers={'Accept': 'application/json'})
+    return response.json()
+
+
+def pooled_request(connector: TwelveDataConnector, symbol: str) -> dict:
+
+    return connector._execute_request('price', {'symbol': symbol})
+
+
+def run_sync_path(request, connector: TwelveDataConnector) -> tuple:
+
+    request_timings, poll_timings = [], []
+    for _ in range(N_POLLS):
+        t_poll = time.perf_counter()
+        for symbol in SYMBOLS:
+            t0 = time.perf_counter()
+            data = request(connector, symbol)
+            request_timings.append(time.perf_counter() - t0)
+        poll_timings.append(time.perf_counter() - t_poll)
+
+    assert 'price' in data, 'stand-in server answered with no price'
+    return request_timings, poll_timings
+
+
+def run_async_path(connector: TwelveDataConnector) -> list:
+
+    poll_timings = []
+    for _ in range(N_POLLS):
+        t0 = time.perf_counter()
+        df = connector.get_realtime_prices(SYMBOLS).collect()
+        poll_timings.append(time.perf_counter() - t0)
+
+    assert df.height == len(SYMBOLS), 'prices missing from the poll'
+    return poll_timings
+
+
+def run_async_client_path(connector: TwelveDataConnector) -> list:
+
+    async def poll_all() -> list:
+        poll_timings = []
+        async with connector._async_client() as client:
+            for _ in range(N_POLLS):
+                t0 = time.perf_counter()
+                lf = await connector.get_realtime_prices_async(SYMBOLS, client=client)
+                poll_timings.append(time.perf_counter() - t0)
+
+        assert lf.collect().height == len(SYMBOLS), 'prices missing from the poll'
+        return poll_timings
+
+    return asyncio.run(poll_all())
+
+
+def run_benchmark() -> dict:
+
+    results: dict = {}
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PriceHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+
+    temp_path = Path(tempfile.mkdtemp(prefix='forex_data_twelvedata_'))
+    os.environ.setdefault('TWELVE_DATA_API_KEY', 'benchmark')
+    try:
+        connector = TwelveDataConnector(
+            plan='ultra',
+            data_path=str(temp_path),
+            max_concurrent_downloads=MAX_CONCURRENT_REQUESTS)
+        connector._base_url = f'http://127.0.0.1:{server.server_port}'
+        connector._max_requests_per_minute = 10 ** 9
+
+        with phase_timer('per_call', results):
+            results['per call requests.get'] = run_sync_path(per_call_request,
+                                                             connector)
+        with phase_timer('pooled', results):
+            results['pooled session'] = run_sync_path(pooled_request, connector)
+        with phase_timer('async', results):
+            results['async get_realtime_prices'] = (None, run_async_path(connector))
+        with phase_timer('async_client', results):
+            results['async, client reused'] = (None, run_async_client_path(connector))
+
+        connector.clear_temporary_folder()
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(temp_path, ignore_errors=True)
+
+    return results
+
+
+def percentiles(timings: list) -> str:
+
+    p50, p99 = np.percentile(np.array(timings) * 1000, [50, 99])
+    return f"p50 {p50:8.3f} ms   p99 {p99:8.3f} ms"
+
+
+def print_report(results: dict) -> None:
+    lines = []
+    lines.append("=" * 64)
+    lines.append("  Twelve Data price requests latency benchmark")
+    lines.append("=" * 64)
+    lines.append(f"  symbols per poll               {len(SYMBOLS):10d}")
+    lines.append(f"  polls                          {N_POLLS:10d}")
+    lines.append(f"  stand-in server delay          {SERVER_DELAY * 1000:10.3f} ms")
+    lines.append(f"  concurrent requests (async)    {MAX_CONCURRENT_REQUESTS:10d}")
+    lines.append("")
+    for label in ('per call requests.get', 'pooled session',
+                  'async get_realtime_prices', 'async, client reused'):
+        request_timings, poll_timings = results[label]
+        lines.append(f"  {label}")
+        if request_timings is not None:
+            lines.append(f"    request    {percentiles(request_timings)}")
+        lines.append(f"    poll       {percentiles(poll_timings)}")
+    report = "\n".join(lines)
+    print("\n" + report)
+    TIMING_TXT.write_text(report)
+
+
+def main():
+    logger.remove()
+    logger.add(
+        stdout,
+        level="INFO",
+        format="<green>{time:HH:mm:ss}</green> | <level>{level:<8}</level> | {message}")
+
+    print_report(run_benchmark())
+
+
+if __name__ == '__main__':
+    main()
@@ -40,6 +40,9 @@ __all__ = [
     'LocalDBConnector',
     'concat_data',
     'reframe_data',
+    'reframe_data_multi',
+    'rollup_timeframes',
+    'ParquetWriterProfile',
     'validator_dir_path',
     'TickerNotFoundError',
     'TickerDataNotFoundError',
@@ -91,6 +94,9 @@ from .common import (
     check_timeframe_str,
     concat_data,
     reframe_data,
+    reframe_data_multi,
+    rollup_timeframes,
+    ParquetWriterProfile,
     validator_dir_path,
     TickerNotFoundError,
     TickerDataNotFoundError,
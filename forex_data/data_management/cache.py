@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Process-local cache of decoded local database partitions
+
+Year tables read by a local database connector are kept in memory as
+Arrow tables, keyed by (ticker, timeframe, year) and tagged with the
+version of the files they were decoded from. A lookup with a different
+version (file rewritten by another process) is a miss, so no stale data
+is served. Least recently used partitions are evicted to keep the
+total size of the cached tables within a byte budget.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from attrs import (
+    define,
+    field,
+    validators
+)
+from pyarrow import Table
+
+
+__all__ = [
+    'LocalDBPartitionCache'
+]
+
+
+@define(kw_only=True, slots=True)
+class LocalDBPartitionCache:
+    '''
+    LRU cache of Arrow tables with a byte budget.
+
+    An entry is stored under a key with the version of its source,
+    entries larger than the budget are not cached.
+    '''
+
+    max_bytes: int = field(validator=[validators.instance_of(int),
+                                      validators.gt(0)])
+
+    _entries: OrderedDict = field(factory=OrderedDict, init=False)
+    _lock: Any = field(factory=Lock, init=False)
+    _bytes: int = field(default=0, init=False)
+    _hits: int = field(default=0, init=False)
+    _misses: int = field(default=0, init=False)
+    _evictions: int = field(default=0, init=False)
+    _invalidations: int = field(default=0, init=False)
+
+    def get(self, key: Tuple, version: Hashable) -> Optional[Table]:
+        '''
+        Get the table cached under key if its version matches,
+        None otherwise.
+        '''
+
+        with self._lock:
+
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+
+            return entry[1]
+
+    def put(self, key: Tuple, version: Hashable, table: Table) -> None:
+
+        size = table.nbytes
+
+        with self._lock:
+
+            self._discard(key)
+
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (version, table)
+            self._bytes += size
+
+            # evict least recently used partitions over budget
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self._evictions += 1
+
+    def invalidate(self, **key_elements: Any) -> None:
+        '''
+        Remove the entries whose key elements match the given values,
+        key elements are matched by position as ticker, timeframe, year.
+        With no element given all entries are removed.
+        '''
+
+        positions = {'ticker': 0, 'timeframe': 1, 'year': 2}
+
+        with self._lock:
+
+            for key in list(self._entries):
+                if all(key[positions[name]] == value
+                       for name, value in key_elements.items()):
+                    self._discard(key)
+                    self._invalidations += 1
+
+    def clear(self) -> None:
+
+        self.invalidate()
+
+    def stats(self) -> Dict[str, int]:
+
+        with self._lock:
+
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations
+            }
+
+    def _discard(self, key: Tuple) -> None:
+
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1].nbytes
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""
+Manifest of the files stored in a local database folder
+
+A sqlite file in the database folder records one row per data file
+(year files, single files and month segments) with the details
+needed to answer coverage questions without listing or opening
+data files: ticker, timeframe, year, months present, timestamps
+range, row count, byte size and content hash.
+
+Aggregation watermarks are recorded per ticker and timeframe: the
+last tick timestamp already rolled up into the timeframe data.
+
+Each update is a single sqlite transaction, so concurrent processes
+sharing the database folder always see a consistent manifest.
+"""
+
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from attrs import (
+    define,
+    field,
+    validators
+)
+from loguru import logger
+
+
+__all__ = [
+    'LocalDBCatalog'
+]
+
+
+CATALOG_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    path          TEXT PRIMARY KEY,
+    table_path    TEXT NOT NULL,
+    data_type     TEXT NOT NULL,
+    market        TEXT NOT NULL,
+    ticker        TEXT NOT NULL,
+    timeframe     TEXT NOT NULL,
+    year          INTEGER,
+    years_months  TEXT NOT NULL,
+    min_timestamp TEXT,
+    max_timestamp TEXT,
+    row_count     INTEGER NOT NULL,
+    byte_size     INTEGER NOT NULL,
+    content_hash  TEXT NOT NULL,
+    updated_at    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_ticker_timeframe
+    ON files (ticker, timeframe, data_type);
+CREATE TABLE IF NOT EXISTS watermarks (
+    data_type     TEXT NOT NULL,
+    ticker        TEXT NOT NULL,
+    timeframe     TEXT NOT NULL,
+    watermark     TEXT NOT NULL,
+    updated_at    TEXT NOT NULL,
+    PRIMARY KEY (data_type, ticker, timeframe)
+);
+'''
+
+CATALOG_COLUMNS = (
+    'path',
+    'table_path',
+    'data_type',
+    'market',
+    'ticker',
+    'timeframe',
+    'year',
+    'years_months',
+    'min_timestamp',
+    'max_timestamp',
+    'row_count',
+    'byte_size',
+    'content_hash',
+    'updated_at'
+)
+
+CATALOG_UPSERT = (f'INSERT OR REPLACE INTO files ({", ".join(CATALOG_COLUMNS)}) '
+                  f'VALUES ({", ".join("?" * len(CATALOG_COLUMNS))})')
+
+
+@define(kw_only=True, slots=True)
+class LocalDBCatalog:
+    '''
+    sqlite manifest of a local database folder.
+
+    Paths are stored relative to data_path, a file entry is a dict
+    with keys CATALOG_COLUMNS where years_months is a dict
+    year -> list of months and timestamps are datetime.
+    '''
+
+    filepath: Path = field(converter=Path)
+    data_path: Path = field(converter=Path)
+    timeout: float = field(default=60.0,
+                           validator=validators.instance_of(float))
+
+    def __attrs_post_init__(self) -> None:
+
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.executescript(CATALOG_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+
+        # a connection per operation keeps the catalog usable
+        # from threads and processes sharing the database folder
+        connection = sqlite3.connect(self.filepath, timeout=self.timeout)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _relative(self, filepath: Path | str) -> str:
+
+        filepath = Path(filepath)
+        if filepath.is_absolute():
+            filepath = filepath.relative_to(self.data_path)
+
+        return filepath.as_posix()
+
+    def _to_row(self, entry: Dict[str, Any]) -> tuple:
+
+        row = dict(entry)
+        row['path'] = self._relative(row['path'])
+        row['table_path'] = self._relative(row['table_path'])
+        row['years_months'] = json.dumps(
+            {str(year): sorted(months) for year, months in row['years_months'].items()})
+        for key in ('min_timestamp', 'max_timestamp'):
+            if row[key] is not None:
+                row[key] = row[key].isoformat()
+        row['updated_at'] = datetime.now(timezone.utc).isoformat()
+
+        return tuple(row[column] for column in CATALOG_COLUMNS)
+
+    def _from_row(self, row: sqlite3.Row) -> Dict[str, Any]:
+
+        entry = dict(row)
+        entry['path'] = self.data_path / entry['path']
+        entry['table_path'] = self.data_path / entry['table_path']
+        entry['years_months'] = {
+            int(year): months
+            for year, months in json.loads(entry['years_months']).items()}
+        for key in ('min_timestamp', 'max_timestamp'):
+            if entry[key] is not None:
+                entry[key] = datetime.fromisoformat(entry[key])
+
+        return entry
+
+    def update(self,
+               entries: Iterable[Dict[str, Any]] = (),
+               removed: Iterable[Path | str] = ()) -> None:
+        '''
+        Atomically insert or replace entries and delete the removed paths.
+        '''
+
+        rows = [self._to_row(entry) for entry in entries]
+        removed_rows = [(self._relative(path),) for path in removed]
+
+        try:
+
+            with closing(self._connect()) as connection:
+                with connection:
+                    if removed_rows:
+                        connection.executemany(
+                            'DELETE FROM files WHERE path = ?', removed_rows)
+                    if rows:
+                        connection.executemany(CATALOG_UPSERT, rows)
+
+        except sqlite3.Error as e:
+
+            logger.bind(target='localdb').error(
+                f'Error updating catalog {self.filepath}: {e}')
+            raise
+
+    def clear(self) -> None:
+
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.execute('DELETE FROM files')
+                connection.execute('DELETE FROM watermarks')
+
+    def entries(self,
+                data_type: str,
+                ticker: Optional[str] = None,
+                timeframe: Optional[str] = None) -> List[Dict[str, Any]]:
+        '''
+        Get file entries of data_type, optionally of a ticker and timeframe,
+        sorted by path.
+        '''
+
+        query = 'SELECT * FROM files WHERE data_type = ?'
+        parameters: List[Any] = [data_type.lower()]
+        if ticker is not None:
+            query += ' AND ticker = ?'
+            parameters.append(ticker.lower())
+        if timeframe is not None:
+            query += ' AND timeframe = ?'
+            parameters.append(timeframe.lower())
+        query += ' ORDER BY path'
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute(query, parameters).fetchall()
+
+        return [self._from_row(row) for row in rows]
+
+    def table_paths(self, data_type: str) -> List[Path]:
+        '''
+        Get paths of the tables stored, a year table stored as month
+        segments only is reported by its year file path.
+        '''
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                'SELECT DISTINCT table_path FROM files '
+                'WHERE data_type = ? ORDER BY table_path',
+                (data_type.lower(),)).fetchall()
+
+        return [self.data_path / row['table_path'] for row in rows]
+
+    def max_timestamp(self, paths: Iterable[Path | str]) -> Optional[datetime]:
+        '''
+        Get the max timestamp recorded over the entries of paths,
+        None if no entry has one.
+        '''
+
+        paths = [self._relative(path) for path in paths]
+        if not paths:
+            return None
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                'SELECT max_timestamp FROM files '
+                f'WHERE path IN ({", ".join("?" * len(paths))})',
+                paths).fetchall()
+
+        values = [datetime.fromisoformat(row['max_timestamp'])
+                  for row in rows if row['max_timestamp'] is not None]
+
+        return max(values) if values else None
+
+    def years_months(self,
+                     data_type: str,
+                     ticker: str,
+                     timeframe: str) -> Dict[int, List[int]]:
+        '''
+        Get years mapped to the sorted list of months present
+        for ticker and timeframe.
+        '''
+
+        years_months: Dict[int, set] = {}
+        for entry in self.entries(data_type, ticker, timeframe):
+            for year, months in entry['years_months'].items():
+                years_months.setdefault(year, set()).update(months)
+
+        return {year: sorted(months)
+                for year, months in sorted(years_months.items())}
+
+    def watermark(self,
+                  data_type: str,
+                  ticker: str,
+                  timeframe: str) -> Optional[datetime]:
+        '''
+        Get the aggregation watermark of ticker and timeframe,
+        None if not recorded.
+        '''
+
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                'SELECT watermark FROM watermarks '
+                'WHERE data_type = ? AND ticker = ? AND timeframe = ?',
+                (data_type.lower(), ticker.lower(), timeframe.lower())).fetchone()
+
+        return datetime.fromisoformat(row['watermark']) if row else None
+
+    def set_watermark(self,
+                      data_type: str,
+                      ticker: str,
+                      timeframe: str,
+                      watermark: datetime) -> None:
+
+        try:
+
+            with closing(self._connect()) as connection:
+                with connection:
+                    connection.execute(
+                        'INSERT OR REPLACE INTO watermarks '
+                        '(data_type, ticker, timeframe, watermark, updated_at) '
+                        'VALUES (?, ?, ?, ?, ?)',
+                        (data_type.lower(), ticker.lower(), timeframe.lower(),
+                         watermark.isoformat(),
+                         datetime.now(timezone.utc).isoformat()))
+
+        except sqlite3.Error as e:
+
+            logger.bind(target='localdb').error(
+                f'Error updating watermark in catalog {self.filepath}: {e}')
+            raise
+
+    def clear_watermarks(self,
+                         data_type: str,
+                         ticker: Optional[str] = None,
+                         timeframe: Optional[str] = None) -> None:
+        '''
+        Delete the aggregation watermarks of data_type,
+        optionally only of a ticker and timeframe.
+        '''
+
+        query = 'DELETE FROM watermarks WHERE data_type = ?'
+        parameters: List[Any] = [data_type.lower()]
+        if ticker is not None:
+            query += ' AND ticker = ?'
+            parameters.append(ticker.lower())
+        if timeframe is not None:
+            query += ' AND timeframe = ?'
+            parameters.append(timeframe.lower())
+
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.execute(query, parameters)
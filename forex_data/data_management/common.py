@@ -21,6 +21,7 @@ from typing import (
     List,
     Literal,
     Dict,
+    Optional,
     Tuple
 )
 
@@ -36,8 +37,21 @@ from datetime import (
 )
 
 from pathlib import Path
+from functools import (
+    lru_cache,
+    reduce
+)
+from operator import (
+    gt,
+    lt,
+    ge,
+    le,
+    eq,
+    ne
+)
 
 from attrs import (
+    define,
     field,
     validators
 )
@@ -66,6 +80,7 @@ from pandas.tseries.offsets import DateOffset
 
 # PYARROW
 from pyarrow import (
+    compute as pc,
     float32 as pyarrow_float32,
     timestamp as pyarrow_timestamp,
     schema as pyarrow_schema,
@@ -76,6 +91,7 @@ from pyarrow import (
 )
 
 from pyarrow.parquet import (
+    ParquetWriter,
     write_table,
     read_table
 )
@@ -87,9 +103,12 @@ from polars import (
     read_csv as polars_read_csv,
     concat as polars_concat,
     col,
+    collect_all,
+    Config,
     len as polars_len,
     read_parquet as polars_read_parquet,
     from_arrow,
+    Expr as PolarsExpr,
     DataFrame as PolarsDataFrame,
     LazyFrame as PolarsLazyFrame,
     scan_csv as polars_scan_csv,
@@ -124,6 +143,8 @@ __all__ = [
     'ASSET_TYPE',
     'TEMP_FOLDER',
     'TEMP_CSV_FILE',
+    'RAW_CACHE_FOLDER',
+    'TICK_VAULT_STORE_FOLDER',
     'DTYPE_DICT',
     'PYARROW_DTYPE_DICT',
     'POLARS_DTYPE_DICT',
@@ -135,20 +156,33 @@ __all__ = [
     'NormalizedDict',
     'FILENAME_STR',
     'FILENAME_YEAR_STR',
+    'MONTH_SEGMENTS_FOLDER_SUFFIX',
+    'MONTH_SEGMENT_FILENAME_STR',
+    'CATALOG_FILENAME',
+    'TICKERS_REGISTRY_FILENAME',
+    'TEMP_FILE_SUFFIX',
+    'COMPACT_TICKS_METADATA_KEY',
+    'VWMP_PIPETTE_SUBDIVISIONS',
     'DATE_NO_HOUR_FORMAT',
     'SQL_COMPARISON_OPERATORS',
     'SUPPORTED_SQL_COMPARISON_OPERATORS',
     'SUPPORTED_COLUMN_NAME',
     'SQL_CONDITION_AGGREGATION_MODES',
     'SUPPORTED_SQL_CONDITION_AGGREGATION_MODES',
+    'COMPARISON_OPERATORS_FUNCTIONS',
     'HISTORICAL_DB_MIN_DATE',
     'FOREX_HOLIDAYS',
     'HISTDATA_PROVIDER',
     'DUKASCOPY_PROVIDER',
+    'HISTDATA_MAX_CONCURRENT_DOWNLOADS',
+    'DUKASCOPY_MAX_CONCURRENT_DOWNLOADS',
+    'DUKASCOPY_PUBLISH_DELAY',
     'SUPPORTED_HISTORICAL_DATA_PROVIDERS',
     'TWELVEDATA_PROVIDER',
     'TWELVEDATA_PROVIDER_PLAN_LIST',
     'TWELVE_DATA_CHUNK_SIZE',
+    'TWELVE_DATA_MAX_CONCURRENT_REQUESTS',
+    'TWELVE_DATA_REQUEST_TIMEOUT',
     'TWELVE_DATA_FREE_TIER_MINUTE_RATE_LIMIT',
     'TWELVE_DATA_FREE_TIER_DAY_RATE_LIMIT',
     'TWELVE_DATA_PRO_MINUTE_RATE_LIMIT',
@@ -157,6 +191,7 @@ __all__ = [
     'TWELVE_DATA_TIMEFRAMES',
     'SUPPORTED_REALTIME_DATA_PROVIDERS',
     'collect_lazyframe',
+    'compile_conditions_expression',
 
     'validator_file_path',
     'validator_dir_path',
@@ -176,8 +211,14 @@ __all__ = [
     'concat_data',
     'list_remove_duplicates',
     'reframe_data',
+    'reframe_data_multi',
+    'plan_timeframes_rollup',
+    'find_rollup_parent',
+    'rollup_timeframes',
     'write_csv',
     'write_parquet',
+    'write_parquet_table',
+    'ParquetWriterProfile',
     'read_parquet',
     'to_pandas_dataframe',
     'get_pair_symbols',
@@ -243,6 +284,8 @@ class TickerDataInvalidException(Exception):
 # common functions, constants and templates
 TEMP_FOLDER = "Temp"
 TEMP_CSV_FILE = "Temp.csv"
+RAW_CACHE_FOLDER = "RawCache"
+TICK_VAULT_STORE_FOLDER = "TickVault"
 
 HISTDATA_URL_TICKDATA_TEMPLATE = (
     'https://www.histdata.com/download-free-forex-historical-data/?/'
@@ -275,6 +318,20 @@ DATA_KEY_TEMPLATE_STR = '{market}.{ticker}.{tf}'
 DATA_KEY_TEMPLATE_PATTERN = '^[A-Za-z0-9]_[A-Za-z]+.[A-Za-z0-9]+'
 FILENAME_STR = '{market}_{ticker}_{tf}.{file_ext}'
 FILENAME_YEAR_STR = '{market}_{ticker}_{tf}_{year}.{file_ext}'
+# month segments of a year file are stored in a sibling folder
+# named after the year file: <year file stem>.segments/<MM>.<file_ext>
+MONTH_SEGMENTS_FOLDER_SUFFIX = '.segments'
+MONTH_SEGMENT_FILENAME_STR = '{month:02d}.{file_ext}'
+# manifest of the files stored in a local database folder
+CATALOG_FILENAME = 'catalog.sqlite'
+TICKERS_REGISTRY_FILENAME = 'tickers_registry.json'
+# data files are written as temporary files then renamed
+TEMP_FILE_SUFFIX = '.tmp'
+# compact tick files store prices as int32 pipettes, the pipette size
+# is recorded in the parquet key-value metadata under this key
+COMPACT_TICKS_METADATA_KEY = 'forex_data.pipette_size'
+# vwmp is not on the quotes grid: stored in hundredths of pipette
+VWMP_PIPETTE_SUBDIVISIONS = 100
 DEFAULT_TIMEZONE = 'utc'
 TICK_TIMEFRAME = 'tick'
 
@@ -420,6 +477,7 @@ class COLUMN_NAME:
     TRANSACTIONS = 'transactions'
     OTC = 'otc'
     VWAP = 'vwap'
+    TICKER = 'ticker'
 
 
 SUPPORTED_COLUMN_NAME = Literal[
@@ -529,6 +587,16 @@ SUPPORTED_SQL_CONDITION_AGGREGATION_MODES = Literal[
     SQL_CONDITION_AGGREGATION_MODES.OR
 ]
 
+# comparison operators mapped to their polars expression builders
+COMPARISON_OPERATORS_FUNCTIONS = {
+    SQL_COMPARISON_OPERATORS.GREATER_THAN: gt,
+    SQL_COMPARISON_OPERATORS.LESS_THAN: lt,
+    SQL_COMPARISON_OPERATORS.GREATER_THAN_OR_EQUAL: ge,
+    SQL_COMPARISON_OPERATORS.LESS_THAN_OR_EQUAL: le,
+    SQL_COMPARISON_OPERATORS.EQUAL: eq,
+    SQL_COMPARISON_OPERATORS.NOT_EQUAL: ne
+}
+
 
 # auxiliary functions
 
@@ -1180,9 +1248,14 @@ def read_parquet(engine, filepath):
         raise ValueError
 
 
-def write_parquet(dataframe, filepath):
+def write_parquet(dataframe, filepath, profile=None):
 
-    if isinstance(dataframe, pandas_dataframe):
+    if profile is not None:
+
+        # options of the writer profile, same for every engine
+        write_parquet_profile(dataframe, filepath, profile)
+
+    elif isinstance(dataframe, pandas_dataframe):
 
         try:
 
@@ -1238,6 +1311,145 @@ def write_parquet(dataframe, filepath):
         raise ValueError
 
 
+PARQUET_COMPRESSION_CODECS = ['uncompressed', 'snappy', 'gzip', 'brotli', 'lz4', 'zstd']
+
+
+@define(kw_only=True, slots=True)
+class ParquetWriterProfile:
+    '''
+    Options of the parquet files writer.
+
+    Row groups are at most row_group_size rows and, if row_group_period
+    is set (e.g. '1d' or '1mo'), never span two periods of the timestamp
+    column: a range read skips the row groups outside the range by
+    their statistics.
+    '''
+
+    compression: str = field(default='zstd',
+                             validator=validators.in_(PARQUET_COMPRESSION_CODECS))
+    compression_level: Optional[int] = field(
+        default=None,
+        validator=validators.optional(validators.instance_of(int)))
+    row_group_size: Optional[int] = field(
+        default=None,
+        validator=validators.optional([validators.instance_of(int),
+                                       validators.gt(0)]))
+    row_group_period: Optional[str] = field(
+        default=None,
+        validator=validators.optional(validators.matches_re(POLARS_DURATION_PATTERN_STR)))
+    statistics: bool = field(default=True,
+                             validator=validators.instance_of(bool))
+    dictionary: bool = field(default=True,
+                             validator=validators.instance_of(bool))
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ParquetWriterProfile':
+        '''
+        Build a profile from a configuration mapping,
+        keys are matched case insensitive to the profile fields.
+        '''
+
+        try:
+
+            return cls(**{key.lower(): value for key, value in config.items()})
+
+        except (TypeError, ValueError) as e:
+
+            logger.error(f'parquet writer profile {config} invalid: {e}')
+            raise
+
+
+def _row_group_bounds(table: Table, profile: ParquetWriterProfile) -> List[Tuple[int, int]]:
+
+    # (offset, rows) of the row groups of a table sorted by timestamp
+    bounds = [(0, table.num_rows)]
+
+    if profile.row_group_period and COLUMN_NAME.TIMESTAMP in table.column_names:
+
+        periods = from_arrow(table[COLUMN_NAME.TIMESTAMP]).dt.truncate(
+            profile.row_group_period).rle().struct.field('len')
+        offsets = periods.cum_sum().to_list()
+        bounds = list(zip([0] + offsets[:-1], periods.to_list()))
+
+    if profile.row_group_size:
+
+        bounds = [(offset + start, min(profile.row_group_size, rows - start))
+                  for offset, rows in bounds
+                  for start in range(0, rows, profile.row_group_size)]
+
+    return bounds
+
+
+def write_parquet_table(table: Table,
+                        filepath,
+                        profile: ParquetWriterProfile,
+                        **options: Any) -> None:
+    '''
+    Write an Arrow table to parquet with the options of profile,
+    options are passed to the pyarrow writer and override the profile.
+    '''
+
+    writer_options = dict(compression=profile.compression,
+                          compression_level=profile.compression_level,
+                          write_statistics=profile.statistics,
+                          use_dictionary=profile.dictionary)
+    writer_options.update(options)
+
+    with ParquetWriter(filepath, table.schema, **writer_options) as writer:
+
+        if table.num_rows == 0:
+            writer.write_table(table)
+            return
+
+        for offset, rows in _row_group_bounds(table, profile):
+            writer.write_table(table.slice(offset, rows), row_group_size=rows)
+
+
+def write_parquet_profile(dataframe, filepath, profile: ParquetWriterProfile) -> None:
+
+    if isinstance(dataframe, PolarsLazyFrame):
+
+        if profile.row_group_period is None and profile.dictionary:
+
+            # polars sink supports the profile, data is streamed
+            try:
+
+                dataframe.sink_parquet(filepath,
+                                       compression=profile.compression,
+                                       compression_level=profile.compression_level,
+                                       statistics=profile.statistics,
+                                       row_group_size=profile.row_group_size)
+                return
+
+            except Exception as e:
+
+                logger.exception(f'polars lazyframe sink parquet failed: {e}')
+                raise
+
+        dataframe = dataframe.collect()
+
+    if isinstance(dataframe, pandas_dataframe):
+        table = Table.from_pandas(dataframe, preserve_index=True)
+    elif isinstance(dataframe, PolarsDataFrame):
+        table = dataframe.to_arrow()
+    elif isinstance(dataframe, Table):
+        table = dataframe
+    else:
+        logger.error('function write_parquet not available'
+                     ' for instance of type'
+                     f' {type(dataframe)}')
+        raise ValueError
+
+    try:
+
+        write_parquet_table(table, filepath, profile)
+
+    except Exception as e:
+
+        logger.exception(f'write parquet with profile {profile} failed: {e}')
+        raise
+
+
 def read_csv(engine, file, **kwargs):
 
     if engine == 'pandas':
@@ -1399,6 +1611,148 @@ def to_pandas_dataframe(dataframe):
         raise ValueError
 
 
+def _tick_aggregations() -> List[PolarsExpr]:
+
+    # bars from ticks: ohlc of vwmp, last prices, volumes sum
+    return [col(COLUMN_NAME.VWMP).first().alias(COLUMN_NAME.OPEN),
+            col(COLUMN_NAME.VWMP).max().alias(COLUMN_NAME.HIGH),
+            col(COLUMN_NAME.VWMP).min().alias(COLUMN_NAME.LOW),
+            col(COLUMN_NAME.VWMP).last().alias(COLUMN_NAME.CLOSE),
+            col(COLUMN_NAME.ASK).last().alias(COLUMN_NAME.ASK),
+            col(COLUMN_NAME.BID).last().alias(COLUMN_NAME.BID),
+            col(COLUMN_NAME.ASK_VOLUME).sum().alias(COLUMN_NAME.ASK_VOLUME),
+            col(COLUMN_NAME.BID_VOLUME).sum().alias(COLUMN_NAME.BID_VOLUME),
+            col(COLUMN_NAME.VWMP).last().alias(COLUMN_NAME.VWMP),
+            col(COLUMN_NAME.VWMP).mean().alias(COLUMN_NAME.VWMP_AVG)]
+
+
+def _bar_aggregations(vwmp_avg: PolarsExpr | None = None) -> List[PolarsExpr]:
+
+    # bars from bars: first open, max high, min low,
+    # last close and prices, volumes sum
+    if vwmp_avg is None:
+        vwmp_avg = col(COLUMN_NAME.VWMP_AVG).mean()
+
+    return [col(COLUMN_NAME.OPEN).first(),
+            col(COLUMN_NAME.HIGH).max(),
+            col(COLUMN_NAME.LOW).min(),
+            col(COLUMN_NAME.CLOSE).last(),
+            col(COLUMN_NAME.ASK).last(),
+            col(COLUMN_NAME.BID).last(),
+            col(COLUMN_NAME.ASK_VOLUME).sum(),
+            col(COLUMN_NAME.BID_VOLUME).sum(),
+            col(COLUMN_NAME.VWMP).last(),
+            vwmp_avg.alias(COLUMN_NAME.VWMP_AVG)]
+
+
+def _group_by_timeframes(dataframe: PolarsDataFrame | PolarsLazyFrame,
+                         aggregations: Dict[str, List[PolarsExpr]],
+                         engine: str = 'auto') -> Dict[str, PolarsDataFrame]:
+    '''
+    Aggregate dataframe, sorted by timestamp, to each timeframe with its
+    aggregations. The queries share a cached input and are executed
+    together by collect_all, so dataframe is scanned once.
+    '''
+
+    source = dataframe.lazy().cache()
+
+    queries = [source.group_by_dynamic(COLUMN_NAME.TIMESTAMP,
+                                       every=tf).agg(tf_aggregations)
+               for tf, tf_aggregations in aggregations.items()]
+
+    return dict(zip(aggregations, collect_all(queries, engine=engine)))
+
+
+# pyarrow temporal units of polars duration units
+ARROW_TEMPORAL_UNITS = {
+    'ns': 'nanosecond',
+    'us': 'microsecond',
+    'ms': 'millisecond',
+    's': 'second',
+    'm': 'minute',
+    'h': 'hour',
+    'd': 'day',
+    'w': 'week',
+    'mo': 'month',
+    'q': 'quarter',
+    'y': 'year'
+}
+
+
+def _reframe_arrow_table(table: Table, tf: str) -> Table:
+    '''
+    Reframe an Arrow table with pyarrow compute only: timestamps are
+    floored to the timeframe buckets and each bucket is aggregated with
+    an ordered group by, bars are in the same layout of reframe_data()
+    on polars data.
+    '''
+
+    match = fullmatch(POLARS_DURATION_PATTERN_STR, tf, flags=IGNORECASE)
+    if not match or match.group(1).lower() not in ARROW_TEMPORAL_UNITS:
+        logger.error(f'timeframe {tf} not supported by pyarrow engine')
+        raise ValueError(f'timeframe {tf} not supported by pyarrow engine')
+
+    if all([column in DATA_COLUMN_NAMES.TICK_DATA for column in table.column_names]):
+
+        aggregations = [
+            (COLUMN_NAME.OPEN, COLUMN_NAME.VWMP, 'first'),
+            (COLUMN_NAME.HIGH, COLUMN_NAME.VWMP, 'max'),
+            (COLUMN_NAME.LOW, COLUMN_NAME.VWMP, 'min'),
+            (COLUMN_NAME.CLOSE, COLUMN_NAME.VWMP, 'last'),
+            (COLUMN_NAME.ASK, COLUMN_NAME.ASK, 'last'),
+            (COLUMN_NAME.BID, COLUMN_NAME.BID, 'last'),
+            (COLUMN_NAME.ASK_VOLUME, COLUMN_NAME.ASK_VOLUME, 'sum'),
+            (COLUMN_NAME.BID_VOLUME, COLUMN_NAME.BID_VOLUME, 'sum'),
+            (COLUMN_NAME.VWMP, COLUMN_NAME.VWMP, 'last'),
+            (COLUMN_NAME.VWMP_AVG, COLUMN_NAME.VWMP, 'mean')
+        ]
+
+    elif all([column in DATA_COLUMN_NAMES.TF_DATA for column in table.column_names]):
+
+        aggregations = [
+            (COLUMN_NAME.OPEN, COLUMN_NAME.OPEN, 'first'),
+            (COLUMN_NAME.HIGH, COLUMN_NAME.HIGH, 'max'),
+            (COLUMN_NAME.LOW, COLUMN_NAME.LOW, 'min'),
+            (COLUMN_NAME.CLOSE, COLUMN_NAME.CLOSE, 'last'),
+            (COLUMN_NAME.ASK, COLUMN_NAME.ASK, 'last'),
+            (COLUMN_NAME.BID, COLUMN_NAME.BID, 'last'),
+            (COLUMN_NAME.ASK_VOLUME, COLUMN_NAME.ASK_VOLUME, 'sum'),
+            (COLUMN_NAME.BID_VOLUME, COLUMN_NAME.BID_VOLUME, 'sum'),
+            (COLUMN_NAME.VWMP, COLUMN_NAME.VWMP, 'last'),
+            (COLUMN_NAME.VWMP_AVG, COLUMN_NAME.VWMP_AVG, 'mean')
+        ]
+
+    else:
+
+        logger.error(f'data columns {table.column_names} invalid, '
+                     f'required {DATA_COLUMN_NAMES.TICK_DATA} '
+                     f'or {DATA_COLUMN_NAMES.TF_DATA}')
+        raise ValueError
+
+    # first and last of a group follow the table order
+    table = table.sort_by(COLUMN_NAME.TIMESTAMP)
+
+    buckets = pc.floor_temporal(table[COLUMN_NAME.TIMESTAMP],
+                                multiple=int(tf[:match.start(1)]),
+                                unit=ARROW_TEMPORAL_UNITS[match.group(1).lower()])
+
+    # an aggregation shared by several outputs is computed once
+    grouped = table.drop_columns([COLUMN_NAME.TIMESTAMP]).append_column(
+        COLUMN_NAME.TIMESTAMP, buckets
+    ).group_by(COLUMN_NAME.TIMESTAMP, use_threads=False).aggregate(
+        list(dict.fromkeys((source, function) for _, source, function in aggregations)))
+
+    # results of mean and sum are cast back to the source type
+    columns = [grouped[COLUMN_NAME.TIMESTAMP]] + [
+        grouped[f'{source}_{function}'].cast(table.schema.field(source).type)
+        for _, source, function in aggregations]
+
+    return pyarrow_table(
+        columns,
+        names=[COLUMN_NAME.TIMESTAMP] + [name for name, _, _ in aggregations]
+    ).sort_by(COLUMN_NAME.TIMESTAMP)
+
+
 def reframe_data(dataframe, tf):
     '''
 
@@ -1475,27 +1829,44 @@ def reframe_data(dataframe, tf):
         if all([col in DATA_COLUMN_NAMES.TICK_DATA_TIME_INDEX
                 for col in dataframe.columns]):
 
-            # resample vwmp to ohlc
-            ohlc_df = dataframe[COLUMN_NAME.VWMP].resample(tf).ohlc().interpolate(method='nearest')
-            # Sum the volumes
-            ask_vol_df = dataframe[COLUMN_NAME.ASK_VOLUME].resample(tf).sum()
-            bid_vol_df = dataframe[COLUMN_NAME.BID_VOLUME].resample(tf).sum()
-            # Mean of vwmp for vwmp_avg
-            vwmp_avg_df = dataframe[COLUMN_NAME.VWMP].resample(tf).mean()
-            # Last values for ask, bid, vwmp
-            ask_df = dataframe[COLUMN_NAME.ASK].resample(tf).last()
-            bid_df = dataframe[COLUMN_NAME.BID].resample(tf).last()
-            vwmp_df = dataframe[COLUMN_NAME.VWMP].resample(tf).last()
-            
-            # Combine them
-            dataframe = pandas_concat([ohlc_df, ask_df, bid_df, ask_vol_df, bid_vol_df, vwmp_df, vwmp_avg_df], axis=1)
-            dataframe.columns = DATA_COLUMN_NAMES.TF_DATA_TIME_INDEX
+            # single resample pass aggregating all columns
+            dataframe = dataframe.resample(tf).agg(**{
+                COLUMN_NAME.OPEN: (COLUMN_NAME.VWMP, 'first'),
+                COLUMN_NAME.HIGH: (COLUMN_NAME.VWMP, 'max'),
+                COLUMN_NAME.LOW: (COLUMN_NAME.VWMP, 'min'),
+                COLUMN_NAME.CLOSE: (COLUMN_NAME.VWMP, 'last'),
+                COLUMN_NAME.ASK: (COLUMN_NAME.ASK, 'last'),
+                COLUMN_NAME.BID: (COLUMN_NAME.BID, 'last'),
+                COLUMN_NAME.ASK_VOLUME: (COLUMN_NAME.ASK_VOLUME, 'sum'),
+                COLUMN_NAME.BID_VOLUME: (COLUMN_NAME.BID_VOLUME, 'sum'),
+                COLUMN_NAME.VWMP: (COLUMN_NAME.VWMP, 'last'),
+                COLUMN_NAME.VWMP_AVG: (COLUMN_NAME.VWMP, 'mean')
+            })
+
+            # fill ohlc of intervals without ticks
+            ohlc = [COLUMN_NAME.OPEN, COLUMN_NAME.HIGH, COLUMN_NAME.LOW, COLUMN_NAME.CLOSE]
+            dataframe[ohlc] = dataframe[ohlc].interpolate(method='nearest')
 
         elif all([col in DATA_COLUMN_NAMES.TF_DATA_TIME_INDEX
                   for col in dataframe.columns]):
 
-            # resample along given data already in ohlc format
-            dataframe = dataframe.resample(tf).interpolate(method='nearest')
+            # single resample pass combining the bars
+            dataframe = dataframe.resample(tf).agg({
+                COLUMN_NAME.OPEN: 'first',
+                COLUMN_NAME.HIGH: 'max',
+                COLUMN_NAME.LOW: 'min',
+                COLUMN_NAME.CLOSE: 'last',
+                COLUMN_NAME.ASK: 'last',
+                COLUMN_NAME.BID: 'last',
+                COLUMN_NAME.ASK_VOLUME: 'sum',
+                COLUMN_NAME.BID_VOLUME: 'sum',
+                COLUMN_NAME.VWMP: 'last',
+                COLUMN_NAME.VWMP_AVG: 'mean'
+            })
+
+            # fill ohlc of intervals without bars
+            ohlc = [COLUMN_NAME.OPEN, COLUMN_NAME.HIGH, COLUMN_NAME.LOW, COLUMN_NAME.CLOSE]
+            dataframe[ohlc] = dataframe[ohlc].interpolate(method='nearest')
 
         else:
 
@@ -1511,23 +1882,7 @@ def reframe_data(dataframe, tf):
         # assert timeframe input value
         tf = check_timeframe_str(tf, engine='pyarrow')
 
-        if all([col in DATA_COLUMN_NAMES.TICK_DATA
-                for col in dataframe.column_names]):
-
-            # convert to polars dataframe
-            dataframe = from_arrow(dataframe,
-                                   schema=cast(Any, POLARS_DTYPE_DICT.TIME_TICK_DTYPE))
-
-        elif all([col in DATA_COLUMN_NAMES.TF_DATA
-                  for col in dataframe.column_names]):
-
-            # convert to polars dataframe
-            dataframe = from_arrow(dataframe,
-                                   schema=cast(Any, POLARS_DTYPE_DICT.TIME_TF_DTYPE))
-
-        # perform operation
-        # convert to arrow Table and return
-        return reframe_data(dataframe, tf).to_arrow()
+        return _reframe_arrow_table(dataframe, tf.lower())
 
     elif isinstance(dataframe, PolarsDataFrame):
 
@@ -1543,34 +1898,14 @@ def reframe_data(dataframe, tf):
 
             return dataframe.group_by_dynamic(
                 COLUMN_NAME.TIMESTAMP,
-                every=tf).agg(col(COLUMN_NAME.VWMP).first().alias(COLUMN_NAME.OPEN),
-                              col(COLUMN_NAME.VWMP).max().alias(COLUMN_NAME.HIGH),
-                              col(COLUMN_NAME.VWMP).min().alias(COLUMN_NAME.LOW),
-                              col(COLUMN_NAME.VWMP).last().alias(COLUMN_NAME.CLOSE),
-                              col(COLUMN_NAME.ASK).last().alias(COLUMN_NAME.ASK),
-                              col(COLUMN_NAME.BID).last().alias(COLUMN_NAME.BID),
-                              col(COLUMN_NAME.ASK_VOLUME).sum().alias(COLUMN_NAME.ASK_VOLUME),
-                              col(COLUMN_NAME.BID_VOLUME).sum().alias(COLUMN_NAME.BID_VOLUME),
-                              col(COLUMN_NAME.VWMP).last().alias(COLUMN_NAME.VWMP),
-                              col(COLUMN_NAME.VWMP).mean().alias(COLUMN_NAME.VWMP_AVG)
-                              )
+                every=tf).agg(_tick_aggregations())
 
         elif all([col in DATA_COLUMN_NAMES.TF_DATA
                   for col in dataframe.columns]):
 
             return dataframe.group_by_dynamic(
                 COLUMN_NAME.TIMESTAMP,
-                every=tf).agg(col(COLUMN_NAME.OPEN).first(),
-                              col(COLUMN_NAME.HIGH).max(),
-                              col(COLUMN_NAME.LOW).min(),
-                              col(COLUMN_NAME.CLOSE).last(),
-                              col(COLUMN_NAME.ASK).last(),
-                              col(COLUMN_NAME.BID).last(),
-                              col(COLUMN_NAME.ASK_VOLUME).sum(),
-                              col(COLUMN_NAME.BID_VOLUME).sum(),
-                              col(COLUMN_NAME.VWMP).last(),
-                              col(COLUMN_NAME.VWMP_AVG).mean()
-                              )
+                every=tf).agg(_bar_aggregations())
 
         else:
 
@@ -1590,34 +1925,14 @@ def reframe_data(dataframe, tf):
 
             return dataframe.group_by_dynamic(
                 COLUMN_NAME.TIMESTAMP,
-                every=tf).agg(col(COLUMN_NAME.VWMP).first().alias(COLUMN_NAME.OPEN),
-                              col(COLUMN_NAME.VWMP).max().alias(COLUMN_NAME.HIGH),
-                              col(COLUMN_NAME.VWMP).min().alias(COLUMN_NAME.LOW),
-                              col(COLUMN_NAME.VWMP).last().alias(COLUMN_NAME.CLOSE),
-                              col(COLUMN_NAME.ASK).last().alias(COLUMN_NAME.ASK),
-                              col(COLUMN_NAME.BID).last().alias(COLUMN_NAME.BID),
-                              col(COLUMN_NAME.ASK_VOLUME).sum().alias(COLUMN_NAME.ASK_VOLUME),
-                              col(COLUMN_NAME.BID_VOLUME).sum().alias(COLUMN_NAME.BID_VOLUME),
-                              col(COLUMN_NAME.VWMP).last().alias(COLUMN_NAME.VWMP),
-                              col(COLUMN_NAME.VWMP).mean().alias(COLUMN_NAME.VWMP_AVG)
-                              )
+                every=tf).agg(_tick_aggregations())
 
         elif all([col in DATA_COLUMN_NAMES.TF_DATA
                   for col in dataframe.collect_schema().names()]):
 
             return dataframe.group_by_dynamic(
                 COLUMN_NAME.TIMESTAMP,
-                every=tf).agg(col(COLUMN_NAME.OPEN).first(),
-                              col(COLUMN_NAME.HIGH).max(),
-                              col(COLUMN_NAME.LOW).min(),
-                              col(COLUMN_NAME.CLOSE).last(),
-                              col(COLUMN_NAME.ASK).last(),
-                              col(COLUMN_NAME.BID).last(),
-                              col(COLUMN_NAME.ASK_VOLUME).sum(),
-                              col(COLUMN_NAME.BID_VOLUME).sum(),
-                              col(COLUMN_NAME.VWMP).last(),
-                              col(COLUMN_NAME.VWMP_AVG).mean()
-                              )
+                every=tf).agg(_bar_aggregations())
 
         else:
 
@@ -1626,6 +1941,256 @@ def reframe_data(dataframe, tf):
                          f'or {DATA_COLUMN_NAMES.TF_DATA}')
             raise ValueError
 
+
+def reframe_data_multi(dataframe, tfs: List[str]) -> Dict[str, Any]:
+    '''
+    Reframe data to several timeframes in a single pass.
+
+    Polars data is aggregated by one query per timeframe over a shared
+    cached input, executed together with collect_all, so the source is
+    read once instead of once per timeframe. Data of other engines is
+    reframed for each timeframe with reframe_data().
+
+    Parameters
+    ----------
+    dataframe :
+        Tick or timeframe data.
+    tfs : List[str]
+        Timeframes to reframe to.
+
+    Returns
+    -------
+    Dict
+        timeframe -> reframed data, of the same type of dataframe.
+    '''
+
+    if (
+        not isinstance(dataframe, (PolarsDataFrame, PolarsLazyFrame)) or
+        is_empty_dataframe(dataframe)
+    ):
+
+        return {tf: reframe_data(dataframe, tf) for tf in tfs}
+
+    timeframes = [check_timeframe_str(tf, engine='polars').lower() for tf in tfs]
+
+    columns = dataframe.collect_schema().names()
+    if all([column in DATA_COLUMN_NAMES.TICK_DATA for column in columns]):
+        aggregations = _tick_aggregations()
+    elif all([column in DATA_COLUMN_NAMES.TF_DATA for column in columns]):
+        aggregations = _bar_aggregations()
+    else:
+        logger.error(f'data columns {columns} invalid, '
+                     f'required {DATA_COLUMN_NAMES.TICK_DATA} '
+                     f'or {DATA_COLUMN_NAMES.TF_DATA}')
+        raise ValueError
+
+    source = collect_lazyframe(dataframe).sort(COLUMN_NAME.TIMESTAMP)
+
+    reframed = _group_by_timeframes(source,
+                                    {tf: aggregations for tf in timeframes})
+
+    return {tf: (reframed[timeframe].lazy()
+                 if isinstance(dataframe, PolarsLazyFrame)
+                 else reframed[timeframe])
+            for tf, timeframe in zip(tfs, timeframes)}
+
+
+# TIMEFRAMES ROLLUP
+
+# hidden column counting the ticks aggregated in a bar,
+# needed to combine vwmp_avg of bars exactly
+ROLLUP_TICKS_COLUMN = '__ticks'
+
+# nanoseconds of fixed duration units
+DURATION_UNIT_NS = {
+    'ns': 1,
+    'us': 10**3,
+    'ms': 10**6,
+    's': 10**9,
+    'm': 60 * 10**9,
+    'h': 3600 * 10**9,
+    'd': 86400 * 10**9
+}
+
+
+def _timeframe_span(tf: str) -> Tuple[str, int] | None:
+    '''
+    Kind and size of a polars timeframe: ('fixed', nanoseconds),
+    ('week', weeks) or ('month', months). None if the timeframe is
+    not time based.
+    '''
+
+    match = fullmatch(POLARS_DURATION_PATTERN_STR, tf, flags=IGNORECASE)
+    if not match:
+        return None
+
+    count, unit = int(tf[:match.start(1)]), match.group(1).lower()
+
+    if unit in DURATION_UNIT_NS:
+        return 'fixed', count * DURATION_UNIT_NS[unit]
+    elif unit == 'w':
+        return 'week', count
+    elif unit == 'mo':
+        return 'month', count
+    elif unit == 'q':
+        return 'month', 3 * count
+    elif unit == 'y':
+        return 'month', 12 * count
+
+    return None
+
+
+def _timeframe_sort_key(tf: str) -> int:
+
+    kind, size = _timeframe_span(tf) or ('fixed', 0)
+    if kind == 'week':
+        return size * 7 * DURATION_UNIT_NS['d']
+    elif kind == 'month':
+        return size * 30 * DURATION_UNIT_NS['d']
+
+    return size
+
+
+def _is_rollup_parent(parent: str, tf: str) -> bool:
+    '''
+    True if every bar of parent falls within a single bar of tf,
+    so that tf can be aggregated from parent bars.
+    '''
+
+    parent_span = _timeframe_span(parent)
+    tf_span = _timeframe_span(tf)
+    if parent_span is None or tf_span is None or parent_span == tf_span:
+        return False
+
+    parent_kind, parent_size = parent_span
+    tf_kind, tf_size = tf_span
+
+    if parent_kind == 'fixed':
+
+        if tf_kind == 'fixed':
+            # fixed windows are aligned on the epoch
+            return tf_size % parent_size == 0
+
+        # calendar windows start on day boundaries
+        return DURATION_UNIT_NS['d'] % parent_size == 0
+
+    # calendar months always start on a month boundary
+    return parent_kind == 'month' and tf_kind == 'month' and parent_size == 1
+
+
+def plan_timeframes_rollup(timeframes: List[str]) -> Dict[str, str]:
+    '''
+    Plan the aggregation of timeframes as a dependency DAG: each
+    timeframe is mapped to the coarsest of the other timeframes whose
+    bars it can be aggregated from, or to TICK_TIMEFRAME if none.
+
+    The plan is ordered so that parents come before their children,
+    e.g. ['1m', '5m', '1h', '1d'] gives
+    {'1m': 'tick', '5m': '1m', '1h': '5m', '1d': '1h'}.
+    '''
+
+    plan: Dict[str, str] = {}
+    for tf in sorted(list_remove_duplicates([tf.lower() for tf in timeframes]),
+                     key=_timeframe_sort_key):
+
+        plan[tf] = find_rollup_parent(tf, list(plan)) or TICK_TIMEFRAME
+
+    return plan
+
+
+def find_rollup_parent(timeframe: str, timeframes: List[str]) -> str | None:
+    '''
+    Get the coarsest of timeframes that evenly divides timeframe,
+    i.e. whose bars can be aggregated to timeframe bars.
+    None if there is none.
+    '''
+
+    parents = [tf.lower() for tf in timeframes
+               if tf != TICK_TIMEFRAME and _is_rollup_parent(tf.lower(), timeframe.lower())]
+
+    return max(parents, key=_timeframe_sort_key, default=None)
+
+
+def rollup_timeframes(dataframe,
+                      timeframes: List[str],
+                      streaming_chunk_size: int = 0) -> Dict[str, Any]:
+    '''
+    Aggregate tick data to several timeframes following the plan of
+    plan_timeframes_rollup(): only the finest timeframes are aggregated
+    from ticks, the others from the bars of their parent timeframe.
+
+    Bars combine as open first, high max, low min, close, ask, bid and
+    vwmp last, volumes sum and vwmp_avg as the tick weighted mean of
+    the parent bars, so the result equals reframe_data() of the ticks.
+    Data of engines other than polars is reframed from ticks for
+    each timeframe.
+
+    If streaming_chunk_size is greater than 0 and dataframe is a
+    LazyFrame, already sorted by timestamp, the ticks are aggregated by
+    the polars streaming engine in chunks of that many rows and are never
+    materialized: peak memory is bounded by the chunks and the bars.
+
+    Returns
+    -------
+    Dict
+        timeframe -> aggregated data, of the same type of dataframe.
+    '''
+
+    if (
+        not isinstance(dataframe, (PolarsDataFrame, PolarsLazyFrame)) or
+        is_empty_dataframe(dataframe)
+    ):
+
+        return {tf: reframe_data(dataframe, tf) for tf in timeframes}
+
+    lazy = isinstance(dataframe, PolarsLazyFrame)
+    streaming = lazy and streaming_chunk_size > 0
+
+    if streaming:
+        # ticks are streamed from the source, only bars are in memory
+        tiers = {TICK_TIMEFRAME: dataframe}
+    else:
+        # ticks are read once, every tier is built in memory
+        tiers = {TICK_TIMEFRAME: collect_lazyframe(dataframe).sort(COLUMN_NAME.TIMESTAMP)}
+
+    ticks = col(ROLLUP_TICKS_COLUMN)
+    vwmp_dtype = tiers[TICK_TIMEFRAME].collect_schema()[COLUMN_NAME.VWMP]
+
+    tick_aggregations = _tick_aggregations() + [
+        col(COLUMN_NAME.VWMP).count().alias(ROLLUP_TICKS_COLUMN)]
+    bar_aggregations = _bar_aggregations(
+        ((col(COLUMN_NAME.VWMP_AVG) * ticks).sum() / ticks.sum()).cast(vwmp_dtype)
+    ) + [ticks.sum()]
+
+    # the tiers sharing a parent are aggregated in a single pass over it
+    children: Dict[str, List[str]] = {}
+    for tf, parent in plan_timeframes_rollup(timeframes).items():
+        children.setdefault(parent, []).append(tf)
+
+    for parent, parent_children in children.items():
+
+        if parent != TICK_TIMEFRAME:
+            tiers.update(_group_by_timeframes(tiers[parent],
+                                              {tf: bar_aggregations for tf in parent_children}))
+        elif streaming:
+            with Config(streaming_chunk_size=streaming_chunk_size):
+                tiers.update(_group_by_timeframes(tiers[parent],
+                                                  {tf: tick_aggregations
+                                                   for tf in parent_children},
+                                                  engine='streaming'))
+        else:
+            tiers.update(_group_by_timeframes(tiers[parent],
+                                              {tf: tick_aggregations for tf in parent_children}))
+
+    rollup = {}
+    for tf in timeframes:
+        rollup[tf] = tiers[tf.lower()].drop(ROLLUP_TICKS_COLUMN)
+        if lazy:
+            rollup[tf] = rollup[tf].lazy()
+
+    return rollup
+
+
 # ATTRS
 
 # ADDED VALIDATORS
@@ -2343,6 +2908,13 @@ SUPPORTED_HISTORICAL_DATA_PROVIDERS = [
     DUKASCOPY_PROVIDER
 ]
 
+# default months downloaded concurrently per provider
+HISTDATA_MAX_CONCURRENT_DOWNLOADS = 4
+DUKASCOPY_MAX_CONCURRENT_DOWNLOADS = 2
+
+# latency of the hourly tick files publication on the Dukascopy datafeed
+DUKASCOPY_PUBLISH_DELAY = timedelta(hours=2)
+
 
 '''
 REALTIME DATA PROVIDERS
@@ -2357,6 +2929,10 @@ PAIR_TWELVE_DATA_PATTERN = '^' + SINGLE_CURRENCY_PATTERN_STR + \
 
 TWELVE_DATA_CHUNK_SIZE = 5000
 
+# requests in flight at once, each on a pooled keep-alive connection
+TWELVE_DATA_MAX_CONCURRENT_REQUESTS = 4
+TWELVE_DATA_REQUEST_TIMEOUT = 30.0  # seconds
+
 # LIST OF AVAILABLE PLANS ON TWELVE DATA
 TWELVEDATA_PROVIDER_PLAN_LIST = ["free", "grow", "pro", "ultra"]
 
@@ -2402,3 +2978,97 @@ def collect_lazyframe(dataframe: PolarsLazyFrame, use_gpu: bool = False) -> Pola
                 return dataframe.collect()
         return dataframe.collect()
     return dataframe
+
+
+@lru_cache(maxsize=256)
+def _compile_conditions(conditions: Tuple[Tuple[str, str, int | float], ...],
+                        aggregation_mode: str) -> PolarsExpr:
+
+    expressions = [
+        COMPARISON_OPERATORS_FUNCTIONS[operator](col(column), level)
+        for column, operator, level in conditions
+    ]
+
+    if aggregation_mode == SQL_CONDITION_AGGREGATION_MODES.OR:
+        return reduce(lambda left, right: left | right, expressions)
+
+    return reduce(lambda left, right: left & right, expressions)
+
+
+def compile_conditions_expression(
+    comparison_column_name: List[str] | str | None = None,
+    check_level: List[int | float] | int | float | None = None,
+    comparison_operator: List[str] | str | None = None,
+    comparison_aggregation_mode: str | None = None
+) -> PolarsExpr | None:
+    '''
+    Compile the comparison conditions "column operator level"
+    joined by the aggregation mode (AND by default) into a polars
+    expression, to be passed to a lazy scan filter so that the
+    conditions are evaluated by the file reader.
+
+    Compiled expressions are cached by conditions,
+    returns None if no condition is given.
+    '''
+
+    if (
+        comparison_column_name is None and
+        check_level is None and
+        comparison_operator is None
+    ):
+        return None
+
+    if isinstance(comparison_column_name, str):
+        comparison_column_name = [comparison_column_name]
+
+    if isinstance(check_level, (int, float)):
+        check_level = [check_level]
+
+    if isinstance(comparison_operator, str):
+        comparison_operator = [comparison_operator]
+
+    if (
+        comparison_column_name is None or
+        check_level is None or
+        comparison_operator is None or
+        len(comparison_column_name) != len(check_level) or
+        len(comparison_column_name) != len(comparison_operator)
+    ):
+        logger.bind(target='localdb').error(
+            'comparison_column_name, check_level and comparison_operator must have the same length')
+        raise ValueError(
+            'comparison_column_name, check_level and comparison_operator must have the same length')
+
+    if any([column not in list(SUPPORTED_COLUMN_NAME.__args__)
+            for column in comparison_column_name]):
+        logger.bind(target='localdb').error(
+            f'comparison_column_name must be a supported column name: '
+            f'{list(SUPPORTED_COLUMN_NAME.__args__)}')
+        raise ValueError(
+            'comparison_column_name must be a supported column name')
+
+    if any([operator not in list(SUPPORTED_SQL_COMPARISON_OPERATORS.__args__)
+            for operator in comparison_operator]):
+        logger.bind(target='localdb').error(
+            f'comparison_operator must be a supported SQL comparison operator: '
+            f'{list(SUPPORTED_SQL_COMPARISON_OPERATORS.__args__)}')
+        raise ValueError(
+            'comparison_operator must be a supported SQL comparison operator')
+
+    if comparison_aggregation_mode is None:
+        comparison_aggregation_mode = SQL_CONDITION_AGGREGATION_MODES.AND
+
+    if (
+        len(comparison_column_name) > 1 and
+        comparison_aggregation_mode not in list(
+            SUPPORTED_SQL_CONDITION_AGGREGATION_MODES.__args__)
+    ):
+        logger.bind(target='localdb').error(
+            f'comparison_aggregation_mode must be a supported SQL condition aggregation mode: '
+            f'{list(SUPPORTED_SQL_CONDITION_AGGREGATION_MODES.__args__)}')
+        raise ValueError(
+            'comparison_aggregation_mode must be a supported SQL condition aggregation mode')
+
+    return _compile_conditions(
+        tuple(zip(comparison_column_name, comparison_operator, check_level)),
+        comparison_aggregation_mode)
@@ -13,12 +13,15 @@ Created on Sun Feb 23 00:02:36 2025
         start with only support for polars, prefer lazyframe when possibile
 
         read and write using polars dataframe or lazyframe
-        exec requests using SQL query language
+        filter with polars expressions evaluated by the lazy scans
         OSS versions for windows required
 '''
 
 import time
 import requests
+from threading import Thread, local
+from contextlib import ExitStack, contextmanager
+from shutil import rmtree
 from requests import Session
 from filelock import FileLock
 from io import BytesIO
@@ -33,14 +36,18 @@ from bs4 import BeautifulSoup
 from polars import (
     DataFrame as PolarsDataFrame,
     LazyFrame as PolarsLazyFrame,
-    concat
+    Float64 as PolarsFloat64,
+    Int32 as PolarsInt32,
+    col,
+    concat,
+    from_arrow
 )
 
 from pandas import to_timedelta
 import json
 from datetime import datetime, timedelta
 from pathlib import Path as PathType
-from typing import Any, Dict, List, Optional, Tuple, Union, cast, Literal
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union, cast, Literal
 from numpy import array
 from re import (
     fullmatch,
@@ -49,16 +56,253 @@ from re import (
 )
 from attrs import (
     define,
+    evolve,
     field,
     validate,
     validators
 )
 from loguru import logger
 from pathlib import Path
+from hashlib import file_digest
+from pyarrow import Schema, Table
+from pyarrow.parquet import (
+    ParquetFile,
+    read_schema as parquet_read_schema
+)
+from uuid import uuid4
+from os import (
+    O_RDONLY,
+    fsync,
+    close as os_close,
+    name as os_name,
+    open as os_open,
+    replace as os_replace
+)
 
 
 from ..config import _apply_config
 from .common import *
+from .catalog import LocalDBCatalog
+from .cache import LocalDBPartitionCache
+
+
+# attempts to commit a written file over the current version
+REPLACE_ATTEMPTS = 20
+# rows per row group of compact tick files, small enough for
+# parallel decoding and for the row groups index of windows reads
+COMPACT_TICKS_ROW_GROUP_SIZE = 128 * 1024
+
+
+def _fsync_directory(path: Path) -> None:
+    '''
+    Flush a directory entry change (e.g. a rename) to disk,
+    only supported on posix systems.
+    '''
+
+    if os_name != 'posix':
+        return
+
+    directory_fd = os_open(path, O_RDONLY)
+    try:
+        fsync(directory_fd)
+    finally:
+        os_close(directory_fd)
+
+
+def _replace_file(temp_filepath: Path, filepath: Path) -> None:
+    '''
+    Rename temp_filepath over filepath. On windows a file open by
+    a reader can't be replaced, readers hold files only briefly
+    so the rename is retried shortly.
+    '''
+
+    for attempt in range(REPLACE_ATTEMPTS):
+        try:
+            os_replace(temp_filepath, filepath)
+            return
+        except PermissionError:
+            if attempt == REPLACE_ATTEMPTS - 1:
+                raise
+            time.sleep(0.05 * (attempt + 1))
+
+
+def _parquet_max_timestamp(filepath: Path) -> Optional[datetime]:
+    '''
+    Read the max timestamp of a parquet file from the footer statistics
+    of the timestamp column, no data page is decoded.
+
+    Returns None if the statistics are not available.
+    '''
+
+    parquet_file = ParquetFile(filepath)
+    metadata = parquet_file.metadata
+    column_index = parquet_file.schema_arrow.get_field_index(COLUMN_NAME.TIMESTAMP)
+
+    if column_index < 0:
+        return None
+
+    max_values = []
+    for row_group_index in range(metadata.num_row_groups):
+
+        row_group = metadata.row_group(row_group_index)
+        if row_group.num_rows == 0:
+            continue
+
+        statistics = row_group.column(column_index).statistics
+        if statistics is None or not statistics.has_min_max:
+            return None
+
+        max_values.append(statistics.max)
+
+    return max(max_values) if max_values else None
+
+
+def _parquet_row_groups_index(
+        parquet_file: ParquetFile) -> Optional[List[Tuple[int, datetime]]]:
+    '''
+    Time index of a parquet file sorted by timestamp from its footer:
+    rows count and max timestamp of each row group.
+
+    Returns None if the statistics are not available.
+    '''
+
+    metadata = parquet_file.metadata
+    column_index = parquet_file.schema_arrow.get_field_index(COLUMN_NAME.TIMESTAMP)
+
+    if column_index < 0:
+        return None
+
+    index = []
+    for row_group_index in range(metadata.num_row_groups):
+
+        row_group = metadata.row_group(row_group_index)
+        if row_group.num_rows == 0:
+            index.append((0, None))
+            continue
+
+        statistics = row_group.column(column_index).statistics
+        if statistics is None or not statistics.has_min_max:
+            return None
+
+        index.append((row_group.num_rows, statistics.max))
+
+    return index
+
+
+def _ticker_pipette_size(ticker: str) -> float:
+    '''
+    Pipette size of ticker quotes: from the tick_vault registry if
+    available, otherwise 1e-3 for JPY quoted pairs and metals and
+    1e-5 for the other tickers.
+    '''
+
+    try:
+        from tick_vault.constants import PIPET_SIZE_REGISTRY
+    except ImportError:
+        PIPET_SIZE_REGISTRY = {}
+
+    if ticker.upper() in PIPET_SIZE_REGISTRY:
+        return PIPET_SIZE_REGISTRY[ticker.upper()]
+
+    if ticker.lower().endswith('jpy') or ticker.lower()[:3] in ('xau', 'xag'):
+        return 1e-3
+
+    return 1e-5
+
+
+def _parquet_pipette_size(source: Any) -> Optional[float]:
+    '''
+    Pipette size of a parquet file stored with the compact tick schema,
+    read from the footer key-value metadata of source, a file or its
+    arrow schema. None for other files.
+    '''
+
+    schema = source if isinstance(source, Schema) else parquet_read_schema(source)
+    metadata = schema.metadata or {}
+    pipette_size = metadata.get(COMPACT_TICKS_METADATA_KEY.encode())
+
+    return float(pipette_size) if pipette_size is not None else None
+
+
+def _compact_ticks_units(pipette_size: float) -> Dict[str, float]:
+
+    # stored units per price unit, integers for decimal pipettes:
+    # dividing by them gives the correctly rounded price
+    return {
+        COLUMN_NAME.ASK: round(1 / pipette_size),
+        COLUMN_NAME.BID: round(1 / pipette_size),
+        COLUMN_NAME.VWMP: round(VWMP_PIPETTE_SUBDIVISIONS / pipette_size)
+    }
+
+
+def _encode_compact_ticks(dataframe: PolarsDataFrame,
+                          pipette_size: float) -> Optional[Table]:
+    '''
+    Encode tick data to the compact schema: ask and bid as int32
+    pipettes, vwmp as int32 hundredths of pipette.
+
+    Returns None if ask or bid are not quoted in pipettes, if scaled
+    prices overflow int32 or are NaN: data is stored with the float schema.
+    '''
+
+    units = _compact_ticks_units(pipette_size)
+
+    if dataframe.select(col(list(units)).is_nan().any()).sum_horizontal().item():
+        return None
+
+    scaled = dataframe.select(
+        [(col(column).cast(PolarsFloat64) * column_units).alias(column)
+         for column, column_units in units.items()])
+    # distance of quotes from the pipettes grid and largest scaled price
+    errors = scaled.select(
+        (col(column) - col(column).round()).abs().max()
+        for column in (COLUMN_NAME.ASK, COLUMN_NAME.BID)).row(0)
+    bound = scaled.select(col(column).abs().max() for column in units).row(0)
+
+    if (
+        any(value is None for value in errors + bound) or
+        max(errors) > 0.05 or
+        max(bound) >= 2 ** 31
+    ):
+        return None
+
+    table = dataframe.with_columns(
+        scaled[column].round().cast(PolarsInt32) for column in units
+    ).to_arrow()
+
+    return table.replace_schema_metadata(
+        {COMPACT_TICKS_METADATA_KEY: repr(pipette_size)})
+
+
+def _decode_compact_ticks(dataframe: Union[PolarsDataFrame, PolarsLazyFrame],
+                          pipette_size: Optional[float]
+                          ) -> Union[PolarsDataFrame, PolarsLazyFrame]:
+    '''
+    Decode data stored with the compact tick schema
+    back to the float prices, other data is returned as is.
+    '''
+
+    if pipette_size is None:
+        return dataframe
+
+    return dataframe.with_columns(
+        (col(column).cast(PolarsFloat64) / column_units).cast(POLARS_DTYPE_DICT.TICK_DTYPE[column])
+        for column, column_units in _compact_ticks_units(pipette_size).items())
+
+
+def _window_bounds(position: int,
+                   height: int,
+                   periods: int,
+                   direction: str) -> Tuple[int, int]:
+    '''
+    Rows range [start, end) of a window of periods rows ending before
+    position (backward) or starting at position (forward).
+    '''
+
+    if direction == 'backward':
+        return max(0, position - periods), position
+
+    return position, min(height, position + periods)
 
 # BASE CONNECTOR
 
@@ -74,10 +318,22 @@ class DatabaseConnector:
                         validator=validators.in_(SUPPORTED_DATA_ENGINES))
     polars_gpu_engine: bool = field(default=False,
                                     validator=validators.instance_of(bool))
+    # store parquet tick files with the compact schema: int32 pipettes
+    # prices and delta encoded timestamps, decoded on read
+    compact_ticks: bool = field(default=False,
+                                validator=validators.instance_of(bool))
+    # options of the parquet files writer, None for the engine defaults
+    parquet_writer: Optional[ParquetWriterProfile] = field(
+        default=None,
+        validator=validators.optional(validators.instance_of(ParquetWriterProfile)))
 
     _tickers_years_info_filepath = field(default=Path('.'))
     _local_files_cache: Any = field(default=None, init=False)
     _last_timestamp_cache: Any = field(default=None, init=False)
+    _catalog: Any = field(default=None, init=False)
+    _partition_cache: Any = field(default=None, init=False)
+    _deferred_records: Any = field(default=None, init=False)
+    _read_scope: Any = field(factory=local, init=False)
 
     def __init__(self, **kwargs: Any) -> None:
 
@@ -96,6 +352,15 @@ class DatabaseConnector:
             self.data_path.mkdir(parents=True,
                                  exist_ok=True)
 
+        # files manifest, built from the data files
+        # the first time the database folder is opened
+        catalog_filepath = self.data_path / CATALOG_FILENAME
+        catalog_bootstrap = not catalog_filepath.exists()
+        self._catalog = LocalDBCatalog(filepath=catalog_filepath,
+                                       data_path=self.data_path)
+        if catalog_bootstrap:
+            self.rebuild_catalog()
+
     def connect(self) -> Any:
         """Connect to database - must be implemented by subclasses."""
         raise NotImplementedError("Subclasses must implement connect")
@@ -118,10 +383,32 @@ class DatabaseConnector:
             ticker: str,
             timeframe: str,
             start: datetime,
-            end: datetime) -> PolarsLazyFrame:
+            end: datetime,
+            comparison_column_name: List[str] | str | None = None,
+            check_level: List[int | float] | int | float | None = None,
+            comparison_operator: List[SUPPORTED_SQL_COMPARISON_OPERATORS] | SUPPORTED_SQL_COMPARISON_OPERATORS | None = None,
+            comparison_aggregation_mode: SUPPORTED_SQL_CONDITION_AGGREGATION_MODES | None = None,
+            columns: Optional[List[str]] = None
+    ) -> PolarsLazyFrame:
         """Read data from database - must be implemented by subclasses."""
         raise NotImplementedError("Subclasses must implement read_data")
 
+    def scan_data(
+            self,
+            market: str,
+            ticker: str,
+            timeframe: str,
+            start: datetime,
+            end: datetime,
+            comparison_column_name: List[str] | str | None = None,
+            check_level: List[int | float] | int | float | None = None,
+            comparison_operator: List[SUPPORTED_SQL_COMPARISON_OPERATORS] | SUPPORTED_SQL_COMPARISON_OPERATORS | None = None,
+            comparison_aggregation_mode: SUPPORTED_SQL_CONDITION_AGGREGATION_MODES | None = None,
+            columns: Optional[List[str]] = None
+    ) -> PolarsLazyFrame:
+        """Lazy query of read_data - must be implemented by subclasses."""
+        raise NotImplementedError("Subclasses must implement scan_data")
+
     def read_data_year(self,
                        market: str,
                        ticker: str,
@@ -156,18 +443,557 @@ class DatabaseConnector:
         if self._local_files_cache is not None:
             return self._local_files_cache
 
-        local_files = []
-        local_files_name = []
-
-        # list for all data filetypes supported
-        local_files = [file for file in list(self.data_path.rglob(f'*'))
-                       if search(self.data_type + '$', file.suffix)]
-
+        # tables recorded in the catalog, month segments are reported
+        # as the year table they belong to, which may not exist yet
+        # as a single compacted file
+        local_files = self._catalog.table_paths(self.data_type)
         local_files_name = [file.name for file in local_files]
 
         self._local_files_cache = (local_files, local_files_name)
         return self._local_files_cache
 
+    def _list_data_files(self) -> List[PathType]:
+        '''
+        List data files of data_type actually present in data path,
+        month segments included.
+        '''
+
+        return sorted(
+            file for file in self.data_path.rglob(f'*.{self.data_type}')
+            if file.is_file()
+        )
+
+    def _get_table_filepath(self, filepath: PathType) -> PathType:
+
+        # month segment files belong to the year table named as their folder
+        if filepath.parent.name.endswith(MONTH_SEGMENTS_FOLDER_SUFFIX):
+            return filepath.parent.with_suffix(f'.{self.data_type}')
+
+        return filepath
+
+    @contextmanager
+    def pinned_reads(self) -> Iterator[None]:
+        '''
+        Scope of reads pinned to the file versions current at scan time.
+
+        Files scanned in the scope are read from handles opened by the
+        scan, so a version committed meanwhile by rename never mixes
+        with the one being read. Handles are closed when the scope
+        exits: frames scanned in it must be collected before. Scopes
+        are per thread and nest, the outermost one closes the handles.
+        '''
+
+        if getattr(self._read_scope, 'files', None) is not None:
+            yield
+            return
+
+        with ExitStack() as files:
+            self._read_scope.files = files
+            try:
+                yield
+            finally:
+                self._read_scope.files = None
+
+    def _scan_file(self, filepath: PathType) -> PolarsLazyFrame:
+        '''
+        Lazy scan of a data file. In a pinned_reads() scope the scan
+        reads from a file handle closed with the scope, otherwise from
+        the path: the version read is then the one current at collect.
+        CSV columns are cast back to the stored dtypes.
+        '''
+
+        files = getattr(self._read_scope, 'files', None)
+        source = files.enter_context(open(filepath, 'rb')) if files is not None else filepath
+
+        if self.data_type == DATA_TYPE.PARQUET_FILETYPE:
+
+            # compact tick files are decoded to the float schema
+            pipette_size = _parquet_pipette_size(source)
+            if files is not None:
+                source.seek(0)
+
+            return _decode_compact_ticks(read_parquet('polars_lazy', source), pipette_size)
+
+        dataframe = read_csv('polars_lazy', source, try_parse_dates=True)
+
+        items = self._get_items_from_db_key(self._get_table_filepath(filepath).stem)
+        if items[DATA_KEY.TF_INDEX] == TICK_TIMEFRAME:
+            dtypes = POLARS_DTYPE_DICT.TIME_TICK_DTYPE
+        else:
+            dtypes = POLARS_DTYPE_DICT.TIME_TF_DTYPE
+        columns = dataframe.collect_schema().names()
+
+        return dataframe.cast({column: dtype for column, dtype in dtypes.items()
+                               if column in columns})
+
+    def _get_table_files(self, filepath: PathType) -> List[PathType]:
+        '''
+        Data files composing the table stored at filepath.
+        '''
+
+        return [filepath] if filepath.is_file() else []
+
+    def _read_table(self, filepath: PathType) -> Union[PolarsDataFrame, PolarsLazyFrame]:
+
+        return self._scan_file(filepath)
+
+    def _read_table_window(
+        self,
+        filepath: PathType,
+        date: datetime,
+        periods: int,
+        direction: str,
+        anchor: bool
+    ) -> Tuple[Union[PolarsDataFrame, PolarsLazyFrame], int]:
+        '''
+        Slice up to periods rows of a table sorted by timestamp,
+        ending at date (included) if direction is backward or
+        starting at date if forward.
+
+        If anchor is False the table is known to lie entirely before
+        (backward) or after (forward) date and no search is needed.
+        A single parquet file is indexed by the footer statistics of its
+        row groups: only the row group holding date is decoded to search
+        it and only the row groups covering the window are read.
+        Otherwise the timestamp column is read and searched.
+
+        Returns the slice and its rows count.
+        '''
+
+        side = 'right' if direction == 'backward' else 'left'
+        table_files = self._get_table_files(filepath)
+
+        if (
+            self.data_type == DATA_TYPE.PARQUET_FILETYPE and
+            len(table_files) == 1 and
+            table_files[0] == filepath
+        ):
+
+            # footer and row groups read from the same file version,
+            # the row groups are decoded before the file is closed
+            with open(filepath, 'rb') as file:
+
+                parquet_file = ParquetFile(file)
+                index = _parquet_row_groups_index(parquet_file)
+                pipette_size = _parquet_pipette_size(parquet_file.schema_arrow)
+
+                if index is not None:
+
+                    offsets = [0]
+                    for rows, _ in index:
+                        offsets.append(offsets[-1] + rows)
+                    height = offsets[-1]
+
+                    position = height if direction == 'backward' else 0
+                    if anchor:
+                        position = height
+                        for row_group_index, (rows, max_timestamp) in enumerate(index):
+                            if rows == 0:
+                                continue
+                            if (
+                                max_timestamp > date or
+                                (side == 'left' and max_timestamp == date)
+                            ):
+                                timestamps = PolarsDataFrame(parquet_file.read_row_group(
+                                    row_group_index, columns=[COLUMN_NAME.TIMESTAMP]))
+                                position = (offsets[row_group_index] +
+                                            timestamps[COLUMN_NAME.TIMESTAMP].search_sorted(date, side=side))
+                                break
+
+                    start, end = _window_bounds(position, height, periods, direction)
+                    if start == end:
+                        return _decode_compact_ticks(
+                            PolarsDataFrame(schema=parquet_file.schema_arrow), pipette_size), 0
+
+                    # row groups covering [start, end)
+                    row_groups = [
+                        row_group_index for row_group_index in range(len(index))
+                        if offsets[row_group_index] < end and offsets[row_group_index + 1] > start
+                    ]
+                    dataframe = _decode_compact_ticks(
+                        PolarsDataFrame(parquet_file.read_row_groups(row_groups)), pipette_size)
+
+                    return dataframe.slice(start - offsets[row_groups[0]], end - start), end - start
+
+        # generic table: search the timestamp column, the scan is
+        # closed with the pinned_reads() scope of _read_window
+        dataframe = self._read_table(filepath)
+        if isinstance(dataframe, PolarsDataFrame):
+            dataframe = dataframe.lazy()
+
+        if anchor:
+            timestamps = collect_lazyframe(dataframe.select(COLUMN_NAME.TIMESTAMP),
+                                           self.polars_gpu_engine)[COLUMN_NAME.TIMESTAMP]
+            height = len(timestamps)
+            position = timestamps.search_sorted(date, side=side)
+        else:
+            height = collect_lazyframe(dataframe.select(col(COLUMN_NAME.TIMESTAMP).count()),
+                                       self.polars_gpu_engine).item(0, 0)
+            position = height if direction == 'backward' else 0
+
+        start, end = _window_bounds(position, height, periods, direction)
+
+        return dataframe.slice(start, end - start), end - start
+
+    def _read_window(
+        self,
+        filepaths: List[PathType],
+        timeframe: str,
+        date: datetime | str | Timestamp | PolarsDatetime,
+        periods: int,
+        direction: Literal['backward', 'forward'],
+        comparison_column_name: List[str] | str | None = None,
+        check_level: List[int | float] | int | float | None = None,
+        comparison_operator: List[SUPPORTED_SQL_COMPARISON_OPERATORS] | SUPPORTED_SQL_COMPARISON_OPERATORS | None = None,
+        comparison_aggregation_mode: SUPPORTED_SQL_CONDITION_AGGREGATION_MODES | None = None
+    ) -> Union[PolarsDataFrame, PolarsLazyFrame]:
+        '''
+        Read the window of periods rows ending at date (backward)
+        or starting at date (forward) from tables sorted by timestamp,
+        filepaths must be ordered in the direction of the window
+        starting from the table holding date. A table is read only if
+        the ones before it do not fill the window.
+        The comparison conditions are applied to the rows of the window.
+        '''
+
+        if direction not in ('backward', 'forward'):
+            logger.bind(target='localdb').error(
+                f'direction {direction} invalid: required backward or forward')
+            raise ValueError(
+                f'direction {direction} invalid: required backward or forward')
+
+        conditions = compile_conditions_expression(comparison_column_name,
+                                                   check_level,
+                                                   comparison_operator,
+                                                   comparison_aggregation_mode)
+
+        date = any_date_to_datetime64(date, to_pydatetime=True)
+        if date.tzinfo is not None:
+            date = date.replace(tzinfo=None)
+
+        slices = []
+        remaining = periods
+        anchor = True
+        with self.pinned_reads():
+
+            for filepath in filepaths:
+
+                if remaining <= 0:
+                    break
+
+                if not self._get_table_files(filepath):
+                    continue
+
+                dataframe, rows = self._read_table_window(filepath,
+                                                          date,
+                                                          remaining,
+                                                          direction,
+                                                          anchor)
+                slices.append(dataframe.lazy())
+                remaining -= rows
+                anchor = False
+
+            if not slices:
+                logger.bind(target='localdb').critical(
+                    f'No files found for window of {periods} rows {direction} from {date}')
+                raise FileNotFoundError(
+                    f'No files found for window of {periods} rows {direction} from {date}')
+
+            if direction == 'backward':
+                slices.reverse()
+
+            dataframe = concat(slices, how='vertical')
+
+            if conditions is not None:
+
+                dataframe = dataframe.filter(conditions)
+
+            if timeframe == TICK_TIMEFRAME:
+                dtype_dict = POLARS_DTYPE_DICT.TIME_TICK_DTYPE
+            else:
+                dtype_dict = POLARS_DTYPE_DICT.TIME_TF_DTYPE
+
+            columns = dataframe.collect_schema().names()
+            dataframe = dataframe.cast({column: dtype for column, dtype in dtype_dict.items()
+                                        if column in columns})
+
+            # the window is collected before the pinned files are closed
+            dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine)
+
+        if self.engine == 'polars_lazy':
+            return dataframe.lazy()
+
+        return dataframe
+
+    def _file_entry(self,
+                    filepath: PathType,
+                    table_filepath: Optional[PathType] = None) -> Dict[str, Any]:
+        '''
+        Build the catalog entry of a data file: items from the table
+        name, timestamps statistics from the file timestamp column,
+        byte size and content hash.
+        '''
+
+        table_filepath = table_filepath or self._get_table_filepath(filepath)
+        items = self._get_items_from_db_key(table_filepath.stem)
+
+        timestamp = col(COLUMN_NAME.TIMESTAMP)
+        with self.pinned_reads():
+            stats = collect_lazyframe(
+                self._scan_file(filepath).group_by(
+                    timestamp.dt.year().alias('year'),
+                    timestamp.dt.month().alias('month')
+                ).agg(
+                    timestamp.min().alias('min'),
+                    timestamp.max().alias('max'),
+                    timestamp.count().alias('rows')
+                ),
+                self.polars_gpu_engine)
+
+        years_months: Dict[int, List[int]] = {}
+        for year, month in stats.select('year', 'month').iter_rows():
+            years_months.setdefault(int(year), []).append(int(month))
+
+        with open(filepath, 'rb') as file:
+            content_hash = file_digest(file, 'blake2b').hexdigest()
+
+        return {
+            'path': filepath,
+            'table_path': table_filepath,
+            'data_type': self.data_type.lower(),
+            'market': items[DATA_KEY.MARKET],
+            'ticker': items[DATA_KEY.TICKER_INDEX],
+            'timeframe': items[DATA_KEY.TF_INDEX],
+            'year': (int(items[DATA_KEY.YEAR_INDEX])
+                     if len(items) > DATA_KEY.YEAR_INDEX else None),
+            'years_months': years_months,
+            'min_timestamp': stats['min'].min(),
+            'max_timestamp': stats['max'].max(),
+            'row_count': int(stats['rows'].sum()),
+            'byte_size': filepath.stat().st_size,
+            'content_hash': content_hash
+        }
+
+    def _record_files(self,
+                      filepaths: List[PathType],
+                      table_filepath: Optional[PathType] = None,
+                      removed: List[PathType] = ()) -> None:
+        '''
+        Update the catalog with the files just written and the ones
+        removed in a single transaction.
+        '''
+
+        entries = [self._file_entry(filepath, table_filepath)
+                   for filepath in filepaths]
+
+        if self._deferred_records is not None:
+            self._deferred_records[0].extend(entries)
+            self._deferred_records[1].extend(removed)
+            return
+
+        self._catalog.update(entries=entries, removed=removed)
+
+    def defer_records(self) -> None:
+        '''
+        Keep the catalog entries of the files written from now on
+        instead of updating the catalog, see pop_deferred_records().
+        '''
+
+        self._deferred_records = ([], [])
+
+    def pop_deferred_records(self) -> Tuple[List[Dict[str, Any]], List[PathType]]:
+        '''
+        Stop deferring catalog updates and get the entries and
+        the removed paths kept, to be merged by commit_records().
+        '''
+
+        records, self._deferred_records = self._deferred_records, None
+
+        return records
+
+    def commit_records(self,
+                       entries: List[Dict[str, Any]],
+                       removed: List[PathType] = ()) -> None:
+        '''
+        Merge in a single catalog transaction the entries of files
+        written by other connectors, e.g. in worker processes.
+        '''
+
+        self._catalog.update(entries=entries, removed=removed)
+
+        self._local_files_cache = None
+        self._last_timestamp_cache = {}
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        '''
+        Statistics of the partition cache: entries, bytes, hits,
+        misses, evictions and invalidations. Empty if the cache is disabled.
+        '''
+
+        if self._partition_cache is None:
+            return {}
+
+        return self._partition_cache.stats()
+
+    def get_ticker_byte_size(self, ticker: str) -> int:
+        '''
+        Size on disk in bytes of the files of ticker,
+        all timeframes included.
+        '''
+
+        return sum(entry['byte_size']
+                   for entry in self._catalog.entries(self.data_type, ticker))
+
+    def get_aggregation_watermark(self,
+                                  ticker: str,
+                                  timeframe: str) -> Optional[datetime]:
+        '''
+        Last tick timestamp already aggregated into the timeframe
+        data of ticker, None if the timeframe was never rolled up.
+        '''
+
+        return self._catalog.watermark(self.data_type, ticker, timeframe)
+
+    def set_aggregation_watermark(self,
+                                  ticker: str,
+                                  timeframe: str,
+                                  watermark: datetime) -> None:
+
+        self._catalog.set_watermark(self.data_type, ticker, timeframe, watermark)
+
+    def _write_file(self,
+                    dataframe: Union[PolarsDataFrame, PolarsLazyFrame],
+                    filepath: PathType) -> None:
+        '''
+        Write dataframe to filepath with a copy-on-write commit:
+        data is written to a temporary file in the same folder,
+        flushed to disk and renamed over filepath. Readers never
+        lock and always open a complete version of the file.
+        Concurrent writers must be serialized by the caller.
+        With compact_ticks, parquet tick data is written with the
+        compact schema, see _write_compact_ticks().
+        '''
+
+        temp_filepath = filepath.with_name(
+            f'.{filepath.name}.{uuid4().hex}{TEMP_FILE_SUFFIX}')
+
+        try:
+
+            if self.data_type == DATA_TYPE.CSV_FILETYPE:
+
+                write_csv(dataframe, temp_filepath)
+
+            elif self.data_type == DATA_TYPE.PARQUET_FILETYPE:
+
+                if not (
+                    self.compact_ticks and
+                    set(dataframe.collect_schema().names()) == set(DATA_COLUMN_NAMES.TICK_DATA) and
+                    self._write_compact_ticks(dataframe, filepath, temp_filepath)
+                ):
+
+                    write_parquet(dataframe, temp_filepath, self.parquet_writer)
+
+            with open(temp_filepath, 'rb+') as file:
+                fsync(file.fileno())
+
+            _replace_file(temp_filepath, filepath)
+
+        except Exception as e:
+
+            temp_filepath.unlink(missing_ok=True)
+            logger.bind(target='localdb').error(
+                f'commit of {filepath} failed: {e}')
+            raise
+
+        _fsync_directory(filepath.parent)
+
+    def _write_compact_ticks(self,
+                             dataframe: Union[PolarsDataFrame, PolarsLazyFrame],
+                             filepath: PathType,
+                             temp_filepath: PathType) -> bool:
+        '''
+        Write tick data with the compact schema: prices as int32 pipettes,
+        delta encoded as the timestamps.
+        The pipette size of the ticker is recorded in the file metadata.
+
+        Returns False if nothing is written because prices
+        are not quoted in pipettes of the ticker.
+        '''
+
+        items = self._get_items_from_db_key(self._get_table_filepath(filepath).stem)
+        pipette_size = _ticker_pipette_size(items[DATA_KEY.TICKER_INDEX])
+
+        table = _encode_compact_ticks(collect_lazyframe(dataframe, self.polars_gpu_engine),
+                                      pipette_size)
+
+        if table is None:
+
+            logger.bind(target='localdb').warning(
+                f'{filepath.name}: prices not quoted in pipettes of {pipette_size}, '
+                'written with the float schema')
+            return False
+
+        profile = self.parquet_writer or ParquetWriterProfile()
+        if profile.row_group_size is None and profile.row_group_period is None:
+            profile = evolve(profile, row_group_size=COMPACT_TICKS_ROW_GROUP_SIZE)
+
+        # volumes have few distinct values, dictionary encoded
+        write_parquet_table(
+            table,
+            temp_filepath,
+            profile,
+            use_dictionary=([COLUMN_NAME.ASK_VOLUME, COLUMN_NAME.BID_VOLUME]
+                            if profile.dictionary else False),
+            column_encoding={
+                COLUMN_NAME.TIMESTAMP: 'DELTA_BINARY_PACKED',
+                COLUMN_NAME.ASK: 'DELTA_BINARY_PACKED',
+                COLUMN_NAME.BID: 'DELTA_BINARY_PACKED',
+                COLUMN_NAME.VWMP: 'DELTA_BINARY_PACKED'
+            })
+
+        return True
+
+    def _read_max_timestamp(self, filepaths: List[PathType]) -> Optional[datetime]:
+        '''
+        Read the max timestamp of data files from metadata only:
+        parquet footer statistics, or the catalog entry recorded
+        on write for CSV files. The timestamp column is scanned
+        only if metadata is not available.
+        '''
+
+        if self.data_type == DATA_TYPE.PARQUET_FILETYPE:
+            max_values = [_parquet_max_timestamp(filepath) for filepath in filepaths]
+        else:
+            max_values = [self._catalog.max_timestamp(filepaths)]
+
+        if all(value is not None for value in max_values):
+            return max(max_values) if max_values else None
+
+        with self.pinned_reads():
+
+            scans = [self._scan_file(filepath) for filepath in filepaths]
+
+            return collect_lazyframe(
+                concat(scans, how='vertical').select(col(COLUMN_NAME.TIMESTAMP).max()),
+                self.polars_gpu_engine).item(0, 0)
+
+    def rebuild_catalog(self) -> None:
+        '''
+        Rebuild the catalog from the data files present in data path.
+
+        Needed only if data files are added or removed
+        without using the connector methods.
+        '''
+
+        with FileLock(str(self._catalog.filepath) + '.lock'):
+
+            stale = [entry['path'] for entry in self._catalog.entries(self.data_type)]
+            self._catalog.update(
+                entries=[self._file_entry(file) for file in self._list_data_files()],
+                removed=stale)
+
+        self._local_files_cache = None
+
     def _list_tables(self) -> List[str]:
 
         local_files, tables_list = self._list_local_data()
@@ -343,10 +1169,21 @@ class DatabaseConnector:
                 else:
                     serializable[ticker][tf] = {str(y): list(range(1, 13)) for y in yml}
 
+        # written to a temporary file and renamed over the info file,
+        # so that concurrent managers never read or leave a partial file
+        filepath = self._tickers_years_info_filepath
+        temp_filepath = filepath.with_name(
+            f'.{filepath.name}.{uuid4().hex}{TEMP_FILE_SUFFIX}')
+
         try:
-            with open(self._tickers_years_info_filepath, 'w') as f:
+            with open(temp_filepath, 'w') as f:
                 json.dump(serializable, f, indent=2)
+                f.flush()
+                fsync(f.fileno())
+            _replace_file(temp_filepath, filepath)
+            _fsync_directory(filepath.parent)
         except Exception as e:
+            temp_filepath.unlink(missing_ok=True)
             logger.bind(
                 target='localdb').error(
                 f'Error writing ticker years data to {
@@ -413,6 +1250,9 @@ class DatabaseConnector:
         delete only files related to that ticker
         """
 
+        self._local_files_cache = None
+        self._last_timestamp_cache = {}
+
         # create a list of data files
         # with extension matching either one of the supported data types
         data_files = [
@@ -432,9 +1272,27 @@ class DatabaseConnector:
             if isinstance(filter, str):
 
                 if data_files:
+                    removed = []
+                    removed_tables = set()
                     for file in data_files:
-                        if search(filter, file.stem, IGNORECASE):
+                        # month segments are matched by their year table name
+                        if file.parent.name.endswith(MONTH_SEGMENTS_FOLDER_SUFFIX):
+                            file_stem = file.parent.stem
+                        else:
+                            file_stem = file.stem
+
+                        if search(filter, file_stem, IGNORECASE):
                             file.unlink(missing_ok=True)
+                            removed.append(file)
+                            items = self._get_items_from_db_key(file_stem)
+                            removed_tables.add((items[DATA_KEY.TICKER_INDEX],
+                                                items[DATA_KEY.TF_INDEX]))
+
+                    self._catalog.update(removed=removed)
+
+                    # rollups of removed tables have to restart from scratch
+                    for ticker, timeframe in removed_tables:
+                        self._catalog.clear_watermarks(self.data_type, ticker, timeframe)
 
                     # clear just ticker years info in all tickers years info json file
                     self.clear_tickers_years_info(filter=filter)
@@ -452,9 +1310,19 @@ class DatabaseConnector:
             for file in data_files:
                 file.unlink(missing_ok=True)
 
+            self._catalog.clear()
+
             # clear the json file containing tickers years info
             self.clear_tickers_years_info()
 
+        if self._partition_cache is not None:
+            self._partition_cache.clear()
+
+        # remove month segments folders left empty
+        for folder in list(self.data_path.rglob(f'*{MONTH_SEGMENTS_FOLDER_SUFFIX}')):
+            if folder.is_dir() and not any(folder.iterdir()):
+                folder.rmdir()
+
     def load_tickers_years_info(self) -> Dict[str, Dict[str, YearMonthList]]:
         """
         Load ticker years list from a JSON file.
@@ -602,99 +1470,16 @@ class LocalDBConnector(DatabaseConnector):
             ticker: str,
             timeframe: str = TICK_TIMEFRAME) -> List[int]:
 
-        ticker_years_list = []
-        table = ''
-
-        local_files, local_files_name = self._list_local_data()
-
-        files = [
-            key for key in local_files
-            if search(f'{ticker.lower()}',
-                      str(key.stem)) and
-            self._get_items_from_db_key(str(key.stem))[DATA_KEY.TF_INDEX] ==
-            timeframe.lower()
-        ]
+        return list(self._get_ticker_years_months_from_db(ticker, timeframe).keys())
 
-        dataframe = None
+    def _get_ticker_years_months_from_db(
+            self,
+            ticker: str,
+            timeframe: str = TICK_TIMEFRAME) -> Dict[int, List[int]]:
 
-        if len(files) == 1:
-
-            if self.data_type == DATA_TYPE.CSV_FILETYPE:
-
-                dataframe = read_csv(self.engine, files[0])
-
-            elif self.data_type == DATA_TYPE.PARQUET_FILETYPE:
-
-                dataframe = read_parquet(self.engine, files[0])
-
-            try:
-
-                query = f'''SELECT DISTINCT STRFTIME({
-                    COLUMN_NAME.TIMESTAMP}, '%Y')
-                            AS YEAR
-                            FROM self'''
-                read = dataframe.sql(query)
-
-            except Exception as e:
-
-                logger.bind(target='localdb').error(
-                    f'Error querying table {table}: {e}')
-                raise
-
-            else:
-
-                ticker_years_list = [int(row[0]) for row in collect_lazyframe(read, self.polars_gpu_engine).iter_rows()]
-
-        return ticker_years_list
-
-    def _get_ticker_years_months_from_db(
-            self,
-            ticker: str,
-            timeframe: str = TICK_TIMEFRAME) -> Dict[int, List[int]]:
-
-        years_months = {}
-        local_files, local_files_name = self._list_local_data()
-
-        files = [
-            key for key in local_files
-            if search(f'{ticker.lower()}',
-                      str(key.stem)) and
-            self._get_items_from_db_key(str(key.stem))[DATA_KEY.TF_INDEX] ==
-            timeframe.lower()
-        ]
-
-        if len(files) == 1:
-            if not files[0].is_file():
-                return years_months
-            if self.data_type == DATA_TYPE.CSV_FILETYPE:
-                dataframe = read_csv(self.engine, files[0])
-            elif self.data_type == DATA_TYPE.PARQUET_FILETYPE:
-                dataframe = read_parquet(self.engine, files[0])
-
-            try:
-                query = f'''SELECT DISTINCT 
-                                EXTRACT(YEAR FROM {COLUMN_NAME.TIMESTAMP}) AS YEAR,
-                                EXTRACT(MONTH FROM {COLUMN_NAME.TIMESTAMP}) AS MONTH
-                            FROM self'''
-                read = dataframe.sql(query)
-                rows = collect_lazyframe(read, self.polars_gpu_engine).iter_rows()
-                for row in rows:
-                    if row[0] is not None and row[1] is not None:
-                        y, m = int(row[0]), int(row[1])
-                        if y not in years_months:
-                            years_months[y] = []
-                        if m not in years_months[y]:
-                            years_months[y].append(m)
-            except Exception as e:
-                logger.bind(target='localdb').error(
-                    f'Error querying Year/Month from db file: {e}')
-                raise
-
-        # Sort months for each year
-        for y in years_months:
-            years_months[y].sort()
-
-        return years_months
+        # years and months present are recorded in the catalog
+        # when the file is written
+        return self._catalog.years_months(self.data_type, ticker, timeframe)
 
     def write_data(
         self,
@@ -736,7 +1521,8 @@ class LocalDBConnector(DatabaseConnector):
 
                 elif self.data_type == DATA_TYPE.PARQUET_FILETYPE:
 
-                    dataframe_ex = read_parquet(self.engine, filepath)
+                    dataframe_ex = _decode_compact_ticks(read_parquet(self.engine, filepath),
+                                                         _parquet_pipette_size(filepath))
 
                 dataframe = concat_data([dataframe, dataframe_ex])
                 # clean duplicated timestamps rows, keep first by default
@@ -746,15 +1532,11 @@ class LocalDBConnector(DatabaseConnector):
                     keep='first').sort(
                     COLUMN_NAME.TIMESTAMP)
 
-            if self.data_type == DATA_TYPE.CSV_FILETYPE:
-
-                write_csv(dataframe, filepath)
+            self._write_file(dataframe, filepath)
 
-            elif self.data_type == DATA_TYPE.PARQUET_FILETYPE:
-
-                write_parquet(dataframe, filepath)
+            self._record_files([filepath])
 
-    def read_data(self,
+    def scan_data(self,
                   market: str,
                   ticker: str,
                   timeframe: str,
@@ -763,70 +1545,26 @@ class LocalDBConnector(DatabaseConnector):
                   comparison_column_name: List[str] | str | None = None,
                   check_level: List[int | float] | int | float | None = None,
                   comparison_operator: List[SUPPORTED_SQL_COMPARISON_OPERATORS] | SUPPORTED_SQL_COMPARISON_OPERATORS | None = None,
-                  comparison_aggregation_mode: SUPPORTED_SQL_CONDITION_AGGREGATION_MODES | None = None
+                  comparison_aggregation_mode: SUPPORTED_SQL_CONDITION_AGGREGATION_MODES | None = None,
+                  columns: List[str] | None = None
                   ) -> PolarsLazyFrame:
+        '''
+        Lazy query of read_data: no data is read until collected, so that
+        queries of several tickers can be collected together.
+        '''
 
-        comparisons_len = 0
-
-        # Validate and normalize condition parameters if provided
-        if comparison_column_name is not None or check_level is not None or comparison_operator is not None:
-            comparisons_len = len(comparison_column_name)
-
-            if isinstance(comparison_column_name, str):
-                comparison_column_name = [comparison_column_name]
-
-            if isinstance(check_level, (int, float)):
-                check_level = [check_level]
-
-            if isinstance(comparison_operator, str):
-                comparison_operator = [comparison_operator]
-
-            if any([col not in list(SUPPORTED_COLUMN_NAME.__args__)
-                   for col in comparison_column_name]):
-                logger.bind(
-                    target='localdb').error(
-                    f'comparison_column_name must be a supported column name: {
-                        list(
-                            SUPPORTED_COLUMN_NAME.__args__)}')
-                raise ValueError(
-                    'comparison_column_name must be a supported column name')
-
-            if any([cond not in list(SUPPORTED_SQL_COMPARISON_OPERATORS.__args__)
-                   for cond in comparison_operator]):
-                logger.bind(
-                    target='localdb').error(
-                    f'comparison_operator must be a supported SQL comparison operator: {
-                        list(
-                            SUPPORTED_SQL_COMPARISON_OPERATORS.__args__)}')
-                raise ValueError(
-                    'comparison_operator must be a supported SQL comparison operator')
-
-            if (
-                (
-                    comparison_aggregation_mode is not None and
-                    comparisons_len > 1
-                ) and
-                comparison_aggregation_mode not in list(
-                    SUPPORTED_SQL_CONDITION_AGGREGATION_MODES.__args__)
-            ):
-                logger.bind(
-                    target='localdb').error(
-                    f'comparison_aggregation_mode must be a supported SQL condition aggregation mode: {
-                        list(
-                            SUPPORTED_SQL_CONDITION_AGGREGATION_MODES.__args__)}')
-                raise ValueError(
-                    'comparison_aggregation_mode must be a supported SQL condition aggregation mode')
-
-            if len(comparison_column_name) != len(check_level) or len(
-                    comparison_column_name) != len(comparison_operator):
-                logger.bind(target='localdb').error(
-                    'comparison_column_name, check_level and comparison_operator must have the same length')
-                raise ValueError(
-                    'comparison_column_name, check_level and comparison_operator must have the same length')
+        # conditions compiled to a polars expression evaluated by the scan
+        conditions = compile_conditions_expression(comparison_column_name,
+                                                   check_level,
+                                                   comparison_operator,
+                                                   comparison_aggregation_mode)
 
-            comparisons_len = len(comparison_column_name)
+        if self.engine not in ('polars', 'polars_lazy'):
 
-        dataframe = PolarsLazyFrame()
+            logger.bind(target='localdb').error(
+                f'Engine {self.engine} or data type {self.data_type} not supported')
+            raise ValueError(
+                f'Engine {self.engine} or data type {self.data_type} not supported')
 
         filename = self._get_filename(market,
                                       ticker,
@@ -837,114 +1575,98 @@ class LocalDBConnector(DatabaseConnector):
                     ticker /
                     filename)
 
-        if self.engine == 'polars':
+        if not (
+            filepath.exists() and
+            filepath.is_file()
+        ):
 
-            dataframe = PolarsDataFrame()
+            logger.bind(target='localdb').critical(f'file {filepath} not found')
+            raise FileNotFoundError(f"file {filepath} not found")
 
-        elif self.engine == 'polars_lazy':
+        # Read through a lazy scan so that the timestamp range and the
+        # comparison conditions are pushed down to the file reader: parquet
+        # row groups whose statistics fall outside the filter are skipped and
+        # only the requested columns are decoded.
+        # No lock needed: the scan is pinned to the current file version.
+        dataframe = self._scan_file(filepath)
+
+        predicate = (
+            (col(COLUMN_NAME.TIMESTAMP) >= start)
+            &
+            (col(COLUMN_NAME.TIMESTAMP) <= end)
+        )
 
-            dataframe = PolarsLazyFrame()
+        if conditions is not None:
 
-        else:
+            predicate = predicate & conditions
 
-            logger.bind(target='localdb').error(
-                f'Engine {self.engine} or data type {self.data_type} not supported')
-            raise ValueError(
-                f'Engine {self.engine} or data type {self.data_type} not supported')
+        dataframe = dataframe.filter(predicate)
 
-        if (
-            filepath.exists() and
-            filepath.is_file()
-        ):
-            # Per-file lock ensures we don't read while write_data is writing.
-            # IMPORTANT: for polars lazy engine, read_parquet() only creates a
-            # *scan plan* — the actual file I/O happens at .collect() time,
-            # which would be AFTER the lock is released. To close this race
-            # window we eagerly .collect() inside the lock and re-wrap as
-            # .lazy() so all downstream SQL / cast / collect calls work on
-            # an in-memory frame rather than a deferred file scan.
-            file_lock_path = str(filepath) + '.lock'
-            with FileLock(file_lock_path):
-                if self.data_type == DATA_TYPE.CSV_FILETYPE:
+        if columns:
 
-                    dataframe = read_csv(self.engine, filepath)
-                    # Eagerly materialise inside the lock (see comment above)
-                    if hasattr(dataframe, 'collect'):
-                        dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine).lazy()
+            dataframe = dataframe.select(
+                list_remove_duplicates([COLUMN_NAME.TIMESTAMP] + list(columns)))
 
-                elif self.data_type == DATA_TYPE.PARQUET_FILETYPE:
+        if timeframe == TICK_TIMEFRAME:
 
-                    dataframe = read_parquet(self.engine, filepath)
-                    # Eagerly materialise inside the lock (see comment above)
-                    if hasattr(dataframe, 'collect'):
-                        dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine).lazy()
+            dtype_dict = POLARS_DTYPE_DICT.TIME_TICK_DTYPE
 
-            try:
+        else:
 
-                start_str = start.isoformat()
-                end_str = end.isoformat()
-
-                # Build base query with timestamp filter
-                query = f'''SELECT * FROM self
-                        WHERE
-                        {COLUMN_NAME.TIMESTAMP} >= '{start_str}'
-                        AND
-                        {COLUMN_NAME.TIMESTAMP} <= '{end_str}'
-                        '''
-                # Aggregate conditional filters if provided
-                # with the aggregation mode specified
-                if comparisons_len > 0:
-
-                    if comparisons_len == 1:
-                        # only one condition
-                        query += f'''AND
-                                 {comparison_column_name[0]} {comparison_operator[0]} {check_level[0]}
-                                 '''
-                    else:
-                        # multiple conditions
-                        # wrap all conditions in parentheses with aggregation mode
-                        # between them
-                        query += f'''AND
-                                 ({comparison_column_name[0]} {comparison_operator[0]} {check_level[0]}
-                                 '''
-                        for col, level, cond, index in zip(
-                                comparison_column_name[1:], check_level[1:], comparison_operator[1:], range(1, comparisons_len)):
-
-                            if index == comparisons_len - 1:
-                                # closing conditions needs closing bracket
-                                query += f'''{comparison_aggregation_mode}
-                                    {col} {cond} {level})
-                                    '''
-                            else:
-                                # intermediate conditions
-                                query += f'''{comparison_aggregation_mode}
-                                    {col} {cond} {level}
-                                    '''
-                # Close query with timestamp ordering
-                query += f'ORDER BY {COLUMN_NAME.TIMESTAMP}'
-                dataframe = dataframe.sql(query)
+            dtype_dict = POLARS_DTYPE_DICT.TIME_TF_DTYPE
 
-            except Exception as e:
+        # final cast to standard dtypes
+        schema_columns = dataframe.collect_schema().names()
+        dataframe = dataframe.cast({column: dtype for column, dtype in dtype_dict.items()
+                                    if column in schema_columns})
 
-                logger.bind(target='localdb').error(
-                    f'executing query {query} failed: {e}')
+        return dataframe.sort(COLUMN_NAME.TIMESTAMP)
 
-            else:
+    def read_data(self,
+                  market: str,
+                  ticker: str,
+                  timeframe: str,
+                  start: datetime,
+                  end: datetime,
+                  comparison_column_name: List[str] | str | None = None,
+                  check_level: List[int | float] | int | float | None = None,
+                  comparison_operator: List[SUPPORTED_SQL_COMPARISON_OPERATORS] | SUPPORTED_SQL_COMPARISON_OPERATORS | None = None,
+                  comparison_aggregation_mode: SUPPORTED_SQL_CONDITION_AGGREGATION_MODES | None = None,
+                  columns: List[str] | None = None
+                  ) -> PolarsLazyFrame:
+        '''
+        Read data between start and end (included), optionally filtered by
+        comparison conditions and restricted to columns (timestamp is
+        always included).
+        '''
 
-                if timeframe == TICK_TIMEFRAME:
+        # only the filtered rows are materialized
+        try:
 
-                    # final cast to standard dtypes
-                    dataframe = dataframe.cast(POLARS_DTYPE_DICT.TIME_TICK_DTYPE)
+            with self.pinned_reads():
 
-                else:
+                dataframe = self.scan_data(market,
+                                           ticker,
+                                           timeframe,
+                                           start,
+                                           end,
+                                           comparison_column_name,
+                                           check_level,
+                                           comparison_operator,
+                                           comparison_aggregation_mode,
+                                           columns)
 
-                    # final cast to standard dtypes
-                    dataframe = dataframe.cast(POLARS_DTYPE_DICT.TIME_TF_DTYPE)
+                dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine)
 
-        else:
+        except Exception as e:
 
-            logger.bind(target='localdb').critical(f'file {filepath} not found')
-            raise FileNotFoundError(f"file {filepath} not found")
+            logger.bind(target='localdb').error(
+                f'reading {market} {ticker} {timeframe} failed: {e}')
+            raise
+
+        if self.engine == 'polars_lazy':
+
+            dataframe = dataframe.lazy()
 
         return dataframe
 
@@ -954,7 +1676,7 @@ class LocalDBConnector(DatabaseConnector):
                        timeframe: str,
                        years: int | List[int]) -> PolarsLazyFrame:
         """
-        Read data for specific year(s) using SQL YEAR() filter.
+        Read data for specific year(s) filtered by timestamp year.
         """
         if isinstance(years, int):
             years_list = [years]
@@ -968,33 +1690,23 @@ class LocalDBConnector(DatabaseConnector):
             logger.bind(target='localdb').critical(f'File not found: {filepath}')
             raise FileNotFoundError(f"File not found: {filepath}")
 
-        # Per-file lock ensures we don't read while write_data is writing.
-        file_lock_path = str(filepath) + '.lock'
-        with FileLock(file_lock_path):
-            if self.data_type == DATA_TYPE.CSV_FILETYPE:
-                dataframe = read_csv(self.engine, filepath)
-                if hasattr(dataframe, 'collect'):
-                    dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine).lazy()
-            elif self.data_type == DATA_TYPE.PARQUET_FILETYPE:
-                dataframe = read_parquet(self.engine, filepath)
-                if hasattr(dataframe, 'collect'):
-                    dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine).lazy()
-
-        # Apply year filter via SQL
-        year_filter_str = ", ".join([str(y) for y in years_list])
-        query = f'''SELECT * FROM self
-                WHERE
-                EXTRACT(YEAR FROM {COLUMN_NAME.TIMESTAMP}) IN ({year_filter_str})
-                ORDER BY {COLUMN_NAME.TIMESTAMP}
-                '''
-
+        # Snapshot of the file version current at read time,
+        # no lock needed since writers commit by atomic rename.
+        # The year filter is evaluated by the scan.
         try:
-            dataframe = dataframe.sql(query)
+            with self.pinned_reads():
+                dataframe = self._scan_file(filepath).filter(
+                    col(COLUMN_NAME.TIMESTAMP).dt.year().is_in(years_list)
+                ).sort(COLUMN_NAME.TIMESTAMP)
+                dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine)
         except Exception as e:
             logger.bind(target='localdb').error(
-                f'executing query {query} failed: {e}')
+                f'reading {filepath} failed: {e}')
             raise
 
+        if self.engine == 'polars_lazy':
+            dataframe = dataframe.lazy()
+
         # Cast types
         if timeframe == TICK_TIMEFRAME:
             dataframe = dataframe.cast(POLARS_DTYPE_DICT.TIME_TICK_DTYPE)
@@ -1019,25 +1731,9 @@ class LocalDBConnector(DatabaseConnector):
         Read window of data specified by input requirements:
         the data window has timespan in order to return a dataframe
         with rows size equal to periods.
-        Query the local db to calculate the start date of the window
-        if direction is forward, or end date if backward.
+        The window is located by a binary search of date over the
+        timestamp column and sliced in a single pass over the file.
         """
-        if direction == 'backward':
-            end_date = date
-            start_date = estimate_start_date_to_business_days(
-                end_date,
-                timeframe,
-                periods,
-                holidays=FOREX_HOLIDAYS
-            )
-        elif direction == 'forward':
-            start_date = date
-            end_date = estimate_end_date_to_business_days(
-                start_date,
-                timeframe,
-                periods,
-                holidays=FOREX_HOLIDAYS
-            )
 
         filename = self._get_filename(market, ticker, timeframe)
         filepath = (self.data_path / market / ticker / filename)
@@ -1046,60 +1742,18 @@ class LocalDBConnector(DatabaseConnector):
             logger.bind(target='localdb').critical(f'file {filepath} not found')
             raise FileNotFoundError(f"file {filepath} not found")
 
-        # Per-file lock ensures we don't read while write_data is writing.
-        file_lock_path = str(filepath) + '.lock'
-        with FileLock(file_lock_path):
-            if self.data_type == DATA_TYPE.CSV_FILETYPE:
-                dataframe = read_csv(self.engine, filepath)
-                if hasattr(dataframe, 'collect'):
-                    dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine).lazy()
-            elif self.data_type == DATA_TYPE.PARQUET_FILETYPE:
-                dataframe = read_parquet(self.engine, filepath)
-                if hasattr(dataframe, 'collect'):
-                    dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine).lazy()
-
-        if direction == 'backward':
-            query = f'''SELECT MIN({COLUMN_NAME.TIMESTAMP}) AS start_time,
-                        MAX({COLUMN_NAME.TIMESTAMP}) AS end_time
-                        FROM (
-                            SELECT {COLUMN_NAME.TIMESTAMP} FROM self
-                            WHERE {COLUMN_NAME.TIMESTAMP} <= '{end_date}'
-                            ORDER BY {COLUMN_NAME.TIMESTAMP} DESC
-                            LIMIT {periods}
-                        ) AS sub
-                        '''
-        elif direction == 'forward':
-            query = f'''SELECT MIN({COLUMN_NAME.TIMESTAMP}) AS start_time,
-                        MAX({COLUMN_NAME.TIMESTAMP}) AS end_time
-                        FROM (
-                            SELECT {COLUMN_NAME.TIMESTAMP} FROM self
-                            WHERE {COLUMN_NAME.TIMESTAMP} >= '{start_date}'
-                            ORDER BY {COLUMN_NAME.TIMESTAMP} ASC
-                            LIMIT {periods}
-                        ) AS sub
-                        '''
-
-        try:
-            window_dates = dataframe.sql(query)
-            if isinstance(window_dates, PolarsLazyFrame):
-                window_dates = collect_lazyframe(window_dates, self.polars_gpu_engine)
-        except Exception as e:
-            logger.bind(target='localdb').error(f'executing query {query} failed: {e}')
-            return PolarsLazyFrame([])
-        else:
-            start_date_from_db = window_dates.item(0, 0)
-            end_date_from_db = window_dates.item(0, 1)
-
-        return self.read_data(
-            market,
-            ticker,
+        # Snapshot of the file version current at read time,
+        # no lock needed since writers commit by atomic rename.
+        return self._read_window(
+            [filepath],
             timeframe,
-            start_date_from_db,
-            end_date_from_db,
+            date,
+            periods,
+            direction,
             comparison_column_name,
             check_level,
             comparison_operator,
-            comparison_aggregation_mode,
+            comparison_aggregation_mode
         )
 
     def read_last_timestamp(
@@ -1145,31 +1799,8 @@ class LocalDBConnector(DatabaseConnector):
             logger.bind(target='localdb').critical(f'file {filepath} not found')
             raise FileNotFoundError(f"file {filepath} not found")
 
-        # Per-file lock ensures we don't read while write_data is writing.
-        file_lock_path = str(filepath) + '.lock'
-        with FileLock(file_lock_path):
-            if self.data_type == DATA_TYPE.CSV_FILETYPE:
-                dataframe = read_csv(self.engine, filepath)
-                if hasattr(dataframe, 'collect'):
-                    dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine).lazy()
-            elif self.data_type == DATA_TYPE.PARQUET_FILETYPE:
-                dataframe = read_parquet(self.engine, filepath)
-                if hasattr(dataframe, 'collect'):
-                    dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine).lazy()
-
-        query = f'''SELECT MAX({COLUMN_NAME.TIMESTAMP}) AS end_time
-                    FROM self
-                    '''
-
-        try:
-            window_dates = dataframe.sql(query)
-            if isinstance(window_dates, PolarsLazyFrame):
-                window_dates = collect_lazyframe(window_dates, self.polars_gpu_engine)
-        except Exception as e:
-            logger.bind(target='localdb').error(f'executing query {query} failed: {e}')
-            raise
-        else:
-            end_date_from_db = window_dates.item(0, 0)
+        # footer of the file version current at read time, no lock needed
+        end_date_from_db = self._read_max_timestamp([filepath])
 
         if self._last_timestamp_cache is not None:
             self._last_timestamp_cache[cache_key] = end_date_from_db
@@ -1179,6 +1810,18 @@ class LocalDBConnector(DatabaseConnector):
 @define(kw_only=True, slots=True)
 class LocalDBYearConnector(DatabaseConnector):
 
+    # store year files as month segments: a write replaces only the
+    # months it touches, reads merge year file and segments
+    month_segments: bool = field(default=False,
+                                 validator=validators.instance_of(bool))
+    # byte budget of the in-memory cache of decoded year tables,
+    # 0 disables the cache
+    cache_max_bytes: int = field(default=0,
+                                 validator=[validators.instance_of(int),
+                                            validators.ge(0)])
+
+    _compaction_thread: Any = field(default=None, init=False)
+
     def __init__(self, **kwargs: Any) -> None:
 
         _class_attributes_name = get_attrs_names(self, **kwargs)
@@ -1230,6 +1873,9 @@ class LocalDBYearConnector(DatabaseConnector):
         self.data_path = Path(self.data_path)
         self._tickers_years_info_filepath = self.data_path / 'tickers_years_info.json'
 
+        if self.cache_max_bytes > 0:
+            self._partition_cache = LocalDBPartitionCache(max_bytes=self.cache_max_bytes)
+
     def _db_key(self,
                 market: str,
                 ticker: str,
@@ -1271,69 +1917,366 @@ class LocalDBYearConnector(DatabaseConnector):
             tf=tf.lower(),
             file_ext=self.data_type.lower())
 
-    def _get_ticker_years_list_from_db(
-            self,
-            ticker: str,
-            timeframe: str = TICK_TIMEFRAME) -> List[int]:
+    def _get_segments_path(self, filepath: Path) -> Path:
 
-        years_list = []
-        local_files, local_files_name = self._list_local_data()
+        return filepath.with_suffix(MONTH_SEGMENTS_FOLDER_SUFFIX)
 
-        files = [
-            key for key in local_files
-            if search(f'{ticker.lower()}',
-                      str(key.stem)) and
-            len(self._get_items_from_db_key(str(key.stem))) > DATA_KEY.YEAR_INDEX and
-            self._get_items_from_db_key(str(key.stem))[DATA_KEY.TF_INDEX] ==
-            timeframe.lower()
-        ]
+    def _get_month_segments(self, filepath: Path) -> Dict[int, Path]:
+        '''
+        Get the month segments of a year file as a dict
+        month number -> segment filepath, sorted by month.
+        '''
 
-        # read year info from file name
-        years_list = [int(self._get_items_from_db_key(str(key.stem))[DATA_KEY.YEAR_INDEX]) for key in files]
-        years_list = sorted(list(set(years_list)))
+        segments_path = self._get_segments_path(filepath)
 
-        return years_list
+        if not segments_path.is_dir():
+            return {}
 
-    def _get_ticker_years_months_from_db(
-            self,
-            ticker: str,
-            timeframe: str = TICK_TIMEFRAME) -> Dict[int, List[int]]:
+        segments = {}
+        for file in segments_path.glob(f'*.{self.data_type}'):
+            if file.stem.isdigit():
+                segments[int(file.stem)] = file
 
-        years_months = {}
-        local_files, local_files_name = self._list_local_data()
+        return dict(sorted(segments.items()))
 
-        files = [
-            key for key in local_files
-            if search(f'{ticker.lower()}',
-                      str(key.stem)) and
-            len(self._get_items_from_db_key(str(key.stem))) > DATA_KEY.YEAR_INDEX and
-            self._get_items_from_db_key(str(key.stem))[DATA_KEY.TF_INDEX] ==
-            timeframe.lower()
-        ]
+    def _read_file(self, filepath: Path) -> Union[PolarsDataFrame, PolarsLazyFrame]:
+
+        if self.engine == 'polars_lazy':
+
+            return self._scan_file(filepath)
+
+        with self.pinned_reads():
+
+            return collect_lazyframe(self._scan_file(filepath), self.polars_gpu_engine)
+
+    def _get_table_files(self, filepath: Path) -> List[Path]:
+
+        segments = list(self._get_month_segments(filepath).values())
+
+        return segments + [filepath] if filepath.is_file() else segments
+
+    def _read_table(self, filepath: Path) -> Union[PolarsDataFrame, PolarsLazyFrame]:
+
+        return self._read_year_table(filepath, lazy=True)
+
+    def _read_year_table(
+        self,
+        filepath: Path,
+        lazy: bool = False
+    ) -> Union[PolarsDataFrame, PolarsLazyFrame, None]:
+        '''
+        Read a year table merging the year file with its month segments:
+        a month stored as segment replaces the same month in the year file.
+        Months are concatenated in order so no sort is needed on the result.
+        If lazy the files are returned as scans whatever the engine.
+        With the partition cache enabled the table is served from memory.
+
+        Returns None if neither the year file nor any segment exists.
+        '''
+
+        if self._partition_cache is not None:
+            read_table = self._read_cached_year_table
+        else:
+            read_table = self._merge_year_table
+
+        try:
+
+            return read_table(filepath, lazy)
+
+        except FileNotFoundError:
+
+            # segments folded into the year file by a concurrent
+            # compaction between listing and opening them
+            return read_table(filepath, lazy)
+
+    def _partition_key(self, filepath: Path) -> Tuple[str, str, int]:
+
+        # (ticker, timeframe, year) of a year file path
+        return (filepath.parent.parent.name,
+                filepath.parent.name,
+                int(filepath.stem.rsplit('_', 1)[-1]))
+
+    def _read_cached_year_table(
+        self,
+        filepath: Path,
+        lazy: bool = False
+    ) -> Union[PolarsDataFrame, PolarsLazyFrame, None]:
+        '''
+        Read a year table through the partition cache. The cached
+        table is valid as long as the files composing the year table
+        are the same, tracked by their inode, mtime and size.
+        '''
+
+        table_files = self._get_table_files(filepath)
+        if not table_files:
+            return None
+
+        version = tuple(
+            (file.name, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            for file, stat in ((file, file.stat()) for file in table_files)
+        )
+        key = self._partition_key(filepath)
+
+        table = self._partition_cache.get(key, version)
+
+        if table is not None:
+
+            dataframe = from_arrow(table)
+
+        else:
+
+            with self.pinned_reads():
+
+                dataframe = self._merge_year_table(filepath, lazy=True)
+                if dataframe is None:
+                    return None
+
+                dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine)
+            self._partition_cache.put(key, version, dataframe.to_arrow())
+
+        if lazy or self.engine == 'polars_lazy':
+            return dataframe.lazy()
+
+        return dataframe
+
+    def _record_files(self,
+                      filepaths: List[Path],
+                      table_filepath: Optional[Path] = None,
+                      removed: List[Path] = ()) -> None:
+
+        super()._record_files(filepaths, table_filepath, removed)
+
+        # drop the cached year tables the files belong to
+        if self._partition_cache is not None:
+            for filepath in filepaths:
+                ticker, timeframe, year = self._partition_key(
+                    table_filepath or self._get_table_filepath(filepath))
+                self._partition_cache.invalidate(ticker=ticker,
+                                                 timeframe=timeframe,
+                                                 year=year)
+
+    def commit_records(self,
+                       entries: List[Dict[str, Any]],
+                       removed: List[Path] = ()) -> None:
+
+        super().commit_records(entries, removed)
+
+        # drop the cached year tables the files belong to
+        if self._partition_cache is not None:
+            for entry in entries:
+                ticker, timeframe, year = self._partition_key(entry['table_path'])
+                self._partition_cache.invalidate(ticker=ticker,
+                                                 timeframe=timeframe,
+                                                 year=year)
+
+    def _merge_year_table(
+        self,
+        filepath: Path,
+        lazy: bool = False
+    ) -> Union[PolarsDataFrame, PolarsLazyFrame, None]:
+
+        read_file = self._scan_file if lazy else self._read_file
+        segments = self._get_month_segments(filepath)
+        year_data = read_file(filepath) if filepath.is_file() else None
+
+        if not segments:
+            return year_data
+
+        frames = []
+        year_months = []
+        for month in range(1, 13):
 
-        for file in files:
-            if not file.is_file():
+            if month in segments:
+
+                if year_months and year_data is not None:
+                    frames.append(year_data.filter(
+                        col(COLUMN_NAME.TIMESTAMP).dt.month().is_in(year_months)))
+
+                year_months = []
+                frames.append(read_file(segments[month]))
+
+            else:
+
+                year_months.append(month)
+
+        if year_months and year_data is not None:
+            frames.append(year_data.filter(
+                col(COLUMN_NAME.TIMESTAMP).dt.month().is_in(year_months)))
+
+        return concat(frames, how='vertical')
+
+    def _write_month_segments(
+        self,
+        filepath: Path,
+        dataframe: Union[PolarsDataFrame, PolarsLazyFrame]
+    ) -> None:
+        '''
+        Merge new data into the month segments of a year file.
+        Only the months present in dataframe are read and rewritten,
+        the caller must hold the year file lock.
+        '''
+
+        if isinstance(dataframe, PolarsLazyFrame):
+            dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine)
+
+        segments = self._get_month_segments(filepath)
+        segments_path = self._get_segments_path(filepath)
+        segments_path.mkdir(parents=True, exist_ok=True)
+
+        year_data = self._read_file(filepath) if filepath.is_file() else None
+
+        written = []
+        month_column = '__month'
+        months_data = dataframe.with_columns(
+            col(COLUMN_NAME.TIMESTAMP).dt.month().alias(month_column)
+        ).partition_by(month_column, as_dict=True, include_key=False)
+
+        for key, month_data in months_data.items():
+
+            month = int(key[0] if isinstance(key, tuple) else key)
+
+            # existing month data: the segment if already present,
+            # otherwise the month slice of the year file
+            if month in segments:
+                dataframe_ex = self._read_file(segments[month])
+            elif year_data is not None:
+                dataframe_ex = year_data.filter(
+                    col(COLUMN_NAME.TIMESTAMP).dt.month() == month)
+            else:
+                dataframe_ex = None
+
+            if dataframe_ex is not None:
+
+                if isinstance(dataframe_ex, PolarsLazyFrame):
+                    dataframe_ex = collect_lazyframe(dataframe_ex, self.polars_gpu_engine)
+
+                # clean duplicated timestamps rows, keep first by default
+                month_data = concat_data([month_data, dataframe_ex]).unique(
+                    subset=[COLUMN_NAME.TIMESTAMP],
+                    keep='first')
+
+            segment_filepath = segments_path / MONTH_SEGMENT_FILENAME_STR.format(
+                month=month,
+                file_ext=self.data_type.lower())
+
+            self._write_file(month_data.sort(COLUMN_NAME.TIMESTAMP), segment_filepath)
+            written.append(segment_filepath)
+
+        self._record_files(written, table_filepath=filepath)
+
+    def _compact_year_table(self, filepath: Path) -> bool:
+        '''
+        Fold the month segments of a year table into the single year file.
+        The caller must hold the year file lock.
+        '''
+
+        segments_path = self._get_segments_path(filepath)
+        segments = list(self._get_month_segments(filepath).values())
+
+        # segments may have been folded by another writer meanwhile
+        if not segments:
+            rmtree(segments_path, ignore_errors=True)
+            return False
+
+        dataframe = self._read_year_table(filepath)
+
+        # materialize before overwriting the year file the scan points to
+        if isinstance(dataframe, PolarsLazyFrame):
+            dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine)
+
+        self._write_file(dataframe, filepath)
+        rmtree(segments_path, ignore_errors=True)
+
+        self._record_files([filepath], removed=segments)
+
+        return True
+
+    def compact_month_segments(self,
+                               filter: Optional[str] = None,
+                               background: bool = False) -> Optional[Thread]:
+        '''
+        Fold month segments back into single year files.
+
+        Parameters
+        ----------
+        filter : Optional[str], optional
+            Compact only year tables whose name matches filter
+            (e.g. a ticker), by default all tables are compacted
+        background : bool, optional
+            Run compaction in a daemon thread and return it,
+            by default False
+
+        Returns
+        -------
+        Optional[Thread]
+            The compaction thread if background is True, otherwise None
+        '''
+
+        if background:
+
+            if (
+                self._compaction_thread is not None and
+                self._compaction_thread.is_alive()
+            ):
+                return self._compaction_thread
+
+            self._compaction_thread = Thread(target=self.compact_month_segments,
+                                             kwargs={'filter': filter},
+                                             name='localdb-compaction',
+                                             daemon=True)
+            self._compaction_thread.start()
+
+            return self._compaction_thread
+
+        # year tables having month segments recorded in the catalog
+        segmented_tables = sorted({
+            entry['table_path'] for entry in self._catalog.entries(self.data_type)
+            if entry['path'] != entry['table_path']
+        })
+
+        for filepath in segmented_tables:
+
+            if filter and not search(filter, filepath.stem, IGNORECASE):
                 continue
-            year_val = int(self._get_items_from_db_key(str(file.stem))[DATA_KEY.YEAR_INDEX])
-            if self.data_type == DATA_TYPE.CSV_FILETYPE:
-                dataframe = read_csv(self.engine, file)
-            elif self.data_type == DATA_TYPE.PARQUET_FILETYPE:
-                dataframe = read_parquet(self.engine, file)
 
             try:
-                query = f'''SELECT DISTINCT 
-                                EXTRACT(MONTH FROM {COLUMN_NAME.TIMESTAMP}) AS MONTH
-                            FROM self'''
-                read = dataframe.sql(query)
-                months = [int(row[0]) for row in collect_lazyframe(read, self.polars_gpu_engine).iter_rows() if row[0] is not None]
-                if months:
-                    years_months[year_val] = sorted(list(set(months)))
+
+                with FileLock(str(filepath) + '.lock'):
+                    if self._compact_year_table(filepath):
+                        logger.bind(target='localdb').trace(
+                            f'compacted month segments into {filepath}')
+
             except Exception as e:
+
                 logger.bind(target='localdb').error(
-                    f'Error querying Month from year {year_val} file: {e}')
+                    f'compaction of {filepath} failed: {e}')
                 raise
 
-        return years_months
+        self._local_files_cache = None
+
+        return None
+
+    def _get_ticker_years_list_from_db(
+            self,
+            ticker: str,
+            timeframe: str = TICK_TIMEFRAME) -> List[int]:
+
+        # year info from the catalog entries of the year files
+        return sorted({
+            entry['year'] for entry in self._catalog.entries(self.data_type,
+                                                             ticker,
+                                                             timeframe)
+            if entry['year'] is not None
+        })
+
+    def _get_ticker_years_months_from_db(
+            self,
+            ticker: str,
+            timeframe: str = TICK_TIMEFRAME) -> Dict[int, List[int]]:
+
+        # months present are recorded in the catalog for the year file
+        # and each of its month segments
+        return self._catalog.years_months(self.data_type, ticker, timeframe)
 
     def write_data(
         self,
@@ -1347,6 +2290,8 @@ class LocalDBYearConnector(DatabaseConnector):
         Thus the target_table must be composed by 4 items (market, ticker, timeframe and year).
         In this object performance is prioritized, the method writes a single year data but sanity check that it is a year
         must be done by the caller. This to avoid other calls especially to polars collect() calls.
+        If month_segments is enabled, only the months present in dataframe are merged and
+        rewritten as month segments of the year file, see compact_month_segments().
 
         Parameters
         ----------
@@ -1375,26 +2320,29 @@ class LocalDBYearConnector(DatabaseConnector):
 
         # Per-file lock prevents concurrent processes from corrupting the
         # parquet file by interleaving a read-existing + write sequence.
+        # The same lock covers the month segments of the year file.
         file_lock_path = str(filepath) + '.lock'
         with FileLock(file_lock_path):
-            if (
-                not filepath.exists()
-                or
-                not filepath.is_file()
-            ):
 
-                filepath.parent.mkdir(parents=True,
-                                      exist_ok=True)
+            filepath.parent.mkdir(parents=True,
+                                  exist_ok=True)
 
-            else:
+            if self.month_segments:
 
-                if self.data_type == DATA_TYPE.CSV_FILETYPE:
+                # rewrite only the months touched by dataframe
+                self._write_month_segments(filepath, dataframe)
+                return
 
-                    dataframe_ex = read_csv(self.engine, filepath)
+            dataframe_ex = self._read_year_table(filepath)
 
-                elif self.data_type == DATA_TYPE.PARQUET_FILETYPE:
+            if dataframe_ex is not None:
+
+                # materialize before overwriting the file the scan points to
+                if isinstance(dataframe_ex, PolarsLazyFrame):
+                    dataframe_ex = collect_lazyframe(dataframe_ex, self.polars_gpu_engine)
 
-                    dataframe_ex = read_parquet(self.engine, filepath)
+                if isinstance(dataframe, PolarsLazyFrame):
+                    dataframe_ex = dataframe_ex.lazy()
 
                 dataframe = concat_data([dataframe, dataframe_ex])
                 # clean duplicated timestamps rows, keep first by default
@@ -1404,15 +2352,15 @@ class LocalDBYearConnector(DatabaseConnector):
                     keep='first').sort(
                     COLUMN_NAME.TIMESTAMP)
 
-            if self.data_type == DATA_TYPE.CSV_FILETYPE:
-
-                write_csv(dataframe, filepath)
+            self._write_file(dataframe, filepath)
 
-            elif self.data_type == DATA_TYPE.PARQUET_FILETYPE:
+            # segments, if any, are now folded into the year file
+            segments = list(self._get_month_segments(filepath).values())
+            rmtree(self._get_segments_path(filepath), ignore_errors=True)
 
-                write_parquet(dataframe, filepath)
+            self._record_files([filepath], removed=segments)
 
-    def read_data(self,
+    def scan_data(self,
                   market: str,
                   ticker: str,
                   timeframe: str,
@@ -1421,68 +2369,22 @@ class LocalDBYearConnector(DatabaseConnector):
                   comparison_column_name: List[str] | str | None = None,
                   check_level: List[int | float] | int | float | None = None,
                   comparison_operator: List[SUPPORTED_SQL_COMPARISON_OPERATORS] | SUPPORTED_SQL_COMPARISON_OPERATORS | None = None,
-                  comparison_aggregation_mode: SUPPORTED_SQL_CONDITION_AGGREGATION_MODES | None = None
+                  comparison_aggregation_mode: SUPPORTED_SQL_CONDITION_AGGREGATION_MODES | None = None,
+                  columns: List[str] | None = None
                   ) -> PolarsLazyFrame:
+        '''
+        Lazy query of read_data: no data is read until collected, so that
+        queries of several tickers can be collected together.
+        '''
 
-        comparisons_len = 0
-
-        # Validate and normalize condition parameters if provided
-        if comparison_column_name is not None or check_level is not None or comparison_operator is not None:
-            comparisons_len = len(comparison_column_name)
-
-            if isinstance(comparison_column_name, str):
-                comparison_column_name = [comparison_column_name]
-
-            if isinstance(check_level, (int, float)):
-                check_level = [check_level]
-
-            if isinstance(comparison_operator, str):
-                comparison_operator = [comparison_operator]
-
-            if any([col not in list(SUPPORTED_COLUMN_NAME.__args__)
-                   for col in comparison_column_name]):
-                logger.bind(
-                    target='localdb').error(
-                    f'comparison_column_name must be a supported column name: {list(SUPPORTED_COLUMN_NAME.__args__)}')
-                raise ValueError(
-                    'comparison_column_name must be a supported column name')
+        # conditions compiled to a polars expression evaluated by the scan
+        conditions = compile_conditions_expression(comparison_column_name,
+                                                   check_level,
+                                                   comparison_operator,
+                                                   comparison_aggregation_mode)
 
-            if any([cond not in list(SUPPORTED_SQL_COMPARISON_OPERATORS.__args__)
-                   for cond in comparison_operator]):
-                logger.bind(
-                    target='localdb').error(
-                    f'comparison_operator must be a supported SQL comparison operator: {list(SUPPORTED_SQL_COMPARISON_OPERATORS.__args__)}')
-                raise ValueError(
-                    'comparison_operator must be a supported SQL comparison operator')
+        if self.engine not in ('polars', 'polars_lazy'):
 
-            if (
-                (
-                    comparison_aggregation_mode is not None and
-                    comparisons_len > 1
-                ) and
-                comparison_aggregation_mode not in list(
-                    SUPPORTED_SQL_CONDITION_AGGREGATION_MODES.__args__)
-            ):
-                logger.bind(
-                    target='localdb').error(
-                    f'comparison_aggregation_mode must be a supported SQL condition aggregation mode: {list(SUPPORTED_SQL_CONDITION_AGGREGATION_MODES.__args__)}')
-                raise ValueError(
-                    'comparison_aggregation_mode must be a supported SQL condition aggregation mode')
-
-            if len(comparison_column_name) != len(check_level) or len(
-                    comparison_column_name) != len(comparison_operator):
-                logger.bind(target='localdb').error(
-                    'comparison_column_name, check_level and comparison_operator must have the same length')
-                raise ValueError(
-                    'comparison_column_name, check_level and comparison_operator must have the same length')
-
-            comparisons_len = len(comparison_column_name)
-
-        if self.engine == 'polars':
-            dataframe = PolarsDataFrame()
-        elif self.engine == 'polars_lazy':
-            dataframe = PolarsLazyFrame()
-        else:
             logger.bind(target='localdb').error(
                 f'Engine {self.engine} or data type {self.data_type} not supported')
             raise ValueError(
@@ -1494,67 +2396,91 @@ class LocalDBYearConnector(DatabaseConnector):
 
         dataframes_list = []
 
-        # iterate over the years and read the data
+        # iterate over the years and scan the data
         for year in years:
             filename = self._get_filename(market, ticker, timeframe, year)
             filepath = (self.data_path / market / ticker / timeframe / filename)
 
-            if filepath.exists() and filepath.is_file():
-                file_lock_path = str(filepath) + '.lock'
-                with FileLock(file_lock_path):
-                    if self.data_type == DATA_TYPE.CSV_FILETYPE:
-                        df_year = read_csv(self.engine, filepath)
-                    elif self.data_type == DATA_TYPE.PARQUET_FILETYPE:
-                        df_year = read_parquet(self.engine, filepath)
-                    dataframes_list.append(df_year)
+            df_year = self._read_year_table(filepath, lazy=True)
+            if df_year is not None:
+                dataframes_list.append(df_year)
 
         if not dataframes_list:
             logger.bind(target='localdb').critical(f'No files found for {market} {ticker} {timeframe} between {start} and {end}')
             raise FileNotFoundError(f"No files found for {market} {ticker} {timeframe} between {start} and {end}")
 
-        dataframe = concat(dataframes_list)
+        # years and months are concatenated in order,
+        # the result is already sorted by timestamp
+        dataframe = concat(dataframes_list, how='vertical')
+
+        predicate = (
+            (col(COLUMN_NAME.TIMESTAMP) >= start)
+            &
+            (col(COLUMN_NAME.TIMESTAMP) <= end)
+        )
+
+        if conditions is not None:
 
+            predicate = predicate & conditions
+
+        dataframe = dataframe.filter(predicate)
+
+        if columns:
+
+            dataframe = dataframe.select(
+                list_remove_duplicates([COLUMN_NAME.TIMESTAMP] + list(columns)))
+
+        if timeframe == TICK_TIMEFRAME:
+            dtype_dict = POLARS_DTYPE_DICT.TIME_TICK_DTYPE
+        else:
+            dtype_dict = POLARS_DTYPE_DICT.TIME_TF_DTYPE
+
+        schema_columns = dataframe.collect_schema().names()
+
+        return dataframe.cast({column: dtype for column, dtype in dtype_dict.items()
+                               if column in schema_columns})
+
+    def read_data(self,
+                  market: str,
+                  ticker: str,
+                  timeframe: str,
+                  start: datetime,
+                  end: datetime,
+                  comparison_column_name: List[str] | str | None = None,
+                  check_level: List[int | float] | int | float | None = None,
+                  comparison_operator: List[SUPPORTED_SQL_COMPARISON_OPERATORS] | SUPPORTED_SQL_COMPARISON_OPERATORS | None = None,
+                  comparison_aggregation_mode: SUPPORTED_SQL_CONDITION_AGGREGATION_MODES | None = None,
+                  columns: List[str] | None = None
+                  ) -> PolarsLazyFrame:
+
+        # only the filtered rows are materialized, before the
+        # pinned files are closed whatever the engine
         try:
-            start_str = start.isoformat()
-            end_str = end.isoformat()
-
-            query = f'''SELECT * FROM self
-                    WHERE
-                    {COLUMN_NAME.TIMESTAMP} >= '{start_str}'
-                    AND
-                    {COLUMN_NAME.TIMESTAMP} <= '{end_str}'
-                    '''
-            if comparisons_len > 0:
-                if comparisons_len == 1:
-                    query += f'''AND
-                             {comparison_column_name[0]} {comparison_operator[0]} {check_level[0]}
-                             '''
-                else:
-                    query += f'''AND
-                             ({comparison_column_name[0]} {comparison_operator[0]} {check_level[0]}
-                             '''
-                    for col, level, cond, index in zip(
-                            comparison_column_name[1:], check_level[1:], comparison_operator[1:], range(1, comparisons_len)):
-                        if index == comparisons_len - 1:
-                            query += f'''{comparison_aggregation_mode}
-                                {col} {cond} {level})
-                                '''
-                        else:
-                            query += f'''{comparison_aggregation_mode}
-                                {col} {cond} {level}
-                                '''
-            query += f'ORDER BY {COLUMN_NAME.TIMESTAMP}'
-            dataframe = dataframe.sql(query)
+
+            with self.pinned_reads():
+
+                dataframe = self.scan_data(market,
+                                           ticker,
+                                           timeframe,
+                                           start,
+                                           end,
+                                           comparison_column_name,
+                                           check_level,
+                                           comparison_operator,
+                                           comparison_aggregation_mode,
+                                           columns)
+
+                dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine)
 
         except Exception as e:
+
             logger.bind(target='localdb').error(
-                f'executing query {query} failed: {e}')
+                f'reading {market} {ticker} {timeframe} between {start} and {end} failed: {e}')
+            raise
 
-        else:
-            if timeframe == TICK_TIMEFRAME:
-                dataframe = dataframe.cast(POLARS_DTYPE_DICT.TIME_TICK_DTYPE)
-            else:
-                dataframe = dataframe.cast(POLARS_DTYPE_DICT.TIME_TF_DTYPE)
+        if self.engine == 'polars_lazy':
+
+            dataframe = dataframe.lazy()
 
         return dataframe
 
@@ -1562,28 +2488,49 @@ class LocalDBYearConnector(DatabaseConnector):
                        market: str,
                        ticker: str,
                        timeframe: str,
-                       years: int | List[int]) -> PolarsLazyFrame:
+                       years: int | List[int],
+                       lazy: bool = False) -> PolarsLazyFrame:
         """
-        Read data for specific year(s) using SQL YEAR() filter.
+        Read data for specific year(s) filtered by timestamp year.
+        If lazy the files are returned as scans by path whatever the
+        engine, a version committed before collect may be read, otherwise
+        the data is collected from the versions current at read time.
         """
         if isinstance(years, int):
             years_list = [years]
         else:
             years_list = sorted(years)
 
+        if lazy:
+
+            return self._scan_data_year(market, ticker, timeframe, years_list)
+
+        with self.pinned_reads():
+
+            dataframe = collect_lazyframe(
+                self._scan_data_year(market, ticker, timeframe, years_list),
+                self.polars_gpu_engine)
+
+        if self.engine == 'polars_lazy':
+
+            dataframe = dataframe.lazy()
+
+        return dataframe
+
+    def _scan_data_year(self,
+                        market: str,
+                        ticker: str,
+                        timeframe: str,
+                        years_list: List[int]) -> PolarsLazyFrame:
+
         dataframes_list = []
         for y in years_list:
             filename = self._get_filename(market, ticker, timeframe, y)
             filepath = (self.data_path / market / ticker / timeframe / filename)
 
-            if filepath.exists():
-                file_lock_path = str(filepath) + '.lock'
-                with FileLock(file_lock_path):
-                    if self.data_type == DATA_TYPE.CSV_FILETYPE:
-                        df_year = read_csv(self.engine, filepath)
-                    elif self.data_type == DATA_TYPE.PARQUET_FILETYPE:
-                        df_year = read_parquet(self.engine, filepath)
-                    dataframes_list.append(df_year)
+            df_year = self._read_year_table(filepath, lazy=True)
+            if df_year is not None:
+                dataframes_list.append(df_year)
 
         if not dataframes_list:
             logger.bind(target='localdb').critical(
@@ -1591,22 +2538,10 @@ class LocalDBYearConnector(DatabaseConnector):
             raise FileNotFoundError(
                 f"No files found for {market} {ticker} {timeframe} for years {years_list}")
 
-        dataframe = concat(dataframes_list)
-
-        # Apply year filter via SQL
-        year_filter_str = ", ".join([str(y) for y in years_list])
-        query = f'''SELECT * FROM self
-                WHERE
-                EXTRACT(YEAR FROM {COLUMN_NAME.TIMESTAMP}) IN ({year_filter_str})
-                ORDER BY {COLUMN_NAME.TIMESTAMP}
-                '''
-
-        try:
-            dataframe = dataframe.sql(query)
-        except Exception as e:
-            logger.bind(target='localdb').error(
-                f'executing query {query} failed: {e}')
-            raise
+        # years are concatenated in order,
+        # the result is already sorted by timestamp
+        dataframe = concat(dataframes_list, how='vertical').filter(
+            col(COLUMN_NAME.TIMESTAMP).dt.year().is_in(years_list))
 
         # Cast types
         if timeframe == TICK_TIMEFRAME:
@@ -1632,8 +2567,9 @@ class LocalDBYearConnector(DatabaseConnector):
         Read window of data specified by input requirements:
         the data window has timespan in order to return a dataframe
         with rows size equal to periods.
-        Query the local db to calculate the start date of the window
-        if direction is forward, or end date if backward.
+        The year holding date is searched for the window start
+        (forward) or end (backward) and the window is sliced from it,
+        following years are read only if it does not fill the window.
 
 
         Args:
@@ -1661,116 +2597,31 @@ class LocalDBYearConnector(DatabaseConnector):
             PolarsDataFrame: DataFrame with data for the window.
         """
 
-        # based on timeframe and window size (units of timeframe)
-        # estimate how many years the query should cover
-        if direction == 'backward':
-            end_date = date
-            start_date = estimate_start_date_to_business_days(
-                end_date,
-                timeframe,
-                periods,
-                holidays=FOREX_HOLIDAYS
-            )
-
-            # consider (start_date.year - 1) with -1 as margin
-            # e.g. if start_date is 2000-01-01, we need to include 1999 files
-            years_list = range(start_date.year - 1, end_date.year + 1)
-
-        elif direction == 'forward':
-            start_date = date
-            end_date = estimate_end_date_to_business_days(
-                start_date,
-                timeframe,
-                periods,
-                holidays=FOREX_HOLIDAYS
-            )
-
-            # consider end_date.year + 2 with +1 as margin
-            # e.g. if end_date is 2022-12-31, we need to include 2023 files
-            years_list = range(start_date.year, end_date.year + 2)
-
-        # get a hook (lazyframe) to the local db files needed
-        dataframes_list = []
-        for y in years_list:
-            filename = self._get_filename(market, ticker, timeframe, y)
-            filepath = (self.data_path / market / ticker / timeframe / filename)
-
-            if filepath.exists():
-                file_lock_path = str(filepath) + '.lock'
-                with FileLock(file_lock_path):
-                    if self.data_type == DATA_TYPE.CSV_FILETYPE:
-                        df_year = read_csv(self.engine, filepath)
-                    elif self.data_type == DATA_TYPE.PARQUET_FILETYPE:
-                        df_year = read_parquet(self.engine, filepath)
-                    dataframes_list.append(df_year)
-
-        if not dataframes_list:
-            logger.bind(target='localdb').critical(
-                f'No files found for {market} {ticker} {timeframe} for years {years_list}')
-            raise FileNotFoundError(
-                f"No files found for {market} {ticker} {timeframe} for years {years_list}")
-
-        if not dataframes_list:
-            logger.bind(target='localdb').critical(f'No files found for {market} {ticker} {timeframe} between {start} and {end}')
-            raise FileNotFoundError(f"No files found for {market} {ticker} {timeframe} between {start} and {end}")
-
-        # aggregated lazyframe to query from
-        dataframe = concat(dataframes_list)
+        date = any_date_to_datetime64(date, to_pydatetime=True)
 
-        # produce a SQL query to local database to count the number of entries (rows)
-        # from start date or end date
-        # the count stops when it reaches 'window' number of rows
-        # the query shall return the first and last datetime entries
-        # in ascending order of timestamp
+        # years stored, in the direction of the window from date
+        years_list = self._get_ticker_years_list_from_db(ticker, timeframe)
         if direction == 'backward':
-            query = f'''SELECT MIN({COLUMN_NAME.TIMESTAMP}) AS start_time,
-                        MAX({COLUMN_NAME.TIMESTAMP}) AS end_time
-                        FROM (
-                            SELECT {COLUMN_NAME.TIMESTAMP} FROM self
-                            WHERE {COLUMN_NAME.TIMESTAMP} <= '{end_date}'
-                            ORDER BY {COLUMN_NAME.TIMESTAMP} DESC
-                            LIMIT {periods}
-                        ) AS sub
-                        '''
-        elif direction == 'forward':
-            query = f'''SELECT MIN({COLUMN_NAME.TIMESTAMP}) AS start_time,
-                        MAX({COLUMN_NAME.TIMESTAMP}) AS end_time
-                        FROM (
-                            SELECT {COLUMN_NAME.TIMESTAMP} FROM self
-                            WHERE {COLUMN_NAME.TIMESTAMP} >= '{start_date}'
-                            ORDER BY {COLUMN_NAME.TIMESTAMP} ASC
-                            LIMIT {periods}
-                        ) AS sub
-                        '''
-
-        try:
-
-            window_dates = dataframe.sql(query)
-            if isinstance(window_dates, PolarsLazyFrame):
-                window_dates = collect_lazyframe(window_dates, self.polars_gpu_engine)
-
-        except Exception as e:
-            logger.bind(target='localdb').error(
-                f'executing query {query} failed: {e}')
-
-            return PolarsLazyFrame([])
-
+            years_list = [y for y in reversed(years_list) if y <= date.year]
         else:
+            years_list = [y for y in years_list if y >= date.year]
 
-            # get the corrected dates
-            start_date_from_db = window_dates.item(0, 0)
-            end_date_from_db = window_dates.item(0, 1)
+        filepaths = [
+            self.data_path / market / ticker / timeframe /
+            self._get_filename(market, ticker, timeframe, y)
+            for y in years_list
+        ]
 
-        return self.read_data(
-            market,
-            ticker,
+        return self._read_window(
+            filepaths,
             timeframe,
-            start_date_from_db,
-            end_date_from_db,
+            date,
+            periods,
+            direction,
             comparison_column_name,
             check_level,
             comparison_operator,
-            comparison_aggregation_mode,
+            comparison_aggregation_mode
         )
 
     def read_last_timestamp(
@@ -1835,35 +2686,16 @@ class LocalDBYearConnector(DatabaseConnector):
         filename = self._get_filename(market, ticker, timeframe, latest_year)
         filepath = (self.data_path / market / ticker / timeframe / filename)
 
-        if not (filepath.exists() and filepath.is_file()):
+        # The year table max is the max over the year file and its segments,
+        # no lock needed since writers commit by atomic rename.
+        table_files = list(self._get_month_segments(filepath).values())
+        if filepath.is_file():
+            table_files.append(filepath)
+        if not table_files:
             logger.bind(target='localdb').critical(f'file {filepath} not found')
             raise FileNotFoundError(f"file {filepath} not found")
 
-        # Per-file lock ensures we don't read while write_data is writing.
-        file_lock_path = str(filepath) + '.lock'
-        with FileLock(file_lock_path):
-            if self.data_type == DATA_TYPE.CSV_FILETYPE:
-                dataframe = read_csv(self.engine, filepath)
-                if hasattr(dataframe, 'collect'):
-                    dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine).lazy()
-            elif self.data_type == DATA_TYPE.PARQUET_FILETYPE:
-                dataframe = read_parquet(self.engine, filepath)
-                if hasattr(dataframe, 'collect'):
-                    dataframe = collect_lazyframe(dataframe, self.polars_gpu_engine).lazy()
-
-        query = f'''SELECT MAX({COLUMN_NAME.TIMESTAMP}) AS end_time
-                    FROM self
-                    '''
-
-        try:
-            window_dates = dataframe.sql(query)
-            if isinstance(window_dates, PolarsLazyFrame):
-                window_dates = collect_lazyframe(window_dates, self.polars_gpu_engine)
-        except Exception as e:
-            logger.bind(target='localdb').error(f'executing query {query} failed: {e}')
-            raise
-        else:
-            end_date_from_db = window_dates.item(0, 0)
+        end_date_from_db = self._read_max_timestamp(table_files)
 
         if self._last_timestamp_cache is not None:
             self._last_timestamp_cache[cache_key] = end_date_from_db
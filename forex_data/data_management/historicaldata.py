@@ -4,6 +4,9 @@ from typing import Any, Dict, List, Optional, Union, Literal
 from datetime import datetime, date, timedelta, timezone
 from uuid import uuid4
 from filelock import FileLock
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+from multiprocessing import get_context
 from textwrap import dedent
 
 from attrs import (
@@ -38,8 +41,13 @@ from pyarrow import (
 from polars import (
     String as polars_string,
     col,
+    collect_all,
+    concat,
+    lit,
     DataFrame as PolarsDataFrame,
-    LazyFrame as PolarsLazyFrame
+    Expr as PolarsExpr,
+    LazyFrame as PolarsLazyFrame,
+    Series as PolarsSeries
 )
 
 from zipfile import (
@@ -83,9 +91,51 @@ from .remoteconnector import (
     DukascopyConnector
 )
 
+from .registry import TickerRegistry
+
 __all__ = ['HistoricalManagerDB']
 
 
+# database connector of a worker process of HistoricalManagerDB._update_db_parallel
+_update_worker_connector = None
+
+
+def _init_update_worker(connector_kwargs: Dict[str, Any]) -> None:
+
+    global _update_worker_connector
+    _update_worker_connector = LocalDBYearConnector(**connector_kwargs)
+
+
+def _update_year_worker(ticker: str,
+                        year: int,
+                        timeframes: List[str],
+                        streaming_chunk_size: int = 0) -> tuple:
+    '''
+    Aggregate the tick data of a ticker year to timeframes and write
+    the year files. The catalog is not updated: the entries of the files
+    written are returned to be merged by the calling process.
+    '''
+
+    connector = _update_worker_connector
+    connector.defer_records()
+
+    try:
+
+        tick_dataframe = connector.read_data_year('forex', ticker, TICK_TIMEFRAME, year,
+                                                  lazy=streaming_chunk_size > 0)
+
+        rollup = rollup_timeframes(tick_dataframe, timeframes, streaming_chunk_size)
+
+        for tf in timeframes:
+            connector.write_data(connector._db_key('forex', ticker, tf, year), rollup[tf])
+
+    finally:
+
+        records = connector.pop_deferred_records()
+
+    return records
+
+
 # HISTORICAL DATA MANAGER
 @define(kw_only=True, slots=True)
 class HistoricalManagerDB:
@@ -103,6 +153,37 @@ class HistoricalManagerDB:
                                                             validators.instance_of(Path)))
     db_files_year_partitioning: bool = field(default=True,
                                              validator=validators.instance_of(bool))
+    db_files_month_segments: bool = field(default=False,
+                                          validator=validators.instance_of(bool))
+    db_cache_max_bytes: int = field(default=0,
+                                    validator=[validators.instance_of(int),
+                                               validators.ge(0)])
+    db_incremental_rollup: bool = field(default=False,
+                                        validator=validators.instance_of(bool))
+    derived_timeframes: bool = field(default=False,
+                                     validator=validators.instance_of(bool))
+    db_update_workers: int = field(default=1,
+                                   validator=[validators.instance_of(int),
+                                              validators.ge(1)])
+    db_streaming_chunk_size: int = field(default=0,
+                                         validator=[validators.instance_of(int),
+                                                    validators.ge(0)])
+    db_compact_ticks: bool = field(default=False,
+                                   validator=validators.instance_of(bool))
+    db_parquet_writer: Dict[str, Any] = field(factory=dict,
+                                              validator=validators.instance_of(dict))
+    download_concurrency: Dict[str, int] = field(factory=dict,
+                                                 validator=validators.instance_of(dict))
+    download_raw_cache_max_bytes: int = field(default=0,
+                                              validator=[validators.instance_of(int),
+                                                         validators.ge(0)])
+    download_tick_vault_store: bool = field(default=False,
+                                            validator=validators.instance_of(bool))
+    download_tick_vault_retention_days: int = field(default=0,
+                                                    validator=[validators.instance_of(int),
+                                                               validators.ge(0)])
+    source_connectors: List[RemoteConnector] = field(factory=list,
+                                                     validator=validators.instance_of(list))
     volume_data: bool = field(default=False,
                               validator=validators.instance_of(bool))
     ssl_verify: bool = field(default=True,
@@ -118,6 +199,13 @@ class HistoricalManagerDB:
             validate_timedelta_str
         )
     )
+    tickers_registry_ttl: str = field(
+        default='7D',
+        validator=validators.and_(
+            validators.instance_of(str),
+            validate_timedelta_str
+        )
+    )
 
     # internal
     _db_connector = field(factory=DatabaseConnector)
@@ -132,7 +220,10 @@ class HistoricalManagerDB:
         validator=validators.optional(
             validators.instance_of(Path)))
     _histdata_tickers_list = field(factory=list, validator=validators.instance_of(list))
+    _tickers_registry = field(default=None)
+    _tickers_refreshed: bool = field(default=False)
     _tickers_years_dict = field(factory=dict, validator=validators.instance_of(dict))
+    _derived_warned_timeframes = field(factory=set, validator=validators.instance_of(set))
 
     # if a valid config file or string
     # is passed
@@ -245,8 +336,18 @@ class HistoricalManagerDB:
             self.data_type == DATA_TYPE.PARQUET_FILETYPE
         ):
 
+            connector_kwargs = dict(
+                data_type=self.data_type,
+                engine=self.engine,
+                polars_gpu_engine=self.polars_gpu_engine,
+                compact_ticks=self.db_compact_ticks,
+                parquet_writer=self._parquet_writer_profile()
+            )
+
             if self.db_files_year_partitioning:
                 connector_type = LocalDBYearConnector
+                connector_kwargs['month_segments'] = self.db_files_month_segments
+                connector_kwargs['cache_max_bytes'] = self.db_cache_max_bytes
             else:
                 connector_type = LocalDBConnector
 
@@ -257,9 +358,7 @@ class HistoricalManagerDB:
                 # independent data folder under LocalDB
                 self._db_connector = connector_type(
                     data_path=str(self._histdata_path / f'LocalDB_{self.connector_id}'),
-                    data_type=self.data_type,
-                    engine=self.engine,
-                    polars_gpu_engine=self.polars_gpu_engine
+                    **connector_kwargs
                 )
 
             else:
@@ -267,9 +366,7 @@ class HistoricalManagerDB:
                 # no id provided so set id=0 as default
                 self._db_connector = connector_type(
                     data_path=str(self._histdata_path / 'LocalDB'),
-                    data_type=self.data_type,
-                    engine=self.engine,
-                    polars_gpu_engine=self.polars_gpu_engine
+                    **connector_kwargs
                 )
 
         else:
@@ -278,8 +375,11 @@ class HistoricalManagerDB:
                 f'Data type {self.data_type} not supported')
             raise ValueError(f'Data type {self.data_type} not supported')
 
-        # initialize histdata connectors
-        if self.volume_data:
+        # initialize histdata connectors, connectors of another
+        # manager are shared with their sessions and tickers lists
+        if self.source_connectors:
+            self._histdata_connector = list(self.source_connectors)
+        elif self.volume_data:
             self._histdata_connector = [
                 DukascopyConnector(
                     ssl_verify=self.ssl_verify,
@@ -287,6 +387,9 @@ class HistoricalManagerDB:
                     engine=self.engine,
                     data_type=self.data_type,
                     volume_data=self.volume_data,
+                    tick_vault_store=self.download_tick_vault_store,
+                    tick_vault_retention_days=self.download_tick_vault_retention_days,
+                    **self._download_concurrency_kwargs(DUKASCOPY_PROVIDER)
                 )
             ]
         else:
@@ -297,6 +400,8 @@ class HistoricalManagerDB:
                     engine=self.engine,
                     data_type=self.data_type,
                     volume_data=self.volume_data,
+                    raw_cache_max_bytes=self.download_raw_cache_max_bytes,
+                    **self._download_concurrency_kwargs(HISTDATA_PROVIDER)
                 ),
                 DukascopyConnector(
                     ssl_verify=self.ssl_verify,
@@ -304,25 +409,54 @@ class HistoricalManagerDB:
                     engine=self.engine,
                     data_type=self.data_type,
                     volume_data=self.volume_data,
+                    tick_vault_store=self.download_tick_vault_store,
+                    tick_vault_retention_days=self.download_tick_vault_retention_days,
+                    **self._download_concurrency_kwargs(DUKASCOPY_PROVIDER)
                 )
             ]
 
-        # cache histdata tickers list at initialization (merged from all connectors)
-        tickers_set = set()
-        for conn in self._histdata_connector:
-            try:
-                for ticker in conn.get_available_tickers():
-                    tickers_set.add(ticker.upper())
-            except Exception as e:
-                logger.bind(target='histmanager').warning(
-                    f"Failed to get tickers from connector {conn.__class__.__name__}: {e}"
-                )
-        self._histdata_tickers_list = sorted(list(tickers_set))
+        # tickers available from the providers are read from the
+        # persistent registry, no request is done at initialization:
+        # the registry is refreshed when an unknown ticker is
+        # requested or when it is expired
+        self._tickers_registry = TickerRegistry(
+            filepath=self._histdata_path / TICKERS_REGISTRY_FILENAME,
+            ttl=to_timedelta(self.tickers_registry_ttl).to_pytimedelta()
+        )
+        self._load_tickers_registry()
 
         # initialize tickers years dict info of data available
         # with the current connector
         self._tickers_years_dict = self._db_connector.create_tickers_years_dict()
 
+    def _parquet_writer_profile(self) -> Optional[ParquetWriterProfile]:
+
+        # engine defaults if no writer option is configured
+        if not self.db_parquet_writer:
+            return None
+
+        return ParquetWriterProfile.from_config(self.db_parquet_writer)
+
+    def _download_concurrency_kwargs(self, provider: str) -> Dict[str, int]:
+
+        # months downloaded concurrently by the provider connector,
+        # connector default if not configured
+        limits = {key.lower(): value
+                  for key, value in self.download_concurrency.items()}
+        providers = [name.lower() for name in SUPPORTED_HISTORICAL_DATA_PROVIDERS]
+
+        unknown = set(limits) - set(providers)
+        if unknown:
+            logger.bind(target='histmanager').error(
+                f'download concurrency providers {sorted(unknown)} not supported, '
+                f'supported: {providers}')
+            raise ValueError(f'download concurrency providers {sorted(unknown)} not supported')
+
+        if provider.lower() in limits:
+            return {'max_concurrent_downloads': limits[provider.lower()]}
+
+        return {}
+
     def _clear_temporary_data_folder(self) -> None:
 
         # delete temporary data path
@@ -345,6 +479,77 @@ class HistoricalManagerDB:
 
         return self._histdata_connector
 
+    def _load_tickers_registry(self) -> None:
+
+        # seed the connectors with the tickers lists registered,
+        # so that downloads need no tickers request
+        providers = self._tickers_registry.providers()
+        for conn in self._histdata_connector:
+            if conn.provider in providers:
+                conn.set_available_tickers(providers[conn.provider])
+
+        self._histdata_tickers_list = self._tickers_registry.tickers()
+
+    def refresh_tickers(self) -> List[str]:
+        '''
+        Request the tickers available to the data providers and
+        update the persistent tickers registry.
+
+        A provider not reachable keeps the tickers list registered.
+
+        Returns
+        -------
+        List[str]
+            Tickers available from any provider, upper case.
+        '''
+
+        providers = {}
+        for conn in self._histdata_connector:
+
+            # drop the list cached by the connector
+            conn.set_available_tickers([])
+
+            try:
+                tickers = conn.get_available_tickers()
+            except Exception as e:
+                logger.bind(target='histmanager').warning(
+                    f"Failed to get tickers from connector {conn.__class__.__name__}: {e}"
+                )
+                tickers = []
+
+            if tickers:
+                providers[conn.provider] = tickers
+
+        if providers:
+            self._tickers_registry.update(providers)
+        else:
+            logger.bind(target='histmanager').warning(
+                'No data provider reachable, tickers registry not updated')
+
+        self._tickers_refreshed = True
+        self._load_tickers_registry()
+
+        return self._histdata_tickers_list
+
+    def _is_available_ticker(self, ticker: str) -> bool:
+
+        # tickers in the local database need no request
+        if ticker.lower() in self._get_ticker_list():
+            return True
+
+        # refresh the registry at most once per instance if the
+        # ticker is unknown or the registry is expired
+        if (
+            not self._tickers_refreshed and
+            (
+                ticker.upper() not in self._histdata_tickers_list or
+                self._tickers_registry.is_expired()
+            )
+        ):
+            self.refresh_tickers()
+
+        return ticker.upper() in self._histdata_tickers_list
+
     def _get_ticker_list(self) -> List[str]:
 
         # return list of tickers elements as str
@@ -393,20 +598,248 @@ class HistoricalManagerDB:
 
         return ticker_years_list
 
-    def _update_db(self, ticker: str = None) -> None:
+    def _refresh_tickers_years_info(self, ticker: str, timeframe: str) -> None:
+        '''
+        Update the years/months info of ticker and timeframe
+        from the database catalog, no data file is read.
+        '''
+
+        if ticker not in self._tickers_years_dict:
+            self._tickers_years_dict[ticker] = {}
+
+        self._tickers_years_dict[ticker][timeframe] = YearMonthList(
+            self._db_connector._get_ticker_years_months_from_db(ticker, timeframe))
+
+    def _init_tickers_years_info(self, ticker: str, timeframe: str) -> None:
+
+        # initialize ticker/timeframe in dict if not present
+        if ticker not in self._tickers_years_dict:
+            self._tickers_years_dict[ticker] = {}
+        if timeframe not in self._tickers_years_dict[ticker]:
+            self._tickers_years_dict[ticker][timeframe] = YearMonthList()
+        if TICK_TIMEFRAME not in self._tickers_years_dict[ticker]:
+            self._tickers_years_dict[ticker][TICK_TIMEFRAME] = YearMonthList()
+
+    def _requested_months(self,
+                          start: datetime,
+                          end: datetime,
+                          now_utc: datetime) -> Dict[int, List[int]]:
+        '''
+        Years of the interval between start and end mapped to the
+        months requested, capped at the current month.
+        '''
+
+        requested_months = {}
+        for y in range(start.year, end.year + 1):
+            start_m = start.month if y == start.year else 1
+            end_m = end.month if y == end.year else 12
+            if y == now_utc.year:
+                end_m = min(end_m, now_utc.month)
+            req_months = list(range(start_m, end_m + 1))
+            if req_months:
+                requested_months[y] = req_months
+
+        return requested_months
+
+    def _missing_years(self,
+                       ticker: str,
+                       timeframe: str,
+                       requested_months: Dict[int, List[int]]) -> List[int]:
+
+        # years whose requested months are not all available
+        ticker_years_list = self._tickers_years_dict[ticker][timeframe]
+        missing_years = []
+        for y, req_months in requested_months.items():
+            if y not in ticker_years_list:
+                missing_years.append(y)
+            else:
+                available_months = ticker_years_list.months.get(y, [])
+                if not set(req_months).issubset(available_months):
+                    missing_years.append(y)
+
+        return missing_years
+
+    def _is_current_year_requested(self,
+                                   ticker: str,
+                                   start: datetime,
+                                   end: datetime,
+                                   now_utc: datetime) -> bool:
+        '''
+        Determine if current year data of ticker has to be updated
+        to cover the interval between start and end.
+        '''
+
+        if not start.year <= now_utc.year <= end.year:
+            return False
+
+        ticker_available_last_timestamp = self._db_connector.read_last_timestamp('forex', ticker)
+
+        if not ticker_available_last_timestamp:
+
+            # ticker is not in DD
+            # request for current year forced to True
+            return True
+
+        elif end >= ticker_available_last_timestamp:
+
+            # determine if to include and update of current year data
+            # if not is on a weekend day (Saturday or Sunday)
+            # set now as previous Friday at 17:00
+            if now_utc.weekday() in [5, 6]:
+                now_ref = now_utc - timedelta(days=now_utc.weekday() + 1)
+                now_ref = now_ref.replace(hour=17, minute=0, second=0, microsecond=0)
+            else:
+                now_ref = now_utc
+
+            # Use the requested end date as the reference point for update,
+            # but capped at the current time (now_ref) since we cannot download future data.
+            # This prevents downloads when the requested end date is in the past
+            # and the database already has data up to that end date.
+            now_ref_ts = to_datetime(now_ref)
+            end_ts = to_datetime(end)
+            reference_time = min(end_ts, now_ref_ts)
+
+            return (
+                (
+                    reference_time
+                    -
+                    to_datetime(ticker_available_last_timestamp)
+                ).total_seconds()
+                >
+                to_timedelta(self.max_discrepancy_with_now).total_seconds()
+            )
+
+        # db already cover request for current year
+        # end date is less recent than available timestamp
+        return False
+
+    def _complete_tickers(self,
+                          tickers: List[str],
+                          timeframe: str,
+                          start: datetime,
+                          end: datetime) -> None:
+        '''
+        Plan the coverage of the interval between start and end at
+        timeframe for all tickers, then download the missing tick data
+        and aggregate the missing timeframe data of the tickers in need
+        under a single lock acquisition.
+        '''
+
+        now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
+        current_year = now_utc.year
+        requested_months = self._requested_months(start, end, now_utc)
+
+        # here determine if to ask for new download
+        # if requested years are not already in localdb (tracked by tickers years dict)
+        # or if current year is requested
+        tickers_to_complete = {}
+        for ticker in tickers:
+
+            self._init_tickers_years_info(ticker, timeframe)
+
+            is_current_year_requested = self._is_current_year_requested(ticker,
+                                                                        start,
+                                                                        end,
+                                                                        now_utc)
+            if (
+                is_current_year_requested or
+                self._missing_years(ticker, timeframe, requested_months)
+            ):
+                tickers_to_complete[ticker] = is_current_year_requested
+
+        if not tickers_to_complete:
+            return
+
+        # one lock per ticker, acquired in a fixed order, so that
+        # different tickers are completed concurrently
+        with ExitStack() as locks:
+
+            for ticker in sorted(tickers_to_complete):
+                locks.enter_context(FileLock(
+                    str(Path(self.data_path) / f"tickers_years_info_{ticker}.json.lock")))
+
+            # Re-read the catalog to fetch the latest state from disk
+            self._tickers_years_dict = self._db_connector.create_tickers_years_dict()
+
+            for ticker, is_current_year_requested in tickers_to_complete.items():
+
+                self._init_tickers_years_info(ticker, timeframe)
+
+                # If the current year is requested, we force re-aggregation
+                # by removing it from the known timeframe list in memory,
+                # an incremental rollup instead starts from the watermark
+                if is_current_year_requested and not self.db_incremental_rollup:
+                    for tf in list(self._tickers_years_dict[ticker].keys()):
+                        if tf != TICK_TIMEFRAME and current_year in self._tickers_years_dict[ticker][tf]:
+                            self._tickers_years_dict[ticker][tf].remove(current_year)
+
+                # Re-calculate missing years after re-reading
+                year_tick_missing = self._missing_years(ticker,
+                                                        TICK_TIMEFRAME,
+                                                        requested_months)
+
+                if is_current_year_requested and current_year not in year_tick_missing:
+                    year_tick_missing.append(current_year)
+
+                # ONLY download years not already in the database
+                if year_tick_missing:
+                    self._download(
+                        ticker,
+                        year_tick_missing,
+                        start_month=start.month,
+                        end_month=end.month,
+                        start_year=start.year,
+                        end_year=end.year
+                    )
+                else:
+                    logger.bind(
+                        target='histmanager').info(
+                        f"Skipped downloading {ticker} {list(requested_months)} as it was managed by another process.")
+
+            # add timeframe and update db INSIDE the lock so that
+            # a concurrent process can't read a parquet that is still
+            # being written by this process
+            self.add_timeframe(timeframe)
+
+            self._update_db(list(tickers_to_complete))
+
+            for ticker in tickers_to_complete:
+
+                # check if requested year/months are subset after processing
+                if self._missing_years(ticker, timeframe, requested_months):
+
+                    logger.bind(target='histmanager').critical(
+                        f'processing year data completion of {ticker} for '
+                        f'{list(requested_months)} not ok')
+                    raise ValueError
+
+    def _update_db(self, ticker: str | List[str] = None) -> None:
 
         if not ticker:
             ticker_list = self._get_ticker_list()
-        else:
+        elif isinstance(ticker, str):
             ticker_list = [ticker]
+        else:
+            ticker_list = list(ticker)
+
+        # tickers whose missing years are aggregated by the workers pool
+        parallel_updates = {}
 
         for ticker in ticker_list:
 
             years_tick = self._tickers_years_dict[ticker][TICK_TIMEFRAME]
 
+            # last tick timestamp aggregated by this update
+            tick_watermark = None
+            if years_tick:
+                tick_watermark = self._db_connector.read_last_timestamp('forex',
+                                                                        ticker,
+                                                                        TICK_TIMEFRAME)
+
             # Collect all missing years per timeframe
             missing_years_per_tf = {}
             all_missing_years = set()
+            rollup_starts = {}
 
             for tf in self._tf_list:
                 if tf not in self._tickers_years_dict[ticker]:
@@ -423,20 +856,29 @@ class HistoricalManagerDB:
                         if not set(tick_months).issubset(tf_months):
                             missing_years.append(y)
 
+                if self.db_incremental_rollup:
+                    missing_years, rollup_start = self._split_incremental_rollup(
+                        ticker, tf, missing_years, tick_watermark)
+                    if rollup_start is not None:
+                        rollup_starts[tf] = rollup_start
+
                 if missing_years:
                     missing_years_per_tf[tf] = missing_years
                     all_missing_years.update(missing_years)
 
+            if rollup_starts:
+                self._rollup_incremental(ticker, rollup_starts, tick_watermark)
+
             if not all_missing_years:
+                self._set_aggregation_watermarks(ticker, tick_watermark)
                 continue
 
-            # call read function optimized for years query
-            tick_dataframe = self._db_connector.read_data_year(
-                market='forex',
-                ticker=ticker,
-                timeframe=TICK_TIMEFRAME,
-                years=all_missing_years
-            )
+            if (
+                isinstance(self._db_connector, LocalDBYearConnector) and
+                self.db_update_workers > 1
+            ):
+                parallel_updates[ticker] = (missing_years_per_tf, tick_watermark)
+                continue
 
             if isinstance(self._db_connector, LocalDBYearConnector):
                 # Map each missing year to the timeframes that need it
@@ -449,23 +891,24 @@ class HistoricalManagerDB:
 
                 # Process each missing year once
                 for year in sorted(year_to_tfs.keys()):
-                    year_start = f'{year}-01-01 00:00:00.000'
-                    year_end = f'{year + 1}-01-01 00:00:00.000'
-
-                    start = datetime.strptime(year_start, DATE_FORMAT_SQL)
-                    end = datetime.strptime(year_end, DATE_FORMAT_SQL)
-
-                    # Read missing year from tick_dataframe
-                    # use filter to get just the year needed
-                    dataframe = tick_dataframe.filter(
-                        (col(COLUMN_NAME.TIMESTAMP) >= start)
-                        &
-                        (col(COLUMN_NAME.TIMESTAMP) < end)
+
+                    # with streaming the year files are scanned by the
+                    # aggregation itself, ticks are never materialized
+                    dataframe = self._db_connector.read_data_year(
+                        market='forex',
+                        ticker=ticker,
+                        timeframe=TICK_TIMEFRAME,
+                        years=year,
+                        lazy=self.db_streaming_chunk_size > 0
                     )
 
+                    # aggregate the timeframes along the rollup plan,
+                    # coarse timeframes from the bars of finer ones
+                    rollup = rollup_timeframes(dataframe, year_to_tfs[year],
+                                               self.db_streaming_chunk_size)
+
                     for tf in year_to_tfs[year]:
-                        # reframe to timeframe
-                        dataframe_tf = reframe_data(dataframe, tf)
+                        dataframe_tf = rollup[tf]
 
                         # get data id key
                         tf_key = self._db_connector._db_key(
@@ -478,25 +921,26 @@ class HistoricalManagerDB:
                         # write to database
                         self._db_connector.write_data(tf_key, dataframe_tf)
 
-                        self._db_connector.add_tickers_years_info_to_file(ticker, tf, [year])
-                        self._tickers_years_dict = self._db_connector.load_tickers_years_info()
+                        self._refresh_tickers_years_info(ticker, tf)
 
                 # After all years are processed, verify consistency for each TF
-                for tf, missing_years in missing_years_per_tf.items():
-                    if set(years_tick).difference(self._tickers_years_dict[ticker][tf]):
-                        logger.bind(target='histmanager').critical(
-                            f'ticker {ticker}: {tf} timeframe completing'
-                            ' operation FAILED')
-                        raise KeyError
-                    else:
-                        logger.bind(
-                            target='histmanager').trace(
-                            f'ticker {ticker}: {tf} timeframe completing operation successful for {missing_years}')
+                self._check_timeframes_completed(ticker, missing_years_per_tf)
             else:
 
+                # call read function optimized for years query
+                tick_dataframe = self._db_connector.read_data_year(
+                    market='forex',
+                    ticker=ticker,
+                    timeframe=TICK_TIMEFRAME,
+                    years=all_missing_years
+                )
+
+                # aggregate the timeframes along the rollup plan,
+                # coarse timeframes from the bars of finer ones
+                rollup = rollup_timeframes(tick_dataframe, list(missing_years_per_tf))
+
                 for tf, missing_years in missing_years_per_tf.items():
-                    # reframe to timeframe
-                    dataframe_tf = reframe_data(tick_dataframe, tf)
+                    dataframe_tf = rollup[tf]
 
                     # get data id key
                     tf_key = self._db_connector._db_key('forex', ticker, tf)
@@ -505,8 +949,7 @@ class HistoricalManagerDB:
                     self._db_connector.write_data(tf_key, dataframe_tf)
 
                     # update metadata
-                    self._db_connector.add_tickers_years_info_to_file(ticker, tf, missing_years)
-                    self._tickers_years_dict = self._db_connector.load_tickers_years_info()
+                    self._refresh_tickers_years_info(ticker, tf)
 
                     # REDO THE CHECK FOR CONSISTENCY
                     if set(years_tick).difference(self._tickers_years_dict[ticker][tf]):
@@ -522,6 +965,220 @@ class HistoricalManagerDB:
                             target='histmanager').trace(
                             f'ticker {ticker}: {tf} timeframe completing operation successful for {missing_years}')
 
+            self._set_aggregation_watermarks(ticker, tick_watermark)
+
+        if parallel_updates:
+            self._update_db_parallel(parallel_updates)
+
+    def _check_timeframes_completed(self,
+                                    ticker: str,
+                                    missing_years_per_tf: Dict[str, List[int]]) -> None:
+
+        years_tick = self._tickers_years_dict[ticker][TICK_TIMEFRAME]
+
+        for tf, missing_years in missing_years_per_tf.items():
+            if set(years_tick).difference(self._tickers_years_dict[ticker][tf]):
+                logger.bind(target='histmanager').critical(
+                    f'ticker {ticker}: {tf} timeframe completing'
+                    ' operation FAILED')
+                raise KeyError
+            else:
+                logger.bind(
+                    target='histmanager').trace(
+                    f'ticker {ticker}: {tf} timeframe completing operation successful for {missing_years}')
+
+    def _update_db_parallel(self, updates: Dict[str, tuple]) -> None:
+        '''
+        Aggregate the missing years of several tickers in a pool of
+        db_update_workers processes, one (ticker, year) unit per task.
+
+        Workers write the timeframe files under the per-file locks and
+        return the catalog entries of the files written, merged in a
+        single catalog transaction once all units are done.
+        '''
+
+        units = []
+        for ticker, (missing_years_per_tf, _) in updates.items():
+
+            # Map each missing year to the timeframes that need it
+            year_to_tfs: Dict[int, List[str]] = {}
+            for tf, missing_years in missing_years_per_tf.items():
+                for year in missing_years:
+                    year_to_tfs.setdefault(year, []).append(tf)
+
+            units.extend((ticker, year, tfs, self.db_streaming_chunk_size)
+                         for year, tfs in sorted(year_to_tfs.items()))
+
+        connector_kwargs = dict(
+            data_path=str(self._db_connector.data_path),
+            data_type=self.data_type,
+            engine=self.engine,
+            polars_gpu_engine=self.polars_gpu_engine,
+            compact_ticks=self.db_compact_ticks,
+            parquet_writer=self._db_connector.parquet_writer,
+            month_segments=self.db_files_month_segments
+        )
+
+        entries: List[Dict[str, Any]] = []
+        removed: List[Path] = []
+        error = None
+
+        # spawned workers do not inherit the threads of polars and loguru
+        with ProcessPoolExecutor(max_workers=min(self.db_update_workers, len(units)),
+                                 mp_context=get_context('spawn'),
+                                 initializer=_init_update_worker,
+                                 initargs=(connector_kwargs,)) as executor:
+
+            futures = {executor.submit(_update_year_worker, *unit): unit for unit in units}
+
+            for future in as_completed(futures):
+
+                ticker, year, tfs, _ = futures[future]
+
+                try:
+                    unit_entries, unit_removed = future.result()
+                except Exception as e:
+                    logger.bind(target='histmanager').error(
+                        f'ticker {ticker}: aggregation of {year} to {tfs} failed: {e}')
+                    error = error or e
+                    continue
+
+                entries.extend(unit_entries)
+                removed.extend(unit_removed)
+
+        # files of the units completed are recorded even if a unit failed
+        self._db_connector.commit_records(entries, removed)
+
+        if error is not None:
+            raise error
+
+        for ticker, (missing_years_per_tf, tick_watermark) in updates.items():
+
+            for tf in missing_years_per_tf:
+                self._refresh_tickers_years_info(ticker, tf)
+
+            self._check_timeframes_completed(ticker, missing_years_per_tf)
+
+            self._set_aggregation_watermarks(ticker, tick_watermark)
+
+    def _split_incremental_rollup(self,
+                                  ticker: str,
+                                  timeframe: str,
+                                  missing_years: List[int],
+                                  tick_watermark: datetime) -> tuple:
+        '''
+        Split the missing years of a timeframe between the ones to
+        aggregate again in full, because tick data was added before the
+        aggregation watermark, and an incremental rollup of the tick data
+        after the watermark.
+
+        Returns the years to aggregate in full and the start of the
+        incremental rollup, None if no rollup is needed.
+        '''
+
+        watermark = self._db_connector.get_aggregation_watermark(ticker, timeframe)
+        ticker_years_list = self._tickers_years_dict[ticker][timeframe]
+
+        if watermark is None or not ticker_years_list:
+            return missing_years, None
+
+        years_tick = self._tickers_years_dict[ticker][TICK_TIMEFRAME]
+
+        full_years = []
+        incremental = tick_watermark is not None and tick_watermark > watermark
+        for y in missing_years:
+            tick_months = getattr(years_tick, "months", {}).get(y, [])
+            tf_months = getattr(ticker_years_list, "months", {}).get(y, [])
+            missing_months = set(tick_months).difference(tf_months)
+            if (
+                y < watermark.year or
+                (y == watermark.year and min(missing_months, default=13) < watermark.month)
+            ):
+                full_years.append(y)
+            else:
+                incremental = True
+
+        if not incremental:
+            return full_years, None
+
+        # the last bar stored contains the watermark and may be built
+        # from part of its ticks: the rollup restarts from its start
+        return full_years, self._db_connector.read_last_timestamp('forex',
+                                                                  ticker,
+                                                                  timeframe)
+
+    def _rollup_incremental(self,
+                            ticker: str,
+                            rollup_starts: Dict[str, datetime],
+                            tick_watermark: datetime) -> None:
+        '''
+        Aggregate the tick data from the rollup start of each timeframe
+        and upsert the resulting bars: bars already stored with the same
+        timestamp are replaced, older bars are left untouched.
+        '''
+
+        # tick data after the oldest rollup start, usually the last days
+        with self._db_connector.pinned_reads():
+            tick_dataframe = collect_lazyframe(
+                self._db_connector.scan_data('forex',
+                                             ticker,
+                                             TICK_TIMEFRAME,
+                                             min(rollup_starts.values()),
+                                             tick_watermark),
+                self.polars_gpu_engine)
+
+        if isinstance(self._db_connector, LocalDBYearConnector):
+
+            # bars of a year file are aggregated from the year ticks only
+            years = [y for y in self._tickers_years_dict[ticker][TICK_TIMEFRAME]
+                     if y >= min(rollup_starts.values()).year]
+            dataframes = {year: tick_dataframe.filter(
+                col(COLUMN_NAME.TIMESTAMP).dt.year() == year) for year in years}
+
+        else:
+
+            dataframes = {None: tick_dataframe}
+
+        for year, dataframe in dataframes.items():
+
+            rollup = rollup_timeframes(dataframe, list(rollup_starts))
+
+            for tf, rollup_start in rollup_starts.items():
+
+                # bars before the rollup start of tf are partial
+                dataframe_tf = rollup[tf].filter(
+                    col(COLUMN_NAME.TIMESTAMP) >= rollup_start)
+
+                if is_empty_dataframe(dataframe_tf):
+                    continue
+
+                if year is None:
+                    tf_key = self._db_connector._db_key('forex', ticker, tf)
+                else:
+                    tf_key = self._db_connector._db_key('forex', ticker, tf, year)
+
+                self._db_connector.write_data(tf_key, dataframe_tf)
+
+        for tf, rollup_start in rollup_starts.items():
+
+            self._refresh_tickers_years_info(ticker, tf)
+
+            logger.bind(target='histmanager').trace(
+                f'ticker {ticker}: {tf} timeframe rolled up from {rollup_start} '
+                f'to {tick_watermark}')
+
+    def _set_aggregation_watermarks(self,
+                                    ticker: str,
+                                    tick_watermark: Optional[datetime]) -> None:
+
+        # all tick data up to tick_watermark is now aggregated
+        # in the timeframes of the manager
+        if tick_watermark is None:
+            return
+
+        for tf in self._tf_list:
+            self._db_connector.set_aggregation_watermark(ticker, tf, tick_watermark)
+
     def _download_year(self,
                        ticker,
                        year,
@@ -536,6 +1193,7 @@ class HistoricalManagerDB:
         year_tick_df = empty_dataframe(self.engine)
         now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
 
+        months = []
         for month in MONTHS:
 
             month_num = MONTHS.index(month) + 1
@@ -559,84 +1217,112 @@ class HistoricalManagerDB:
                     )
                     continue
 
-            month_data = None
-            last_err = None
-            for connector in self._histdata_connector:
-                if (
+            months.append(month_num)
+
+        # months are downloaded concurrently by each connector, the months
+        # failed by a connector fall back to the next one
+        months_data: Dict[int, Any] = {}
+        months_error: Dict[int, Exception] = {}
+        last_connector_error: Dict[int, bool] = {}
+        pending = list(months)
+        for connector in self._histdata_connector:
+
+            if not pending:
+                break
+
+            connector_months = [
+                month_num for month_num in pending
+                if not (
                     isinstance(connector, HistDataConnector) and
                     year == now_utc.year and
                     month_num == now_utc.month
-                ):
-                    continue
+                )
+            ]
+            if not connector_months:
+                continue
 
-                try:
-                    if ticker.upper() not in connector.get_available_tickers():
-                        continue
-                except Exception:
+            try:
+                if ticker.upper() not in connector.get_available_tickers():
                     continue
+            except Exception:
+                continue
 
-                try:
-                    conn_engine = self.engine
-                    if isinstance(connector, DukascopyConnector) and conn_engine not in ('polars', 'polars_lazy'):
-                        conn_engine = 'polars'
+            conn_engine = self.engine
+            if isinstance(connector, DukascopyConnector) and conn_engine not in ('polars', 'polars_lazy'):
+                conn_engine = 'polars'
 
-                    month_data = connector.download_month_raw(
-                        ticker,
-                        year,
-                        month_num,
-                        engine=conn_engine
-                    )
+            try:
+                outcomes = connector.download_months_raw(
+                    ticker,
+                    year,
+                    connector_months,
+                    engine=conn_engine
+                )
+            except Exception as e:
+                outcomes = {month_num: e for month_num in connector_months}
 
-                    if isinstance(connector, DukascopyConnector) and self.engine not in ('polars', 'polars_lazy'):
-                        if self.engine == 'pandas':
-                            month_data = month_data.to_pandas()
-                        elif self.engine == 'pyarrow':
-                            month_data = month_data.to_arrow()
+            for month_num, month_data in outcomes.items():
 
-                    if is_empty_dataframe(month_data):
-                        raise TickerDataNotFoundError("Ticker data is empty/not found")
+                month = MONTHS[month_num - 1]
 
-                    last_err = None
-                    break
-                except TickerDataBadTypeException as e:
-                    last_err = e
-                    logger.bind(target='histmanager').warning(
-                        f"Connector {connector.__class__.__name__} failed for {ticker}-{year}-{month}: {e}. Trying fallback."
-                    )
-                    if connector == self._histdata_connector[-1]:
-                        raise e
-                except TickerDataNotFoundError as e:
-                    last_err = e
+                if (
+                    not isinstance(month_data, Exception) and
+                    is_empty_dataframe(month_data)
+                ):
+                    month_data = TickerDataNotFoundError("Ticker data is empty/not found")
+
+                is_last_connector = connector == self._histdata_connector[-1]
+                if isinstance(month_data, TickerDataNotFoundError):
                     logger.bind(target='histmanager').warning(
-                        f"Ticker {ticker}-{year}-{month} not found for connector {connector.__class__.__name__}."
-                    )
-                    if connector == self._histdata_connector[-1]:
-                        if missing_downloads is not None:
-                            missing_downloads.append(f"{ticker}-{year}-{month}")
-                except Exception as e:
-                    last_err = e
+                        f"Ticker {ticker}-{year}-{month} not found for connector {connector.__class__.__name__}."
+                    )
+                elif isinstance(month_data, Exception):
                     logger.bind(target='histmanager').warning(
-                        f"Connector {connector.__class__.__name__} failed for {ticker}-{year}-{month}: {e}. Trying fallback."
+                        f"Connector {connector.__class__.__name__} failed for {ticker}-{year}-{month}: {month_data}. Trying fallback."
                     )
-                    if connector == self._histdata_connector[-1]:
-                        raise e
+                else:
+                    if isinstance(connector, DukascopyConnector) and self.engine not in ('polars', 'polars_lazy'):
+                        if self.engine == 'pandas':
+                            month_data = month_data.to_pandas()
+                        elif self.engine == 'pyarrow':
+                            month_data = month_data.to_arrow()
+
+                    months_data[month_num] = month_data
+                    months_error.pop(month_num, None)
+                    pending.remove(month_num)
+                    continue
+
+                months_error[month_num] = month_data
+                last_connector_error[month_num] = is_last_connector
+
+        # merge in months order, an error of the last connector
+        # is raised unless the ticker data was not found
+        for month_num in months:
+
+            month = MONTHS[month_num - 1]
+            last_err = months_error.get(month_num)
 
             if last_err is not None:
+                if last_connector_error[month_num]:
+                    if isinstance(last_err, TickerDataNotFoundError):
+                        if missing_downloads is not None:
+                            missing_downloads.append(f"{ticker}-{year}-{month}")
+                    else:
+                        raise last_err
                 if (
                     year == now_utc.year and
                     month_num >= now_utc.month
                 ):
                     logger.bind(target='histmanager').warning(
-                        f"Ticker {ticker}-{year}-{MONTHS[month_num - 1]} query exceeded data availability for Historical Data"
+                        f"Ticker {ticker}-{year}-{month} query exceeded data availability for Historical Data"
                     )
                     break
                 if isinstance(last_err, TickerDataNotFoundError):
                     continue
-                elif isinstance(last_err, TickerDataBadTypeException):
-                    raise last_err
                 else:
                     raise last_err
 
+            month_data = months_data.get(month_num)
             if month_data is not None and not is_empty_dataframe(month_data):
 
                 # if first iteration, assign instead of concat
@@ -713,13 +1399,8 @@ class HistoricalManagerDB:
                     self._db_connector.write_data(tick_key,
                                                   year_tick_df)
 
-                    # update years list in local info file
-                    self._db_connector.add_tickers_years_info_to_file(ticker,
-                                                                      TICK_TIMEFRAME,
-                                                                      [year])
-
                     # update internal ticker years list info
-                    self._tickers_years_dict = self._db_connector.load_tickers_years_info()
+                    self._refresh_tickers_years_info(ticker, TICK_TIMEFRAME)
 
                 else:
                     logger.bind(
@@ -756,13 +1437,8 @@ class HistoricalManagerDB:
                 self._db_connector.write_data(tick_key,
                                               years_data_df)
 
-                # update years list in local info file
-                self._db_connector.add_tickers_years_info_to_file(ticker,
-                                                                  TICK_TIMEFRAME,
-                    years)
-
                 # update internal ticker years list info
-                self._tickers_years_dict = self._db_connector.load_tickers_years_info()
+                self._refresh_tickers_years_info(ticker, TICK_TIMEFRAME)
 
             else:
                 logger.bind(
@@ -780,10 +1456,33 @@ class HistoricalManagerDB:
         self._db_connector.clear_database(filter=filter)
 
         if filter:
-            self._tickers_years_dict = self._db_connector.load_tickers_years_info()
+            self._tickers_years_dict = self._db_connector.create_tickers_years_dict()
         else:
             self._tickers_years_dict.clear()
 
+    def compact_database(self, background: bool = False) -> None:
+        """
+        Fold month segments of the local database back into single year files.
+
+        Only meaningful when the database stores month segments
+        (db_files_month_segments enabled), otherwise it does nothing.
+
+        Args:
+            background (bool): run the compaction in a background thread.
+                Default is False.
+        """
+
+        if isinstance(self._db_connector, LocalDBYearConnector):
+            self._db_connector.compact_month_segments(background=background)
+
+    def get_ticker_byte_size(self, ticker: str) -> int:
+        """
+        Size on disk in bytes of the data of ticker in the local database,
+        tick and timeframes data included.
+        """
+
+        return self._db_connector.get_ticker_byte_size(ticker.lower())
+
     def add_timeframe(self, timeframe: str | List[str]) -> None:
         """
         Add and cache a new timeframe to the database.
@@ -907,15 +1606,15 @@ class HistoricalManagerDB:
             - First call for a new timeframe may take longer as it builds the aggregation
             - Downloaded data is cached for faster subsequent access
             - Ticker names are case-insensitive and automatically normalized
+            - With derived_timeframes enabled, a timeframe not stored is aggregated
+              in memory from the coarsest stored timeframe dividing it, if any.
+              Its vwmp_avg is approximate: the mean of the parent bars vwmp_avg,
+              not weighted by their ticks count as in stored timeframes
         """
 
         # check ticker exists in available tickers
         # from histdata database
-        if (
-            ticker.upper() not in self._histdata_tickers_list
-            and
-            ticker.lower() not in self._get_ticker_list()
-        ):
+        if not self._is_available_ticker(ticker):
             logger.bind(target='histmanager').error(
                 f'ticker {ticker.upper()} not found in database')
             raise TickerNotFoundError(f'ticker {ticker} not found in database')
@@ -964,231 +1663,292 @@ class HistoricalManagerDB:
                 f'date in database {now_utc}')
             raise ValueError(f'start date {start} is newer now date')
 
-        # get years including interval requested
-        years_interval_req = list(range(start.year, end.year + 1, 1))
+        # a timeframe not stored is derived from the bars of a stored one
+        parent = self._derived_timeframe_parent(ticker, timeframe)
+        if parent is not None:
 
-        # Initialize ticker/timeframe in dict if not present
-        if ticker not in self._tickers_years_dict:
-            self._tickers_years_dict[ticker] = {}
-        if timeframe not in self._tickers_years_dict[ticker]:
-            self._tickers_years_dict[ticker][timeframe] = YearMonthList()
-        if TICK_TIMEFRAME not in self._tickers_years_dict[ticker]:
-            self._tickers_years_dict[ticker][TICK_TIMEFRAME] = YearMonthList()
+            self._complete_tickers([ticker], parent, start, end)
 
-        # determine if current year data new download
-        # has to be requested
-        current_year = now_utc.year
-        is_current_year_requested = False
+            return self._read_derived_timeframe(ticker,
+                                                timeframe,
+                                                parent,
+                                                start,
+                                                end,
+                                                comparison_column_name,
+                                                check_level,
+                                                comparison_operator,
+                                                aggregation_mode)
 
-        ticker_available_last_timestamp = self._db_connector.read_last_timestamp('forex', ticker)
+        # plan coverage, download and aggregate what is missing
+        self._complete_tickers([ticker], timeframe, start, end)
 
-        if current_year in years_interval_req:
+        # execute a read query on database
+        return self._db_connector.read_data(
+            market='forex',
+            ticker=ticker,
+            timeframe=timeframe,
+            start=start,
+            end=end,
+            comparison_column_name=comparison_column_name,
+            check_level=check_level,
+            comparison_operator=comparison_operator,
+            comparison_aggregation_mode=aggregation_mode
+        )
 
-            if not ticker_available_last_timestamp:
+    def _derived_timeframe_parent(self, ticker: str, timeframe: str) -> Optional[str]:
+        '''
+        Stored timeframe of ticker to derive timeframe from if derived
+        timeframes are enabled and timeframe is not stored, None otherwise.
+        '''
 
-                # ticker is not in DD
-                # request for current year forced to True
-                is_current_year_requested = True
+        if not self.derived_timeframes or timeframe == TICK_TIMEFRAME:
+            return None
 
-            elif end >= ticker_available_last_timestamp:
+        timeframes_list = self._get_ticker_timeframes_list(ticker)
+        if timeframe in timeframes_list:
+            return None
 
-                # determine if to include and update of current year data
-                # if not is on a weekend day (Saturday or Sunday)
-                # set now as previous Friday at 17:00
-                if now_utc.weekday() in [5, 6]:
-                    now_ref = now_utc - timedelta(days=now_utc.weekday() + 1)
-                    now_ref = now_ref.replace(hour=17, minute=0, second=0, microsecond=0)
-                else:
-                    now_ref = now_utc
-
-                # Use the requested end date as the reference point for update,
-                # but capped at the current time (now_ref) since we cannot download future data.
-                # This prevents downloads when the requested end date is in the past
-                # and the database already has data up to that end date.
-                now_ref_ts = to_datetime(now_ref)
-                end_ts = to_datetime(end)
-                reference_time = min(end_ts, now_ref_ts)
-
-                is_current_year_requested = (
-                    (
-                        reference_time
-                        -
-                        to_datetime(ticker_available_last_timestamp)
-                    ).total_seconds()
-                    >
-                    to_timedelta(self.max_discrepancy_with_now).total_seconds()
-                )
+        return find_rollup_parent(timeframe, timeframes_list)
 
-            else:
+    def _read_derived_timeframe(
+        self,
+        ticker: str,
+        timeframe: str,
+        parent: str,
+        start: datetime,
+        end: datetime,
+        comparison_column_name: List[str] | str | None = None,
+        check_level: List[int | float] | int | float | None = None,
+        comparison_operator: List[SUPPORTED_SQL_COMPARISON_OPERATORS] | SUPPORTED_SQL_COMPARISON_OPERATORS | None = None,
+        aggregation_mode: SUPPORTED_SQL_CONDITION_AGGREGATION_MODES | None = None
+    ) -> Union[PolarsDataFrame, PolarsLazyFrame]:
+        '''
+        Read timeframe data between start and end by aggregating the
+        bars of the stored parent timeframe in memory, conditions
+        are evaluated on the derived bars.
+
+        Stored bars hold no ticks count, so vwmp_avg of a derived bar
+        is the unweighted mean of its parent bars vwmp_avg and differs
+        from the tick weighted mean of a stored bar when the parent bars
+        have uneven ticks counts. Open, high, low, close and volumes
+        are exact.
+        '''
+
+        if timeframe not in self._derived_warned_timeframes:
+            self._derived_warned_timeframes.add(timeframe)
+            logger.bind(target='histmanager').warning(
+                f'{timeframe} derived from {parent} bars: '
+                f'{COLUMN_NAME.VWMP_AVG} is approximate, '
+                f'not weighted by the ticks count of the {parent} bars')
+
+        # parent bars of the derived bars including start and end
+        bounds = PolarsSeries([start, end]).dt.truncate(timeframe)
+        parent_start = bounds[0]
+        parent_end = bounds.dt.offset_by(timeframe)[1]
+
+        predicate = col(COLUMN_NAME.TIMESTAMP).is_between(start, end)
+
+        conditions = compile_conditions_expression(comparison_column_name,
+                                                   check_level,
+                                                   comparison_operator,
+                                                   aggregation_mode)
+        if conditions is not None:
+            predicate = predicate & conditions
+
+        # collected before the pinned parent files are closed
+        with self._db_connector.pinned_reads():
+            dataframe = collect_lazyframe(
+                self._scan_derived_timeframe(ticker, timeframe, parent,
+                                             parent_start, parent_end, predicate),
+                self.polars_gpu_engine)
+
+        if self.engine == 'polars_lazy':
+            return dataframe.lazy()
+
+        return dataframe
+
+    def _scan_derived_timeframe(self,
+                                ticker: str,
+                                timeframe: str,
+                                parent: str,
+                                parent_start: datetime,
+                                parent_end: datetime,
+                                predicate: PolarsExpr) -> PolarsLazyFrame:
+
+        dataframe = self._db_connector.scan_data('forex',
+                                                 ticker,
+                                                 parent,
+                                                 parent_start,
+                                                 parent_end)
+
+        dataframe = reframe_data(
+            dataframe.filter(col(COLUMN_NAME.TIMESTAMP) < parent_end),
+            timeframe)
+
+        return dataframe.filter(predicate)
+
+    def get_data_many(
+        self,
+        tickers: List[str],
+        timeframe: str,
+        start,
+        end,
+        comparison_column_name: List[str] | str | None = None,
+        check_level: List[int | float] | int | float | None = None,
+        comparison_operator: List[SUPPORTED_SQL_COMPARISON_OPERATORS] | SUPPORTED_SQL_COMPARISON_OPERATORS | None = None,
+        aggregation_mode: SUPPORTED_SQL_CONDITION_AGGREGATION_MODES | None = None,
+        output: Literal['dict', 'long'] = 'dict'
+    ) -> Union[Dict[str, Union[PolarsDataFrame, PolarsLazyFrame]], PolarsDataFrame, PolarsLazyFrame]:
+        """
+        Retrieve OHLC historical data for a basket of tickers in one batch.
 
-                # db already cover request for current year
-                # end date is less recent than available timestamp
-                is_current_year_requested = False
+        Coverage is planned for all the tickers at once: the missing data
+        of every ticker is downloaded and aggregated under a single lock
+        acquisition, then the reads of all tickers are collected together
+        as one parallel query.
 
-        # here determine if to ask for new download
-        # if requested years are not already in localdb (tracked by tickers years dict)
-        # or if current year is requested
-        # check if requested year/months are subset
-        requested_subset = True
-        for y in years_interval_req:
-            start_m = start.month if y == start.year else 1
-            end_m = end.month if y == end.year else 12
-            if y == now_utc.year:
-                end_m = min(end_m, now_utc.month)
-            req_months = list(range(start_m, end_m + 1))
-            if not req_months:
-                continue
-            if y not in self._tickers_years_dict[ticker][timeframe]:
-                requested_subset = False
-                break
-            else:
-                available_months = self._tickers_years_dict[ticker][timeframe].months.get(y, [])
-                if not set(req_months).issubset(available_months):
-                    requested_subset = False
-                    break
+        Args:
+            tickers (List[str]): Currency pair symbols (e.g., ['EURUSD', 'GBPUSD']).
+                Case-insensitive.
+            timeframe (str): Candle timeframe for data aggregation, same as get_data.
+            start (str | datetime): Start date for data retrieval.
+            end (str | datetime): End date for data retrieval.
+            comparison_column_name (List[str] | str | None): Column names to retrieve. Default is None.
+            check_level (List[int | float] | int | float | None): Check level for conditions. Default is None.
+            comparison_operator (List[SUPPORTED_SQL_COMPARISON_OPERATORS] | SUPPORTED_SQL_COMPARISON_OPERATORS | None): Condition for data retrieval. Default is None.
+            aggregation_mode (SUPPORTED_SQL_CONDITION_AGGREGATION_MODES | None): Aggregation mode for data retrieval. Default is None.
+            output (str): 'dict' to return a dict ticker -> dataframe,
+                'long' to return a single dataframe with a ticker column.
+                Default is 'dict'.
 
-        if not requested_subset or is_current_year_requested:
-
-            # If the current year is requested, we force re-aggregation
-            # by removing it from the known timeframe list in memory
-            if is_current_year_requested:
-                for tf in list(self._tickers_years_dict[ticker].keys()):
-                    if tf != TICK_TIMEFRAME and current_year in self._tickers_years_dict[ticker][tf]:
-                        self._tickers_years_dict[ticker][tf].remove(current_year)
-
-            year_tf_missing = []
-            for y in years_interval_req:
-                start_m = start.month if y == start.year else 1
-                end_m = end.month if y == end.year else 12
-                if y == now_utc.year:
-                    end_m = min(end_m, now_utc.month)
-                req_months = list(range(start_m, end_m + 1))
-                if not req_months:
-                    continue
-                if y not in self._tickers_years_dict[ticker][timeframe]:
-                    year_tf_missing.append(y)
-                else:
-                    available_months = self._tickers_years_dict[ticker][timeframe].months.get(y, [])
-                    if not set(req_months).issubset(available_months):
-                        year_tf_missing.append(y)
-
-            year_tick_missing = []
-            for y in years_interval_req:
-                start_m = start.month if y == start.year else 1
-                end_m = end.month if y == end.year else 12
-                if y == now_utc.year:
-                    end_m = min(end_m, now_utc.month)
-                req_months = list(range(start_m, end_m + 1))
-                if not req_months:
-                    continue
-                if y not in self._tickers_years_dict[ticker][TICK_TIMEFRAME]:
-                    year_tick_missing.append(y)
-                else:
-                    available_months = self._tickers_years_dict[ticker][TICK_TIMEFRAME].months.get(y, [])
-                    if not set(req_months).issubset(available_months):
-                        year_tick_missing.append(y)
+        Returns:
+            Dict[str, PolarsDataFrame | PolarsLazyFrame] | PolarsDataFrame | PolarsLazyFrame:
+                data of each ticker, as returned by get_data.
 
-            if is_current_year_requested and current_year not in year_tick_missing:
-                year_tick_missing.append(current_year)
+        Raises:
+            TickerNotFoundError: If a ticker is not available in the historical database
+            ValueError: If timeframe or output are invalid
 
-            lock_file = str(Path(self.data_path) / "tickers_years_info.json.lock")
+        Example:
+            >>> manager = HistoricalManagerDB(config='data_config.yaml')
+            >>> data = manager.get_data_many(
+            ...     tickers=['EURUSD', 'GBPUSD', 'USDJPY'],
+            ...     timeframe='1h',
+            ...     start='2020-01-01',
+            ...     end='2020-01-31',
+            ...     output='long'
+            ... )
+        """
 
-            with FileLock(lock_file):
-                # Re-read the JSON file to fetch the latest state from disk
-                self._tickers_years_dict = self._db_connector.create_tickers_years_dict()
+        if output not in ('dict', 'long'):
 
-                # Initialize ticker/timeframe in dict if not present after rebuild
-                if ticker not in self._tickers_years_dict:
-                    self._tickers_years_dict[ticker] = {}
-                if timeframe not in self._tickers_years_dict[ticker]:
-                    self._tickers_years_dict[ticker][timeframe] = YearMonthList()
-                if TICK_TIMEFRAME not in self._tickers_years_dict[ticker]:
-                    self._tickers_years_dict[ticker][TICK_TIMEFRAME] = YearMonthList()
+            logger.bind(target='histmanager').error(
+                f'output {output} invalid: required dict or long')
+            raise ValueError(f'output {output} invalid: required dict or long')
 
-                if is_current_year_requested:
-                    for tf in list(self._tickers_years_dict[ticker].keys()):
-                        if tf != TICK_TIMEFRAME and current_year in self._tickers_years_dict[ticker][tf]:
-                            self._tickers_years_dict[ticker][tf].remove(current_year)
+        if isinstance(tickers, str):
 
-                # Re-calculate missing years after re-reading
-                year_tick_missing = []
-                for y in years_interval_req:
-                    start_m = start.month if y == start.year else 1
-                    end_m = end.month if y == end.year else 12
-                    if y == now_utc.year:
-                        end_m = min(end_m, now_utc.month)
-                    req_months = list(range(start_m, end_m + 1))
-                    if not req_months:
-                        continue
-                    if y not in self._tickers_years_dict[ticker][TICK_TIMEFRAME]:
-                        year_tick_missing.append(y)
-                    else:
-                        available_months = self._tickers_years_dict[ticker][TICK_TIMEFRAME].months.get(y, [])
-                        if not set(req_months).issubset(available_months):
-                            year_tick_missing.append(y)
+            tickers = [tickers]
 
-                if is_current_year_requested and current_year not in year_tick_missing:
-                    year_tick_missing.append(current_year)
+        # check tickers exist in available tickers
+        # from histdata database
+        tickers_list = []
+        for ticker in tickers:
 
-                # ONLY download years not already in the database
-                if year_tick_missing:
-                    self._download(
-                        ticker,
-                        year_tick_missing,
-                        start_month=start.month,
-                        end_month=end.month,
-                        start_year=start.year,
-                        end_year=end.year
+            if not self._is_available_ticker(ticker):
+                logger.bind(target='histmanager').error(
+                    f'ticker {ticker.upper()} not found in database')
+                raise TickerNotFoundError(f'ticker {ticker} not found in database')
+
+            tickers_list.append(ticker.lower())
+
+        tickers_list = list_remove_duplicates(tickers_list)
+
+        # force timeframe parameter to lower case
+        timeframe = timeframe.lower()
+
+        if not check_timeframe_str(timeframe, engine=self.engine):
+
+            logger.bind(target='histmanager').error(
+                f'timeframe request {timeframe} invalid')
+            raise ValueError(f'timeframe request {timeframe} invalid')
+
+        if start == 'now':
+            raise ValueError("start date cannot be 'now'")
+        if end == 'now':
+            end = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+        start = any_date_to_datetime64(start)
+        end = any_date_to_datetime64(end)
+
+        # sanity checks on query dates specific to historical data
+        if end < start or start < HISTORICAL_DB_MIN_DATE:
+
+            logger.bind(target='histmanager').error(
+                f'date interval {start} - {end} not valid, '
+                'end must be older than start and start not older than '
+                f'the minimum date in database {HISTORICAL_DB_MIN_DATE}')
+
+            if output == 'long':
+                return self._dataframe_type([])
+
+            return {ticker: self._dataframe_type([]) for ticker in tickers_list}
+
+        now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
+        if start > now_utc:
+
+            logger.bind(target='histmanager').error(
+                f'start date {start} is newer than the maximum '
+                f'date in database {now_utc}')
+            raise ValueError(f'start date {start} is newer now date')
+
+        # plan coverage for all tickers, download and aggregate what is missing
+        self._complete_tickers(tickers_list, timeframe, start, end)
+
+        try:
+
+            # one lazy query per ticker, executed together
+            with self._db_connector.pinned_reads():
+
+                queries = [
+                    self._db_connector.scan_data(
+                        market='forex',
+                        ticker=ticker,
+                        timeframe=timeframe,
+                        start=start,
+                        end=end,
+                        comparison_column_name=comparison_column_name,
+                        check_level=check_level,
+                        comparison_operator=comparison_operator,
+                        comparison_aggregation_mode=aggregation_mode
                     )
-                else:
-                    logger.bind(
-                        target='histmanager').info(
-                        f"Skipped downloading {ticker} {years_interval_req} as it was managed by another process.")
+                    for ticker in tickers_list
+                ]
 
-                # add timeframe and update db INSIDE the lock so that
-                # a concurrent process can't read a parquet that is still
-                # being written by this process
-                self.add_timeframe(timeframe)
-                self._update_db(ticker)
+                dataframes = collect_all(queries)
 
-                # check if requested year/months are subset after processing
-                completed_ok = True
-                for y in years_interval_req:
-                    start_m = start.month if y == start.year else 1
-                    end_m = end.month if y == end.year else 12
-                    if y == now_utc.year:
-                        end_m = min(end_m, now_utc.month)
-                    req_months = list(range(start_m, end_m + 1))
-                    if not req_months:
-                        continue
-                    if y not in self._tickers_years_dict[ticker][timeframe]:
-                        completed_ok = False
-                        break
-                    else:
-                        available_months = self._tickers_years_dict[ticker][timeframe].months.get(y, [])
-                        if not set(req_months).issubset(available_months):
-                            completed_ok = False
-                            break
+        except Exception as e:
 
-                if not completed_ok:
+            logger.bind(target='histmanager').error(
+                f'reading {tickers_list} {timeframe} between {start} and {end} failed: {e}')
+            raise
 
-                    logger.bind(target='histmanager').critical(
-                        f'processing year data completion for '
-                        f'{years_interval_req} not ok')
-                    raise ValueError
+        if output == 'long':
 
-        # execute a read query on database
-        return self._db_connector.read_data(
-            market='forex',
-            ticker=ticker,
-            timeframe=timeframe,
-            start=start,
-            end=end,
-            comparison_column_name=comparison_column_name,
-            check_level=check_level,
-            comparison_operator=comparison_operator,
-            comparison_aggregation_mode=aggregation_mode
-        )
+            dataframe = concat([
+                dataframe.select(lit(ticker).alias(COLUMN_NAME.TICKER), col('*'))
+                for ticker, dataframe in zip(tickers_list, dataframes)
+            ], how='vertical')
+
+            if self.engine == 'polars_lazy':
+                return dataframe.lazy()
+
+            return dataframe
+
+        if self.engine == 'polars_lazy':
+            dataframes = [dataframe.lazy() for dataframe in dataframes]
+
+        return dict(zip(tickers_list, dataframes))
 
     def get_data_window(
         self,
@@ -1268,10 +2028,7 @@ class HistoricalManagerDB:
 
         # check ticker exists in available tickers
         # from histdata database
-        if (
-            ticker.upper() not in self._histdata_tickers_list and
-            ticker.lower() not in self._get_ticker_list()
-        ):
+        if not self._is_available_ticker(ticker):
             logger.bind(target='histmanager').error(
                 f'ticker {ticker.upper()} not found in database')
             raise TickerNotFoundError(f'ticker {ticker} not found in database')
@@ -1323,217 +2080,8 @@ class HistoricalManagerDB:
                 f'date in database {now_utc}')
             raise ValueError(f'start date {start} is newer now date')
 
-        # get years including interval requested
-        years_interval_req = list(range(start.year, end.year + 1, 1))
-
-        # Initialize ticker/timeframe in dict if not present
-        if ticker not in self._tickers_years_dict:
-            self._tickers_years_dict[ticker] = {}
-        if timeframe not in self._tickers_years_dict[ticker]:
-            self._tickers_years_dict[ticker][timeframe] = YearMonthList()
-        if TICK_TIMEFRAME not in self._tickers_years_dict[ticker]:
-            self._tickers_years_dict[ticker][TICK_TIMEFRAME] = YearMonthList()
-
-        # determine if current year data new download
-        # has to be requested
-        is_current_year_requested = False
-        current_year = now_utc.year
-
-        ticker_available_last_timestamp = self._db_connector.read_last_timestamp('forex', ticker)
-
-        if current_year in years_interval_req:
-
-            if not ticker_available_last_timestamp:
-
-                # ticker is not in DD
-                # request for current year forced to True
-                is_current_year_requested = True
-
-            elif end >= ticker_available_last_timestamp:
-
-                # determine if to include and update of current year data
-                # if not is on a weekend day (Saturday or Sunday)
-                # set now as previous Friday at 17:00
-                if now_utc.weekday() in [5, 6]:
-                    now_ref = now_utc - timedelta(days=now_utc.weekday() + 1)
-                    now_ref = now_ref.replace(hour=17, minute=0, second=0, microsecond=0)
-                else:
-                    now_ref = now_utc
-
-                # Use the requested end date as the reference point for update,
-                # but capped at the current time (now_ref) since we cannot download future data.
-                # This prevents downloads when the requested end date is in the past
-                # and the database already has data up to that end date.
-                now_ref_ts = to_datetime(now_ref)
-                end_ts = to_datetime(end)
-                reference_time = min(end_ts, now_ref_ts)
-
-                is_current_year_requested = (
-                    (
-                        reference_time
-                        -
-                        to_datetime(ticker_available_last_timestamp)
-                    ).total_seconds()
-                    >
-                    to_timedelta(self.max_discrepancy_with_now).total_seconds()
-                )
-
-            else:
-
-                # db already cover request for current year
-                # end date is less recent than available timestamp
-                is_current_year_requested = False
-
-        # here determine if to ask for new download
-        # if requested years are not already in localdb (tracked by tickers years dict)
-        # or if current year is requested
-        # check if requested year/months are subset
-        requested_subset = True
-        for y in years_interval_req:
-            start_m = start.month if y == start.year else 1
-            end_m = end.month if y == end.year else 12
-            if y == now_utc.year:
-                end_m = min(end_m, now_utc.month)
-            req_months = list(range(start_m, end_m + 1))
-            if not req_months:
-                continue
-            if y not in self._tickers_years_dict[ticker][timeframe]:
-                requested_subset = False
-                break
-            else:
-                available_months = self._tickers_years_dict[ticker][timeframe].months.get(y, [])
-                if not set(req_months).issubset(available_months):
-                    requested_subset = False
-                    break
-
-        if not requested_subset or is_current_year_requested:
-
-            # If the current year is requested, we force re-aggregation by removing it from the known timeframe list in memory
-            if is_current_year_requested:
-                for tf in list(self._tickers_years_dict[ticker].keys()):
-                    if tf != TICK_TIMEFRAME and current_year in self._tickers_years_dict[ticker][tf]:
-                        self._tickers_years_dict[ticker][tf].remove(current_year)
-
-            year_tf_missing = []
-            for y in years_interval_req:
-                start_m = start.month if y == start.year else 1
-                end_m = end.month if y == end.year else 12
-                if y == now_utc.year:
-                    end_m = min(end_m, now_utc.month)
-                req_months = list(range(start_m, end_m + 1))
-                if not req_months:
-                    continue
-                if y not in self._tickers_years_dict[ticker][timeframe]:
-                    year_tf_missing.append(y)
-                else:
-                    available_months = self._tickers_years_dict[ticker][timeframe].months.get(y, [])
-                    if not set(req_months).issubset(available_months):
-                        year_tf_missing.append(y)
-
-            year_tick_missing = []
-            for y in years_interval_req:
-                start_m = start.month if y == start.year else 1
-                end_m = end.month if y == end.year else 12
-                if y == now_utc.year:
-                    end_m = min(end_m, now_utc.month)
-                req_months = list(range(start_m, end_m + 1))
-                if not req_months:
-                    continue
-                if y not in self._tickers_years_dict[ticker][TICK_TIMEFRAME]:
-                    year_tick_missing.append(y)
-                else:
-                    available_months = self._tickers_years_dict[ticker][TICK_TIMEFRAME].months.get(y, [])
-                    if not set(req_months).issubset(available_months):
-                        year_tick_missing.append(y)
-
-            if is_current_year_requested and current_year not in year_tick_missing:
-                year_tick_missing.append(current_year)
-
-            lock_file = str(Path(self.data_path) / "tickers_years_info.json.lock")
-
-            with FileLock(lock_file):
-                # Re-read the JSON file to fetch the latest state from disk
-                self._tickers_years_dict = self._db_connector.create_tickers_years_dict()
-
-                # Initialize ticker/timeframe in dict if not present after rebuild
-                if ticker not in self._tickers_years_dict:
-                    self._tickers_years_dict[ticker] = {}
-                if timeframe not in self._tickers_years_dict[ticker]:
-                    self._tickers_years_dict[ticker][timeframe] = YearMonthList()
-                if TICK_TIMEFRAME not in self._tickers_years_dict[ticker]:
-                    self._tickers_years_dict[ticker][TICK_TIMEFRAME] = YearMonthList()
-
-                if is_current_year_requested:
-                    for tf in list(self._tickers_years_dict[ticker].keys()):
-                        if tf != TICK_TIMEFRAME and current_year in self._tickers_years_dict[ticker][tf]:
-                            self._tickers_years_dict[ticker][tf].remove(current_year)
-
-                # Re-calculate missing years after re-reading
-                year_tick_missing = []
-                for y in years_interval_req:
-                    start_m = start.month if y == start.year else 1
-                    end_m = end.month if y == end.year else 12
-                    if y == now_utc.year:
-                        end_m = min(end_m, now_utc.month)
-                    req_months = list(range(start_m, end_m + 1))
-                    if not req_months:
-                        continue
-                    if y not in self._tickers_years_dict[ticker][TICK_TIMEFRAME]:
-                        year_tick_missing.append(y)
-                    else:
-                        available_months = self._tickers_years_dict[ticker][TICK_TIMEFRAME].months.get(y, [])
-                        if not set(req_months).issubset(available_months):
-                            year_tick_missing.append(y)
-
-                if is_current_year_requested and current_year not in year_tick_missing:
-                    year_tick_missing.append(current_year)
-
-                # ONLY download years not already in the database
-                if year_tick_missing:
-                    self._download(
-                        ticker,
-                        year_tick_missing,
-                        start_month=start.month,
-                        end_month=end.month,
-                        start_year=start.year,
-                        end_year=end.year
-                    )
-                else:
-                    logger.bind(
-                        target='histmanager').info(
-                        f"Skipped downloading {ticker} {years_interval_req} as it was managed by another process.")
-
-                # add timeframe and update db INSIDE the lock so that
-                # a concurrent process can't read a parquet that is still
-                # being written by this process
-                self.add_timeframe(timeframe)
-                self._update_db(ticker)
-
-                # check if requested year/months are subset after processing
-                completed_ok = True
-                for y in years_interval_req:
-                    start_m = start.month if y == start.year else 1
-                    end_m = end.month if y == end.year else 12
-                    if y == now_utc.year:
-                        end_m = min(end_m, now_utc.month)
-                    req_months = list(range(start_m, end_m + 1))
-                    if not req_months:
-                        continue
-                    if y not in self._tickers_years_dict[ticker][timeframe]:
-                        completed_ok = False
-                        break
-                    else:
-                        available_months = self._tickers_years_dict[ticker][timeframe].months.get(y, [])
-                        if not set(req_months).issubset(available_months):
-                            completed_ok = False
-                            break
-
-                if not completed_ok:
-
-                    logger.bind(target='histmanager').critical(
-                        f'processing year data completion for '
-                        f'{years_interval_req} not ok')
-                    raise ValueError
+        # plan coverage, download and aggregate what is missing
+        self._complete_tickers([ticker], timeframe, start, end)
 
         return self._db_connector.read_data_window(
             market='forex',
@@ -1622,9 +2170,15 @@ class HistoricalManagerDB:
         # update tickers years info file with current data status
         self._db_connector.save_tickers_years_info(self._tickers_years_dict)
 
+        # fold month segments written in this session into year files
+        if self.db_files_month_segments:
+            self.compact_database()
+
         # clear temporary files
         self._clear_temporary_data_folder()
 
-        # call connectors clear method
-        for conn in self.get_source_connectors():
-            conn.clear_temporary_folder()
+        # call connectors clear method, shared connectors
+        # are cleared by the manager that created them
+        if not self.source_connectors:
+            for conn in self.get_source_connectors():
+                conn.clear_temporary_folder()
@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent cache of the raw payloads downloaded by remote connectors
+
+Original payloads (zip archives, bi5 chunks) are stored as content
+addressed blobs, named by their sha256 digest, so that identical
+payloads are stored once. A sqlite index in the cache folder maps
+each key (source, ticker, year, period) to its blob with the byte
+size, and records the last access time used to evict least recently
+used payloads over a byte budget.
+
+Parsing and ingestion can then be repeated from local payloads,
+without downloading them again from the data provider.
+"""
+
+import os
+import sqlite3
+from contextlib import closing
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from attrs import (
+    define,
+    field,
+    validators
+)
+from loguru import logger
+
+
+__all__ = [
+    'RawDownloadCache'
+]
+
+
+RAW_CACHE_INDEX_FILENAME = 'index.sqlite'
+RAW_CACHE_BLOBS_FOLDER = 'blobs'
+
+RAW_CACHE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS payloads (
+    source        TEXT NOT NULL,
+    ticker        TEXT NOT NULL,
+    year          INTEGER NOT NULL,
+    period        INTEGER NOT NULL,
+    digest        TEXT NOT NULL,
+    byte_size     INTEGER NOT NULL,
+    last_access   REAL NOT NULL,
+    PRIMARY KEY (source, ticker, year, period)
+);
+CREATE INDEX IF NOT EXISTS payloads_last_access
+    ON payloads (last_access);
+'''
+
+
+@define(kw_only=True, slots=True)
+class RawDownloadCache:
+    '''
+    Content addressed cache of raw downloads with a byte budget.
+
+    A payload is keyed by source, ticker, year and period (month or
+    hour number), payloads larger than the budget are not cached.
+    '''
+
+    cache_path: Path = field(converter=Path)
+    max_bytes: int = field(validator=[validators.instance_of(int),
+                                      validators.gt(0)])
+    timeout: float = field(default=60.0,
+                           validator=validators.instance_of(float))
+
+    _lock: Any = field(factory=Lock, init=False)
+    _hits: int = field(default=0, init=False)
+    _misses: int = field(default=0, init=False)
+    _evictions: int = field(default=0, init=False)
+
+    def __attrs_post_init__(self) -> None:
+
+        (self.cache_path / RAW_CACHE_BLOBS_FOLDER).mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.executescript(RAW_CACHE_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+
+        # a connection per operation keeps the cache usable
+        # from threads and processes sharing the cache folder
+        connection = sqlite3.connect(self.cache_path / RAW_CACHE_INDEX_FILENAME,
+                                     timeout=self.timeout)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _blob_path(self, digest: str) -> Path:
+
+        return self.cache_path / RAW_CACHE_BLOBS_FOLDER / digest[:2] / digest
+
+    @staticmethod
+    def _key(source: str, ticker: str, year: int, period: int) -> tuple:
+
+        return (source.lower(), ticker.lower(), int(year), int(period))
+
+    def get(self,
+            source: str,
+            ticker: str,
+            year: int,
+            period: int) -> Optional[bytes]:
+        '''
+        Get the payload cached under the key, None if not cached
+        or if its content does not match the digest recorded.
+        '''
+
+        key = self._key(source, ticker, year, period)
+
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                'SELECT digest, byte_size FROM payloads '
+                'WHERE source = ? AND ticker = ? AND year = ? AND period = ?',
+                key).fetchone()
+
+        payload = None
+        if row is not None:
+            try:
+                payload = self._blob_path(row['digest']).read_bytes()
+            except OSError:
+                payload = None
+
+            # a truncated or corrupted blob is dropped, never served
+            if payload is not None and (
+                len(payload) != row['byte_size']
+                or sha256(payload).hexdigest() != row['digest']
+            ):
+                logger.bind(target='rawcache').warning(
+                    f'Raw cache payload of {key} does not match its digest, discarded')
+                payload = None
+                self.invalidate(*key)
+
+        if payload is None:
+            with self._lock:
+                self._misses += 1
+            return None
+
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.execute(
+                    'UPDATE payloads SET last_access = ? '
+                    'WHERE source = ? AND ticker = ? AND year = ? AND period = ?',
+                    (time(), *key))
+
+        with self._lock:
+            self._hits += 1
+
+        return payload
+
+    def put(self,
+            source: str,
+            ticker: str,
+            year: int,
+            period: int,
+            payload: bytes) -> None:
+        '''
+        Store the payload under the key, then evict least recently
+        used payloads to keep the cache within max_bytes.
+        '''
+
+        if len(payload) > self.max_bytes:
+            return
+
+        key = self._key(source, ticker, year, period)
+        digest = sha256(payload).hexdigest()
+        blob_path = self._blob_path(digest)
+
+        try:
+
+            if not blob_path.exists():
+                # write aside and rename, readers never see a partial blob
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = blob_path.with_name(f'{digest}.{uuid4().hex}.tmp')
+                temp_path.write_bytes(payload)
+                os.replace(temp_path, blob_path)
+
+            with closing(self._connect()) as connection:
+                with connection:
+                    replaced = connection.execute(
+                        'SELECT digest FROM payloads '
+                        'WHERE source = ? AND ticker = ? AND year = ? AND period = ?',
+                        key).fetchone()
+                    connection.execute(
+                        'INSERT OR REPLACE INTO payloads '
+                        '(source, ticker, year, period, digest, '
+                        'byte_size, last_access) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        (*key, digest, len(payload), time()))
+
+            if replaced is not None and replaced['digest'] != digest:
+                self._remove_unreferenced_blob(replaced['digest'])
+
+            self._evict()
+
+        except (OSError, sqlite3.Error) as e:
+
+            # a cache failure never fails the download
+            logger.bind(target='rawcache').warning(
+                f'Error storing raw cache payload of {key}: {e}')
+
+    def invalidate(self,
+                   source: Optional[str] = None,
+                   ticker: Optional[str] = None,
+                   year: Optional[int] = None,
+                   period: Optional[int] = None) -> None:
+        '''
+        Remove the entries matching the given key elements,
+        with no element given all entries are removed.
+        '''
+
+        conditions = []
+        parameters: list = []
+        for name, value in (('source', source), ('ticker', ticker)):
+            if value is not None:
+                conditions.append(f'{name} = ?')
+                parameters.append(value.lower())
+        for name, value in (('year', year), ('period', period)):
+            if value is not None:
+                conditions.append(f'{name} = ?')
+                parameters.append(int(value))
+        where = f' WHERE {" AND ".join(conditions)}' if conditions else ''
+
+        with closing(self._connect()) as connection:
+            with connection:
+                digests = {row['digest'] for row in connection.execute(
+                    f'SELECT digest FROM payloads{where}', parameters)}
+                connection.execute(f'DELETE FROM payloads{where}', parameters)
+
+        for digest in digests:
+            self._remove_unreferenced_blob(digest)
+
+    def clear(self) -> None:
+
+        self.invalidate()
+
+    def stats(self) -> Dict[str, int]:
+
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                'SELECT COUNT(*) AS entries FROM payloads').fetchone()
+            entries = row['entries']
+
+        with self._lock:
+
+            return {
+                'entries': entries,
+                'bytes': self._stored_bytes(),
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions
+            }
+
+    def _stored_bytes(self) -> int:
+
+        # blobs shared by several keys are counted once
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                'SELECT COALESCE(SUM(byte_size), 0) AS stored FROM '
+                '(SELECT DISTINCT digest, byte_size FROM payloads)').fetchone()
+
+        return row['stored']
+
+    def _evict(self) -> None:
+
+        stored = self._stored_bytes()
+        while stored > self.max_bytes:
+
+            with closing(self._connect()) as connection:
+                with connection:
+                    row = connection.execute(
+                        'SELECT source, ticker, year, period, digest FROM payloads '
+                        'ORDER BY last_access LIMIT 1').fetchone()
+                    if row is None:
+                        return
+                    connection.execute(
+                        'DELETE FROM payloads '
+                        'WHERE source = ? AND ticker = ? AND year = ? AND period = ?',
+                        (row['source'], row['ticker'], row['year'], row['period']))
+
+            self._remove_unreferenced_blob(row['digest'])
+            with self._lock:
+                self._evictions += 1
+
+            stored = self._stored_bytes()
+
+    def _remove_unreferenced_blob(self, digest: str) -> None:
+
+        with closing(self._connect()) as connection:
+            referenced = connection.execute(
+                'SELECT 1 FROM payloads WHERE digest = ? LIMIT 1',
+                (digest,)).fetchone()
+
+        if referenced is None:
+            self._blob_path(digest).unlink(missing_ok=True)
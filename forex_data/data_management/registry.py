@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent registry of the tickers available from the data providers
+
+A json file records the tickers list of each historical data provider
+with the time of the last refresh. A manager reads it at construction
+instead of querying the providers, and refreshes it only when it is
+older than its time to live or an unknown ticker is requested.
+
+The file is replaced atomically, so concurrent processes sharing the
+data folder always read a complete registry.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from attrs import (
+    define,
+    field,
+    validators
+)
+from loguru import logger
+
+
+__all__ = [
+    'TickerRegistry'
+]
+
+
+@define(kw_only=True, slots=True)
+class TickerRegistry:
+    '''
+    json registry of the tickers available per data provider.
+
+    Tickers are stored upper case, a registry never refreshed or
+    older than ttl is expired.
+    '''
+
+    filepath: Path = field(converter=Path)
+    ttl: timedelta = field(validator=validators.instance_of(timedelta))
+
+    _data: Optional[Dict[str, Any]] = field(default=None, init=False)
+
+    def _load(self) -> Dict[str, Any]:
+
+        if self._data is not None:
+            return self._data
+
+        data: Dict[str, Any] = {'updated_at': None, 'providers': {}}
+        try:
+            content = json.loads(self.filepath.read_text())
+            data['updated_at'] = datetime.fromisoformat(content['updated_at'])
+            data['providers'] = {provider: list(tickers)
+                                 for provider, tickers in content['providers'].items()}
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.bind(target='histmanager').warning(
+                f'Tickers registry {self.filepath} is not valid, ignored: {e}')
+
+        self._data = data
+        return data
+
+    def reload(self) -> None:
+        '''
+        Drop the content read, the file is read again at next access.
+        '''
+
+        self._data = None
+
+    def providers(self) -> Dict[str, List[str]]:
+
+        return dict(self._load()['providers'])
+
+    def tickers(self) -> List[str]:
+        '''
+        Get the sorted tickers available from any provider.
+        '''
+
+        return sorted({ticker
+                       for tickers in self._load()['providers'].values()
+                       for ticker in tickers})
+
+    def updated_at(self) -> Optional[datetime]:
+
+        return self._load()['updated_at']
+
+    def is_expired(self) -> bool:
+
+        updated_at = self.updated_at()
+
+        return (updated_at is None
+                or datetime.now(timezone.utc) - updated_at > self.ttl)
+
+    def update(self, providers: Dict[str, List[str]]) -> None:
+        '''
+        Replace the tickers lists of the given providers, the lists
+        of other providers are kept, and set the refresh time to now.
+        '''
+
+        self.reload()
+        data = self._load()
+        data['providers'].update({
+            provider: sorted({ticker.upper() for ticker in tickers})
+            for provider, tickers in providers.items()})
+        data['updated_at'] = datetime.now(timezone.utc)
+
+        # write aside and rename, readers never see a partial file
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        temp_filepath = self.filepath.with_name(
+            f'{self.filepath.name}.{uuid4().hex}.tmp')
+        try:
+            temp_filepath.write_text(json.dumps({
+                'updated_at': data['updated_at'].isoformat(),
+                'providers': data['providers']
+            }, indent=4))
+            os.replace(temp_filepath, self.filepath)
+        except OSError as e:
+            temp_filepath.unlink(missing_ok=True)
+            logger.bind(target='histmanager').error(
+                f'Error writing tickers registry {self.filepath}: {e}')
+            raise
@@ -17,15 +17,22 @@ Created on Sun Feb 23 00:02:36 2025
 #         OSS versions for windows required
 #
 
+import asyncio
 import os
 import shutil
+import sqlite3
 import time
 import socket
 import ssl
 import struct
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from threading import Lock
 from uuid import uuid4
+import httpx
 import requests
 from requests import Session
+from requests.adapters import HTTPAdapter
 from io import BytesIO
 from zipfile import ZipFile, ZipExtFile, BadZipFile
 from textwrap import dedent
@@ -33,12 +40,13 @@ from bs4 import BeautifulSoup
 import pandas as pd
 import polars as pl
 from attrs import define, field, validators, validate
-from typing import Any, Dict, List, Union
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Union
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from re import search
 
 from pyarrow import (
+    float32 as pyarrow_float32,
     int64 as pyarrow_int64,
     string as pyarrow_string,
     BufferReader,
@@ -58,7 +66,8 @@ from .common import (
     PolarsFloat32,
     DATE_FORMAT_SQL,
     TEMP_FOLDER,
-    TEMP_CSV_FILE,
+    RAW_CACHE_FOLDER,
+    TICK_VAULT_STORE_FOLDER,
     SUPPORTED_DATA_FILES,
     SUPPORTED_DATA_ENGINES,
     DATA_COLUMN_NAMES,
@@ -68,11 +77,16 @@ from .common import (
     HISTDATA_URL_TICKDATA_TEMPLATE,
     HISTDATA_BASE_DOWNLOAD_METHOD,
     HISTDATA_BASE_DOWNLOAD_URL,
+    HISTDATA_MAX_CONCURRENT_DOWNLOADS,
+    DUKASCOPY_MAX_CONCURRENT_DOWNLOADS,
+    DUKASCOPY_PUBLISH_DELAY,
     MONTHS,
     DTYPE_DICT,
     PYARROW_DTYPE_DICT,
     POLARS_DTYPE_DICT,
     TWELVE_DATA_CHUNK_SIZE,
+    TWELVE_DATA_MAX_CONCURRENT_REQUESTS,
+    TWELVE_DATA_REQUEST_TIMEOUT,
     TWELVE_DATA_FREE_TIER_MINUTE_RATE_LIMIT,
     TWELVE_DATA_PRO_MINUTE_RATE_LIMIT,
     TWELVEDATA_PROVIDER_PLAN_LIST,
@@ -88,14 +102,21 @@ from .common import (
     TickerDataBadTypeException,
     get_attrs_names,
     collect_lazyframe,
+    HISTDATA_PROVIDER,
+    DUKASCOPY_PROVIDER,
+    TWELVEDATA_PROVIDER,
 )
 
+from .rawcache import RawDownloadCache
 from ..config import _apply_config
 
 
 @define(kw_only=True, slots=True)
 class RemoteConnector:
 
+    # data provider name
+    provider: ClassVar[str] = ''
+
     # interface parameters
     data_path: Union[str, Path] = field(default='', validator=validators.or_(
         validators.instance_of(str), validators.instance_of(Path)))
@@ -107,10 +128,23 @@ class RemoteConnector:
                                     validator=validators.instance_of(bool))
     volume_data: bool = field(default=False,
                               validator=validators.instance_of(bool))
+    max_concurrent_downloads: int = field(default=1,
+                                          validator=[validators.instance_of(int),
+                                                     validators.gt(0)])
+    # byte budget of the persistent cache of raw downloaded
+    # payloads, 0 disables the cache
+    raw_cache_max_bytes: int = field(default=0,
+                                     validator=[validators.instance_of(int),
+                                                validators.ge(0)])
 
     # internal parameters
     _tickers_years_info_filepath = field(default=Path('.'))
     _temporary_data_path = field(default=Path('.'))
+    _raw_cache: Any = field(default=None, init=False)
+    _tickers_cache: List[str] = field(factory=list,
+                                      validator=validators.instance_of(list))
+    _active_downloads: int = field(default=0, init=False)
+    _downloads_lock: Any = field(factory=Lock, init=False)
 
     def __init__(self, **kwargs: Any) -> None:
 
@@ -141,6 +175,11 @@ class RemoteConnector:
         self.clear_temporary_folder()
         self._temporary_data_path.mkdir(parents=True, exist_ok=False)
 
+        # raw payloads cache persists across instances and sessions
+        if self.raw_cache_max_bytes > 0:
+            self._raw_cache = RawDownloadCache(cache_path=self.data_path / RAW_CACHE_FOLDER,
+                                               max_bytes=self.raw_cache_max_bytes)
+
     def connect(self) -> Any:
         """Connect to database - must be implemented by subclasses."""
         raise NotImplementedError("Subclasses must implement connect")
@@ -190,10 +229,44 @@ class RemoteConnector:
             except Exception:
                 pass
 
+    @contextmanager
+    def _downloads_batch(self) -> Iterator[None]:
+        '''
+        Scope of a batch of downloads using the temporary folder, the
+        folder is cleared when the last batch in flight is done, so that
+        a connector can be shared by several threads.
+        '''
+
+        with self._downloads_lock:
+            self._active_downloads += 1
+
+        try:
+            yield
+        finally:
+            with self._downloads_lock:
+                self._active_downloads -= 1
+                if self._active_downloads == 0:
+                    self._downloads_done()
+
+    def _downloads_done(self) -> None:
+        '''
+        Called when the last batch of downloads in flight is done.
+        '''
+
+        self.clear_temporary_folder()
+
     def get_available_tickers(self) -> List[str]:
         """Get available tickers - must be implemented by subclasses."""
         raise NotImplementedError("Subclasses must implement get_available_tickers")
 
+    def set_available_tickers(self, tickers: List[str]) -> None:
+        """
+        Set the tickers list returned by get_available_tickers with no
+        request to the provider, e.g. from a persistent registry.
+        An empty list makes the next call query the provider again.
+        """
+        self._tickers_cache = sorted({ticker.upper() for ticker in tickers})
+
     def get_data(self, symbol: str, timeframe: str, start_date: str, end_date: str) -> PolarsLazyFrame:
         """Get data - must be implemented by subclasses."""
         raise NotImplementedError("Subclasses must implement get_data")
@@ -236,6 +309,54 @@ class RemoteConnector:
         """
         raise NotImplementedError("Subclasses must implement download_month_raw")
 
+    def download_months_raw(
+        self,
+        ticker: str,
+        year: int,
+        months: List[int],
+        engine: str = 'polars_lazy'
+    ) -> Dict[int, Union[PolarsDataFrame, PolarsLazyFrame, Exception]]:
+        """
+        Download several months of tick data of a year, at most
+        max_concurrent_downloads months at a time on a thread pool.
+
+        Parameters
+        ----------
+        ticker : str
+            Forex pair symbol (e.g. 'eurusd').
+        year : int
+            Data year.
+        months : List[int]
+            Month numbers (1-12) to download.
+        engine : str
+            DataFrame engine to use for parsing.
+
+        Returns
+        -------
+        Dict[int, Union[PolarsDataFrame, PolarsLazyFrame, Exception]]
+            Month number to tick data, in the order of months.
+            A month whose download failed is mapped to the exception
+            raised, so that the caller can fall back per month.
+        """
+
+        def download(month_num: int) -> Any:
+
+            try:
+                return self.download_month_raw(ticker, year, month_num, engine=engine)
+            except Exception as e:
+                return e
+
+        workers = min(self.max_concurrent_downloads, len(months))
+
+        with self._downloads_batch():
+            if workers <= 1:
+                outcomes = [download(month_num) for month_num in months]
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    outcomes = list(executor.map(download, months))
+
+        return dict(zip(months, outcomes))
+
 
 # HISTORICAL DATA CONNECTOR CLASS (histdata.com)
 
@@ -250,13 +371,16 @@ class HistDataConnector(RemoteConnector):
     connector interface.
     """
 
+    provider: ClassVar[str] = HISTDATA_PROVIDER
+
     # interface parameters
     ssl_verify: bool = field(default=True, validator=validators.instance_of(bool))
+    max_concurrent_downloads: int = field(default=HISTDATA_MAX_CONCURRENT_DOWNLOADS,
+                                          validator=[validators.instance_of(int),
+                                                     validators.gt(0)])
 
     # internal parameters
     _session: Session = field(factory=Session)
-    _tickers_cache: List[str] = field(factory=list,
-                                      validator=validators.instance_of(list))
 
     def __init__(self, **kwargs: Any) -> None:
 
@@ -389,7 +513,10 @@ class HistDataConnector(RemoteConnector):
         Scrapes the download token from the histdata page, POSTs to
         the download endpoint to retrieve the ZIP archive, extracts
         the CSV content, and converts it to a DataFrame using the
-        specified engine.
+        specified engine. With the raw cache enabled the ZIP archive
+        of an ended month is read from the cache when present, and
+        stored in it after a successful download. A cached archive
+        failing to parse is removed from the cache and downloaded again.
 
         Parameters
         ----------
@@ -421,103 +548,173 @@ class HistDataConnector(RemoteConnector):
             If the extracted file type is unexpected.
         """
 
-        self._temporary_data_path.mkdir(parents=True, exist_ok=True)
+        url = HISTDATA_URL_TICKDATA_TEMPLATE.format(
+            ticker=ticker.lower(),
+            year=year,
+            month_num=month_num
+        )
+
+        payload = None
+        if self._raw_cache is not None:
+            payload = self._raw_cache.get(HISTDATA_PROVIDER, ticker, year, month_num)
+            if payload is not None:
+                logger.bind(target='histdata').trace(
+                    f'{ticker} - {year} - {MONTHS[month_num - 1]}: read from raw cache')
+
+        downloaded = payload is None
+        if downloaded:
+            r = self._download_month_payload(ticker, year, month_num, url)
+            payload = r.content
 
         try:
-            temp_filepath = str(
-                self._temporary_data_path /
-                (f'{ticker}_' +
-                 f'{year}_' +
-                 f'{MONTHS[month_num - 1]}_' +
-                 TEMP_CSV_FILE)
-            )
 
-            url = HISTDATA_URL_TICKDATA_TEMPLATE.format(
-                ticker=ticker.lower(),
-                year=year,
-                month_num=month_num
-            )
-            r = self._session.get(url)
+            data = self._month_payload_to_df(payload, ticker, year, month_num,
+                                             url, engine)
 
-            token = None
-            try:
-                token = search('id="tk" value="(.*?)"', r.text).groups()[0]
-            except AttributeError:
-                logger.bind(target='histdata').critical(
-                    f'token value was not found scraping '
-                    f'url {url}: {ticker} not existing or'
-                    f'not supported by histdata.com: {ticker} - '
-                    f'{year}-{MONTHS[month_num - 1]}')
-
-            # If exception was caught, token will still be None
-            if token is None:
-                raise TickerNotFoundError(
-                    f"Ticker {ticker} not found or not supported by histdata.com")
-
-            headers = {'Referer': url}
-            data = {
-                'tk': token,
-                'date': year,
-                'datemonth': "%d%02d" % (year, month_num),
-                'platform': 'ASCII',
-                'timeframe': 'T',
-                'fxpair': ticker
-            }
+        except Exception as e:
 
-            # logger trace ticker year and month specifed are being downloaded
-            logger.bind(target='histdata').trace(
-                f'{ticker} - {year} - {MONTHS[month_num - 1]}: downloading')
-            r = self._session.request(
-                HISTDATA_BASE_DOWNLOAD_METHOD,
-                HISTDATA_BASE_DOWNLOAD_URL,
-                data=data,
-                headers=headers,
-                stream=True
-            )
+            if downloaded:
+                raise
+
+            # a cached payload failing to parse is dropped
+            # and downloaded again, never served again
+            logger.bind(target='histdata').warning(
+                f'{ticker} - {year} - {MONTHS[month_num - 1]}: '
+                f'raw cache payload invalid, downloading again: {e}')
+            self._raw_cache.invalidate(HISTDATA_PROVIDER, ticker, year, month_num)
+
+            downloaded = True
+            r = self._download_month_payload(ticker, year, month_num, url)
+            payload = r.content
+            data = self._month_payload_to_df(payload, ticker, year, month_num,
+                                             url, engine)
+
+        # cache only payloads parsed successfully of months already
+        # ended, the current month file is still growing upstream
+        month_end = datetime(year + month_num // 12, month_num % 12 + 1, 1)
+        if (
+            downloaded and
+            self._raw_cache is not None and
+            month_end <= datetime.now()
+        ):
+            self._raw_cache.put(HISTDATA_PROVIDER, ticker, year, month_num, payload)
 
-            bio = BytesIO()
+        return data
 
-            # write content to stream
-            bio.write(r.content)
+    def _month_payload_to_df(
+        self,
+        payload: bytes,
+        ticker: str,
+        year: int,
+        month_num: int,
+        url: str,
+        engine: str
+    ) -> Union[PolarsDataFrame, PolarsLazyFrame]:
+        """
+        Extract the CSV file of the month ZIP archive payload
+        and parse it into a DataFrame with the specified engine.
 
+        Raises
+        ------
+        TickerDataBadTypeException
+            If payload is not a valid ZIP file.
+        TickerDataNotFoundError
+            If the ZIP archive contents cannot be extracted.
+        """
+
+        try:
+            # zip archive read in memory
+            zf = ZipFile(BytesIO(payload))
+        except BadZipFile as e:
+            # here will be a warning log
+            logger.bind(target='histdata').error(
+                dedent(f'''Data {ticker} - {year} - {MONTHS[month_num - 1]}: {e}
+                           url: {url}'''))
+            raise TickerDataBadTypeException(
+                dedent(f'''Data {ticker} - {year} - {MONTHS[month_num - 1]} BadZipFile error: {e}
+                           url: {url}'''))
+        else:
+            # extract and parse zip file content
             try:
-                zf = ZipFile(bio)
-            except BadZipFile as e:
-                # here will be a warning log
+                ExtFile = zf.open(zf.namelist()[0])
+            except Exception as e:
                 logger.bind(target='histdata').error(
-                    dedent(f'''Data {ticker} - {year} - {MONTHS[month_num - 1]}: {e}
-                               url: {url}'''))
-                raise TickerDataBadTypeException(
-                    dedent(f'''Data {ticker} - {year} - {MONTHS[month_num - 1]} BadZipFile error: {e}
-                               url: {url}'''))
+                    f'{ticker} - {year} - {MONTHS[month_num - 1]}: '
+                    f'not found or invalid download: {e}')
+                raise TickerDataNotFoundError(
+                    f"Data {ticker} - {year} - {MONTHS[month_num - 1]} not found or not supported by histdata.com")
             else:
-                # extract and parse zip file content
-                try:
-                    ExtFile = zf.open(zf.namelist()[0])
-                except Exception as e:
+                if isinstance(ExtFile, ZipExtFile):
+                    data = self._raw_zipfile_to_df(
+                        ExtFile, engine=engine
+                    )
+                else:
                     logger.bind(target='histdata').error(
                         f'{ticker} - {year} - {MONTHS[month_num - 1]}: '
-                        f'not found or invalid download: {e}')
-                    raise TickerDataNotFoundError(
-                        f"Data {ticker} - {year} - {MONTHS[month_num - 1]} not found or not supported by histdata.com")
-                else:
-                    if isinstance(ExtFile, ZipExtFile):
-                        return self._raw_zipfile_to_df(
-                            ExtFile, temp_filepath, engine=engine
-                        )
-                    else:
-                        logger.bind(target='histdata').error(
-                            f'{ticker} - {year} - {MONTHS[month_num - 1]}: '
-                            f'data type not expected')
-                        raise TickerDataBadTypeException(
-                            f"Data {ticker} - {year} - {MONTHS[month_num - 1]} type not expected")
-        finally:
-            self.clear_temporary_folder()
+                        f'data type not expected')
+                    raise TickerDataBadTypeException(
+                        f"Data {ticker} - {year} - {MONTHS[month_num - 1]} type not expected")
+
+        return data
+
+    def _download_month_payload(
+        self,
+        ticker: str,
+        year: int,
+        month_num: int,
+        url: str
+    ) -> requests.Response:
+        """
+        Scrape the download token from the month page at url and
+        POST to the download endpoint to get the month ZIP archive.
+
+        Raises
+        ------
+        TickerNotFoundError
+            If the download token cannot be scraped (ticker not supported).
+        """
+
+        r = self._session.get(url)
+
+        token = None
+        try:
+            token = search('id="tk" value="(.*?)"', r.text).groups()[0]
+        except AttributeError:
+            logger.bind(target='histdata').critical(
+                f'token value was not found scraping '
+                f'url {url}: {ticker} not existing or'
+                f'not supported by histdata.com: {ticker} - '
+                f'{year}-{MONTHS[month_num - 1]}')
+
+        # If exception was caught, token will still be None
+        if token is None:
+            raise TickerNotFoundError(
+                f"Ticker {ticker} not found or not supported by histdata.com")
+
+        headers = {'Referer': url}
+        data = {
+            'tk': token,
+            'date': year,
+            'datemonth': "%d%02d" % (year, month_num),
+            'platform': 'ASCII',
+            'timeframe': 'T',
+            'fxpair': ticker
+        }
+
+        # logger trace ticker year and month specifed are being downloaded
+        logger.bind(target='histdata').trace(
+            f'{ticker} - {year} - {MONTHS[month_num - 1]}: downloading')
+        return self._session.request(
+            HISTDATA_BASE_DOWNLOAD_METHOD,
+            HISTDATA_BASE_DOWNLOAD_URL,
+            data=data,
+            headers=headers,
+            stream=True
+        )
 
     def _raw_zipfile_to_df(
         self,
         raw_file: ZipExtFile,
-        temp_filepath: str,
         engine: str = 'polars'
     ) -> Union[PolarsDataFrame, PolarsLazyFrame]:
         """
@@ -526,13 +723,12 @@ class HistDataConnector(RemoteConnector):
         Handles engine-specific parsing for pandas, pyarrow, polars,
         and polars_lazy engines. Computes the 'p' (mid-price) column
         and performs deduplication and business-day filtering.
+        The file content is parsed in memory, no temporary file is written.
 
         Parameters
         ----------
         raw_file : ZipExtFile
             The opened file from the downloaded ZIP archive.
-        temp_filepath : str
-            Path for temporary CSV file used during parsing.
         engine : str, optional
             DataFrame engine to use, by default 'polars'.
 
@@ -541,11 +737,7 @@ class HistDataConnector(RemoteConnector):
         Union[PolarsDataFrame, PolarsLazyFrame]
             Parsed tick data DataFrame.
         """
-        from polars import (
-            String as polars_string,
-            col
-        )
-        from polars.exceptions import ComputeError
+        from polars import col
 
         if engine == 'pandas':
 
@@ -582,24 +774,6 @@ class HistDataConnector(RemoteConnector):
 
         elif engine == 'pyarrow':
 
-            buf = BufferReader(raw_file.read())
-
-            if (
-                Path(temp_filepath).exists() and
-                Path(temp_filepath).is_file()
-            ):
-
-                Path(temp_filepath).unlink(missing_ok=True)
-
-            else:
-
-                # create temporary files directory if not present
-                tempdir_path = Path(temp_filepath).parent
-                tempdir_path.mkdir(exist_ok=True)
-
-            # download buffer to file
-            buf.download(temp_filepath)
-
             # use pyarrow native options
             read_opts = arrow_csv.ReadOptions(
                 use_threads=True,
@@ -621,17 +795,17 @@ class HistDataConnector(RemoteConnector):
                 column_types=modtypes
             )
 
-            # at first read file with timestamp as a string
+            # at first read file content with timestamp as a string
             df = read_csv(
                 'pyarrow',
-                temp_filepath,
+                BufferReader(raw_file.read()),
                 read_options=read_opts,
                 parse_options=parse_opts,
                 convert_options=convert_opts
             )
 
             # convert timestamp string array to pyarrow timestamp('ms')
-            mod_format = DATE_FORMAT_HISTDATA_CSV.removesuffix('%f')
+            mod_format = DATE_FORMAT_HISTDATA_CSV.removesuffix('%3f')
             ts2 = pc.strptime(pc.utf8_slice_codeunits(
                 df[COLUMN_NAME.TIMESTAMP], 0, 15), format=mod_format, unit="ms")
             d = pc.utf8_slice_codeunits(df[COLUMN_NAME.TIMESTAMP],
@@ -665,84 +839,12 @@ class HistDataConnector(RemoteConnector):
                 schema=schema(PYARROW_DTYPE_DICT.TIME_TICK_DTYPE.copy().items())
             )
 
-        elif engine == 'polars':
-
-            # download to temporary csv file
-            buf = BufferReader(raw_file.read())
-
-            if (
-                Path(temp_filepath).exists() and
-                Path(temp_filepath).is_file()
-            ):
+        elif engine in ('polars', 'polars_lazy'):
 
-                Path(temp_filepath).unlink(missing_ok=True)
-
-            else:
+            df = self._parse_tick_csv(raw_file.read())
 
-                # create temporary files directory if not present
-                tempdir_path = Path(temp_filepath).parent
-                tempdir_path.mkdir(exist_ok=True)
-
-            buf.download(temp_filepath)
-
-            try:
-                # Fast path: try reading directly as Float32
-                raw_file_dtypes = {
-                    COLUMN_NAME.TIMESTAMP: polars_string,
-                    COLUMN_NAME.ASK: PolarsFloat32,
-                    COLUMN_NAME.BID: PolarsFloat32,
-                    COLUMN_NAME.VOLUME: PolarsFloat32
-                }
-
-                df = read_csv(
-                    'polars',
-                    temp_filepath,
-                    separator=',',
-                    has_header=False,
-                    new_columns=[COLUMN_NAME.TIMESTAMP, COLUMN_NAME.ASK, COLUMN_NAME.BID, COLUMN_NAME.VOLUME],
-                    schema_overrides=raw_file_dtypes,
-                    use_pyarrow=True
-                )
-                df = df.with_columns(
-                    col(COLUMN_NAME.TIMESTAMP).str.strptime(
-                        PolarsDatetime('ms'),
-                        format=DATE_FORMAT_HISTDATA_CSV
-                    )
-                )
-
-            except Exception as e:
-
-                logger.bind(target='histdata').warning(f'Occurred Exception: {type(e).__name__} - {e}.'
-                                                       'Trying remove trailing spaces method')
-
-                # Safe path: fallback to parsing all as String, stripping whitespace, and casting
-                df = read_csv(
-                    'polars',
-                    temp_filepath,
-                    separator=',',
-                    has_header=False,
-                    schema={
-                        'column_1': polars_string,
-                        'column_2': polars_string,
-                        'column_3': polars_string,
-                        'column_4': polars_string
-                    }
-                )
-                df = df.rename({
-                    'column_1': COLUMN_NAME.TIMESTAMP,
-                    'column_2': COLUMN_NAME.ASK,
-                    'column_3': COLUMN_NAME.BID,
-                    'column_4': COLUMN_NAME.VOLUME
-                })
-                df = df.with_columns([
-                    col(COLUMN_NAME.TIMESTAMP).str.strptime(
-                        PolarsDatetime('ms'),
-                        format=DATE_FORMAT_HISTDATA_CSV
-                    ),
-                    col(COLUMN_NAME.ASK).str.strip_chars().cast(PolarsFloat32),
-                    col(COLUMN_NAME.BID).str.strip_chars().cast(PolarsFloat32),
-                    col(COLUMN_NAME.VOLUME).str.strip_chars().cast(PolarsFloat32)
-                ])
+            if engine == 'polars_lazy':
+                df = df.lazy()
 
             # Localize and convert timezone from America/New_York (EST/EDT) to UTC
             df = df.with_columns(
@@ -769,117 +871,77 @@ class HistDataConnector(RemoteConnector):
             # remove business days
             df = business_days_data(df)
 
-        elif engine == 'polars_lazy':
+        else:
 
-            # download to temporary csv file
-            buf = BufferReader(raw_file.read())
+            logger.bind(target='histdata').error(f'Engine {engine} is not supported')
+            raise TypeError
 
-            if (
-                Path(temp_filepath).exists() and
-                Path(temp_filepath).is_file()
-            ):
+        # return dataframe
+        return df
 
-                Path(temp_filepath).unlink(missing_ok=True)
+    def _parse_tick_csv(self, content: bytes) -> PolarsDataFrame:
+        """
+        Parse the content of a histdata tick csv file with the polars
+        multithreaded csv reader, timestamps are left in the histdata
+        America/New_York time.
 
-            else:
+        Parameters
+        ----------
+        content : bytes
+            Decompressed csv file content.
 
-                # create temporary files directory if not present
-                tempdir_path = Path(temp_filepath).parent
-                tempdir_path.mkdir(exist_ok=True)
+        Returns
+        -------
+        PolarsDataFrame
+            Columns timestamp, ask, bid, vol.
+        """
+        from polars import (
+            String as polars_string,
+            col
+        )
 
-            # download buffer to file
-            buf.download(temp_filepath)
+        column_names = [COLUMN_NAME.TIMESTAMP, COLUMN_NAME.ASK, COLUMN_NAME.BID, COLUMN_NAME.VOLUME]
 
-            try:
-                # Fast path: try reading directly as Float32
-                raw_file_dtypes = {
+        try:
+            # Fast path: pinned schema with float prices
+            df = pl.read_csv(
+                content,
+                has_header=False,
+                schema={
                     COLUMN_NAME.TIMESTAMP: polars_string,
                     COLUMN_NAME.ASK: PolarsFloat32,
                     COLUMN_NAME.BID: PolarsFloat32,
                     COLUMN_NAME.VOLUME: PolarsFloat32
                 }
-
-                df = read_csv(
-                    'polars_lazy',
-                    temp_filepath,
-                    separator=',',
-                    has_header=False,
-                    new_columns=[COLUMN_NAME.TIMESTAMP, COLUMN_NAME.ASK, COLUMN_NAME.BID, COLUMN_NAME.VOLUME],
-                    schema_overrides=raw_file_dtypes
-                )
-                df = df.with_columns(
-                    col(COLUMN_NAME.TIMESTAMP).str.strptime(
-                        PolarsDatetime('ms'),
-                        format=DATE_FORMAT_HISTDATA_CSV
-                    )
+            )
+            df = df.with_columns(
+                col(COLUMN_NAME.TIMESTAMP).str.strptime(
+                    PolarsDatetime('ms'),
+                    format=DATE_FORMAT_HISTDATA_CSV
                 )
-                df = collect_lazyframe(df, self.polars_gpu_engine).lazy()
+            )
 
-            except Exception as e:
-                logger.bind(target='histdata').warning(f'Occurred Exception: {type(e).__name__}\n'
-                                                       f' {e}. \n'
-                                                       'Trying remove trailing spaces method')
-                # Safe path: fallback to parsing all as String, stripping whitespace, and casting
-                df = read_csv(
-                    'polars_lazy',
-                    temp_filepath,
-                    separator=',',
-                    has_header=False,
-                    schema={
-                        'column_1': polars_string,
-                        'column_2': polars_string,
-                        'column_3': polars_string,
-                        'column_4': polars_string
-                    }
-                )
-                df = df.rename({
-                    'column_1': COLUMN_NAME.TIMESTAMP,
-                    'column_2': COLUMN_NAME.ASK,
-                    'column_3': COLUMN_NAME.BID,
-                    'column_4': COLUMN_NAME.VOLUME
-                })
-                df = df.with_columns([
-                    col(COLUMN_NAME.TIMESTAMP).str.strptime(
-                        PolarsDatetime('ms'),
-                        format=DATE_FORMAT_HISTDATA_CSV
-                    ),
-                    col(COLUMN_NAME.ASK).str.strip_chars().cast(PolarsFloat32),
-                    col(COLUMN_NAME.BID).str.strip_chars().cast(PolarsFloat32),
-                    col(COLUMN_NAME.VOLUME).str.strip_chars().cast(PolarsFloat32)
-                ])
-                df = collect_lazyframe(df, self.polars_gpu_engine).lazy()
+        except Exception as e:
 
-            # Localize and convert timezone from America/New_York (EST/EDT) to UTC
-            df = df.with_columns(
-                col(COLUMN_NAME.TIMESTAMP)
-                .dt.replace_time_zone('America/New_York', ambiguous='earliest', non_existent='null')
-                .dt.convert_time_zone('UTC')
-                .dt.replace_time_zone(None)
-            ).filter(col(COLUMN_NAME.TIMESTAMP).is_not_null())
+            logger.bind(target='histdata').warning(f'Occurred Exception: {type(e).__name__} - {e}.'
+                                                   'Trying remove trailing spaces method')
 
-            # calculate ask_volume, bid_volume, vwmp
+            # Safe path: fallback to parsing all as String, stripping whitespace, and casting
+            df = pl.read_csv(
+                content,
+                has_header=False,
+                schema={name: polars_string for name in column_names}
+            )
             df = df.with_columns([
-                (col(COLUMN_NAME.VOLUME) * 0.0).alias(COLUMN_NAME.ASK_VOLUME),
-                (col(COLUMN_NAME.VOLUME) * 0.0).alias(COLUMN_NAME.BID_VOLUME),
-                ((col(COLUMN_NAME.ASK) + col(COLUMN_NAME.BID)) / 2).alias(COLUMN_NAME.VWMP)
+                col(COLUMN_NAME.TIMESTAMP).str.strip_chars().str.strptime(
+                    PolarsDatetime('ms'),
+                    format=DATE_FORMAT_HISTDATA_CSV
+                ),
+                col(COLUMN_NAME.ASK).str.strip_chars().cast(PolarsFloat32),
+                col(COLUMN_NAME.BID).str.strip_chars().cast(PolarsFloat32),
+                col(COLUMN_NAME.VOLUME).str.strip_chars().cast(PolarsFloat32)
             ])
 
-            # final cast to standard dtypes
-            df = df.select(DATA_COLUMN_NAMES.TICK_DATA).cast(POLARS_DTYPE_DICT.TIME_TICK_DTYPE)
-
-            # clean duplicated timestamps rows, keep first by default
-            df = df.unique(subset=[COLUMN_NAME.TIMESTAMP],
-                           keep='first')
-
-            # remove business days
-            df = business_days_data(df)
-
-        else:
-
-            logger.bind(target='histdata').error(f'Engine {engine} is not supported')
-            raise TypeError
-
-        # return dataframe
         return df
 
 
@@ -892,13 +954,26 @@ class DukascopyConnector(RemoteConnector):
     behind a single RemoteConnector-derived interface.
     """
 
+    provider: ClassVar[str] = DUKASCOPY_PROVIDER
+
     # interface parameters
     ssl_verify: bool = field(default=True, validator=validators.instance_of(bool))
+    max_concurrent_downloads: int = field(default=DUKASCOPY_MAX_CONCURRENT_DOWNLOADS,
+                                          validator=[validators.instance_of(int),
+                                                     validators.gt(0)])
+    # keep the downloaded hourly chunks and the tick_vault metadata
+    # in a persistent store under data_path, so that a refresh
+    # downloads only the hours not attempted yet
+    tick_vault_store: bool = field(default=False,
+                                   validator=validators.instance_of(bool))
+    # days of hourly chunks kept in the persistent store,
+    # 0 keeps all of them
+    tick_vault_retention_days: int = field(default=0,
+                                           validator=[validators.instance_of(int),
+                                                      validators.ge(0)])
 
     # internal parameters
     _session: Session = field(factory=Session)
-    _tickers_cache: List[str] = field(factory=list,
-                                      validator=validators.instance_of(list))
 
     def __init__(self, **kwargs: Any) -> None:
 
@@ -965,15 +1040,28 @@ class DukascopyConnector(RemoteConnector):
 
         # Configure tick_vault if it's imported
         try:
-            from tick_vault import reload_config
-            reload_config(
-                base_directory=str(self._temporary_data_path),
-                worker_per_proxy=3,
-                fetch_max_retry_attempts=3,
-            )
+            self._configure_tick_vault()
         except ImportError:
             logger.bind(target='dukascopy').warning("tick_vault is not installed. Please install it to use DukascopyConnector.")
 
+    @property
+    def tick_vault_directory(self) -> Path:
+        """Base directory of tick_vault: the persistent store or the temporary folder."""
+        if self.tick_vault_store:
+            return self.data_path / TICK_VAULT_STORE_FOLDER
+        return self._temporary_data_path
+
+    def _configure_tick_vault(self) -> None:
+        """Point tick_vault at its base directory, raises ImportError if not installed."""
+        from tick_vault import reload_config
+
+        self.tick_vault_directory.mkdir(parents=True, exist_ok=True)
+        reload_config(
+            base_directory=str(self.tick_vault_directory),
+            worker_per_proxy=3,
+            fetch_max_retry_attempts=3,
+        )
+
     def check_connection(self) -> bool:
         """Test connectivity to dukascopy.com."""
         url = "https://www.dukascopy.com/swiss/english/marketwatch/historical/"
@@ -1064,6 +1152,43 @@ class DukascopyConnector(RemoteConnector):
         Union[PolarsDataFrame, PolarsLazyFrame]
             Polars DataFrame or LazyFrame with column names matching HistDataConnector.
         """
+        month_data = self.download_months_raw(ticker, year, [month_num], engine=engine)[month_num]
+
+        if isinstance(month_data, Exception):
+            raise month_data
+
+        return month_data
+
+    def download_months_raw(
+        self,
+        ticker: str,
+        year: int,
+        months: List[int],
+        engine: str = 'polars_lazy'
+    ) -> Dict[int, Union[PolarsDataFrame, PolarsLazyFrame, Exception]]:
+        """
+        Downloads tick data for several months of a year from Dukascopy using tick_vault.
+
+        The months are downloaded concurrently on a single event loop,
+        at most max_concurrent_downloads months at a time.
+
+        Parameters
+        -------
+        ticker: str
+            The currency pair (e.g., 'EURUSD').
+        year: int
+            Year of the data to download.
+        months: List[int]
+            Months of the data (1-12).
+        engine: str
+            Either 'polars' or 'polars_lazy'.
+
+        Returns
+        -------
+        Dict[int, Union[PolarsDataFrame, PolarsLazyFrame, Exception]]
+            Month number to Polars DataFrame or LazyFrame, in the order of months.
+            A month whose download failed is mapped to the exception raised.
+        """
         # Input validation
         ticker_upper = ticker.upper()
         if ticker_upper not in self.get_available_tickers():
@@ -1072,8 +1197,9 @@ class DukascopyConnector(RemoteConnector):
         if not isinstance(year, int) or year < 2000 or year > datetime.now().year + 1:
             raise ValueError(f"Invalid year: {year}")
 
-        if not isinstance(month_num, int) or month_num < 1 or month_num > 12:
-            raise ValueError(f"Invalid month number: {month_num}")
+        for month_num in months:
+            if not isinstance(month_num, int) or month_num < 1 or month_num > 12:
+                raise ValueError(f"Invalid month number: {month_num}")
 
         if engine not in ('polars', 'polars_lazy'):
             raise ValueError(f"Unsupported engine: {engine}. Only 'polars' and 'polars_lazy' are supported.")
@@ -1085,71 +1211,185 @@ class DukascopyConnector(RemoteConnector):
             logger.bind(target='dukascopy').error("tick_vault is not installed. Cannot download data.")
             raise RuntimeError("tick_vault is not installed.")
 
-        # Ensure temporary data path exists and reconfigure tick_vault to use it
-        self._temporary_data_path.mkdir(parents=True, exist_ok=True)
-        try:
-            from tick_vault import reload_config
-            reload_config(
-                base_directory=str(self._temporary_data_path),
-                worker_per_proxy=3,
-                fetch_max_retry_attempts=3,
-            )
-        except ImportError:
-            pass
+        # hours attempted are never attempted again in the persistent
+        # store: stop at the last hour already published
+        last_published = (datetime.now(timezone.utc).replace(tzinfo=None) -
+                          DUKASCOPY_PUBLISH_DELAY).replace(minute=0, second=0, microsecond=0)
 
-        try:
+        def month_interval(month_num: int) -> tuple:
             # Determine start and end date for the month
             start = datetime(year, month_num, 1)
             if month_num == 12:
                 end = datetime(year + 1, 1, 1)
             else:
                 end = datetime(year, month_num + 1, 1)
+            if self.tick_vault_store:
+                end = max(start, min(end, last_published))
+            return start, end
+
+        async def download_month(semaphore: Any, month_num: int) -> None:
+            async with semaphore:
+                start, end = month_interval(month_num)
+                if start >= end:
+                    return
+                logger.bind(target='dukascopy').info(f"Downloading {ticker_upper} for {year}-{month_num:02d}...")
+                await download_range(symbol=ticker_upper, start=start, end=end)
+
+        async def download_all() -> list:
+            semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
+            return await asyncio.gather(*(download_month(semaphore, month_num) for month_num in months),
+                                        return_exceptions=True)
+
+        with self._downloads_batch():
+            # Ensure tick_vault base directory exists and reconfigure tick_vault to use it
+            self._configure_tick_vault()
 
             # Run async download process in the event loop
-            logger.bind(target='dukascopy').info(f"Downloading {ticker_upper} for {year}-{month_num:02d}...")
             try:
                 loop = asyncio.get_running_loop()
             except RuntimeError:
                 loop = asyncio.new_event_loop()
                 asyncio.set_event_loop(loop)
 
-            loop.run_until_complete(download_range(symbol=ticker_upper, start=start, end=end))
+            outcomes = loop.run_until_complete(download_all())
 
-            # Read downloaded tick data into Pandas DataFrame
-            logger.bind(target='dukascopy').info(f"Reading downloaded tick data for {ticker_upper}...")
-            pandas_df = read_tick_data(symbol=ticker_upper, start=start, end=end, strict=False)
+            results: Dict[int, Any] = {}
+            for month_num, outcome in zip(months, outcomes):
 
-            if pandas_df.empty:
-                logger.bind(target='dukascopy').warning(f"No data returned for {ticker_upper} {year}-{month_num}")
-                empty_df = PolarsDataFrame(schema=POLARS_DTYPE_DICT.TIME_TICK_DTYPE)
-                return empty_df.lazy() if engine == 'polars_lazy' else empty_df
+                if isinstance(outcome, Exception):
+                    logger.bind(target='dukascopy').error(
+                        f"Download failed for {ticker_upper} {year}-{month_num:02d}: {outcome}")
+                    results[month_num] = outcome
+                    continue
 
-            # Convert to Polars LazyFrame
-            pl_df = pl.from_pandas(pandas_df).lazy()
+                start, end = month_interval(month_num)
+                if start >= end:
+                    # month not published yet
+                    empty_df = PolarsDataFrame(schema=POLARS_DTYPE_DICT.TIME_TICK_DTYPE)
+                    results[month_num] = empty_df.lazy() if engine == 'polars_lazy' else empty_df
+                    continue
 
-            # Rename columns to match TIME_TICK_DTYPE
-            pl_df = pl_df.rename({"time": COLUMN_NAME.TIMESTAMP})
+                try:
+                    results[month_num] = self._read_month_tick_data(
+                        read_tick_data, ticker_upper, start, end, engine)
+                except Exception as e:
+                    results[month_num] = e
 
-            # Calculate vwmp (volume weighted mid price)
-            pl_df = pl_df.with_columns([
-                pl.col(COLUMN_NAME.ASK_VOLUME).cast(pl.Float32),
-                pl.col(COLUMN_NAME.BID_VOLUME).cast(pl.Float32),
-                ((pl.col(COLUMN_NAME.BID) * pl.col(COLUMN_NAME.ASK_VOLUME) + pl.col(COLUMN_NAME.ASK) * pl.col(COLUMN_NAME.BID_VOLUME)) / 
-                 (pl.col(COLUMN_NAME.ASK_VOLUME) + pl.col(COLUMN_NAME.BID_VOLUME))).cast(pl.Float32).alias(COLUMN_NAME.VWMP)
-            ])
+            return results
 
-            # Cast to required TICK schema
-            pl_df = pl_df.select(list(POLARS_DTYPE_DICT.TIME_TICK_DTYPE.keys())).cast(POLARS_DTYPE_DICT.TIME_TICK_DTYPE)
+    def _read_month_tick_data(
+        self,
+        read_tick_data: Any,
+        ticker_upper: str,
+        start: datetime,
+        end: datetime,
+        engine: str
+    ) -> Union[PolarsDataFrame, PolarsLazyFrame]:
 
-            # Deduplicate on timestamp and sort chronologically
-            pl_df = pl_df.unique(subset=[COLUMN_NAME.TIMESTAMP], keep='first', maintain_order=True).sort(COLUMN_NAME.TIMESTAMP)
+        # Read downloaded tick data into Pandas DataFrame
+        logger.bind(target='dukascopy').info(f"Reading downloaded tick data for {ticker_upper}...")
+        pandas_df = read_tick_data(symbol=ticker_upper, start=start, end=end, strict=False)
 
-            # Filter out business days/hours using standard helper
-            pl_df = business_days_data(pl_df)
+        if pandas_df.empty:
+            logger.bind(target='dukascopy').warning(f"No data returned for {ticker_upper} {start.year}-{start.month}")
+            empty_df = PolarsDataFrame(schema=POLARS_DTYPE_DICT.TIME_TICK_DTYPE)
+            return empty_df.lazy() if engine == 'polars_lazy' else empty_df
 
-            return pl_df if engine == 'polars_lazy' else collect_lazyframe(pl_df, self.polars_gpu_engine)
-        finally:
-            self.clear_temporary_folder()
+        # Convert to Polars LazyFrame
+        pl_df = pl.from_pandas(pandas_df).lazy()
+
+        # Rename columns to match TIME_TICK_DTYPE
+        pl_df = pl_df.rename({"time": COLUMN_NAME.TIMESTAMP})
+
+        # Calculate vwmp (volume weighted mid price)
+        pl_df = pl_df.with_columns([
+            pl.col(COLUMN_NAME.ASK_VOLUME).cast(pl.Float32),
+            pl.col(COLUMN_NAME.BID_VOLUME).cast(pl.Float32),
+            ((pl.col(COLUMN_NAME.BID) * pl.col(COLUMN_NAME.ASK_VOLUME) + pl.col(COLUMN_NAME.ASK) * pl.col(COLUMN_NAME.BID_VOLUME)) /
+             (pl.col(COLUMN_NAME.ASK_VOLUME) + pl.col(COLUMN_NAME.BID_VOLUME))).cast(pl.Float32).alias(COLUMN_NAME.VWMP)
+        ])
+
+        # Cast to required TICK schema
+        pl_df = pl_df.select(list(POLARS_DTYPE_DICT.TIME_TICK_DTYPE.keys())).cast(POLARS_DTYPE_DICT.TIME_TICK_DTYPE)
+
+        # Deduplicate on timestamp and sort chronologically
+        pl_df = pl_df.unique(subset=[COLUMN_NAME.TIMESTAMP], keep='first', maintain_order=True).sort(COLUMN_NAME.TIMESTAMP)
+
+        # Filter out business days/hours using standard helper
+        pl_df = business_days_data(pl_df)
+
+        return pl_df if engine == 'polars_lazy' else collect_lazyframe(pl_df, self.polars_gpu_engine)
+
+    def _downloads_done(self) -> None:
+
+        super()._downloads_done()
+
+        # no download is using the store, chunks can be pruned
+        if self.tick_vault_store and self.tick_vault_retention_days > 0:
+            self.prune_tick_vault_store()
+
+    def prune_tick_vault_store(self, retention_days: Optional[int] = None) -> int:
+        """
+        Remove from the persistent tick_vault store the hourly chunks
+        older than retention_days, together with their metadata rows,
+        so that the hours are downloaded again if requested.
+
+        Parameters
+        -------
+        retention_days: Optional[int]
+            Days of chunks kept, tick_vault_retention_days if not given.
+
+        Returns
+        -------
+        int
+            Number of chunk files removed.
+        """
+        if retention_days is None:
+            retention_days = self.tick_vault_retention_days
+
+        store_path = self.data_path / TICK_VAULT_STORE_FOLDER
+        if retention_days <= 0 or not store_path.exists():
+            return 0
+
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=retention_days)).replace(
+            hour=0, minute=0, second=0, microsecond=0)
+
+        # chunks are stored as SYMBOL/YYYY/MM/DD/HHh_ticks.bi5
+        # with 0-indexed months, whole days are removed
+        removed = 0
+        for day_path in sorted((store_path / 'downloads').glob('*/[0-9]*/[0-9]*/[0-9]*')):
+            try:
+                day = datetime(int(day_path.parent.parent.name),
+                               int(day_path.parent.name) + 1,
+                               int(day_path.name),
+                               tzinfo=timezone.utc)
+            except ValueError:
+                continue
+
+            if day < cutoff:
+                removed += sum(1 for _ in day_path.glob('*.bi5'))
+                shutil.rmtree(day_path, ignore_errors=True)
+
+        metadata_path = store_path / 'metadata.db'
+        if metadata_path.exists():
+            try:
+                with closing(sqlite3.connect(metadata_path)) as connection:
+                    with connection:
+                        tables = [row[0] for row in connection.execute(
+                            "SELECT name FROM sqlite_master "
+                            "WHERE type = 'table' AND name LIKE 'symbol_%'")]
+                        for table in tables:
+                            connection.execute(f'DELETE FROM {table} WHERE timestamp < ?',
+                                               (int(cutoff.timestamp()),))
+            except sqlite3.Error as e:
+                logger.bind(target='dukascopy').error(
+                    f'Error pruning tick_vault metadata {metadata_path}: {e}')
+                raise
+
+        logger.bind(target='dukascopy').info(
+            f'Pruned {removed} chunks older than {cutoff:%Y-%m-%d} from {store_path}')
+
+        return removed
 
     def get_recent_data(
         self,
@@ -1191,23 +1431,14 @@ class DukascopyConnector(RemoteConnector):
             logger.bind(target='dukascopy').error("tick_vault is not installed. Cannot fetch recent data.")
             raise RuntimeError("tick_vault is not installed.")
 
-        # Ensure temporary data path exists and reconfigure tick_vault to use it
-        self._temporary_data_path.mkdir(parents=True, exist_ok=True)
-        try:
-            from tick_vault import reload_config
-            reload_config(
-                base_directory=str(self._temporary_data_path),
-                worker_per_proxy=3,
-                fetch_max_retry_attempts=3,
-            )
-        except ImportError:
-            pass
+        # Ensure tick_vault base directory exists and reconfigure tick_vault to use it
+        self._configure_tick_vault()
 
         try:
             from datetime import timezone
             # Subtract 2 hours from current UTC time because Dukascopy CDN historical files
             # are uploaded with some latency (usually up to 1-2 hours).
-            end = datetime.now(timezone.utc) - timedelta(hours=2)
+            end = datetime.now(timezone.utc) - DUKASCOPY_PUBLISH_DELAY
 
             # Roll back to Friday 21:00 UTC if the end time falls on a weekend.
             # Weekday: 0=Monday, ..., 4=Friday, 5=Saturday, 6=Sunday.
@@ -1289,8 +1520,15 @@ class DukascopyConnector(RemoteConnector):
 class TwelveDataConnector(RemoteConnector):
     """
     Class to read real-time data from the database using TwelveData API.
+
+    Requests go through a pooled keep-alive session, so that polling
+    loops pay connection setup once. Prices of several symbols can be
+    requested concurrently with get_realtime_prices, at most
+    max_concurrent_downloads in flight and within the plan rate limit.
     """
 
+    provider: ClassVar[str] = TWELVEDATA_PROVIDER
+
     # interface parameters
     api_key: str = field(default='', validator=validators.instance_of(str))
     plan: str = field(
@@ -1302,7 +1540,14 @@ class TwelveDataConnector(RemoteConnector):
         converter=str.lower
     )
 
+    max_concurrent_downloads: int = field(default=TWELVE_DATA_MAX_CONCURRENT_REQUESTS,
+                                          validator=[validators.instance_of(int),
+                                                     validators.gt(0)])
+
     # internal parameters
+    _session: Session = field(default=None, init=False)
+    _rate_limit_lock: Any = field(factory=Lock, init=False)
+    _ssl_context: Any = field(default=None, init=False)
     _chunk_size: int = field(
         default=TWELVE_DATA_CHUNK_SIZE,
         validator=validators.instance_of(int)
@@ -1369,6 +1614,40 @@ class TwelveDataConnector(RemoteConnector):
                    filter=lambda record: ('twelvedata' == record['extra'].get('target') and
                                           bool(record["extra"].get('target'))))
 
+        self.connect()
+
+    def connect(self) -> None:
+        """Configure the requests session with a keep-alive connections pool."""
+        self._session = Session()
+        adapter = HTTPAdapter(pool_connections=1,
+                              pool_maxsize=self.max_concurrent_downloads)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        self._session.headers.update({"Accept": "application/json"})
+
+    def check_connection(self) -> bool:
+        """Test connectivity to the Twelve Data API."""
+        try:
+            self._session.head(self._base_url, timeout=5)
+            return True
+        except Exception as e:
+            logger.bind(target='twelvedata').error(
+                f'Failed to connect to {self._base_url}: {e}')
+            return False
+
+    def _async_client(self) -> httpx.AsyncClient:
+        """Async client pooling at most max_concurrent_downloads connections."""
+        # loading the CA bundle dominates the client creation, do it once
+        if self._ssl_context is None:
+            self._ssl_context = httpx.create_ssl_context()
+
+        limits = httpx.Limits(max_connections=self.max_concurrent_downloads,
+                              max_keepalive_connections=self.max_concurrent_downloads)
+        return httpx.AsyncClient(verify=self._ssl_context,
+                                 limits=limits,
+                                 timeout=TWELVE_DATA_REQUEST_TIMEOUT,
+                                 headers={"Accept": "application/json"})
+
     @property
     def chunk_size(self) -> int:
         """Max number of data points per request."""
@@ -1379,19 +1658,47 @@ class TwelveDataConnector(RemoteConnector):
         """Max number of requests per minute."""
         return self._max_requests_per_minute
 
+    def _reserve_request_slot(self) -> float:
+        """
+        Reserve the time of the next request within the rate limit.
+
+        Returns the seconds to wait before sending it, thread safe so that
+        concurrent requests never exceed the requests per minute.
+        """
+        with self._rate_limit_lock:
+            now = time.time()
+            # Evict timestamps older than 60 seconds, reserved ones are kept
+            self._request_timestamps = [t for t in self._request_timestamps if now - t < 60]
+
+            sleep_time = 0.0
+            if len(self._request_timestamps) >= self._max_requests_per_minute:
+                # Wait for the request max_requests_per_minute back to clear the 60s window
+                oldest = self._request_timestamps[-self._max_requests_per_minute]
+                sleep_time = max(60 - (now - oldest) + 0.1, 0.1)
+                logger.bind(target='twelvedata').warning(
+                    f"Rate limit of {self.tier} tier reached, "
+                    f"pausing for {sleep_time:.2f} seconds")
+
+            self._request_timestamps.append(now + sleep_time)
+
+        return sleep_time
+
     def _enforce_rate_limit(self) -> None:
         """Tracks requests internally and blocks execution if exceeding the rate limit."""
-        now = time.time()
-        # Evict timestamps older than 60 seconds
-        self._request_timestamps = [t for t in self._request_timestamps if now - t < 60]
+        sleep_time = self._reserve_request_slot()
+        if sleep_time > 0:
+            time.sleep(sleep_time)
 
-        if len(self._request_timestamps) >= self._max_requests_per_minute:
-            # Calculate sleep required to let the oldest request clear the 60s window
-            sleep_time = 60 - (now - self._request_timestamps[0]) + 0.1
-            print(f"[Rate Limiter] Approaching {self.tier} tier threshold. Pausing for {sleep_time:.2f} seconds...")
-            time.sleep(max(sleep_time, 0.1))
+    def _response_data(self, response: Union[requests.Response, httpx.Response]) -> Dict[str, Any]:
+        """Decode the json body of a response, logging API errors."""
+        if response.status_code != 200:
+            logger.bind(target='twelvedata').error(f"API Error [{response.status_code}]: {response.text}")
 
-        self._request_timestamps.append(time.time())
+        data = response.json()
+        if "status" in data and data["status"] == "error":
+            logger.bind(target='twelvedata').error(f"Twelve Data Error: {data.get('message')}")
+
+        return data
 
     def _execute_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handles HTTP mechanics, rate limiting, and standard headers."""
@@ -1400,38 +1707,100 @@ class TwelveDataConnector(RemoteConnector):
         url = f"{self._base_url}/{endpoint}"
         params["apikey"] = self.api_key
 
-        headers = {"Accept": "application/json"}
-        response = requests.get(url, params=params, headers=headers)
+        response = self._session.get(url, params=params, timeout=TWELVE_DATA_REQUEST_TIMEOUT)
 
-        if response.status_code != 200:
-            logger.bind(target='twelvedata').error(f"API Error [{response.status_code}]: {response.text}")
+        return self._response_data(response)
 
-        data = response.json()
-        if "status" in data and data["status"] == "error":
-            logger.bind(target='twelvedata').error(f"Twelve Data Error: {data.get('message')}")
+    async def _execute_request_async(self,
+                                     client: httpx.AsyncClient,
+                                     endpoint: str,
+                                     params: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of _execute_request, waits for the rate limit without blocking."""
+        sleep_time = self._reserve_request_slot()
+        if sleep_time > 0:
+            await asyncio.sleep(sleep_time)
 
-        return data
+        url = f"{self._base_url}/{endpoint}"
+        params["apikey"] = self.api_key
 
-    def get_realtime_price(self, symbol: str) -> PolarsLazyFrame:
-        """
-        Fetches the instantaneous real-time price and outputs as a 1-row LazyFrame.
-        """
-        data = self._execute_request("price", {"symbol": symbol})
-        record = {}
+        response = await client.get(url, params=params)
+
+        return self._response_data(response)
+
+    @staticmethod
+    def _price_record(symbol: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
 
         if "price" not in data:
             logger.bind(target='twelvedata').error(
                 f"Twelve Data response did not contain 'price': {data}")
-            return {}
+            return None
 
-        record = {
+        return {
             "timestamp": datetime.now(),
             "ticker": symbol,
             "price": float(data["price"]),
             "timezone": "UTC"
         }
+
+    def get_realtime_price(self, symbol: str) -> PolarsLazyFrame:
+        """
+        Fetches the instantaneous real-time price and outputs as a 1-row LazyFrame.
+        """
+        data = self._execute_request("price", {"symbol": symbol})
+
+        record = self._price_record(symbol, data)
+        if record is None:
+            return {}
+
         return PolarsDataFrame([record]).lazy()
 
+    async def get_realtime_prices_async(self,
+                                        symbols: List[str],
+                                        client: Optional[httpx.AsyncClient] = None) -> PolarsLazyFrame:
+        """
+        Fetches the real-time prices of symbols concurrently, one row per symbol.
+
+        At most max_concurrent_downloads requests are in flight, all within
+        the rate limit. Symbols whose request fails are logged and left out.
+        An open client can be given to reuse its connections across calls.
+        """
+        if client is None:
+            async with self._async_client() as own_client:
+                return await self.get_realtime_prices_async(symbols, client=own_client)
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
+
+        async def fetch_price(symbol: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                data = await self._execute_request_async(client, "price", {"symbol": symbol})
+            return self._price_record(symbol, data)
+
+        outcomes = await asyncio.gather(*(fetch_price(symbol) for symbol in symbols),
+                                        return_exceptions=True)
+
+        records = []
+        for symbol, outcome in zip(symbols, outcomes):
+            if isinstance(outcome, Exception):
+                logger.bind(target='twelvedata').error(
+                    f"Price request failed for {symbol}: {outcome}")
+            elif outcome is not None:
+                records.append(outcome)
+
+        return PolarsDataFrame(records,
+                               schema={"timestamp": pl.Datetime('us'),
+                                       "ticker": pl.String,
+                                       "price": pl.Float64,
+                                       "timezone": pl.String}).lazy()
+
+    def get_realtime_prices(self, symbols: List[str]) -> PolarsLazyFrame:
+        """
+        Fetches the real-time prices of symbols concurrently, one row per symbol.
+
+        Blocking wrapper of get_realtime_prices_async, not to be called
+        from a running event loop: await get_realtime_prices_async there.
+        """
+        return asyncio.run(self.get_realtime_prices_async(symbols))
+
     def get_data(self, symbol: str, timeframe: str, start_date: str, end_date: str) -> PolarsLazyFrame:
         """
         Fetches historical data for a specific date range.
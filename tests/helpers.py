@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic data shared by the tests, no download from remote sources is needed.
+"""
+
+from datetime import datetime
+
+import polars as pl
+
+from forex_data import POLARS_DTYPE_DICT
+
+
+def synthetic_ticks(start: datetime,
+                    end: datetime,
+                    every: str = '1h',
+                    offset: float = 0.0,
+                    closed: str = 'both') -> pl.DataFrame:
+    """Build a tick dataframe with the local db tick schema."""
+
+    timestamps = pl.datetime_range(start, end, every, time_unit='ms',
+                                   closed=closed, eager=True)
+    n = len(timestamps)
+    price = pl.Series([1.1 + offset + (i % 100) * 1e-5 for i in range(n)])
+
+    return pl.DataFrame({
+        'timestamp': timestamps,
+        'ask': price + 1e-5,
+        'bid': price - 1e-5,
+        'ask_volume': pl.Series([1.0] * n),
+        'bid_volume': pl.Series([1.0] * n),
+        'vwmp': price
+    }).cast(POLARS_DTYPE_DICT.TIME_TICK_DTYPE)
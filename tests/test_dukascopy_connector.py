@@ -5,11 +5,15 @@ Created on Thu May 21 00:30:00 2026
 @author: Antigravity
 """
 
+import lzma
 import os
+import shutil
+import struct
 import sys
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import polars as pl
 
 from forex_data import DukascopyConnector
@@ -249,6 +253,106 @@ class TestDukascopyConnector(unittest.TestCase):
         )
 
 
+def bi5_chunk(n_ticks: int = 3) -> bytes:
+    """Build a compressed hourly chunk in the Dukascopy bi5 format."""
+
+    records = b''.join(struct.pack('>IIIff', 1000 * i, 108_010 + i, 108_000 + i, 1.0, 1.0)
+                       for i in range(n_ticks))
+    return lzma.compress(records)
+
+
+class TestDukascopyTickVaultStore(unittest.TestCase):
+    """
+    Persistent tick_vault store: downloads run through tick_vault
+    with the fetch of the hourly chunks replaced by a local fake.
+    """
+
+    def setUp(self):
+        self.data_path = Path(tempfile.mkdtemp(prefix='forex_data_tick_vault_'))
+        self.fetched = []
+
+        async def fake_fetch(client, url):
+            self.fetched.append(url)
+            # data only at 12h, other hours have no data
+            return bi5_chunk() if url.endswith('/12h_ticks.bi5') else None
+
+        self.patches = [
+            patch('tick_vault.download_worker.fetch_with_retry', fake_fetch),
+            patch.dict(os.environ, {'TICK_VAULT_REQUEST_PACING_MIN': '0',
+                                    'TICK_VAULT_REQUEST_PACING_MAX': '0',
+                                    'TICK_VAULT_METADATA_UPDATE_BATCH_TIMEOUT': '0.05'}),
+            patch.object(DukascopyConnector, 'get_available_tickers',
+                         return_value=['EURUSD'])
+        ]
+        for patcher in self.patches:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in reversed(self.patches):
+            patcher.stop()
+        shutil.rmtree(self.data_path, ignore_errors=True)
+
+    def _connector(self, **kwargs):
+        return DukascopyConnector(data_path=self.data_path, **kwargs)
+
+    def test_store_reused_across_refreshes(self):
+
+        connector = self._connector(tick_vault_store=True)
+        first = connector.download_month_raw('EURUSD', 2024, 2, engine='polars')
+        self.assertEqual(len(self.fetched), 29 * 24)
+        self.assertGreater(first.height, 0)
+
+        # hours already attempted are not downloaded again,
+        # also by a new connector on the same data path
+        second = self._connector(tick_vault_store=True).download_month_raw(
+            'EURUSD', 2024, 2, engine='polars')
+        self.assertEqual(len(self.fetched), 29 * 24)
+        self.assertTrue(second.equals(first))
+
+        store_path = self.data_path / 'TickVault'
+        self.assertTrue((store_path / 'metadata.db').exists())
+        self.assertEqual(len(list(store_path.rglob('*.bi5'))), 29)
+
+        # without the store every download starts from scratch
+        temporary = self._connector()
+        temporary.download_month_raw('EURUSD', 2024, 2, engine='polars')
+        temporary.download_month_raw('EURUSD', 2024, 2, engine='polars')
+        self.assertEqual(len(self.fetched), 3 * 29 * 24)
+
+    def test_store_current_month_stops_at_published_hours(self):
+
+        connector = self._connector(tick_vault_store=True)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        connector.download_month_raw('EURUSD', now.year, now.month, engine='polars')
+
+        # hours not yet published are not attempted,
+        # so a later refresh downloads them
+        # chunk urls end with YYYY/MM/DD/HHh_ticks.bi5, months 0-indexed
+        parts = [url.split('/')[-4:] for url in self.fetched]
+        hours = [datetime(int(year), int(month) + 1, int(day), int(hour[:2]))
+                 for year, month, day, hour in parts]
+        self.assertTrue(all(hour <= now - timedelta(hours=2) for hour in hours))
+
+    def test_store_retention(self):
+
+        connector = self._connector(tick_vault_store=True,
+                                    tick_vault_retention_days=30)
+
+        # old chunks are pruned once the download is done
+        data = connector.download_month_raw('EURUSD', 2024, 2, engine='polars')
+        self.assertGreater(data.height, 0)
+        self.assertEqual(list((self.data_path / 'TickVault').rglob('*.bi5')), [])
+
+        # and downloaded again when requested
+        connector.download_month_raw('EURUSD', 2024, 2, engine='polars')
+        self.assertEqual(len(self.fetched), 2 * 29 * 24)
+
+        # explicit prune with a custom retention
+        store = self._connector(tick_vault_store=True)
+        store.download_month_raw('EURUSD', 2024, 3, engine='polars')
+        self.assertEqual(store.prune_tick_vault_store(retention_days=1), 31)
+
+
 def main():
     suite = unittest.TestLoader().loadTestsFromTestCase(TestDukascopyConnector)
     runner = unittest.TextTestRunner(verbosity=2)
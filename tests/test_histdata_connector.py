@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Histdata connector tests on synthetic archives,
+no download from remote sources is needed.
+"""
+
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+from zipfile import ZipFile
+
+import polars as pl
+
+from forex_data.data_management import HistDataConnector
+from forex_data.data_management.rawcache import RawDownloadCache
+
+
+def histdata_csv(n: int = 5000, trailing_spaces: bool = False) -> bytes:
+    """Build a tick csv file content in the histdata format."""
+
+    start = datetime(2020, 2, 27, 17)
+    space = ' ' if trailing_spaces else ''
+    lines = []
+    for i in range(n):
+        timestamp = start + timedelta(milliseconds=7919 * i)
+        lines.append(f'{timestamp:%Y%m%d %H%M%S}{timestamp.microsecond // 1000:03d},'
+                     f'1.{10000 + i % 500:06d}{space},1.{10010 + i % 500:06d}{space},0')
+
+    # a duplicated timestamp row
+    lines.append(lines[-1])
+
+    return '\n'.join(lines).encode()
+
+
+def zip_archive(content: bytes) -> bytes:
+    """Build a zip archive with content as the month csv member."""
+
+    buffer = BytesIO()
+    with ZipFile(buffer, 'w') as archive:
+        archive.writestr('DAT_ASCII_EURUSD_T_202002.csv', content)
+
+    return buffer.getvalue()
+
+
+def zip_member(content: bytes):
+    """Open content as the member of an in memory zip archive."""
+
+    buffer = BytesIO()
+    with ZipFile(buffer, 'w') as archive:
+        archive.writestr('DAT_ASCII_EURUSD_T_202002.csv', content)
+
+    return ZipFile(BytesIO(buffer.getvalue())).open('DAT_ASCII_EURUSD_T_202002.csv')
+
+
+class TestHistDataConnector(unittest.TestCase):
+    """Parse of histdata tick files, no download from histdata.com is needed."""
+
+    def setUp(self):
+        self.data_path = Path(tempfile.mkdtemp(prefix='forex_data_histdata_'))
+        self.connector = HistDataConnector(data_path=str(self.data_path))
+
+    def tearDown(self):
+        self.connector.clear_temporary_folder()
+        shutil.rmtree(self.data_path, ignore_errors=True)
+
+    def test_raw_zipfile_to_df_in_memory(self):
+
+        expected = self.connector._raw_zipfile_to_df(zip_member(histdata_csv()),
+                                                     engine='polars').sort('timestamp')
+        self.assertEqual(expected['timestamp'].n_unique(), expected.height)
+        self.assertEqual(expected['timestamp'].min(), datetime(2020, 2, 27, 22))
+
+        lazy = self.connector._raw_zipfile_to_df(zip_member(histdata_csv()),
+                                                 engine='polars_lazy')
+        self.assertIsInstance(lazy, pl.LazyFrame)
+        self.assertTrue(lazy.collect().sort('timestamp').equals(expected))
+
+        # trailing spaces on prices fall back to the string parse
+        spaced = self.connector._raw_zipfile_to_df(
+            zip_member(histdata_csv(trailing_spaces=True)), engine='polars')
+        self.assertTrue(spaced.sort('timestamp').equals(expected))
+
+        arrow = self.connector._raw_zipfile_to_df(zip_member(histdata_csv()),
+                                                  engine='pyarrow')
+        self.assertEqual(pl.from_arrow(arrow)['timestamp'].min(),
+                         expected['timestamp'].min())
+
+        # nothing is written on disk
+        self.assertEqual([path for path in self.data_path.rglob('*.csv')], [])
+
+    @patch('requests.Session.request')
+    @patch('requests.Session.get')
+    def test_download_month_raw(self, mock_get, mock_request):
+
+        mock_get.return_value = MagicMock(text='<input id="tk" value="token">')
+        mock_request.return_value = MagicMock(content=zip_archive(histdata_csv()))
+
+        data = self.connector.download_month_raw('EURUSD', 2020, 2, engine='polars')
+
+        self.assertEqual(data.height, len(histdata_csv().splitlines()) - 1)
+        self.assertEqual(mock_request.call_args.kwargs['data']['datemonth'], '202002')
+        self.assertEqual([path for path in self.data_path.rglob('*.csv')], [])
+
+    @patch('requests.Session.request')
+    @patch('requests.Session.get')
+    def test_download_month_raw_cached(self, mock_get, mock_request):
+
+        mock_get.return_value = MagicMock(text='<input id="tk" value="token">')
+        mock_request.return_value = MagicMock(content=zip_archive(histdata_csv()))
+
+        connector = HistDataConnector(data_path=str(self.data_path / 'cached'),
+                                      raw_cache_max_bytes=10_000_000)
+        try:
+            first = connector.download_month_raw('EURUSD', 2020, 2, engine='polars')
+            self.assertEqual(mock_request.call_count, 1)
+
+            # ended month served from the cache, also by a new connector
+            again = HistDataConnector(data_path=str(self.data_path / 'cached'),
+                                      raw_cache_max_bytes=10_000_000)
+            second = again.download_month_raw('EURUSD', 2020, 2, engine='polars')
+            self.assertEqual(mock_request.call_count, 1)
+            self.assertTrue(second.sort('timestamp').equals(first.sort('timestamp')))
+            self.assertEqual(again._raw_cache.stats()['hits'], 1)
+            again.clear_temporary_folder()
+
+            # the current month is always downloaded
+            now = datetime.now()
+            connector.download_month_raw('EURUSD', now.year, now.month, engine='polars')
+            connector.download_month_raw('EURUSD', now.year, now.month, engine='polars')
+            self.assertEqual(mock_request.call_count, 3)
+            self.assertEqual(connector._raw_cache.stats()['entries'], 1)
+
+            # a cached payload failing to parse is dropped and downloaded again
+            connector._raw_cache.put('histdata', 'eurusd', 2020, 3, b'<html></html>')
+            data = connector.download_month_raw('EURUSD', 2020, 3, engine='polars')
+            self.assertEqual(mock_request.call_count, 4)
+            self.assertTrue(data.sort('timestamp').equals(first.sort('timestamp')))
+            self.assertEqual(connector._raw_cache.get('histdata', 'eurusd', 2020, 3),
+                             zip_archive(histdata_csv()))
+        finally:
+            connector.clear_temporary_folder()
+
+    def test_raw_download_cache(self):
+
+        cache = RawDownloadCache(cache_path=self.data_path / 'RawCache', max_bytes=250)
+
+        cache.put('Histdata', 'EURUSD', 2020, 1, b'a' * 100)
+        self.assertEqual(cache.get('histdata', 'eurusd', 2020, 1), b'a' * 100)
+        self.assertIsNone(cache.get('histdata', 'eurusd', 2020, 2))
+
+        # identical payloads are stored once
+        cache.put('histdata', 'eurusd', 2020, 2, b'a' * 100)
+        self.assertEqual(cache.stats()['bytes'], 100)
+        self.assertEqual(len(list((self.data_path / 'RawCache').rglob('blobs/*/*'))), 1)
+
+        # least recently used entries are evicted over budget
+        cache.get('histdata', 'eurusd', 2020, 1)
+        cache.put('histdata', 'eurusd', 2020, 3, b'b' * 100)
+        cache.put('histdata', 'eurusd', 2020, 4, b'c' * 100)
+        stats = cache.stats()
+        self.assertLessEqual(stats['bytes'], 250)
+        self.assertGreater(stats['evictions'], 0)
+        self.assertIsNotNone(cache.get('histdata', 'eurusd', 2020, 4))
+
+        # payloads over budget are not cached
+        cache.put('histdata', 'eurusd', 2020, 5, b'd' * 300)
+        self.assertIsNone(cache.get('histdata', 'eurusd', 2020, 5))
+
+        # truncated or corrupted blobs are a miss and are dropped
+        for corrupted in (b'x', b'x' * 100):
+            entries = cache.stats()['entries']
+            blob = next((self.data_path / 'RawCache').rglob('blobs/*/*'))
+            blob.write_bytes(corrupted)
+            hits = sum(cache.get('histdata', 'eurusd', 2020, month) is not None
+                       for month in range(1, 5))
+            self.assertEqual(hits, entries - 1)
+            self.assertEqual(cache.stats()['entries'], entries - 1)
+
+        cache.clear()
+        self.assertEqual(cache.stats()['entries'], 0)
+        self.assertEqual(list((self.data_path / 'RawCache').rglob('blobs/*/*')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,22 @@
 import unittest
 import shutil
+import tempfile
+import threading
+import time
 import concurrent.futures
 import multiprocessing
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from loguru import logger
 
-from forex_data import HistoricalManagerDB
+from forex_data import (
+    HistoricalManagerDB,
+    LocalDBConnector,
+    TICK_TIMEFRAME
+)
+from forex_data.data_management import LocalDBYearConnector
+
+from tests.helpers import synthetic_ticks
 
 _base_path = Path.home() / ".test_database_concurrent"
 _data_path = _base_path
@@ -171,3 +181,193 @@ class TestHistoricalManagerConcurrency(unittest.TestCase):
             1,
             "Workers returned different lengths of data!"
         )
+
+
+class TestLocalDBLockFreeReads(unittest.TestCase):
+    """
+    Benchmark reader throughput on a local db file while a writer
+    commits new versions of it, readers must always see a complete
+    version of the file.
+    """
+
+    num_readers = 4
+    phase_seconds = 3.0
+    start = datetime(2020, 1, 1)
+    end = datetime(2021, 1, 1)
+    month_segments = False
+
+    def setUp(self):
+        self.data_path = Path(tempfile.mkdtemp(prefix='forex_data_snapshot_'))
+        self.connector = self._connector()
+        initial_data = synthetic_ticks(self.start, self.end, every='1m', closed='left')
+        self.initial_rows = initial_data.height
+        self.day_rows = synthetic_ticks(self.end, self.end + timedelta(days=1),
+                                        every='1m', closed='left').height
+        self.connector.write_data(self._key(self.start), initial_data)
+
+    def _connector(self):
+
+        return LocalDBConnector(data_path=str(self.data_path),
+                                data_type='parquet',
+                                engine='polars_lazy')
+
+    def _key(self, day):
+
+        return self.connector._db_key('forex', 'eurusd', TICK_TIMEFRAME)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_path, ignore_errors=True)
+
+    def _read_loop(self, stop, reads, errors):
+
+        while not stop.is_set():
+            try:
+                rows = self.connector.read_data(
+                    'forex', 'eurusd', TICK_TIMEFRAME,
+                    self.start, self.end + timedelta(days=365)).collect().height
+                # each committed version adds whole days of ticks
+                if (rows - self.initial_rows) % self.day_rows != 0:
+                    errors.append(f'partial version read: {rows} rows')
+                reads.append(rows)
+            except Exception as e:
+                errors.append(e)
+
+    def _write_loop(self, stop, writes, errors):
+
+        day = self.end
+        while not stop.is_set():
+            try:
+                day_data = synthetic_ticks(day, day + timedelta(days=1),
+                                           every='1m', closed='left')
+                self.connector.write_data(self._key(day), day_data.lazy())
+                day += timedelta(days=1)
+                writes.append(day)
+            except Exception as e:
+                errors.append(e)
+
+    def _compact_loop(self, stop, errors):
+
+        while not stop.is_set():
+            try:
+                self.connector.compact_month_segments()
+            except Exception as e:
+                errors.append(e)
+
+    def _measure(self, with_writer: bool):
+
+        stop = threading.Event()
+        reads, writes, errors = [], [], []
+        threads = [
+            threading.Thread(target=self._read_loop, args=(stop, reads, errors))
+            for _ in range(self.num_readers)
+        ]
+        if with_writer:
+            threads.append(
+                threading.Thread(target=self._write_loop, args=(stop, writes, errors)))
+            if self.month_segments:
+                threads.append(
+                    threading.Thread(target=self._compact_loop, args=(stop, errors)))
+
+        for thread in threads:
+            thread.start()
+        time.sleep(self.phase_seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        return len(reads) / self.phase_seconds, len(writes), errors
+
+    def test_03_reader_throughput_with_active_writer(self):
+        """Readers do not block on an active writer and never see partial files."""
+
+        idle_throughput, _, errors = self._measure(with_writer=False)
+        self.assertEqual(errors, [])
+
+        busy_throughput, writes, errors = self._measure(with_writer=True)
+        self.assertEqual(errors, [])
+        self.assertGreater(writes, 0, 'writer did not commit any version')
+        self.assertGreater(busy_throughput, 0, 'readers blocked by the writer')
+
+        logger.info(
+            f'reader throughput: {idle_throughput:.1f} reads/s idle, '
+            f'{busy_throughput:.1f} reads/s with an active writer '
+            f'({writes} versions committed)')
+
+
+class TestLocalDBYearLockFreeReads(TestLocalDBLockFreeReads):
+    """Lock-free reads of year files with the lazy engine."""
+
+    def _connector(self):
+
+        return LocalDBYearConnector(data_path=str(self.data_path),
+                                    data_type='parquet',
+                                    engine='polars_lazy',
+                                    month_segments=self.month_segments)
+
+    def _key(self, day):
+
+        return self.connector._db_key('forex', 'eurusd', TICK_TIMEFRAME, day.year)
+
+
+class TestLocalDBYearSegmentsLockFreeReads(TestLocalDBYearLockFreeReads):
+    """Lock-free reads of month segments folded by a concurrent compaction."""
+
+    month_segments = True
+
+
+class TestTickersYearsInfoConcurrentSaves(unittest.TestCase):
+    """
+    Managers of different tickers rebuild the shared tickers years
+    info file concurrently, readers must never see a partial file.
+    """
+
+    num_writers = 4
+    phase_seconds = 2.0
+
+    def setUp(self):
+        self.data_path = Path(tempfile.mkdtemp(prefix='forex_data_years_info_'))
+        self.connector = LocalDBConnector(data_path=str(self.data_path),
+                                          data_type='parquet',
+                                          engine='polars_lazy')
+        for ticker in ('eurusd', 'gbpusd', 'usdjpy'):
+            self.connector.write_data(
+                self.connector._db_key('forex', ticker, TICK_TIMEFRAME),
+                synthetic_ticks(datetime(2020, 1, 1), datetime(2020, 3, 1),
+                                every='1h'))
+        self.connector.create_tickers_years_dict()
+
+    def tearDown(self):
+        shutil.rmtree(self.data_path, ignore_errors=True)
+
+    def test_concurrent_rebuilds_keep_the_file_valid(self):
+
+        stop = threading.Event()
+        errors = []
+
+        def rebuild():
+            while not stop.is_set():
+                try:
+                    self.connector.create_tickers_years_dict()
+                except Exception as e:
+                    errors.append(e)
+
+        def load():
+            while not stop.is_set():
+                try:
+                    self.assertEqual(len(self.connector.load_tickers_years_info()), 3)
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=rebuild) for _ in range(self.num_writers)]
+        threads.append(threading.Thread(target=load))
+        for thread in threads:
+            thread.start()
+        time.sleep(self.phase_seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            [path.name for path in self.data_path.iterdir()
+             if path.name.startswith('.tickers_years_info')], [])
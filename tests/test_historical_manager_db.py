@@ -14,6 +14,11 @@ import unittest
 import os
 import shutil
 import random
+import tempfile
+import threading
+import concurrent.futures
+import time
+from unittest import mock
 from loguru import logger
 
 from datetime import (
@@ -24,12 +29,18 @@ from datetime import (
 from polars import (
     DataFrame as PolarsDataFrame,
     LazyFrame as PolarsLazyFrame,
-    col
+    col,
+    concat,
+    lit
 )
 
+from polars.testing import assert_frame_equal
+
 from forex_data import (
     HistoricalManagerDB,
+    DukascopyConnector,
     TickerNotFoundError,
+    TickerDataNotFoundError,
     TickerDataBadTypeException,
     is_empty_dataframe,
     get_histdata_tickers,
@@ -37,12 +48,23 @@ from forex_data import (
     SQL_COMPARISON_OPERATORS,
     SQL_CONDITION_AGGREGATION_MODES,
     POLARS_DTYPE_DICT,
+    TICK_TIMEFRAME,
     business_days_data,
     US_holiday_dates,
     random_date_between
 )
 
-__all__ = ['TestHistoricalManagerDB']
+from forex_data.data_management import (
+    HistDataConnector,
+    reframe_data,
+    rollup_timeframes
+)
+
+from tests.helpers import synthetic_ticks
+
+__all__ = ['TestHistoricalManagerDB',
+           'TestHistoricalManagerDBBatch',
+           'TestHistoricalManagerDBIncrementalRollup']
 
 from pathlib import Path
 
@@ -986,7 +1008,7 @@ class TestHistoricalManagerDB(unittest.TestCase):
 
         with patch(
             'forex_data.data_management.historicaldata'
-            '.DukascopyConnector.download_month_raw'
+            '.DukascopyConnector.download_months_raw'
         ) as mock_duka:
             # fallback test on EURUSD 2004 histdata fail
             ticker = 'EURUSD'
@@ -1195,5 +1217,396 @@ class TestHistoricalManagerDB(unittest.TestCase):
         )
 
 
+class TestHistoricalManagerDBBatch(unittest.TestCase):
+    """Batch query of several tickers on a local database of synthetic data."""
+
+    tickers = ['eurusd', 'gbpusd', 'usdjpy']
+
+    def setUp(self):
+
+        self.data_path = Path(tempfile.mkdtemp(prefix='forex_data_batch_'))
+        self.config_yaml = config_yaml = f'''
+DATA_PATH: '{self.data_path}'
+DATA_FILETYPE: 'parquet'
+ENGINE: 'polars'
+DB_FILES_YEAR_PARTITIONING: True
+'''
+
+        # tick and hourly data of past months, no download is needed
+        writer = HistoricalManagerDB(config=config_yaml)
+        for offset, ticker in enumerate(self.tickers):
+            ticks = synthetic_ticks(datetime(2020, 1, 1), datetime(2020, 3, 1),
+                                    every='1m', offset=offset, closed='left')
+            bars = reframe_data(ticks, '1h')
+            for tf, data in ((TICK_TIMEFRAME, ticks), ('1h', bars)):
+                writer._db_connector.write_data(
+                    writer._db_connector._db_key('forex', ticker, tf, 2020), data)
+        writer.close()
+
+        self.manager = HistoricalManagerDB(config=config_yaml)
+
+    def tearDown(self):
+
+        self.manager.close()
+        shutil.rmtree(self.data_path, ignore_errors=True)
+
+    def test_01_get_data_many(self):
+
+        start, end = '2020-01-06', '2020-02-10 12:00:00'
+        expected = {ticker: self.manager.get_data(ticker, '1h', start, end)
+                    for ticker in self.tickers}
+
+        data = self.manager.get_data_many(['EURUSD', 'gbpusd', 'usdjpy', 'eurusd'],
+                                          '1h', start, end)
+        self.assertEqual(list(data.keys()), self.tickers)
+        for ticker in self.tickers:
+            self.assertFalse(is_empty_dataframe(data[ticker]))
+            self.assertTrue(data[ticker].equals(expected[ticker]))
+
+        long_data = self.manager.get_data_many(self.tickers, '1h', start, end,
+                                               comparison_column_name=COLUMN_NAME.CLOSE,
+                                               check_level=1.5,
+                                               comparison_operator='>',
+                                               output='long')
+        self.assertEqual(long_data.columns[0], COLUMN_NAME.TICKER)
+        self.assertEqual(
+            long_data.height,
+            sum(expected[ticker].filter(col(COLUMN_NAME.CLOSE) > 1.5).height
+                for ticker in self.tickers))
+        self.assertEqual(sorted(long_data[COLUMN_NAME.TICKER].unique().to_list()),
+                         ['gbpusd', 'usdjpy'])
+
+        with self.assertRaises(TickerNotFoundError):
+            self.manager.get_data_many(['eurusd', 'notaticker'], '1h', start, end)
+
+    def test_02_get_data_derived_timeframe(self):
+
+        start, end = datetime(2020, 1, 6, 1, 30), datetime(2020, 2, 10, 12)
+        hourly = self.manager.get_data('eurusd', '1h',
+                                       datetime(2020, 1, 1), datetime(2020, 2, 29, 23))
+
+        manager = HistoricalManagerDB(config=self.config_yaml
+                                      + 'DERIVED_TIMEFRAMES: True\n')
+        try:
+            for timeframe in ('2h', '1d'):
+                data = manager.get_data('eurusd', timeframe, start, end)
+                expected = reframe_data(hourly, timeframe).filter(
+                    col(COLUMN_NAME.TIMESTAMP).is_between(start, end))
+                self.assertFalse(is_empty_dataframe(data))
+                self.assertTrue(data.equals(expected))
+
+            data = manager.get_data('eurusd', '2h', start, end,
+                                    comparison_column_name=COLUMN_NAME.CLOSE,
+                                    check_level=1.1005,
+                                    comparison_operator='>')
+            self.assertTrue((data[COLUMN_NAME.CLOSE] > 1.1005).all())
+
+            # derived timeframes are not stored
+            self.assertEqual(manager._get_ticker_timeframes_list('eurusd'), ['1h'])
+        finally:
+            manager.close()
+
+    def test_03_update_db_parallel(self):
+
+        manager = HistoricalManagerDB(config=self.config_yaml
+                                      + 'DB_UPDATE_WORKERS: 2\n')
+        try:
+            manager.add_timeframe(['5m', '4h'])
+            manager._update_db(self.tickers)
+
+            for ticker in self.tickers:
+                ticks = manager._db_connector.read_data_year('forex', ticker,
+                                                             TICK_TIMEFRAME, 2020)
+                for tf in ('5m', '4h'):
+                    # written by the workers and recorded in the catalog
+                    self.assertIn(tf, manager._get_ticker_timeframes_list(ticker))
+                    months = manager._tickers_years_dict[ticker][tf].months
+                    self.assertEqual(months[2020], [1, 2])
+                    assert_frame_equal(
+                        manager._db_connector.read_data_year('forex', ticker, tf, 2020),
+                        reframe_data(ticks, tf).cast(POLARS_DTYPE_DICT.TIME_TF_DTYPE),
+                        check_exact=False)
+        finally:
+            manager.close()
+
+    def test_04_update_db_streaming(self):
+
+        manager = HistoricalManagerDB(config=self.config_yaml
+                                      + 'DB_STREAMING_CHUNK_SIZE: 5000\n')
+        try:
+            manager.add_timeframe(['5m', '1d'])
+            manager._update_db('eurusd')
+
+            ticks = manager._db_connector.read_data_year('forex', 'eurusd',
+                                                         TICK_TIMEFRAME, 2020)
+            for tf in ('5m', '1d'):
+                self.assertEqual(manager._tickers_years_dict['eurusd'][tf].months[2020],
+                                 [1, 2])
+                assert_frame_equal(
+                    manager._db_connector.read_data_year('forex', 'eurusd', tf, 2020),
+                    reframe_data(ticks, tf).cast(POLARS_DTYPE_DICT.TIME_TF_DTYPE),
+                    check_exact=False)
+        finally:
+            manager.close()
+
+    def test_05_download_year_concurrent_months(self):
+
+        manager = HistoricalManagerDB(config=self.config_yaml
+                                      + 'DOWNLOAD_CONCURRENCY:\n'
+                                      '  HISTDATA: 3\n'
+                                      '  DUKASCOPY: 2\n')
+        histdata, dukascopy = manager._histdata_connector
+        self.assertEqual(histdata.max_concurrent_downloads, 3)
+        self.assertEqual(dukascopy.max_concurrent_downloads, 2)
+
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def month_ticks(month_num):
+            return synthetic_ticks(datetime(2019, month_num, 1),
+                                   datetime(2019, month_num, 1, 12),
+                                   every='1m', closed='left')
+
+        def histdata_month(connector, ticker, year, month_num, engine='polars_lazy'):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.1)
+            with lock:
+                active[0] -= 1
+            # march is missing on histdata and falls back to dukascopy
+            if month_num == 3:
+                raise TickerDataNotFoundError('not found')
+            return month_ticks(month_num)
+
+        with mock.patch.object(HistDataConnector, 'get_available_tickers',
+                               return_value=['EURUSD']), \
+                mock.patch.object(DukascopyConnector, 'get_available_tickers',
+                                  return_value=['EURUSD']), \
+                mock.patch.object(HistDataConnector, 'download_month_raw',
+                                  autospec=True, side_effect=histdata_month), \
+                mock.patch.object(DukascopyConnector, 'download_months_raw',
+                                  return_value={3: month_ticks(3)}) as duka_months:
+            try:
+                data = manager._download_year('eurusd', 2019)
+            finally:
+                manager.close()
+
+        self.assertEqual(active[1], 3)
+        duka_months.assert_called_once_with('eurusd', 2019, [3], engine='polars')
+        self.assertEqual(data[COLUMN_NAME.TIMESTAMP].dt.month().unique().to_list(),
+                         list(range(1, 13)))
+        self.assertTrue(data[COLUMN_NAME.TIMESTAMP].is_sorted())
+
+        with self.assertRaises(ValueError):
+            HistoricalManagerDB(config=self.config_yaml
+                                + 'DOWNLOAD_CONCURRENCY:\n  TWELVEDATA: 2\n')
+
+    def test_06_complete_tickers_concurrently(self):
+
+        start, end = datetime(2020, 1, 6), datetime(2020, 2, 20)
+        source_connectors = self.manager.get_source_connectors()
+        managers = [HistoricalManagerDB(config=self.config_yaml,
+                                        source_connectors=source_connectors)
+                    for _ in self.tickers]
+        try:
+            for manager in managers:
+                self.assertIs(manager.get_source_connectors()[0],
+                              self.manager.get_source_connectors()[0])
+
+            # 4h is not stored: each ticker is aggregated under its own lock
+            with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=len(managers)) as executor:
+                data = dict(zip(self.tickers, executor.map(
+                    lambda args: args[0].get_data(args[1], '4h', start, end),
+                    zip(managers, self.tickers))))
+        finally:
+            for manager in managers:
+                manager.close()
+
+        for ticker in self.tickers:
+            ticks = self.manager._db_connector.read_data_year('forex', ticker,
+                                                              TICK_TIMEFRAME, 2020)
+            assert_frame_equal(
+                data[ticker],
+                reframe_data(ticks, '4h').cast(POLARS_DTYPE_DICT.TIME_TF_DTYPE).filter(
+                    col(COLUMN_NAME.TIMESTAMP).is_between(start, end)),
+                check_exact=False)
+            self.assertGreater(self.manager.get_ticker_byte_size(ticker), 0)
+
+    def test_07_tickers_registry(self):
+
+        start, end = '2020-01-06', '2020-02-10'
+        registry_path = self.data_path / 'HistoricalData' / 'tickers_registry.json'
+
+        with mock.patch.object(HistDataConnector, 'get_available_tickers',
+                               return_value=['EURUSD', 'AUDCAD']) as histdata_tickers, \
+                mock.patch.object(DukascopyConnector, 'get_available_tickers',
+                                  return_value=['EURUSD', 'XAUUSD']) as duka_tickers:
+
+            # no request at construction nor for tickers in the local database
+            manager = HistoricalManagerDB(config=self.config_yaml)
+            try:
+                data = manager.get_data('gbpusd', '1h', start, end)
+                self.assertFalse(is_empty_dataframe(data))
+                self.assertEqual(
+                    histdata_tickers.call_count + duka_tickers.call_count, 0)
+                self.assertFalse(registry_path.exists())
+
+                # an unknown ticker refreshes the registry once
+                with self.assertRaises(TickerNotFoundError):
+                    manager.get_data('notaticker', '1h', start, end)
+                with self.assertRaises(TickerNotFoundError):
+                    manager.get_data('notaticker', '1h', start, end)
+                self.assertEqual(
+                    (histdata_tickers.call_count, duka_tickers.call_count), (1, 1))
+                self.assertTrue(registry_path.exists())
+            finally:
+                manager.close()
+
+            # a new manager reads the registry, connectors are seeded
+            manager = HistoricalManagerDB(config=self.config_yaml)
+            try:
+                self.assertEqual(manager._histdata_tickers_list,
+                                 ['AUDCAD', 'EURUSD', 'XAUUSD'])
+                self.assertTrue(manager._is_available_ticker('xauusd'))
+                self.assertEqual(
+                    histdata_tickers.call_count + duka_tickers.call_count, 2)
+
+                # explicit refresh, an unreachable provider keeps its list
+                duka_tickers.return_value = []
+                histdata_tickers.return_value = ['EURUSD', 'AUDCAD', 'NZDCHF']
+                self.assertEqual(manager.refresh_tickers(),
+                                 ['AUDCAD', 'EURUSD', 'NZDCHF', 'XAUUSD'])
+            finally:
+                manager.close()
+
+            # an expired registry is refreshed when a ticker is checked
+            manager = HistoricalManagerDB(config=self.config_yaml
+                                          + "TICKERS_REGISTRY_TTL: '0s'\n")
+            try:
+                calls = histdata_tickers.call_count
+                self.assertTrue(manager._is_available_ticker('nzdchf'))
+                self.assertEqual(histdata_tickers.call_count, calls + 1)
+            finally:
+                manager.close()
+
+    def test_08_derived_timeframe_uneven_ticks(self):
+
+        # 10 ticks at 1.0 in the first hour, 1 tick at 2.0 in the second
+        first = synthetic_ticks(datetime(2020, 1, 6), datetime(2020, 1, 6, 0, 9),
+                                every='1m')
+        second = synthetic_ticks(datetime(2020, 1, 6, 1), datetime(2020, 1, 6, 1))
+        prices = ('ask', 'bid', 'vwmp')
+        ticks = concat([
+            first.with_columns(lit(1.0).alias(column) for column in prices),
+            second.with_columns(lit(2.0).alias(column) for column in prices)
+        ]).cast(POLARS_DTYPE_DICT.TIME_TICK_DTYPE)
+        self.manager._db_connector.write_data(
+            self.manager._db_connector._db_key('forex', 'eurusd', '1h', 2020),
+            reframe_data(ticks, '1h'))
+
+        messages = []
+        handler_id = logger.add(messages.append, level='WARNING')
+        manager = HistoricalManagerDB(config=self.config_yaml
+                                      + 'DERIVED_TIMEFRAMES: True\n')
+        try:
+            for _ in range(2):
+                derived = manager.get_data('eurusd', '2h', datetime(2020, 1, 6),
+                                           datetime(2020, 1, 6, 1))
+        finally:
+            manager.close()
+            logger.remove(handler_id)
+
+        # stored bars weight vwmp_avg by ticks, derived bars cannot
+        stored = reframe_data(ticks, '2h')
+        self.assertEqual(derived.height, 1)
+        assert_frame_equal(derived.drop(COLUMN_NAME.VWMP_AVG),
+                           stored.select(derived.columns).drop(COLUMN_NAME.VWMP_AVG))
+        self.assertAlmostEqual(stored[COLUMN_NAME.VWMP_AVG][0], 12 / 11, places=5)
+        self.assertAlmostEqual(derived[COLUMN_NAME.VWMP_AVG][0], 1.5, places=5)
+
+        # the approximation is flagged once per timeframe
+        warnings = [message for message in messages if 'is approximate' in message]
+        self.assertEqual(len(warnings), 1)
+
+
+class TestHistoricalManagerDBIncrementalRollup(unittest.TestCase):
+    """Incremental rollup of timeframe data after new tick data is stored."""
+
+    ticker = 'eurusd'
+
+    def setUp(self):
+
+        self.data_path = Path(tempfile.mkdtemp(prefix='forex_data_rollup_'))
+        self.config_yaml = f'''
+DATA_PATH: '{self.data_path}'
+DATA_FILETYPE: 'parquet'
+ENGINE: 'polars'
+DB_FILES_YEAR_PARTITIONING: True
+DB_INCREMENTAL_ROLLUP: True
+'''
+
+        self.ticks = synthetic_ticks(datetime(2020, 1, 1), datetime(2020, 2, 15),
+                                     every='1m', closed='left')
+
+        self.manager = HistoricalManagerDB(config=self.config_yaml)
+        self.manager.add_timeframe(['1h', '1d'])
+
+    def tearDown(self):
+
+        self.manager.close()
+        shutil.rmtree(self.data_path, ignore_errors=True)
+
+    def _write_ticks(self, ticks):
+
+        connector = self.manager._db_connector
+        key = connector._db_key('forex', self.ticker, TICK_TIMEFRAME, 2020)
+        connector.write_data(key, ticks)
+        self.manager._refresh_tickers_years_info(self.ticker, TICK_TIMEFRAME)
+
+    def _assert_timeframes_match(self, ticks):
+
+        for tf in self.manager._tf_list:
+            stored = self.manager._db_connector.read_data_year(
+                'forex', self.ticker, tf, 2020)
+            expected = reframe_data(ticks, tf).cast(POLARS_DTYPE_DICT.TIME_TF_DTYPE)
+            assert_frame_equal(stored, expected.select(stored.columns),
+                               check_exact=False)
+            self.assertEqual(
+                self.manager._db_connector.get_aggregation_watermark(self.ticker, tf),
+                ticks[COLUMN_NAME.TIMESTAMP].max())
+
+    def test_01_incremental_rollup(self):
+
+        # first rollup aggregates the whole year
+        cutoff = datetime(2020, 1, 20, 12, 31)
+        head = self.ticks.filter(col(COLUMN_NAME.TIMESTAMP) < cutoff)
+        self._write_ticks(head)
+        self.manager._update_db(self.ticker)
+        self._assert_timeframes_match(head)
+
+        # ticks after the watermark are rolled up from the last bar stored
+        self._write_ticks(self.ticks.filter(col(COLUMN_NAME.TIMESTAMP) >= cutoff))
+
+        with mock.patch('forex_data.data_management.historicaldata.rollup_timeframes',
+                        wraps=rollup_timeframes) as rollup:
+            self.manager._update_db(self.ticker)
+
+        self.assertTrue(rollup.called)
+        for call in rollup.call_args_list:
+            self.assertGreaterEqual(call.args[0][COLUMN_NAME.TIMESTAMP].min(),
+                                    datetime(2020, 1, 20))
+
+        self._assert_timeframes_match(self.ticks)
+
+        # nothing to do when no tick data is added
+        with mock.patch('forex_data.data_management.historicaldata.rollup_timeframes',
+                        wraps=rollup_timeframes) as rollup:
+            self.manager._update_db(self.ticker)
+
+        self.assertFalse(rollup.called)
+
+
 if __name__ == '__main__':
     unittest.main()
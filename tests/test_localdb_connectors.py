@@ -0,0 +1,557 @@
+# -*- coding: utf-8 -*-
+"""
+Local database connectors tests on synthetic data,
+no download from remote sources is needed.
+"""
+
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from polars.testing import assert_frame_equal
+
+from forex_data import TICK_TIMEFRAME
+from forex_data.data_management import (
+    LocalDBConnector,
+    LocalDBYearConnector,
+    ParquetWriterProfile
+)
+from forex_data.data_management.common import (
+    compile_conditions_expression,
+    plan_timeframes_rollup,
+    reframe_data,
+    reframe_data_multi,
+    rollup_timeframes,
+    write_parquet
+)
+
+from tests.helpers import synthetic_ticks
+
+
+class TestLocalDBYearConnector(unittest.TestCase):
+
+    def setUp(self):
+        self.data_path = Path(tempfile.mkdtemp(prefix='forex_data_localdb_'))
+
+    def tearDown(self):
+        shutil.rmtree(self.data_path, ignore_errors=True)
+
+    def _connector(self, **kwargs):
+        return LocalDBYearConnector(data_path=str(self.data_path),
+                                    data_type='parquet',
+                                    engine='polars_lazy',
+                                    **kwargs)
+
+    def test_month_segments_write_and_compaction(self):
+
+        connector = self._connector(month_segments=True)
+        key = connector._db_key('forex', 'eurusd', TICK_TIMEFRAME, 2020)
+
+        year_data = synthetic_ticks(datetime(2020, 1, 1), datetime(2020, 12, 31))
+        connector.write_data(key, year_data)
+
+        # refresh a single month with updated prices
+        march = synthetic_ticks(datetime(2020, 3, 1), datetime(2020, 3, 31, 23),
+                                offset=0.5)
+        connector.write_data(key, march)
+
+        filename = connector._get_filename('forex', 'eurusd', TICK_TIMEFRAME, 2020)
+        filepath = self.data_path / 'forex' / 'eurusd' / TICK_TIMEFRAME / filename
+        segments = connector._get_month_segments(filepath)
+        self.assertEqual(list(segments.keys()), list(range(1, 13)))
+        self.assertFalse(filepath.exists())
+
+        def check(read):
+            read = read.collect() if isinstance(read, pl.LazyFrame) else read
+            self.assertEqual(read.height, year_data.height)
+            self.assertTrue(read['timestamp'].is_sorted())
+            march_read = read.filter(pl.col('timestamp').dt.month() == 3)
+            self.assertTrue((march_read['vwmp'] > 1.5).all())
+            self.assertTrue(
+                (read.filter(pl.col('timestamp').dt.month() != 3)['vwmp'] < 1.5).all())
+
+        check(connector.read_data_year('forex', 'eurusd', TICK_TIMEFRAME, 2020))
+        self.assertEqual(
+            connector._get_ticker_years_months_from_db('eurusd', TICK_TIMEFRAME),
+            {2020: list(range(1, 13))})
+
+        connector.compact_month_segments()
+        self.assertTrue(filepath.is_file())
+        self.assertEqual(connector._get_month_segments(filepath), {})
+        check(connector.read_data_year('forex', 'eurusd', TICK_TIMEFRAME, 2020))
+
+        # a new segment on top of the compacted year file
+        connector.write_data(key, synthetic_ticks(datetime(2020, 3, 1),
+                                                  datetime(2020, 3, 31, 23)))
+        self.assertEqual(list(connector._get_month_segments(filepath).keys()), [3])
+        read = connector.read_data('forex', 'eurusd', TICK_TIMEFRAME,
+                                   datetime(2020, 1, 1), datetime(2020, 12, 31))
+        read = read.collect() if isinstance(read, pl.LazyFrame) else read
+        self.assertEqual(read.height, year_data.height)
+        self.assertTrue((read['vwmp'] < 1.5).all())
+
+        self.assertIn('eurusd', connector.create_tickers_years_dict())
+        connector.clear_database(filter='eurusd')
+        self.assertFalse(connector._get_segments_path(filepath).exists())
+        self.assertEqual(connector.get_tickers_list(), [])
+
+    def test_catalog_records_writes(self):
+
+        connector = self._connector()
+        for year in (2019, 2020):
+            connector.write_data(
+                connector._db_key('forex', 'eurusd', TICK_TIMEFRAME, year),
+                synthetic_ticks(datetime(year, 2, 1), datetime(year, 4, 30)))
+        connector.write_data(
+            connector._db_key('forex', 'gbpusd', TICK_TIMEFRAME, 2020),
+            synthetic_ticks(datetime(2020, 6, 1), datetime(2020, 6, 30)))
+
+        entries = connector._catalog.entries('parquet', 'eurusd', TICK_TIMEFRAME)
+        self.assertEqual([entry['year'] for entry in entries], [2019, 2020])
+        self.assertEqual(entries[1]['min_timestamp'], datetime(2020, 2, 1))
+        self.assertEqual(entries[1]['max_timestamp'], datetime(2020, 4, 30))
+        expected_ticks = synthetic_ticks(datetime(2020, 2, 1), datetime(2020, 4, 30))
+        self.assertEqual(entries[1]['row_count'], expected_ticks.height)
+        self.assertEqual(entries[1]['byte_size'], entries[1]['path'].stat().st_size)
+
+        expected = {2019: [2, 3, 4], 2020: [2, 3, 4]}
+        self.assertEqual(
+            connector._get_ticker_years_months_from_db('eurusd', TICK_TIMEFRAME),
+            expected)
+        self.assertEqual(sorted(connector.get_tickers_list()), ['eurusd', 'gbpusd'])
+
+        # a new connector on the same folder reads the same manifest,
+        # a rebuild from the data files gives the same content
+        reopened = self._connector()
+        self.assertEqual(
+            reopened._get_ticker_years_months_from_db('eurusd', TICK_TIMEFRAME),
+            expected)
+        hashes = [entry['content_hash'] for entry in entries]
+        reopened.rebuild_catalog()
+        self.assertEqual(
+            [entry['content_hash'] for entry in
+             reopened._catalog.entries('parquet', 'eurusd', TICK_TIMEFRAME)],
+            hashes)
+
+        connector.create_tickers_years_dict()
+        connector.clear_database(filter='gbpusd')
+        self.assertEqual(connector.get_tickers_list(), ['eurusd'])
+        connector.clear_database()
+        self.assertEqual(connector._catalog.entries('parquet'), [])
+
+    def test_read_last_timestamp_from_metadata(self):
+
+        for data_type in ('parquet', 'csv'):
+
+            connector = LocalDBYearConnector(data_path=str(self.data_path / data_type),
+                                             data_type=data_type,
+                                             engine='polars_lazy',
+                                             month_segments=True)
+            key = connector._db_key('forex', 'eurusd', TICK_TIMEFRAME, 2020)
+            connector.write_data(key, synthetic_ticks(datetime(2020, 1, 1),
+                                                      datetime(2020, 5, 20, 13)))
+            connector.compact_month_segments()
+            connector.write_data(key, synthetic_ticks(datetime(2020, 6, 1),
+                                                      datetime(2020, 6, 10, 7)))
+            connector.write_data(
+                connector._db_key('forex', 'eurusd', TICK_TIMEFRAME, 2019),
+                synthetic_ticks(datetime(2019, 1, 1), datetime(2019, 12, 31)))
+
+            self.assertEqual(
+                connector.read_last_timestamp('forex', 'eurusd', TICK_TIMEFRAME),
+                datetime(2020, 6, 10, 7))
+
+            single = LocalDBConnector(data_path=str(self.data_path / data_type),
+                                      data_type=data_type,
+                                      engine='polars_lazy')
+            single.write_data(
+                single._db_key('forex', 'eurusd', TICK_TIMEFRAME),
+                synthetic_ticks(datetime(2021, 1, 1), datetime(2021, 3, 2, 5)))
+            self.assertEqual(
+                single.read_last_timestamp('forex', 'eurusd', TICK_TIMEFRAME),
+                datetime(2021, 3, 2, 5))
+
+    def test_read_data_window_across_years(self):
+
+        data = pl.concat([
+            synthetic_ticks(datetime(year, 1, 1), datetime(year, 12, 31, 23))
+            for year in (2018, 2019, 2020)])
+
+        for data_type in ('parquet', 'csv'):
+
+            connector = LocalDBYearConnector(data_path=str(self.data_path / data_type),
+                                             data_type=data_type,
+                                             engine='polars',
+                                             month_segments=True)
+            for year in (2018, 2019, 2020):
+                key = connector._db_key('forex', 'eurusd', TICK_TIMEFRAME, year)
+                connector.write_data(
+                    key, data.filter(pl.col('timestamp').dt.year() == year))
+            # 2019 folded into the year file, 2018 and 2020 left as segments
+            connector.compact_month_segments()
+            connector.write_data(
+                connector._db_key('forex', 'eurusd', TICK_TIMEFRAME, 2020),
+                data.filter(pl.col('timestamp').dt.year() == 2020))
+            connector.write_data(
+                connector._db_key('forex', 'eurusd', TICK_TIMEFRAME, 2018),
+                data.filter(pl.col('timestamp').dt.year() == 2018))
+
+            for date, periods in ((datetime(2019, 1, 2, 3, 30), 100),
+                                  (datetime(2019, 6, 1, 5), 24 * 400),
+                                  (datetime(2020, 12, 31, 23), 10)):
+
+                read = connector.read_data_window('forex', 'eurusd', TICK_TIMEFRAME,
+                                                  date, periods, 'backward')
+                self.assertTrue(read.equals(
+                    data.filter(pl.col('timestamp') <= date).tail(periods)))
+
+                read = connector.read_data_window('forex', 'eurusd', TICK_TIMEFRAME,
+                                                  date, periods, 'forward')
+                self.assertTrue(read.equals(
+                    data.filter(pl.col('timestamp') >= date).head(periods)))
+
+            read = connector.read_data_window('forex', 'eurusd', TICK_TIMEFRAME,
+                                              datetime(2019, 1, 1), 48, 'backward',
+                                              comparison_column_name='ask',
+                                              check_level=1.1005,
+                                              comparison_operator='>')
+            self.assertTrue(read.equals(
+                data.filter(pl.col('timestamp') <= datetime(2019, 1, 1)).tail(48)
+                .filter(pl.col('ask') > 1.1005)))
+
+    def test_read_data_conditions_across_years(self):
+
+        connector = self._connector(month_segments=True)
+        data = pl.concat([
+            synthetic_ticks(datetime(year, 1, 1), datetime(year, 12, 31, 23))
+            for year in (2019, 2020)])
+        for year in (2019, 2020):
+            key = connector._db_key('forex', 'eurusd', TICK_TIMEFRAME, year)
+            connector.write_data(
+                key, data.filter(pl.col('timestamp').dt.year() == year))
+
+        start, end = datetime(2019, 11, 15), datetime(2020, 2, 1, 12)
+        read = connector.read_data('forex', 'eurusd', TICK_TIMEFRAME, start, end,
+                                   comparison_column_name=['ask', 'bid'],
+                                   check_level=[1.1009, 1.1001],
+                                   comparison_operator=['>', '<='],
+                                   comparison_aggregation_mode='OR').collect()
+        self.assertTrue(read.equals(data.filter(
+            pl.col('timestamp').is_between(start, end)
+            & ((pl.col('ask') > 1.1009) | (pl.col('bid') <= 1.1001)))))
+
+        read = connector.read_data_year(
+            'forex', 'eurusd', TICK_TIMEFRAME, [2020]).collect()
+        self.assertTrue(read.equals(data.filter(pl.col('timestamp').dt.year() == 2020)))
+
+        with self.assertRaises(ValueError):
+            connector.read_data('forex', 'eurusd', TICK_TIMEFRAME, start, end,
+                                comparison_column_name='ask',
+                                check_level=1.1,
+                                comparison_operator='=>')
+
+    def test_partition_cache(self):
+
+        connector = self._connector(month_segments=True, cache_max_bytes=10_000_000)
+        data = {
+            year: synthetic_ticks(datetime(year, 1, 1), datetime(year, 12, 31, 23))
+            for year in (2019, 2020)}
+        for year, year_data in data.items():
+            key = connector._db_key('forex', 'eurusd', TICK_TIMEFRAME, year)
+            connector.write_data(key, year_data)
+
+        start, end = datetime(2019, 6, 1), datetime(2020, 6, 1)
+        expected = pl.concat(data.values()).filter(
+            pl.col('timestamp').is_between(start, end))
+        for _ in range(3):
+            read = connector.read_data(
+                'forex', 'eurusd', TICK_TIMEFRAME, start, end).collect()
+            self.assertTrue(read.equals(expected))
+
+        stats = connector.get_cache_stats()
+        self.assertEqual((stats['entries'], stats['misses'], stats['hits']),
+                         (2, 2, 4))
+
+        # a write drops the cached year, new data is read
+        key = connector._db_key('forex', 'eurusd', TICK_TIMEFRAME, 2020)
+        march = synthetic_ticks(datetime(2020, 3, 1), datetime(2020, 3, 31, 23),
+                                offset=0.5)
+        connector.write_data(key, march)
+        self.assertEqual(connector.get_cache_stats()['invalidations'], 1)
+        read = connector.read_data_year(
+            'forex', 'eurusd', TICK_TIMEFRAME, 2020).collect()
+        march_read = read.filter(pl.col('timestamp').dt.month() == 3)
+        self.assertTrue(march_read['vwmp'].gt(1.5).all())
+
+        # a file changed by another process is detected by its version
+        other = self._connector(month_segments=True)
+        other.write_data(
+            key, synthetic_ticks(datetime(2020, 3, 1), datetime(2020, 3, 31, 23)))
+        read = connector.read_data_year(
+            'forex', 'eurusd', TICK_TIMEFRAME, 2020).collect()
+        self.assertEqual(read.height, data[2020].height)
+        self.assertTrue((read['vwmp'] < 1.5).all())
+
+        # least recently used year evicted over budget
+        year_bytes = data[2019].to_arrow().nbytes
+        small = self._connector(month_segments=True,
+                                cache_max_bytes=int(year_bytes * 1.5))
+        small.read_data('forex', 'eurusd', TICK_TIMEFRAME, start, end)
+        stats = small.get_cache_stats()
+        self.assertEqual((stats['entries'], stats['evictions']), (1, 1))
+        self.assertLessEqual(stats['bytes'], stats['max_bytes'])
+
+        connector.clear_database()
+        self.assertEqual(connector.get_cache_stats()['entries'], 0)
+
+    def test_compact_ticks_schema(self):
+
+        connector = self._connector(month_segments=True, compact_ticks=True)
+        data = {
+            year: synthetic_ticks(datetime(year, 1, 1), datetime(year, 12, 31, 23))
+            for year in (2019, 2020)}
+        for year, year_data in data.items():
+            key = connector._db_key('forex', 'eurusd', TICK_TIMEFRAME, year)
+            connector.write_data(key, year_data)
+        connector.compact_month_segments(background=False)
+
+        filename = connector._get_filename('forex', 'eurusd', TICK_TIMEFRAME, 2020)
+        filepath = self.data_path / 'forex' / 'eurusd' / TICK_TIMEFRAME / filename
+        schema = pq.read_schema(filepath)
+        self.assertEqual(schema.field('ask').type, pa.int32())
+        self.assertEqual(schema.metadata[b'forex_data.pipette_size'], b'1e-05')
+        encodings = pq.ParquetFile(filepath).metadata.row_group(0).column(0).encodings
+        self.assertIn('DELTA_BINARY_PACKED', encodings)
+
+        # decoded back to the float schema by every read path
+        expected = pl.concat(data.values())
+        start, end = datetime(2019, 6, 1), datetime(2020, 6, 1)
+        read = connector.read_data(
+            'forex', 'eurusd', TICK_TIMEFRAME, start, end).collect()
+        self.assertTrue(read.equals(
+            expected.filter(pl.col('timestamp').is_between(start, end))))
+        read = connector.read_data_window('forex', 'eurusd', TICK_TIMEFRAME,
+                                          datetime(2020, 3, 1), 100, 'backward')
+        self.assertTrue(read.collect().equals(
+            expected.filter(pl.col('timestamp') <= datetime(2020, 3, 1)).tail(100)))
+
+        # prices not quoted in pipettes are stored with the float schema
+        off_grid = synthetic_ticks(datetime(2021, 1, 1), datetime(2021, 1, 31),
+                                   offset=3e-6)
+        key = connector._db_key('forex', 'eurusd', TICK_TIMEFRAME, 2021)
+        connector.write_data(key, off_grid)
+        connector.compact_month_segments(background=False)
+        filepath = filepath.with_name(
+            connector._get_filename('forex', 'eurusd', TICK_TIMEFRAME, 2021))
+        self.assertEqual(pq.read_schema(filepath).field('ask').type, pa.float32())
+        read = connector.read_data('forex', 'eurusd', TICK_TIMEFRAME,
+                                   datetime(2020, 12, 31, 23), datetime(2021, 2, 1))
+        read = read.collect()
+        self.assertTrue(read.equals(pl.concat([data[2020].tail(1), off_grid])))
+
+    def test_parquet_writer_profile(self):
+
+        data = synthetic_ticks(datetime(2020, 1, 1), datetime(2020, 3, 31, 23),
+                               every='10m')
+        profile = ParquetWriterProfile(compression='snappy',
+                                       row_group_size=100,
+                                       row_group_period='1d',
+                                       statistics=False)
+
+        # same row groups for every engine: one per day, at most 100 rows
+        for frame in (data, data.lazy(), data.to_arrow(), data.to_pandas()):
+            filepath = self.data_path / 'profile.parquet'
+            write_parquet(frame, filepath, profile)
+            metadata = pq.ParquetFile(filepath).metadata
+            self.assertEqual(metadata.num_row_groups, 91 * 2)
+            self.assertEqual(metadata.row_group(0).num_rows, 100)
+            self.assertEqual(metadata.row_group(0).column(0).compression, 'SNAPPY')
+            self.assertFalse(metadata.row_group(0).column(0).is_stats_set)
+            self.assertTrue(pl.read_parquet(filepath).select(data.columns).equals(data))
+        filepath.unlink()
+
+        with self.assertRaises(ValueError):
+            ParquetWriterProfile.from_config({'COMPRESSION': 'zip'})
+
+        # connectors write every file with the profile
+        connector = self._connector(
+            month_segments=True,
+            compact_ticks=True,
+            parquet_writer=ParquetWriterProfile.from_config(
+                {'ROW_GROUP_PERIOD': '1mo'}))
+        key = connector._db_key('forex', 'eurusd', TICK_TIMEFRAME, 2020)
+        connector.write_data(key, data)
+        connector.compact_month_segments(background=False)
+        filename = connector._get_filename('forex', 'eurusd', TICK_TIMEFRAME, 2020)
+        filepath = self.data_path / 'forex' / 'eurusd' / TICK_TIMEFRAME / filename
+        self.assertEqual(pq.ParquetFile(filepath).metadata.num_row_groups, 3)
+        read = connector.read_data('forex', 'eurusd', TICK_TIMEFRAME,
+                                   datetime(2020, 2, 1), datetime(2020, 2, 2)).collect()
+        self.assertTrue(read.equals(
+            data.filter(pl.col('timestamp').is_between(datetime(2020, 2, 1),
+                                                       datetime(2020, 2, 2)))))
+
+    def test_reframe_data_multi(self):
+
+        ticks = synthetic_ticks(datetime(2020, 1, 1), datetime(2020, 2, 15), every='1m')
+        timeframes = ['5m', '1h', '1D']
+
+        reframed = reframe_data_multi(ticks, timeframes)
+        self.assertEqual(list(reframed), timeframes)
+        for tf in timeframes:
+            assert_frame_equal(reframed[tf], reframe_data(ticks, tf), check_exact=False)
+
+        # timeframe data and lazy input
+        bars = reframe_data(ticks, '5m')
+        reframed = reframe_data_multi(bars.lazy(), ['1h', '4h'])
+        for tf in ('1h', '4h'):
+            self.assertIsInstance(reframed[tf], pl.LazyFrame)
+            assert_frame_equal(reframed[tf].collect(), reframe_data(bars, tf),
+                               check_exact=False)
+
+    def test_reframe_data_engines(self):
+
+        ticks = synthetic_ticks(datetime(2020, 1, 1, 0, 0, 13), datetime(2020, 3, 15),
+                                every='37s')
+        bars = reframe_data(ticks, '5m')
+
+        # pyarrow native path against polars
+        for tf in ('1m', '7m', '1h', '1d', '1w', '1mo'):
+            reframed = reframe_data(ticks.to_arrow(), tf)
+            self.assertIsInstance(reframed, pa.Table)
+            assert_frame_equal(pl.from_arrow(reframed), reframe_data(ticks, tf),
+                               check_exact=False)
+        assert_frame_equal(pl.from_arrow(reframe_data(bars.to_arrow(), '1h')),
+                           reframe_data(bars, '1h'), check_exact=False)
+
+        # pandas single resample pass against polars
+        for data in (ticks, bars):
+            reframed = pl.from_pandas(reframe_data(data.to_pandas(), '1h'))
+            assert_frame_equal(reframed.cast(reframe_data(data, '1h').schema),
+                               reframe_data(data, '1h'), check_exact=False)
+
+    def test_rollup_timeframes(self):
+
+        timeframes = ['1d', '5m', '1h', '7m', '1mo', '1w', '1m']
+        self.assertEqual(plan_timeframes_rollup(timeframes),
+                         {'1m': TICK_TIMEFRAME, '5m': '1m', '7m': '1m', '1h': '5m',
+                          '1d': '1h', '1w': '1d', '1mo': '1d'})
+
+        ticks = synthetic_ticks(datetime(2020, 1, 1, 0, 0, 13), datetime(2020, 3, 15),
+                                every='37s')
+        rollup = rollup_timeframes(ticks, timeframes)
+        self.assertEqual(list(rollup), timeframes)
+        for tf in timeframes:
+            assert_frame_equal(rollup[tf], reframe_data(ticks, tf), check_exact=False)
+
+        rollup = rollup_timeframes(ticks.lazy(), ['1h', '1d'])
+        self.assertIsInstance(rollup['1d'], pl.LazyFrame)
+        assert_frame_equal(rollup['1d'].collect(), reframe_data(ticks, '1d'),
+                           check_exact=False)
+
+        # ticks streamed from a year file scan
+        connector = self._connector()
+        connector.write_data(connector._db_key('forex', 'eurusd', TICK_TIMEFRAME, 2020),
+                             ticks)
+        scan = connector.read_data_year('forex', 'eurusd', TICK_TIMEFRAME, 2020,
+                                        lazy=True)
+        self.assertIsInstance(scan, pl.LazyFrame)
+        rollup = rollup_timeframes(scan, timeframes, streaming_chunk_size=1000)
+        for tf in timeframes:
+            assert_frame_equal(rollup[tf].collect(), reframe_data(ticks, tf),
+                               check_exact=False)
+
+
+class TestCompileConditionsExpression(unittest.TestCase):
+
+    def test_compile_conditions_expression(self):
+
+        self.assertIsNone(compile_conditions_expression())
+
+        expression = compile_conditions_expression('ask', 1.1, '>')
+        self.assertIs(expression, compile_conditions_expression(['ask'], [1.1], ['>']))
+        self.assertIsNot(expression, compile_conditions_expression('ask', 1.1, '>='))
+
+        with self.assertRaises(ValueError):
+            compile_conditions_expression(['ask', 'bid'], [1.1], ['>', '<'])
+
+
+class TestLocalDBConnector(unittest.TestCase):
+
+    def setUp(self):
+        self.data_path = Path(tempfile.mkdtemp(prefix='forex_data_localdb_'))
+        self.connector = LocalDBConnector(data_path=str(self.data_path),
+                                          data_type='parquet',
+                                          engine='polars_lazy')
+        self.data = synthetic_ticks(datetime(2019, 1, 1), datetime(2020, 12, 31),
+                                    every='10m')
+        self.connector.write_data(
+            self.connector._db_key('forex', 'eurusd', TICK_TIMEFRAME), self.data)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_path, ignore_errors=True)
+
+    def test_read_data_range_conditions_and_columns(self):
+
+        start, end = datetime(2020, 2, 3), datetime(2020, 2, 4)
+        read = self.connector.read_data('forex', 'eurusd', TICK_TIMEFRAME,
+                                        start, end).collect()
+        expected = self.data.filter(pl.col('timestamp').is_between(start, end))
+        self.assertTrue(read.equals(expected))
+
+        # conditions aggregated in OR mode
+        read = self.connector.read_data(
+            'forex', 'eurusd', TICK_TIMEFRAME, start, end,
+            comparison_column_name=['ask', 'bid'],
+            check_level=[1.1005, 1.1001],
+            comparison_operator=['>=', '<'],
+            comparison_aggregation_mode='OR').collect()
+        self.assertTrue(read.equals(expected.filter(
+            (pl.col('ask') >= 1.1005) | (pl.col('bid') < 1.1001))))
+
+        # single condition and projection
+        read = self.connector.read_data(
+            'forex', 'eurusd', TICK_TIMEFRAME, start, end,
+            comparison_column_name='ask',
+            check_level=1.1005,
+            comparison_operator='>',
+            columns=['vwmp']).collect()
+        self.assertEqual(read.columns, ['timestamp', 'vwmp'])
+        self.assertTrue(read.equals(expected.filter(
+            pl.col('ask') > 1.1005).select('timestamp', 'vwmp')))
+
+    def test_read_data_window(self):
+
+        # several row groups in the file to index by their statistics
+        filename = self.connector._get_filename('forex', 'eurusd', TICK_TIMEFRAME)
+        filepath = self.data_path / 'forex' / 'eurusd' / filename
+        self.data.write_parquet(filepath, row_group_size=5000)
+
+        for date in (datetime(2019, 1, 1), datetime(2019, 7, 3, 12, 5),
+                     datetime(2020, 12, 31)):
+            for periods in (1, 7000):
+
+                read = self.connector.read_data_window(
+                    'forex', 'eurusd', TICK_TIMEFRAME, date, periods, 'backward'
+                ).collect()
+                self.assertTrue(read.equals(
+                    self.data.filter(pl.col('timestamp') <= date).tail(periods)))
+
+                read = self.connector.read_data_window(
+                    'forex', 'eurusd', TICK_TIMEFRAME, date, periods, 'forward'
+                ).collect()
+                self.assertTrue(read.equals(
+                    self.data.filter(pl.col('timestamp') >= date).head(periods)))
+
+        with self.assertRaises(ValueError):
+            self.connector.read_data_window('forex', 'eurusd', TICK_TIMEFRAME,
+                                            datetime(2020, 1, 1), 10, 'sideways')
+
+
+if __name__ == '__main__':
+    unittest.main()
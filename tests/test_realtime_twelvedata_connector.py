@@ -5,16 +5,22 @@ Created on Mon May 18 21:40:00 2026
 @author: Antigravity
 """
 
+import asyncio
+import json
 import os
 import sys
+import time
 import unittest
 import zoneinfo
 from datetime import (
     datetime,
     timedelta
 )
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from threading import Lock, Thread
 from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
 
 import polars as pl
 from loguru import logger
@@ -338,14 +344,120 @@ class TestTwelveDataConnector(unittest.TestCase):
             self.assertEqual(called_params["start_date"], "2026-06-04 21:00:00")
 
 
+class _PriceHandler(BaseHTTPRequestHandler):
+    """Stand-in of the Twelve Data price endpoint, keeps connections alive."""
+
+    protocol_version = "HTTP/1.1"
+    # headers and body are separate writes, Nagle would hold the body
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(server.delay)
+
+        symbol = parse_qs(urlparse(self.path).query)["symbol"][0]
+        if symbol == "BAD/SYM":
+            data = {"status": "error", "message": "unknown symbol"}
+        else:
+            data = {"price": "1.0850"}
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+        with server.lock:
+            server.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestTwelveDataConnectorPooled(unittest.TestCase):
+    """
+    Pooled session and async requests of TwelveDataConnector against a
+    local stand-in server, no API key is needed.
+    """
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _PriceHandler)
+        self.server.lock = Lock()
+        self.server.connections = set()
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        self.server.delay = 0.0
+        Thread(target=self.server.serve_forever, daemon=True).start()
+
+        with patch.dict("os.environ", {"TWELVE_DATA_API_KEY": "dummy"}):
+            self.connector = TwelveDataConnector(plan="ultra",
+                                                 data_path=_data_path,
+                                                 max_concurrent_downloads=2)
+        self.connector._base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.connector.clear_temporary_folder()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_session_keeps_connection_alive(self):
+
+        for _ in range(5):
+            df = self.connector.get_realtime_price("EUR/USD").collect()
+            self.assertEqual(df["price"].to_list(), [1.085])
+
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_get_realtime_prices(self):
+
+        self.server.delay = 0.1
+        symbols = ["EUR/USD", "GBP/USD", "BAD/SYM", "USD/JPY", "USD/CHF"]
+
+        df = self.connector.get_realtime_prices(symbols).collect()
+
+        # failed symbols are left out, order is kept
+        self.assertEqual(df["ticker"].to_list(),
+                         ["EUR/USD", "GBP/USD", "USD/JPY", "USD/CHF"])
+        self.assertEqual(df.columns, ["timestamp", "ticker", "price", "timezone"])
+
+        # requests overlap up to the concurrency limit, on pooled connections
+        self.assertEqual(self.server.max_in_flight, 2)
+        self.assertLessEqual(len(self.server.connections), 2)
+
+    def test_async_requests_within_rate_limit(self):
+
+        self.connector._max_requests_per_minute = 3
+
+        waits = []
+
+        async def no_wait(seconds):
+            waits.append(seconds)
+
+        with patch("forex_data.data_management.remoteconnector.asyncio.sleep", no_wait):
+            df = asyncio.run(self.connector.get_realtime_prices_async(
+                ["EUR/USD", "GBP/USD", "USD/JPY", "USD/CHF", "AUD/USD"])).collect()
+
+        self.assertEqual(df.height, 5)
+
+        # requests over the per minute budget wait for the window to clear
+        self.assertEqual(len(waits), 2)
+        self.assertTrue(all(55 < wait <= 60.1 for wait in waits))
+
+
 def main():
     print("=" * 70)
     print("  Twelve Data Real-Time Database Connector — Live Test Suite Runner")
     print("=" * 70)
 
-    suite = unittest.TestLoader().loadTestsFromTestCase(
-        TestTwelveDataConnector
-    )
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite([
+        loader.loadTestsFromTestCase(TestTwelveDataConnector),
+        loader.loadTestsFromTestCase(TestTwelveDataConnectorPooled)
+    ])
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
 